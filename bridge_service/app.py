@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import threading
 import time
@@ -11,6 +12,8 @@ from flask import Flask, Response, jsonify, request, stream_with_context
 
 from bridge_service.command_queue import CommandQueue
 
+logger = logging.getLogger(__name__)
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -91,12 +94,11 @@ def create_app() -> Flask:
                 cmd, age_seconds = swept
                 cmd_id = cmd.get("id")
                 cmd_type = cmd.get("type")
-                print(
-                    "[Bridge] Command swept id={!r} type={!r} age_seconds={:.2f}".format(
-                        cmd_id,
-                        cmd_type,
-                        age_seconds,
-                    )
+                logger.info(
+                    "Command swept id=%r type=%r age_seconds=%.2f",
+                    cmd_id,
+                    cmd_type,
+                    age_seconds,
                 )
 
     threading.Thread(target=sweep_commands, daemon=True).start()
@@ -147,7 +149,7 @@ def create_app() -> Flask:
             with open(path, "w", encoding="utf-8") as handle:
                 json.dump(snapshot, handle, indent=2, sort_keys=True)
         except Exception as exc:
-            print(f"[Bridge] Failed to persist snapshot: {exc}")
+            logger.warning("Failed to persist snapshot: %s", exc)
 
     @app.route("/health", methods=["GET", "OPTIONS"])
     def health() -> Any:
@@ -212,7 +214,7 @@ def create_app() -> Flask:
         persist_snapshot(payload)
         world = payload.get("world", "")
         combatants = payload.get("combatants", [])
-        print(f"[Bridge] Snapshot received world={world!r} combatants={len(combatants)}")
+        logger.debug("Snapshot received world=%r combatants=%d", world, len(combatants))
         return jsonify({"status": "ok"})
 
     @app.route("/commands", methods=["GET", "POST", "OPTIONS"])
@@ -225,7 +227,7 @@ def create_app() -> Flask:
                 return auth
             cmd = commands.pop_next()
             count = 1 if cmd else 0
-            print(f"[Bridge] Commands polled count={count}")
+            logger.debug("Commands polled count=%d", count)
             return jsonify({"commands": [cmd] if cmd else []})
 
         auth = require_bearer()
@@ -270,15 +272,19 @@ def create_app() -> Flask:
         if auth:
             return auth
         if not commands.ack(cmd_id):
-            print(f"[Bridge] Command ack missing id={cmd_id}")
+            logger.warning("Command ack missing id=%s", cmd_id)
             return jsonify({"error": "not_found"}), 404
-        print(f"[Bridge] Command acked id={cmd_id}")
+        logger.info("Command acked id=%s", cmd_id)
         return jsonify({"status": "ok"})
 
     return app
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=_load_env("BRIDGE_LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    )
     app = create_app()
     app.run(
         host=_load_env("BRIDGE_HOST", "0.0.0.0"),
@@ -1,9 +1,12 @@
 import json
+import logging
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CommandQueue:
@@ -27,7 +30,7 @@ class CommandQueue:
         except FileNotFoundError:
             return
         except Exception as exc:
-            print(f"[Bridge] Failed to load commands: {exc}")
+            logger.warning("Failed to load commands: %s", exc)
 
     def _persist(self) -> None:
         if not self.persist_path:
@@ -36,7 +39,7 @@ class CommandQueue:
             with open(self.persist_path, "w", encoding="utf-8") as handle:
                 json.dump(self.items, handle, indent=2, sort_keys=True)
         except Exception as exc:
-            print(f"[Bridge] Failed to persist commands: {exc}")
+            logger.warning("Failed to persist commands: %s", exc)
 
     def put(self, cmd: Dict[str, Any]) -> None:
         with self.lock:
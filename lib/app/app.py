@@ -1,5 +1,5 @@
 from typing import Dict, Any, List, Optional
-import fnmatch, json, os, re, sys, threading
+import json, os, re, sys, threading
 from dotenv import load_dotenv
 
 from PyQt5.QtWidgets import(
@@ -9,23 +9,47 @@ from PyQt5.QtWidgets import(
 from PyQt5.QtGui import (
         QPixmap, QFont
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QObject, pyqtSignal
 from app.creature import (
-    I_Creature, Player, Monster, CreatureType
+    I_Creature, Player, Monster, CreatureType, NO_RESOURCES
 )
+from app.autosave import AutosaveService, write_json_atomic
+from app.save_format import decode_state, encode_state
 from app.save_json import GameState
 from app.manager import CreatureManager
+from app.resilience import StorageResilience
 from app.storage_api import StorageAPI
+from app.storage_cache import StorageCache
+from app.storage_changes import ChangeFeed
+from app.storage_sync import MirroredStorage, mirror_dir_name
 from app import settings as app_settings
 from app.config import (
     bridge_stream_enabled,
     get_storage_api_base,
     get_config_path,
     get_local_data_dir,
+    get_local_storage_engine,
+    get_storage_cache_fresh_s,
+    get_storage_cache_max_bytes,
+    get_storage_sync_interval_s,
+    save_compression_enabled,
     local_bridge_enabled,
+    storage_cache_enabled,
+    storage_mirror_enabled,
     use_storage_api_only,
 )
 from app.bridge_client import BridgeClient
+from app.combatant_index import CombatantIndex, normalize_bridge_name
+from app.event_log import event_log, install_logging_bridge
+from app.foundry_ignore import IgnoreMatcher
+from app.pc_group_index import PCGroupIndex
+from app.reconcile import (
+    BridgeReconciler, TrackerState,
+    CreaturesPruned, CreaturesAdded, TurnOrderChanged, CombatChanged, RowsChanged,
+    RoundAdvanced, ShowStatblock, PromptDeathSaves, StatblockNeeded,
+    base_name as _base_name, resolve_creature_type,
+)
+from app.statblock_prefetch import StatblockPrefetcher
 from app.local_bridge_server import LocalBridgeServer
 from ui.windows import (
     AddCombatantWindow, RemoveCombatantWindow, BuildEncounterWindow
@@ -38,6 +62,18 @@ from ui.enter_initiatives_dialog import EnterInitiativesDialog
 load_dotenv(get_config_path(".env"), override=False)
 load_dotenv(override=False)
 
+class _GuiThreadCall(QObject):
+    """Runs callables on the GUI thread when emitted from a worker thread."""
+    call = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.call.connect(self._run)
+
+    def _run(self, fn) -> None:
+        fn()
+
+
 class Application:
 
     def __init__(self):
@@ -68,12 +104,16 @@ class Application:
         self._pc_group_check_seen: set = set()
         self._pc_group_check_dismissed: set = set()
         self._pc_group_prompt_open: bool = False
-        self._pc_group_roster_cache: Dict[str, set] = {}
+        # Normalized rosters of every saved group, persisted so the check never
+        # has to load groups from storage (see app.pc_group_index).
+        self._pc_group_index: Optional[PCGroupIndex] = None
 
         # Foundry combatants to skip (summons, familiars, effect tokens...).
         self._foundry_ignore: Dict[str, List[str]] = app_settings.get_foundry_ignore()
-        self._ignore_logged: set = set()  # keeps the log to one line per name
-        self._last_raw_combatants: List[Dict[str, Any]] = []
+
+        # Snapshot -> tracker reconciliation lives in app.reconcile; this class
+        # only renders the UI events it returns.
+        self.bridge_reconciler = BridgeReconciler(IgnoreMatcher(self._foundry_ignore))
 
 
         self.boolean_fields = {
@@ -87,25 +127,25 @@ class Application:
         if local_bridge_enabled():
             if not os.getenv("BRIDGE_TOKEN"):
                 os.environ["BRIDGE_TOKEN"] = "local-dev"
-                print("[Bridge] BRIDGE_TOKEN not set; defaulting to 'local-dev'.")
+                event_log.info("bridge", "BRIDGE_TOKEN not set; defaulting to 'local-dev'.")
             if not os.getenv("BRIDGE_INGEST_SECRET"):
                 os.environ["BRIDGE_INGEST_SECRET"] = os.environ["BRIDGE_TOKEN"]
-                print("[Bridge] BRIDGE_INGEST_SECRET not set; using BRIDGE_TOKEN for local bridge.")
+                event_log.info("bridge", "BRIDGE_INGEST_SECRET not set; using BRIDGE_TOKEN for local bridge.")
+            install_logging_bridge("bridge_service", category="bridge.service")
             self.local_bridge = LocalBridgeServer.from_env()
             self.local_bridge.start()
 
         self.bridge_client = BridgeClient.from_env()
-        self.bridge_snapshot: Optional[Dict[str, Any]] = None
         self.bridge_timer: Optional[QTimer] = None
         self.bridge_stream_thread: Optional[threading.Thread] = None
         self.bridge_stream_stop: Optional[threading.Event] = None
-        self.bridge_combatants_by_name: Dict[str, List[Dict[str, Any]]] = {}
         self._pending_bridge_snapshot: Optional[Dict[str, Any]] = None
         self._initiative_reset_pending = False
 
         # --- Storage backend ---
         self.storage_api: Optional[StorageAPI] = None
         self.storage_api_warning: Optional[str] = None
+        self.storage_sync: Optional[MirroredStorage] = None
         if use_storage_api_only():
             base = get_storage_api_base()
             if not base:
@@ -113,16 +153,130 @@ class Application:
                     "Remote API mode is enabled, but no API URL is configured.\n\n"
                     "Go to File → Settings to set your API URL, or switch to Local Files mode."
                 )
+            elif storage_mirror_enabled():
+                self.storage_sync = self._open_storage_mirror(base)
+                self.storage_api = self.storage_sync
             else:
-                self.storage_api = StorageAPI(base)
+                self.storage_api = StorageAPI(
+                    base,
+                    cache=self._open_storage_cache(base),
+                    search_index_path=get_config_path("search_index.json"),
+                )
         else:
-            from app.local_storage import LocalStorage
+            from app.local_storage import open_local_storage
             data_dir = get_local_data_dir() or get_config_path("data")
-            self.storage_api = LocalStorage(data_dir)
+            self.storage_api = open_local_storage(data_dir, get_local_storage_engine())
+
+        # Statblock lookups for bridge-sourced monsters run on a worker pool and
+        # land back on the GUI thread, so a big snapshot doesn't block on storage.
+        self._gui_call = _GuiThreadCall()
+
+        # Direct API mode reports the server's health (app.resilience) in the
+        # status bar; in mirror mode the sync status already covers it.
+        self.storage_health: Optional[StorageResilience] = None
+        if isinstance(self.storage_api, StorageAPI):
+            self.storage_health = self.storage_api.resilience
+            self.storage_health.on_change = lambda status: self._gui_call.call.emit(
+                lambda: self._on_storage_health(status)
+            )
+        self.statblock_prefetcher = StatblockPrefetcher(
+            self._fetch_statblock_by_key, self._gui_call.call.emit
+        )
+        self._statblock_fills_pending = False
+
+        # last_state.json is written off the GUI thread. Autosave stays off
+        # until the previous session's state has been loaded (arm_autosave),
+        # so startup can't overwrite it with an empty table.
+        self.autosave = AutosaveService(
+            self._write_last_state,
+            on_saved=lambda ts: self._gui_call.call.emit(lambda: self._on_autosaved(ts)),
+            on_error=lambda exc: self._gui_call.call.emit(lambda: self._on_autosave_failed(exc)),
+        )
+        self._autosave_armed = False
+        self._autosave_requested = False
+        self._announce_next_save = False
+
+        # Another device or a script can change the library under our caches;
+        # the feed tells them which keys to drop (see app.storage_changes).
+        self.storage_changes: Optional[ChangeFeed] = None
+        if hasattr(self.storage_api, "changes_since"):
+            self.storage_changes = ChangeFeed(
+                self.storage_api.changes_since, self._gui_call.call.emit
+            )
+            self.storage_changes.subscribe(("encounters",), self._on_encounters_changed)
+            self.storage_changes.subscribe(("spells",), self._on_spells_changed)
+
+    def _open_storage_cache(self, base: str) -> Optional[StorageCache]:
+        if not storage_cache_enabled():
+            return None
+        try:
+            return StorageCache(
+                get_config_path("storage_cache.sqlite"),
+                namespace=base.rstrip("/"),
+                max_bytes=get_storage_cache_max_bytes(),
+                fresh_s=get_storage_cache_fresh_s(),
+            )
+        except Exception as e:
+            event_log.warning("app", "Storage cache unavailable: {error}", error=e)
+            return None
+
+    def _open_storage_mirror(self, base: str) -> MirroredStorage:
+        # Reads and saves go to a local copy; the sync thread talks to the server.
+        from app.local_storage import open_local_storage
+        mirror_dir = get_config_path(os.path.join("mirror", mirror_dir_name(base)))
+        return MirroredStorage(
+            StorageAPI(base),
+            open_local_storage(mirror_dir, get_local_storage_engine()),
+            interval_s=get_storage_sync_interval_s(),
+            on_status=lambda status: self._gui_call.call.emit(
+                lambda: self._on_storage_sync_status(status)
+            ),
+        )
+
+    def start_storage_changes(self) -> None:
+        if self.storage_sync is not None:
+            self.storage_sync.start()
+        if self.storage_changes is not None:
+            self.storage_changes.start()
+
+    def stop_storage_changes(self) -> None:
+        if self.storage_changes is not None:
+            self.storage_changes.stop()
+        if self.storage_sync is not None:
+            self.storage_sync.stop()
+
+    def _on_storage_sync_status(self, status: Dict[str, Any]) -> None:
+        if hasattr(self, "set_sync_status"):
+            self.set_sync_status(status)
+
+    def _on_storage_health(self, status: Dict[str, Any]) -> None:
+        if hasattr(self, "set_storage_health"):
+            self.set_storage_health(status)
+
+    def _on_spells_changed(self, _collection: str, keys: set, reset: bool) -> None:
+        widget = getattr(self, "statblock_widget", None)
+        if widget is not None:
+            widget.invalidate_spells(keys, reset)
+
+    def _on_encounters_changed(self, _collection: str, keys: set, reset: bool) -> None:
+        # Only a loaded index can be stale; changed groups are re-read on demand.
+        index = self._pc_group_index
+        if index is None:
+            return
+        if reset:
+            index.retain(())
+        else:
+            changed = [k for k in keys if k.startswith(self.PC_GROUP_PREFIX)]
+            if not changed:
+                return
+            for key in changed:
+                index.remove_group(key)
+        index.built = False
+        self._save_pc_group_index()
 
     def start_bridge_polling(self) -> None:
         if not self.bridge_client.enabled:
-            print("[Bridge] BRIDGE_TOKEN is not set; bridge sync is disabled.")
+            event_log.info("bridge", "BRIDGE_TOKEN is not set; bridge sync is disabled.")
             if hasattr(self, "set_bridge_status"):
                 self.set_bridge_status("disabled")
             return
@@ -139,7 +293,7 @@ class Application:
         if self.bridge_stream_thread and self.bridge_stream_thread.is_alive():
             return
         if not self.bridge_client.enabled:
-            print("[Bridge] BRIDGE_TOKEN is not set; bridge stream is disabled.")
+            event_log.info("bridge", "BRIDGE_TOKEN is not set; bridge stream is disabled.")
             return
         if self.bridge_stream_stop is None:
             self.bridge_stream_stop = threading.Event()
@@ -162,14 +316,17 @@ class Application:
             daemon=True,
         )
         self.bridge_stream_thread.start()
-        print("[Bridge] Using SSE stream for snapshots.")
+        event_log.info("bridge", "Using SSE stream for snapshots.")
 
     def refresh_bridge_state(self) -> None:
         try:
-            print(f"[Bridge][DBG] polling base_url={getattr(self.bridge_client, 'base_url', None)!r}")
+            event_log.debug(
+                "bridge.poll", "polling base_url={url!r}",
+                url=getattr(self.bridge_client, "base_url", None),
+            )
             snapshot = self.bridge_client.fetch_state()
         except Exception as exc:
-            print(f"[Bridge] Failed to fetch state: {exc}")
+            event_log.warning("bridge", "Failed to fetch state: {exc}", exc=exc)
             if hasattr(self, "set_bridge_status"):
                 self.set_bridge_status("error")
             return
@@ -188,38 +345,40 @@ class Application:
         if self._is_table_editing():
             self._pending_bridge_snapshot = snapshot
             return
-        combatants = snapshot.get("combatants", [])
-        if not isinstance(combatants, list):
-            combatants = []
-        # Keep the unfiltered feed so the ignore dialog can still show (and
-        # un-ignore) the things being dropped.
-        self._last_raw_combatants = list(combatants)
-
-        # Drop ignored combatants once, here, so nothing downstream ever sees
-        # them: they can't be added to initiative, can't be matched by name, and
-        # can't sync HP/conditions. Filtering summons out also un-confuses name
-        # resolution for the PCs they're named after ("Surina's Echo" vs "Echo").
-        combatants, ignored = self._filter_ignored_combatants(combatants)
-        if ignored:
-            snapshot = dict(snapshot)
-            snapshot["combatants"] = combatants
-
-        self.bridge_snapshot = snapshot
-        self.bridge_combatants_by_name = self._index_bridge_combatants(combatants)
-
-        # Anything already in the tracker that the rules now cover (added before
-        # a rule existed, or restored from a saved state) goes too.
-        for name in self.prune_ignored_creatures():
-            print(f"[Bridge] Dropped ignored '{name}' from initiative")
-
-        self._apply_bridge_snapshot(snapshot)
+        state = TrackerState(
+            manager=getattr(self, "manager", None),
+            round_counter=getattr(self, "round_counter", 1),
+            current_creature_name=getattr(self, "current_creature_name", None),
+        )
+        state, events = self.bridge_reconciler.reconcile(state, snapshot)
+        self.round_counter = state.round_counter
+        self.current_creature_name = state.current_creature_name
+        self._render_bridge_events(events)
+
+        combatants = self.bridge_snapshot.get("combatants", [])
+        ignored = self.bridge_reconciler.last_ignored
         world = snapshot.get("world")
         suffix = f" (ignored {len(ignored)})" if ignored else ""
-        print(f"[Bridge] Snapshot loaded world={world!r} combatants={len(combatants)}{suffix}")
+        event_log.debug(
+            "bridge.snapshot",
+            "Snapshot loaded world={world!r} combatants={count}{suffix}",
+            world=world, count=len(combatants), suffix=suffix,
+        )
         if hasattr(self, "set_bridge_status"):
             self.set_bridge_status("connected")
         self._check_pc_group_matches_foundry(combatants)
 
+    @property
+    def bridge_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Latest snapshot with ignored combatants filtered out."""
+        return self.bridge_reconciler.snapshot
+
+    @property
+    def _last_raw_combatants(self) -> List[Dict[str, Any]]:
+        # Unfiltered feed, so the ignore dialog can still show (and un-ignore)
+        # the things being dropped.
+        return self.bridge_reconciler.raw_combatants
+
     def _is_table_editing(self) -> bool:
         """True if a table cell editor is currently open (mid-edit)."""
         table = getattr(self, "table", None)
@@ -284,473 +443,57 @@ class Application:
         self._initiative_reset_pending = False
         return True
 
-    def _apply_bridge_snapshot(self, snapshot: Dict[str, Any]) -> None:
-        if not getattr(self, "manager", None) or not getattr(self.manager, "creatures", None):
-            return
-        if not isinstance(snapshot, dict):
-            return
-
-        combatants = snapshot.get("combatants", [])
-        if not isinstance(combatants, list):
-            return
-
-        added_combatants = self._ensure_foundry_combatants_present(combatants)
-        updated_initiative = False
-        updated_active = False
-
-        for creature_name, creature in self.manager.creatures.items():
-            if getattr(creature, "_is_lair_action", False):
-                continue
-            combatant = self._resolve_bridge_combatant(creature_name)
-            if not combatant:
-                continue
-
-            initiative = combatant.get("initiative")
-            if initiative is not None and initiative != getattr(creature, "initiative", None):
-                creature.initiative = initiative
-                updated_initiative = True
-
-            setattr(creature, "foundry_combatant_id", combatant.get("combatantId"))
-            setattr(creature, "foundry_token_id", combatant.get("tokenId"))
-            setattr(creature, "foundry_actor_id", combatant.get("actorId"))
-
-            # Auto-set statblock override from actor name if not already set by user
-            actor_name = (combatant.get("actorName") or "").strip()
-            if actor_name and not creature.statblock_override:
-                base_name = self.get_base_name(creature)
-                if actor_name != base_name:
-                    creature.statblock_override = actor_name
-
-            resolved_type = self._resolve_foundry_creature_type(combatant)
-            if resolved_type and getattr(creature, "_type", None) == CreatureType.BASE:
-                creature._type = resolved_type
-                if resolved_type == CreatureType.PLAYER:
-                    creature.death_saves_prompt = True
-
-            # Populate spell slots / innate spells / X-per-day abilities from the
-            # statblock library for bridge-sourced creatures whose resources are
-            # still empty. Only monsters/NPCs — players don't have statblocks.
-            if getattr(creature, "_type", None) == CreatureType.MONSTER and not (
-                creature._spell_slots or creature._innate_slots or creature._ability_uses
-            ):
-                sb_name = (
-                    creature.statblock_override
-                    or actor_name
-                    or self.get_base_name(creature)
-                )
-                if sb_name:
-                    self.apply_statblock_slots(creature, sb_name)
-
-            effects = combatant.get("effects", [])
-            if isinstance(effects, list):
-                setattr(creature, "foundry_effects", effects)
-                labels = [effect.get("label") for effect in effects if effect.get("label")]
-                creature.conditions = labels
-
-            # Sync HP from Foundry snapshot (covers player-initiated HP changes)
-            hp_data = combatant.get("hp", {})
-            if isinstance(hp_data, dict):
-                hp_value = hp_data.get("value")
-                hp_max = hp_data.get("max")
-                hp_temp = hp_data.get("temp")
-                hp_tempmax = hp_data.get("tempmax")
-                print(f"[Bridge][HP] {creature_name!r}: value={hp_value} max={hp_max} temp={hp_temp} tempmax={hp_tempmax}")
-                if hp_value is not None:
-                    try:
-                        new_hp = int(hp_value)
-                        if new_hp != getattr(creature, "curr_hp", None):
-                            creature.curr_hp = new_hp
-                    except (TypeError, ValueError):
-                        pass
-                if hp_max is not None:
-                    try:
-                        new_max = int(hp_max)
-                        if new_max != getattr(creature, "max_hp", None):
-                            creature.max_hp = new_max
-                    except (TypeError, ValueError):
-                        pass
-                if hp_temp is not None:
-                    try:
-                        new_temp = max(0, int(hp_temp))
-                        if new_temp != creature.temp_hp:
-                            creature.temp_hp = new_temp
-                    except (TypeError, ValueError):
-                        pass
-                if hp_tempmax is not None:
-                    try:
-                        new_bonus = int(hp_tempmax)
-                        if new_bonus != creature.max_hp_bonus:
-                            creature.max_hp_bonus = new_bonus
-                    except (TypeError, ValueError):
-                        pass
-
-            ac_value = self._extract_combatant_ac(combatant)
-            if ac_value is not None:
-                try:
-                    creature.armor_class = int(ac_value)
-                except Exception:
-                    setattr(creature, "_armor_class", ac_value)
-
-        old_round = getattr(self, "round_counter", 1)
-
-        combat = snapshot.get("combat", {})
-        if isinstance(combat, dict):
-            round_value = combat.get("round")
-            if isinstance(round_value, int):
-                self.round_counter = max(1, round_value)
-
-            active = combat.get("activeCombatant")
-            active_name = None
-
-            if isinstance(active, dict):
-                active_id = active.get("combatantId")
-                if active_id:
-                    for creature in self.manager.creatures.values():
-                        if getattr(creature, "foundry_combatant_id", None) == active_id:
-                            active_name = creature.name
-                            break
-
-                active_label = None
-                if not active_name:
-                    active_label = active.get("name")
-                if active_label:
-                    active_name = active_label
-
-            current_cr = self.manager.creatures.get(
-                getattr(self, "current_creature_name", None) or ""
-            )
-            if (
-                active_name
-                and active_name != getattr(self, "current_creature_name", None)
-                and not getattr(current_cr, "_is_lair_action", False)
-            ):
-                self.current_creature_name = active_name
-                updated_active = True
-
+    def _render_bridge_events(self, events: List[Any]) -> None:
+        """Do the UI side of a reconcile pass (see app.reconcile)."""
         self._mark_initiative_reset_pending()
-
-        if added_combatants:
-            self.build_turn_order()
-            reset_active = self._maybe_reset_initiative_turn()
-            self.update_table()
-            self.pop_lists()
-            if reset_active:
-                self.update_active_ui()
-        elif updated_initiative or updated_active:
-            self.build_turn_order()
-            if self._maybe_reset_initiative_turn():
+        for event in events:
+            if isinstance(event, CreaturesPruned):
+                self.table_model.refresh()
+                self.build_turn_order()
+                self.update_table()
+                self.pop_lists()
+            elif isinstance(event, CreaturesAdded):
+                self.build_turn_order()
+                reset_active = self._maybe_reset_initiative_turn()
+                self.update_table()
+                self.pop_lists()
+                if reset_active:
+                    self.update_active_ui()
+            elif isinstance(event, TurnOrderChanged):
+                self.build_turn_order()
+                if self._maybe_reset_initiative_turn():
+                    self.update_active_ui()
+            elif isinstance(event, CombatChanged):
                 self.update_active_ui()
-        else:
-            self.update_active_ui()
-
-        # --- Turn-change side effects (mirror what next_turn() does) ---
-
-        round_advanced = (self.round_counter > old_round)
-
-        if round_advanced:
-            # Reset action/bonus_action/object_interaction for ALL creatures at top of round
-            for cr in self.manager.creatures.values():
-                if hasattr(cr, "action"):
-                    cr.action = False
-                if hasattr(cr, "bonus_action"):
-                    cr.bonus_action = False
-                if hasattr(cr, "object_interaction"):
-                    cr.object_interaction = False
-
-            # Tick status timers
-            any_tick = False
-            for cr in self.manager.creatures.values():
-                st = getattr(cr, "status_time", None)
-                try:
-                    st_int = int(st) if st is not None else None
-                except (ValueError, TypeError):
-                    st_int = None
-                if st_int is not None and st_int > 0:
-                    cr.status_time = max(0, st_int - 6)
-                    any_tick = True
-            if any_tick:
-                if hasattr(self, "update_table") and callable(self.update_table):
+            elif isinstance(event, RowsChanged):
+                self._refresh_bridge_rows(dict(event.cells))
+            elif isinstance(event, RoundAdvanced):
+                if event.timers_ticked and hasattr(self, "update_table") and callable(self.update_table):
                     self.update_table()
-
-        if updated_active and self.current_creature_name:
-            cr = self.manager.creatures.get(self.current_creature_name)
-            if cr:
-                # Reset reaction on creature's own turn
-                if hasattr(cr, "reaction"):
-                    cr.reaction = False
-                # Show statblock for monsters
-                if getattr(cr, "_type", None) == CreatureType.MONSTER:
+            elif isinstance(event, ShowStatblock):
+                cr = self.manager.creatures.get(event.name)
+                if cr:
                     self.active_statblock_image(cr)
-                # Prompt death saves
-                self._maybe_prompt_death_saves(cr)
-
-    def _ensure_foundry_combatants_present(
-        self, combatants: List[Dict[str, Any]]
-    ) -> bool:
-        if not getattr(self, "manager", None) or not getattr(self.manager, "creatures", None):
-            return False
-
-        def _normalize_id(value: Any) -> Optional[str]:
-            if value is None:
-                return None
-            if isinstance(value, str) and not value.strip():
-                return None
-            return str(value)
-
-        # Build indexes for creatures already in the app (dedupe keys).
-        # IMPORTANT: do NOT dedupe by actorId. Multiple tokens/combatants can share the same actorId.
-        existing_by_combatant_id: Dict[str, I_Creature] = {}
-        existing_by_token_id: Dict[str, I_Creature] = {}
-        matched_keys: set[str] = set()
-
-        for creature in self.manager.creatures.values():
-            cid = _normalize_id(
-                getattr(creature, "foundry_combatant_id", None)
-                or getattr(creature, "combatant_id", None)
-            )
-            tid = _normalize_id(
-                getattr(creature, "foundry_token_id", None)
-                or getattr(creature, "token_id", None)
-            )
-
-            if cid:
-                existing_by_combatant_id[cid] = creature
-                matched_keys.add(cid)
-            if tid:
-                existing_by_token_id[tid] = creature
-                matched_keys.add(tid)
-
-        # For creatures that have no IDs yet, try to resolve and attach IDs (no new creatures created here).
-        for creature in self.manager.creatures.values():
-            if getattr(creature, "_is_lair_action", False):
-                continue
-            has_any_id = bool(
-                getattr(creature, "foundry_combatant_id", None)
-                or getattr(creature, "foundry_token_id", None)
-                or getattr(creature, "combatant_id", None)
-                or getattr(creature, "token_id", None)
-            )
-            if has_any_id:
-                continue
-
-            resolved = self._resolve_bridge_combatant(getattr(creature, "name", ""))
-            if not resolved:
-                continue
-
-            rcid = _normalize_id(resolved.get("combatantId"))
-            rtid = _normalize_id(resolved.get("tokenId"))
-            raid = _normalize_id(resolved.get("actorId"))
-
-            if rcid:
-                setattr(creature, "foundry_combatant_id", rcid)
-                existing_by_combatant_id[rcid] = creature
-                matched_keys.add(rcid)
-            if rtid:
-                setattr(creature, "foundry_token_id", rtid)
-                existing_by_token_id[rtid] = creature
-                matched_keys.add(rtid)
-            if raid:
-                setattr(creature, "foundry_actor_id", raid)  # keep as metadata only
-
-        # Build sets of IDs currently present in the snapshot (for cross-scene orphan detection).
-        snapshot_combatant_ids = {
-            _normalize_id(c.get("combatantId"))
-            for c in combatants
-            if isinstance(c, dict) and _normalize_id(c.get("combatantId"))
-        }
-        snapshot_token_ids = {
-            _normalize_id(c.get("tokenId"))
-            for c in combatants
-            if isinstance(c, dict) and _normalize_id(c.get("tokenId"))
-        }
-
-        # Build actorId index for orphaned creatures (scene-transition fallback).
-        # Only include creatures whose stored combatantId/tokenId are absent from the current snapshot.
-        existing_by_actor_id: Dict[str, I_Creature] = {}
-        for creature in self.manager.creatures.values():
-            if getattr(creature, "_is_lair_action", False):
-                continue
-            aid = _normalize_id(getattr(creature, "foundry_actor_id", None))
-            if not aid:
-                continue
-            old_cid = _normalize_id(getattr(creature, "foundry_combatant_id", None))
-            old_tid = _normalize_id(getattr(creature, "foundry_token_id", None))
-            # Only eligible if old IDs are gone from snapshot (scene transition)
-            if old_cid in snapshot_combatant_ids or old_tid in snapshot_token_ids:
-                continue
-            existing_by_actor_id[aid] = creature
-
-        # Add missing Foundry combatants into the app (membership add-only).
-        added = False
-        for combatant in combatants:
-            if not isinstance(combatant, dict):
-                continue
-            if combatant.get("excludeFromSync"):
-                continue
-
-            name = (combatant.get("name") or "").strip()
-            if not name:
-                continue
-
-            cid = _normalize_id(combatant.get("combatantId"))
-            tid = _normalize_id(combatant.get("tokenId"))
-            aid = _normalize_id(combatant.get("actorId"))
-
-            # Skip if we've already matched this combatant by combatantId or tokenId.
-            if (cid and cid in matched_keys) or (tid and tid in matched_keys):
-                continue
-
-            # If an existing creature has matching IDs, attach missing metadata and skip creation.
-            existing = None
-            if cid and cid in existing_by_combatant_id:
-                existing = existing_by_combatant_id[cid]
-            elif tid and tid in existing_by_token_id:
-                existing = existing_by_token_id[tid]
-
-            if existing:
-                if cid and not getattr(existing, "foundry_combatant_id", None):
-                    setattr(existing, "foundry_combatant_id", cid)
-                    existing_by_combatant_id[cid] = existing
-                    matched_keys.add(cid)
-                if tid and not getattr(existing, "foundry_token_id", None):
-                    setattr(existing, "foundry_token_id", tid)
-                    existing_by_token_id[tid] = existing
-                    matched_keys.add(tid)
-                if aid and not getattr(existing, "foundry_actor_id", None):
-                    setattr(existing, "foundry_actor_id", aid)
-                resolved_type = self._resolve_foundry_creature_type(combatant)
-                if resolved_type and getattr(existing, "_type", None) == CreatureType.BASE:
-                    existing._type = resolved_type
-                    if resolved_type == CreatureType.PLAYER:
-                        existing.death_saves_prompt = True
-                continue
-
-            # Fallback: match by actorId for scene-transition orphans (old IDs gone from snapshot)
-            if aid and aid in existing_by_actor_id:
-                existing = existing_by_actor_id[aid]
-                if cid:
-                    setattr(existing, "foundry_combatant_id", cid)
-                    existing_by_combatant_id[cid] = existing
-                    matched_keys.add(cid)
-                if tid:
-                    setattr(existing, "foundry_token_id", tid)
-                    existing_by_token_id[tid] = existing
-                    matched_keys.add(tid)
-                del existing_by_actor_id[aid]
-                continue  # don't create new creature
-
-            # Create a new creature for this Foundry combatant using the proper subclass
-            # so it is included in save_state (which filters by isinstance(c, Monster/Player))
-            resolved_type = self._resolve_foundry_creature_type(combatant)
-            if resolved_type == CreatureType.PLAYER:
-                creature = Player(name=str(name))
-            elif resolved_type == CreatureType.MONSTER:
-                creature = Monster(name=str(name))
-            else:
-                creature = I_Creature(_name=str(name))
-
-            if cid:
-                setattr(creature, "foundry_combatant_id", cid)
-            if tid:
-                setattr(creature, "foundry_token_id", tid)
-            if aid:
-                setattr(creature, "foundry_actor_id", aid)
-
-            initiative = combatant.get("initiative")
-            if initiative is not None:
-                try:
-                    creature.initiative = int(initiative)
-                except (TypeError, ValueError):
-                    pass
-
-            hp = combatant.get("hp", {})
-            if isinstance(hp, dict):
-                curr_hp = hp.get("value")
-                max_hp = hp.get("max")
-                if curr_hp is not None:
-                    try:
-                        creature.curr_hp = int(curr_hp)
-                    except (TypeError, ValueError):
-                        pass
-                if max_hp is not None:
-                    try:
-                        creature.max_hp = int(max_hp)
-                    except (TypeError, ValueError):
-                        pass
-
-            # AC (Foundry schema can vary; support common shapes)
-            ac_value = self._extract_combatant_ac(combatant)
-            if ac_value is not None:
-                try:
-                    creature.armor_class = int(ac_value)
-                except Exception:
-                    setattr(creature, "_armor_class", ac_value)
-
-            effects = combatant.get("effects", [])
-            if isinstance(effects, list):
-                setattr(creature, "foundry_effects", effects)
-                labels = [e.get("label") for e in effects if isinstance(e, dict) and e.get("label")]
-                creature.conditions = labels
-
-            # Auto-set statblock override from actor name when token name differs
-            actor_name = (combatant.get("actorName") or "").strip()
-            if actor_name and actor_name != name:
-                creature.statblock_override = actor_name
-                self.apply_statblock_slots(creature, actor_name)
-
-            # Ensure unique name in manager
-            base_name = creature.name
-            counter = 1
-            while creature.name in self.manager.creatures:
-                creature.name = f"{base_name}_{counter}"
-                counter += 1
-
-            self.manager.add_creature(creature)
-            added = True
-
-            # Update indexes + matched keys
-            if cid:
-                existing_by_combatant_id[cid] = creature
-                matched_keys.add(cid)
-            if tid:
-                existing_by_token_id[tid] = creature
-                matched_keys.add(tid)
-
-        return added
-
-    def _extract_combatant_ac(self, combatant: Dict[str, Any]) -> Optional[int]:
-        ac_val = None
-        try:
-            # common: {"ac": {"value": 15}} or {"ac": 15}
-            ac_field = combatant.get("ac")
-            if isinstance(ac_field, dict):
-                ac_val = ac_field.get("value")
-            elif ac_field is not None:
-                ac_val = ac_field
-
-            # fallback shapes
-            if ac_val is None:
-                ac_val = combatant.get("armorClass")
-
-            if ac_val is None:
-                attrs = combatant.get("attributes", {})
-                if isinstance(attrs, dict):
-                    ac_obj = attrs.get("ac", {})
-                    if isinstance(ac_obj, dict):
-                        ac_val = ac_obj.get("value")
-        except Exception:
-            ac_val = None
-
-        if ac_val is None:
-            return None
-        try:
-            return int(ac_val)
-        except (TypeError, ValueError):
-            return None
+            elif isinstance(event, PromptDeathSaves):
+                cr = self.manager.creatures.get(event.name)
+                if cr:
+                    self._maybe_prompt_death_saves(cr)
+            elif isinstance(event, StatblockNeeded):
+                self._prefetch_statblock_slots(event.creature, event.statblock_name)
+
+    def _refresh_bridge_rows(self, touched: Dict[str, Optional[set]]) -> None:
+        """Repaint just the rows a snapshot touched instead of the whole table."""
+        model = getattr(self, "table_model", None)
+        if model is None:
+            return
+        if hasattr(model, "refresh_rows"):
+            try:
+                model.refresh_rows(touched)
+                return
+            except Exception:
+                pass
+        self.update_active_ui()
 
-    # -----------------------
-    # Core ordering utilities
-    # -----------------------
     def _creature_list_sorted(self) -> List[Any]:
         """Deterministic order from the manager: initiative DESC, then natural name ASC."""
         if not getattr(self, "manager", None) or not getattr(self.manager, "creatures", None):
@@ -793,6 +536,14 @@ class Application:
 
     def reload_foundry_ignore(self) -> None:
         self._foundry_ignore = app_settings.get_foundry_ignore()
+        # New matcher, new version: cached decisions from the old rules go with it.
+        self.bridge_reconciler.ignore = IgnoreMatcher(
+            self._foundry_ignore, version=self.foundry_ignore_version + 1
+        )
+
+    @property
+    def foundry_ignore_version(self) -> int:
+        return self.bridge_reconciler.ignore.version
 
     @property
     def foundry_ignore_patterns(self) -> List[str]:
@@ -811,7 +562,7 @@ class Application:
     ) -> None:
         app_settings.set_foundry_ignore(patterns, actor_ids, player_owned_npcs)
         self.reload_foundry_ignore()
-        self._ignore_logged.clear()
+        self.bridge_reconciler.ignore_logged.clear()
 
     def add_foundry_ignore(self, pattern: str = "", actor_id: str = "") -> None:
         """Add a name pattern and/or actor id to the ignore list."""
@@ -830,74 +581,14 @@ class Application:
         ignoring "Echo" never silently swallows "Echo Talonshade". Use globs
         like "*Echo" or "Summon*" when you want a family of tokens.
         """
-        if not name:
-            return None
-        candidate = self._normalize_bridge_name(name)
-        for pattern in self.foundry_ignore_patterns:
-            norm = self._normalize_bridge_name(pattern)
-            if not norm:
-                continue
-            if any(ch in norm for ch in "*?["):
-                if fnmatch.fnmatchcase(candidate, norm):
-                    return pattern
-            elif candidate == norm:
-                return pattern
-        return None
+        return self.bridge_reconciler.ignore.match_name(name)
 
     def combatant_ignore_reason(self, combatant: Dict[str, Any]) -> Optional[str]:
-        """Why this Foundry combatant should be skipped, or None to track it."""
-        if not isinstance(combatant, dict):
-            return None
-        if combatant.get("excludeFromSync"):
-            return "excluded in Foundry"
-        actor_id = combatant.get("actorId")
-        if actor_id and str(actor_id) in self.foundry_ignore_actor_ids:
-            return "ignored actor"
-        if self.ignore_player_owned_npcs:
-            actor_type = (combatant.get("actorType") or "").lower()
-            if actor_type == "npc" and combatant.get("actorHasPlayerOwner") is True:
-                return "player-owned NPC (summon/companion)"
-        for key in ("name", "actorName"):
-            matched = self._name_matches_ignore((combatant.get(key) or "").strip())
-            if matched:
-                return f"matches '{matched}'"
-        return None
-
-    def _filter_ignored_combatants(
-        self, combatants: List[Dict[str, Any]]
-    ) -> tuple:
-        """Split a snapshot's combatants into (kept, ignored)."""
-        kept: List[Dict[str, Any]] = []
-        ignored: List[Dict[str, Any]] = []
-        for combatant in combatants:
-            reason = self.combatant_ignore_reason(combatant)
-            if reason:
-                ignored.append(combatant)
-                if combatant.get("name") not in self._ignore_logged:
-                    self._ignore_logged.add(combatant.get("name"))
-                    print(f"[Bridge] Ignoring '{combatant.get('name')}' ({reason})")
-            else:
-                kept.append(combatant)
-        return kept, ignored
-
-    def _raw_combatant_for_creature(self, creature: I_Creature) -> Optional[Dict[str, Any]]:
-        """Find the unfiltered snapshot entry a tracked creature came from."""
-        cid = getattr(creature, "foundry_combatant_id", None)
-        tid = getattr(creature, "foundry_token_id", None)
-        aid = getattr(creature, "foundry_actor_id", None)
-        name = self._normalize_bridge_name(getattr(creature, "name", "") or "")
-        for combatant in self._last_raw_combatants:
-            if not isinstance(combatant, dict):
-                continue
-            if cid and str(combatant.get("combatantId")) == str(cid):
-                return combatant
-            if tid and str(combatant.get("tokenId")) == str(tid):
-                return combatant
-            if aid and str(combatant.get("actorId")) == str(aid):
-                return combatant
-            if name and self._normalize_bridge_name(combatant.get("name") or "") == name:
-                return combatant
-        return None
+        """Why this Foundry combatant should be skipped, or None to track it.
+
+        Decisions are cached by the matcher until the ignore settings change.
+        """
+        return self.bridge_reconciler.ignore.combatant_reason(combatant)
 
     def creature_ignore_reason(self, creature: I_Creature) -> Optional[str]:
         """Same check, for a creature already sitting in the tracker.
@@ -905,31 +596,15 @@ class Application:
         Prefers the creature's snapshot entry, since rules like the summon one
         key off Foundry fields (actorType) the creature itself doesn't carry.
         """
-        raw = self._raw_combatant_for_creature(creature)
-        if raw is not None:
-            return self.combatant_ignore_reason(raw)
-        actor_id = getattr(creature, "foundry_actor_id", None)
-        if actor_id and str(actor_id) in self.foundry_ignore_actor_ids:
-            return "ignored actor"
-        for name in (getattr(creature, "name", ""), getattr(creature, "statblock_override", "")):
-            matched = self._name_matches_ignore((name or "").strip())
-            if matched:
-                return f"matches '{matched}'"
-        return None
+        return self.bridge_reconciler.creature_ignore_reason(creature)
 
     def prune_ignored_creatures(self) -> List[str]:
         """Drop creatures already in the tracker that the ignore list now covers."""
         if not getattr(self, "manager", None):
             return []
-        doomed = [
-            name for name, creature in self.manager.creatures.items()
-            if not getattr(creature, "_is_lair_action", False)
-            and self.creature_ignore_reason(creature)
-        ]
+        doomed = self.bridge_reconciler.prune(self.manager)
         if not doomed:
             return []
-        self.manager.rm_creatures(doomed)
-        self.manager.sort_creatures()
         self.table_model.refresh()
         self.build_turn_order()
         self.update_table()
@@ -937,88 +612,19 @@ class Application:
         return doomed
 
     def _normalize_bridge_name(self, name: str) -> str:
-        cleaned = re.sub(r"\s*#\s*(\d+)\s*$", r" \1", name or "")
-        return re.sub(r"\s+", " ", cleaned).strip().casefold()
+        return normalize_bridge_name(name)
 
     def _resolve_foundry_creature_type(self, combatant: Dict[str, Any]) -> Optional[CreatureType]:
-        if not isinstance(combatant, dict):
-            return None
-        actor_type = combatant.get("actorType")
-        has_player_owner = combatant.get("actorHasPlayerOwner")
-        # actorType wins over ownership: a player-owned "npc" is a summon or
-        # companion, not a PC, and typing it as one gives it death saves.
-        if isinstance(actor_type, str) and actor_type.lower() == "character":
-            return CreatureType.PLAYER
-        if actor_type:
-            return CreatureType.MONSTER
-        if has_player_owner is True:
-            return CreatureType.PLAYER
-        return None
-
-    def _index_bridge_combatants(
-        self, combatants: List[Dict[str, Any]]
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        indexed: Dict[str, List[Dict[str, Any]]] = {}
-        for combatant in combatants:
-            if not isinstance(combatant, dict):
-                continue
-            name = combatant.get("name")
-            if not name:
-                continue
-            key = self._normalize_bridge_name(str(name))
-            if not key:
-                continue
-            indexed.setdefault(key, []).append(combatant)
-        return indexed
+        return resolve_creature_type(combatant)
 
-    def _resolve_bridge_combatant(self, creature_name: str) -> Optional[Dict[str, Any]]:
-        if not creature_name:
-            return None
-
-        key = self._normalize_bridge_name(creature_name)
-        if not key:
-            return None
-
-        # 1) Exact key match (current behavior)
-        matches = self.bridge_combatants_by_name.get(key, [])
-        if len(matches) == 1:
-            return matches[0]
-        if len(matches) > 1:
-            print(f"[Bridge] Multiple combatants match '{creature_name}', skipping command enqueue.")
-            return None
-
-        # 2) Fallback: prefix/contains match against indexed keys
-        # Example: "chitra" should match "chitraya" or "chitra-ya" after normalization.
-        candidate_lists = []
-        for indexed_key, lst in (self.bridge_combatants_by_name or {}).items():
-            if not indexed_key:
-                continue
-            if indexed_key.startswith(key) or key.startswith(indexed_key) or key in indexed_key:
-                if lst:
-                    candidate_lists.append(lst)
-
-        # Flatten + de-dup by combatantId/tokenId
-        flat: List[Dict[str, Any]] = []
-        seen = set()
-        for lst in candidate_lists:
-            for c in lst:
-                if not isinstance(c, dict):
-                    continue
-                uniq = c.get("combatantId") or c.get("tokenId") or c.get("actorId") or id(c)
-                if uniq in seen:
-                    continue
-                seen.add(uniq)
-                flat.append(c)
-
-        if len(flat) == 1:
-            print(f"[Bridge] Fuzzy matched '{creature_name}' -> '{flat[0].get('name')}'")
-            return flat[0]
-
-        if len(flat) > 1:
-            print(f"[Bridge] Fuzzy match ambiguous for '{creature_name}' ({len(flat)} candidates), skipping.")
-            return None
+    def _bridge_combatant_for(
+        self, creature_name: str, creature: Optional[I_Creature] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot combatant for a creature: by its Foundry IDs, else by name."""
+        return self.bridge_reconciler.combatant_for(creature_name, creature)
 
-        return None
+    def _resolve_bridge_combatant(self, creature_name: str) -> Optional[Dict[str, Any]]:
+        return self.bridge_reconciler.resolve_name(creature_name)
 
     def _enqueue_bridge_set_hp(self, creature_name: str, hp: int) -> None:
         if not self.bridge_client.enabled:
@@ -1037,16 +643,16 @@ class Application:
             or getattr(creature, "foundry_actor_id", None)
         )
         if not token_id:
-            combatant = self._resolve_bridge_combatant(creature_name)
+            combatant = self._bridge_combatant_for(creature_name, creature)
             if not combatant:
-                print(f"[Bridge] No combatant match for '{creature_name}', skipping.")
+                event_log.info("bridge.command", "No combatant match for '{name}', skipping.", name=creature_name)
                 return
             token_id = combatant.get("tokenId")
             actor_id = combatant.get("actorId")
         if not token_id:
-            print(f"[Bridge] Missing tokenId for '{creature_name}', skipping.")
+            event_log.info("bridge.command", "Missing tokenId for '{name}', skipping.", name=creature_name)
             return
-        print(f"[Bridge] enqueue set_hp name={creature_name!r} hp={hp}")
+        event_log.info("bridge.command", "enqueue set_hp name={name!r} hp={hp}", name=creature_name, hp=hp)
         self.bridge_client.enqueue_set_hp(
             token_id=str(token_id), hp=int(hp), actor_id=str(actor_id) if actor_id else None
         )
@@ -1068,14 +674,17 @@ class Application:
             or getattr(creature, "foundry_actor_id", None)
         )
         if not token_id:
-            combatant = self._resolve_bridge_combatant(creature_name)
+            combatant = self._bridge_combatant_for(creature_name, creature)
             if not combatant:
                 return
             token_id = combatant.get("tokenId")
             actor_id = combatant.get("actorId")
         if not token_id:
             return
-        print(f"[Bridge] enqueue set_temp_hp name={creature_name!r} temp={temp_hp}")
+        event_log.info(
+            "bridge.command", "enqueue set_temp_hp name={name!r} temp={temp}",
+            name=creature_name, temp=temp_hp,
+        )
         self.bridge_client.enqueue_set_temp_hp(
             token_id=str(token_id),
             temp_hp=int(temp_hp),
@@ -1099,14 +708,17 @@ class Application:
             or getattr(creature, "foundry_actor_id", None)
         )
         if not token_id:
-            combatant = self._resolve_bridge_combatant(creature_name)
+            combatant = self._bridge_combatant_for(creature_name, creature)
             if not combatant:
                 return
             token_id = combatant.get("tokenId")
             actor_id = combatant.get("actorId")
         if not token_id:
             return
-        print(f"[Bridge] enqueue set_max_hp_bonus name={creature_name!r} bonus={max_hp_bonus}")
+        event_log.info(
+            "bridge.command", "enqueue set_max_hp_bonus name={name!r} bonus={bonus}",
+            name=creature_name, bonus=max_hp_bonus,
+        )
         self.bridge_client.enqueue_set_max_hp_bonus(
             token_id=str(token_id),
             max_hp_bonus=int(max_hp_bonus),
@@ -1115,11 +727,11 @@ class Application:
 
     def _enqueue_bridge_set_initiative(self, creature_name: str, initiative: int) -> None:
         if not getattr(self, "bridge_client", None):
-            print("[Bridge][DBG] bridge_client missing; cannot send set_initiative")
+            event_log.debug("bridge.command", "bridge_client missing; cannot send set_initiative")
             return
 
         if not self.bridge_client.enabled:
-            print("[Bridge][DBG] bridge_client disabled; skipping set_initiative")
+            event_log.debug("bridge.command", "bridge_client disabled; skipping set_initiative")
             return
 
         creature = None
@@ -1145,7 +757,7 @@ class Application:
 
         # Prefer combatantId for initiative updates; resolve from snapshot if missing
         if not combatant_id:
-            combatant = self._resolve_bridge_combatant(creature_name)
+            combatant = self._bridge_combatant_for(creature_name, creature)
 
             # If resolve fails, snapshot may be stale/empty at startup: refresh once and retry
             if not combatant:
@@ -1156,12 +768,15 @@ class Application:
                 if isinstance(snapshot, dict):
                     combatants = snapshot.get("combatants", [])
                     if isinstance(combatants, list):
-                        self.bridge_snapshot = snapshot
-                        self.bridge_combatants_by_name = self._index_bridge_combatants(combatants)
-                combatant = self._resolve_bridge_combatant(creature_name)
+                        self.bridge_reconciler.snapshot = snapshot
+                        self.bridge_reconciler.set_index(CombatantIndex(combatants))
+                combatant = self._bridge_combatant_for(creature_name, creature)
 
             if not combatant:
-                print(f"[Bridge][DBG] no combatant match for {creature_name!r}; skipping set_initiative")
+                event_log.debug(
+                    "bridge.command", "no combatant match for {name!r}; skipping set_initiative",
+                    name=creature_name,
+                )
                 return
 
             combatant_id = combatant.get("combatantId") or combatant_id
@@ -1169,13 +784,18 @@ class Application:
             actor_id = combatant.get("actorId") or actor_id
 
         if not combatant_id and not token_id and not actor_id:
-            print(f"[Bridge][DBG] missing all ids for {creature_name!r}; skipping set_initiative")
+            event_log.debug(
+                "bridge.command", "missing all ids for {name!r}; skipping set_initiative",
+                name=creature_name,
+            )
             return
 
-        print(
-            "[Bridge] enqueue set_initiative "
-            f"name={creature_name!r} initiative={initiative!r} "
-            f"combatant_id={combatant_id!r} token_id={token_id!r} actor_id={actor_id!r}"
+        event_log.info(
+            "bridge.command",
+            "enqueue set_initiative name={name!r} initiative={initiative!r} "
+            "combatant_id={combatant_id!r} token_id={token_id!r} actor_id={actor_id!r}",
+            name=creature_name, initiative=initiative,
+            combatant_id=combatant_id, token_id=token_id, actor_id=actor_id,
         )
         self.bridge_client.send_set_initiative(
             initiative=int(initiative),
@@ -1203,22 +823,25 @@ class Application:
             or getattr(creature, "actor_id", None)
         )
         if not token_id and not actor_id:
-            combatant = self._resolve_bridge_combatant(getattr(creature, "name", ""))
+            combatant = self._bridge_combatant_for(getattr(creature, "name", ""), creature)
             if combatant:
                 token_id = combatant.get("tokenId")
                 actor_id = combatant.get("actorId")
         if not token_id and not actor_id:
-            print(
-                f"[Bridge] Missing tokenId/actorId for condition sync '{getattr(creature, 'name', '')}'"
+            event_log.info(
+                "bridge.command", "Missing tokenId/actorId for condition sync '{name}'",
+                name=getattr(creature, "name", ""),
             )
             return
         if added:
-            print(
-                f"[Bridge] enqueue add_condition name={getattr(creature, 'name', '')!r} added={added}"
+            event_log.info(
+                "bridge.command", "enqueue add_condition name={name!r} added={added}",
+                name=getattr(creature, "name", ""), added=added,
             )
         if removed:
-            print(
-                f"[Bridge] enqueue remove_condition name={getattr(creature, 'name', '')!r} removed={removed}"
+            event_log.info(
+                "bridge.command", "enqueue remove_condition name={name!r} removed={removed}",
+                name=getattr(creature, "name", ""), removed=removed,
             )
         effects = getattr(creature, "foundry_effects", []) or []
         effect_ids_by_label = {
@@ -1319,7 +942,7 @@ class Application:
             self.build_turn_order()
             self._clear_statblock()
         except Exception as e:
-            print(f"[ERROR] Failed to initialize players: {e}")
+            event_log.error("app", "Failed to initialize players: {exc}", exc=e)
 
     def load_state(self):
         filename = "last_state.json"
@@ -1338,13 +961,13 @@ class Application:
         state.current_turn = self.current_turn
         state.round_counter = self.round_counter
         state.time_counter = self.time_counter
-        payload = state.to_dict()
+        payload = self._encode_state(state)
         # optional: add a description field for your server
         # if description:
             # payload["_meta"] = {"description": description}
         if not filename.endswith(".json"):
             filename += ".json"
-        self.storage_api.put_json(filename, payload)
+        self.storage_api.put(filename, payload)
         return {"key": filename}
 
     def save_as_encounter(self):
@@ -1380,12 +1003,12 @@ class Application:
             state.round_counter = getattr(self, "round_counter", 1)
             state.time_counter = getattr(self, "time_counter", 0)
 
-            payload = state.to_dict()
+            payload = self._encode_state(state)
             # if description:
                 # payload["_meta"] = {"description": description}
 
             # ----- Save to Storage -----
-            self.storage_api.put_json(filename, payload)
+            self.storage_api.put(filename, payload)
 
             QMessageBox.information(
                 self,
@@ -1395,32 +1018,72 @@ class Application:
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save: {e}")
 
-    def save_state(self):
-        # --- Build current game state ---
+    @staticmethod
+    def _encode_state(state: GameState) -> Dict[str, Any]:
+        """``state`` in the current save format (see app.save_format)."""
+        return encode_state(state, compress=save_compression_enabled())
+
+    def _state_snapshot(self) -> Dict[str, Any]:
+        """The current combat state as plain JSON data, detached from live creatures."""
         state = GameState()
         state.players = [c for c in self.manager.creatures.values() if isinstance(c, Player)]
         state.monsters = [c for c in self.manager.creatures.values() if isinstance(c, Monster)]
         state.current_turn = getattr(self, "current_turn", 0)
         state.round_counter = getattr(self, "round_counter", 1)
         state.time_counter = getattr(self, "time_counter", 0)
+        return self._encode_state(state)
 
-        save_data = state.to_dict()
-        filename = "last_state.json"
-        description = "Auto-saved state from initiative tracker"
+    def save_state(self):
+        """Save now (Ctrl+S). The write itself happens on the autosave thread."""
+        self._autosave_armed = True
+        self._announce_next_save = True
+        self.autosave.submit(self._state_snapshot(), immediate=True)
+
+    def request_autosave(self) -> None:
+        """Note that the state changed; changes in one event-loop pass share a snapshot."""
+        if not self._autosave_armed or self._autosave_requested:
+            return
+        self._autosave_requested = True
+        QTimer.singleShot(0, self._submit_autosave)
 
+    def _submit_autosave(self) -> None:
+        self._autosave_requested = False
         try:
-            if getattr(self, "storage_api", None):
-                self.storage_api.put_json(filename, save_data)
-                if hasattr(self, "show_status_message"):
-                    self.show_status_message("State saved")
-            else:
-                file_path = self.get_data_path(filename)
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(save_data, f, ensure_ascii=False, indent=2)
-                if hasattr(self, "show_status_message"):
-                    self.show_status_message("State saved")
+            self.autosave.submit(self._state_snapshot())
         except Exception as e:
-            print(f"[ERROR] Failed to save state: {e}")
+            event_log.error("app", "Failed to snapshot state: {exc}", exc=e)
+
+    def arm_autosave(self) -> None:
+        self._autosave_armed = True
+
+    def flush_autosave(self, timeout: float = 5.0) -> None:
+        """Write the final state on shutdown, waiting up to ``timeout`` seconds."""
+        if self._autosave_armed:
+            self._submit_autosave()
+        if not self.autosave.close(timeout):
+            event_log.warning("app", "Autosave did not finish before exit")
+
+    def _write_last_state(self, snapshot: Dict[str, Any]) -> None:
+        # Runs on the autosave thread.
+        storage = getattr(self, "storage_api", None)
+        if storage is not None:
+            storage.put("last_state.json", snapshot)
+        else:
+            write_json_atomic(self.get_data_path("last_state.json"), snapshot)
+
+    def _on_autosaved(self, saved_at: float) -> None:
+        if hasattr(self, "set_autosave_status"):
+            self.set_autosave_status(saved_at)
+        if self._announce_next_save and hasattr(self, "show_status_message"):
+            self.show_status_message("State saved")
+        self._announce_next_save = False
+
+    def _on_autosave_failed(self, exc: Exception) -> None:
+        if hasattr(self, "set_autosave_status"):
+            self.set_autosave_status(None, error=str(exc))
+        if self._announce_next_save and hasattr(self, "show_status_message"):
+            self.show_status_message(f"Save failed: {exc}", 8000)
+        self._announce_next_save = False
 
     def load_file_to_manager(self, file_name, manager, monsters=False, merge=False, prompt_for_initiatives: bool = False) -> bool:
         """Load a saved state into `manager`. Returns False if nothing loaded."""
@@ -1436,15 +1099,15 @@ class Application:
                 if raw is None:
                     self._log(f"[WARN] Storage key not found: {file_name}")
                     return False
-                # Run through your custom decoder
-                state = json.loads(json.dumps(raw), object_hook=self.custom_decoder)
+                # Already parsed; creatures are rebuilt as they're used
+                state = decode_state(raw)
             else:
                 # Local file fallback (dev/offline)
                 if not os.path.exists(file_path):
                     self._log(f"[WARN] Local file not found: {file_path}")
                     return False
                 with open(file_path, "r", encoding="utf-8") as f:
-                    state = json.load(f, object_hook=self.custom_decoder)
+                    state = decode_state(json.load(f))
 
         except Exception as e:
             self._log(f"[ERROR] Failed to load '{file_name}': {e}")
@@ -1494,7 +1157,7 @@ class Application:
         # ===== Full replace (default): clear, load players+monsters, apply counters =====
         pending_inits: List[Player] = []
         manager.creatures.clear()
-        for creature in players + monsters_list:
+        for creature in [*players, *monsters_list]:
             # Skip inactive players on full replace
             if isinstance(creature, Player) and not getattr(creature, "active", True):
                 continue
@@ -1588,6 +1251,7 @@ class Application:
     # Table / UI setup
     # ----------------
     def update_table(self):
+        self.request_autosave()
         # 1) Ensure headers/model are ready
         if not self.table_model.fields:
             self.table_model.set_fields_from_sample()
@@ -1871,9 +1535,7 @@ class Application:
             self.monster_list.show()
 
     def get_base_name(self, creature):
-        non_num_name = re.sub(r'\s*(?:#\s*)?\d+\s*$', '', creature.name)
-        base_name = non_num_name.strip()
-        return base_name
+        return _base_name(creature.name)
 
     # ================== Edit Menu Actions =====================
     def fetch_statblock_for_creature(self, name: str) -> dict | None:
@@ -1886,6 +1548,41 @@ class Application:
         except Exception:
             return None
 
+    def _fetch_statblock_by_key(self, key: str) -> dict | None:
+        # Runs on a prefetch worker thread; errors are handled by the prefetcher.
+        if not self.storage_api:
+            return None
+        return self.storage_api.get_statblock(key)
+
+    def _prefetch_statblock_slots(self, creature, statblock_name: str) -> None:
+        """Fill a bridge creature's slots/abilities from its statblock, off-thread.
+
+        The table picks the result up on the next idle tick; if the creature was
+        removed or replaced in the meantime the result is dropped.
+        """
+        from app.statblock_parser import statblock_key
+
+        def on_loaded(data: dict) -> None:
+            manager = getattr(self, "manager", None)
+            if manager is None or manager.creatures.get(creature.name) is not creature:
+                return
+            if self.apply_statblock_data(creature, data):
+                self._schedule_statblock_fill_refresh()
+
+        self.statblock_prefetcher.request(statblock_key(statblock_name), on_loaded)
+
+    def _schedule_statblock_fill_refresh(self) -> None:
+        # A dozen monsters resolving at once should cost one table rebuild.
+        if self._statblock_fills_pending:
+            return
+        self._statblock_fills_pending = True
+        QTimer.singleShot(0, self._flush_statblock_fills)
+
+    def _flush_statblock_fills(self) -> None:
+        self._statblock_fills_pending = False
+        if getattr(self, "table_model", None) is not None:
+            self.update_table()
+
     def apply_statblock_slots(self, creature, statblock_name: str) -> bool:
         """Pull spell/innate slots from a statblock onto the creature.
 
@@ -1895,6 +1592,10 @@ class Application:
         data = self.fetch_statblock_for_creature(statblock_name)
         if not data:
             return False
+        return self.apply_statblock_data(creature, data)
+
+    def apply_statblock_data(self, creature, data: dict) -> bool:
+        """apply_statblock_slots() for a statblock that's already been fetched."""
         applied = False
 
         # Limited-use martial abilities (X/Day, Recharge, Legendary Actions).
@@ -1934,7 +1635,7 @@ class Application:
                     innate[spell.title()] = uses
             if innate:
                 creature._innate_slots = innate
-                creature._innate_slots_used = {}
+                creature._innate_slots_used = NO_RESOURCES
                 applied = True
         return applied
 
@@ -2036,7 +1737,7 @@ class Application:
         if not getattr(self, "turn_order", None):
             self.build_turn_order()
             if not self.turn_order:
-                print("[WARNING] No creatures in encounter. Cannot advance turn.")
+                event_log.warning("app", "No creatures in encounter. Cannot advance turn.")
                 return
         else:
             # 2) Keep it in sync with the manager's canonical order
@@ -2131,7 +1832,7 @@ class Application:
         if not getattr(self, "turn_order", None):
             self.build_turn_order()
             if not self.turn_order:
-                print("[WARNING] No creatures in encounter. Cannot go back.")
+                event_log.warning("app", "No creatures in encounter. Cannot go back.")
                 return
         else:
             try:
@@ -2323,6 +2024,8 @@ class Application:
         from ui.statblock_import_dialog import StatblockImportDialog
         dlg = StatblockImportDialog(storage_api=self.storage_api, parent=self)
         dlg.exec_()
+        # A newly imported statblock may be one a bridge monster just missed.
+        self.statblock_prefetcher.forget_misses()
 
     def open_import_spell_dialog(self):
         from ui.spell_import_dialog import SpellImportDialog
@@ -2343,6 +2046,10 @@ class Application:
         from ui.lookup_dialog import LookupDialog
         if not hasattr(self, "_lookup_dialog") or self._lookup_dialog is None:
             self._lookup_dialog = LookupDialog(storage_api=self.storage_api, parent=self)
+            if self.storage_changes is not None:
+                self.storage_changes.subscribe(
+                    ("spells", "statblocks", "items"), self._lookup_dialog.on_library_changed
+                )
         self._lookup_dialog.show()
         self._lookup_dialog.raise_()
         self._lookup_dialog.activateWindow()
@@ -2516,14 +2223,14 @@ class Application:
         state.current_turn = 0
         state.round_counter = 1
         state.time_counter = 0
-        payload = state.to_dict()
+        payload = self._encode_state(state)
         # if description:
             # payload["_meta"] = {"description": description}
 
         try:
             if not getattr(self, "storage_api", None):
                 raise RuntimeError("Storage API is not configured.")
-            self.storage_api.put_json(filename, payload)
+            self.storage_api.put(filename, payload)
             QMessageBox.information(self, "Saved", f"Saved encounter to Storage as:\n{filename}")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Failed to save encounter:\n{e}")
@@ -2550,7 +2257,6 @@ class Application:
         # Changing the party by hand re-opens the question of whether it matches
         # Foundry; an explicit "Keep Current" dismissal still stands.
         self._pc_group_check_seen.clear()
-        self._pc_group_roster_cache.clear()
         try:
             app_settings.set(self.ACTIVE_PC_GROUP_SETTING, key)
         except Exception as e:
@@ -2584,6 +2290,8 @@ class Application:
                     out.append((self._pc_group_display(key), key))
         except Exception as e:
             self._log(f"[Groups] list failed: {e}")
+            return sorted(out, key=lambda t: t[0].lower())
+        self._sync_pc_group_index([key for _, key in out])
         return sorted(out, key=lambda t: t[0].lower())
 
     def pc_group_exists(self, key: str) -> bool:
@@ -2608,21 +2316,80 @@ class Application:
                 names.setdefault(key, display)
         return names
 
-    def _pc_group_roster_names(self, key: str) -> set:
-        """Normalized PC names in a saved group. Cached — this hits storage."""
-        if key in self._pc_group_roster_cache:
-            return self._pc_group_roster_cache[key]
+    def _storage_identity(self) -> str:
+        storage = getattr(self, "storage_api", None)
+        if storage is None:
+            return ""
+        if getattr(storage, "base_url", None):
+            return f"api:{storage.base_url}"
+        if getattr(storage, "data_dir", None):
+            return f"local:{os.path.abspath(storage.data_dir)}"
+        return type(storage).__name__
+
+    @property
+    def pc_group_index(self) -> PCGroupIndex:
+        if self._pc_group_index is None:
+            self._pc_group_index = PCGroupIndex.load(
+                get_config_path("pc_group_index.json"), self._storage_identity()
+            )
+        return self._pc_group_index
+
+    def _save_pc_group_index(self) -> None:
         try:
-            players = self.get_pc_group_players(key)
-        except Exception as e:
-            self._log(f"[Groups] Could not read '{key}': {e}")
-            return set()
+            self.pc_group_index.save()
+        except OSError as e:
+            self._log(f"[Groups] Failed to persist group index: {e}")
+
+    def _roster_key_names(self, players: List[Player]) -> set:
         names = {
             self._normalize_bridge_name(getattr(p, "name", "") or "")
             for p in players
         }
         names.discard("")
-        self._pc_group_roster_cache[key] = names
+        return names
+
+    def _sync_pc_group_index(self, keys: List[str]) -> None:
+        """Drop deleted groups from the index; flag groups it hasn't seen."""
+        index = self.pc_group_index
+        before = len(index)
+        missing = index.retain(keys)
+        if missing and index.built:
+            index.built = False
+        elif len(index) == before:
+            return
+        self._save_pc_group_index()
+
+    def _ensure_pc_group_index(self) -> PCGroupIndex:
+        """Make sure every saved group is indexed (reads storage only for gaps)."""
+        index = self.pc_group_index
+        if index.built:
+            return index
+        # list_pc_groups() drops stale entries; anything still missing is read once.
+        missing = index.retain(k for _, k in self.list_pc_groups())
+        for key in missing:
+            try:
+                index.set_group(key, self._roster_key_names(self.get_pc_group_players(key)))
+            except Exception as e:
+                self._log(f"[Groups] Could not read '{key}': {e}")
+        index.built = True
+        self._save_pc_group_index()
+        if missing:
+            self._log(f"[Groups] Indexed {len(missing)} saved group(s)")
+        return index
+
+    def _pc_group_roster_names(self, key: str) -> set:
+        """Normalized PC names in a saved group, from the index when possible."""
+        roster = self.pc_group_index.roster(key)
+        if roster is not None:
+            return set(roster)
+        try:
+            players = self.get_pc_group_players(key)
+        except Exception as e:
+            self._log(f"[Groups] Could not read '{key}': {e}")
+            return set()
+        names = self._roster_key_names(players)
+        self.pc_group_index.set_group(key, names)
+        self._save_pc_group_index()
         return names
 
     def _current_pc_names(self) -> set:
@@ -2665,15 +2432,9 @@ class Application:
 
         # Only suggest a group that accounts for more of Foundry's party than
         # what's loaded; otherwise switching would be a lateral move.
-        self._pc_group_roster_cache.clear()
-        best_cover = len(fingerprint & loaded_names)
-        best_key: Optional[str] = None
-        for _display, key in self.list_pc_groups():
-            if key == active_key:
-                continue
-            cover = len(fingerprint & self._pc_group_roster_names(key))
-            if cover > best_cover:
-                best_cover, best_key = cover, key
+        best_key, _cover = self._ensure_pc_group_index().best_match(
+            fingerprint, exclude=active_key, min_cover=len(fingerprint & loaded_names)
+        )
 
         missing_display = ", ".join(sorted(foundry_pcs[k] for k in missing))
         if not best_key:
@@ -2731,7 +2492,9 @@ class Application:
         state.current_turn = 0
         state.round_counter = 1
         state.time_counter = 0
-        self.storage_api.put_json(key, state.to_dict())
+        self.storage_api.put(key, self._encode_state(state))
+        if self.pc_group_index.set_group(key, self._roster_key_names(players)):
+            self._save_pc_group_index()
         return key
 
     def save_pc_group(self, name: str) -> str:
@@ -2750,13 +2513,15 @@ class Application:
         raw = self.storage_api.get_json(key)
         if raw is None:
             raise RuntimeError(f"Group not found: {key}")
-        state = json.loads(json.dumps(raw), object_hook=self.custom_decoder)
+        state = decode_state(raw)
         return [c for c in (state.get("players", []) or []) if isinstance(c, Player)]
 
     def delete_pc_group(self, key: str) -> None:
         if not getattr(self, "storage_api", None):
             raise RuntimeError("Storage is not configured.")
         self.storage_api.delete(key)
+        if self.pc_group_index.remove_group(key):
+            self._save_pc_group_index()
         if self.active_pc_group == key:
             self._set_active_pc_group(None)
 
@@ -2933,5 +2698,10 @@ class Application:
             pass
 
     def _log(self, msg: str) -> None:
-        """Lightweight logger used throughout the app."""
-        print(msg)
+        """Lightweight logger used throughout the app (goes to the event log)."""
+        if msg.startswith("[ERROR]"):
+            event_log.error("app", msg)
+        elif msg.startswith("[WARN"):
+            event_log.warning("app", msg)
+        else:
+            event_log.info("app", msg)
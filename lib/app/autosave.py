@@ -0,0 +1,183 @@
+# lib/app/autosave.py
+"""
+Background, debounced autosave of combat state.
+
+save_state used to build the GameState, pretty-print it and write
+last_state.json (or PUT it to the storage API) on the GUI thread, on every
+save. A slow server froze the table, and a crash mid-write left a truncated
+file behind.
+
+AutosaveService takes snapshots that are already plain JSON data (see
+serialization.to_primitive), so the worker never touches live creatures.
+A burst of submits within ``delay_s`` produces a single write of the latest
+snapshot. A steady stream of changes still saves at least every
+``max_delay_s``. Snapshots identical to the last one written are skipped.
+Writes run on one worker thread; write_json_atomic() gives the local-file
+path temp-file-plus-rename atomicity.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from app.event_log import event_log
+
+DEFAULT_DELAY_S = 2.0
+DEFAULT_MAX_DELAY_S = 15.0
+
+
+def write_json_atomic(path: str, data: Any, indent: Optional[int] = None) -> None:
+    """Write ``data`` to ``path`` so readers see the old file or the new one, never half."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if indent is None:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class AutosaveService:
+    def __init__(
+        self,
+        write: Callable[[Any], None],
+        delay_s: float = DEFAULT_DELAY_S,
+        max_delay_s: float = DEFAULT_MAX_DELAY_S,
+        on_saved: Optional[Callable[[float], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._write = write
+        self.delay_s = delay_s
+        self.max_delay_s = max_delay_s
+        self.on_saved = on_saved
+        self.on_error = on_error
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._pending: Any = None
+        self._has_pending = False
+        self._first_submit = 0.0
+        self._last_submit = 0.0
+        self._immediate = False
+        self._writing = False
+        self._last_written: Any = None
+        self._has_written = False
+        self._closed = False
+        self.last_saved_at: Optional[float] = None  # wall clock, for display
+        self.writes = 0
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side (GUI thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, snapshot: Any, immediate: bool = False) -> None:
+        """Queue ``snapshot`` (plain JSON data) to be written; replaces any pending one."""
+        with self._cond:
+            if self._closed:
+                return
+            now = self._clock()
+            if not self._has_pending:
+                self._first_submit = now
+            self._pending = snapshot
+            self._has_pending = True
+            self._last_submit = now
+            self._immediate = self._immediate or immediate
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write any pending snapshot now and wait for it; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._has_pending:
+                self._immediate = True
+                self._cond.notify_all()
+            while self._has_pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """Flush, then stop the worker."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._has_pending or self._writing
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _due_in_locked(self) -> float:
+        if self._immediate:
+            return 0.0
+        now = self._clock()
+        return max(
+            0.0,
+            min(self._last_submit + self.delay_s, self._first_submit + self.max_delay_s) - now,
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._has_pending:
+                        wait = self._due_in_locked()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed and not self._has_pending:
+                    return
+                snapshot = self._pending
+                self._pending = None
+                self._has_pending = False
+                self._immediate = False
+                self._writing = True
+                unchanged = self._has_written and snapshot == self._last_written
+            try:
+                if not unchanged:
+                    self._write(snapshot)
+            except Exception as e:
+                event_log.error("app", "Autosave failed: {exc}", exc=e)
+                if self.on_error is not None:
+                    self.on_error(e)
+            else:
+                with self._cond:
+                    self._last_written = snapshot
+                    self._has_written = True
+                    self.last_saved_at = time.time()
+                    if not unchanged:
+                        self.writes += 1
+                if self.on_saved is not None:
+                    self.on_saved(self.last_saved_at)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
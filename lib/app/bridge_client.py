@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, Optional
 
 import requests
 
+from app.event_log import event_log
+from app.session_recorder import SessionRecorder
+
 
 def _get_env(name: str, default: str = "") -> str:
     value = os.getenv(name, "").strip()
@@ -48,28 +51,40 @@ class BridgeClient:
     base_url: str
     token: str
     timeout_s: float = 3.0
+    recorder: Optional[SessionRecorder] = field(default=None, repr=False, compare=False)
 
     @classmethod
     def from_env(cls) -> "BridgeClient":
         base_url = _get_env("BRIDGE_URL", "http://127.0.0.1:8787").rstrip("/")
         token = _get_env("BRIDGE_TOKEN")
         timeout_s = float(_get_env("BRIDGE_TIMEOUT", "3"))
-        return cls(base_url=base_url, token=token, timeout_s=timeout_s)
+        recorder = SessionRecorder.from_env() if token else None
+        return cls(base_url=base_url, token=token, timeout_s=timeout_s, recorder=recorder)
 
     @property
     def enabled(self) -> bool:
         return bool(self.token)
 
+    def close(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+
     def fetch_state(self) -> Optional[Dict[str, Any]]:
         if not self.enabled:
-            print("[Bridge] BRIDGE_TOKEN is not set; skipping sync.")
+            event_log.info("bridge", "BRIDGE_TOKEN is not set; skipping sync.")
             return None
         url = f"{self.base_url}/state"
         response = requests.get(url, headers=_build_headers(self.token), timeout=self.timeout_s)
         if response.status_code != 200:
-            print(f"[Bridge] GET /state failed: {response.status_code} {response.text}")
+            event_log.warning(
+                "bridge.poll", "GET /state failed: {status} {body}",
+                status=response.status_code, body=response.text,
+            )
             return None
-        return response.json()
+        snapshot = response.json()
+        if self.recorder is not None and isinstance(snapshot, dict):
+            self.recorder.record_snapshot(snapshot, source="poll")
+        return snapshot
 
     def stream_state(
         self,
@@ -79,7 +94,7 @@ class BridgeClient:
         on_disconnect: Optional[Callable[[], None]] = None,
     ) -> None:
         if not self.enabled:
-            print("[Bridge] BRIDGE_TOKEN is not set; skipping stream.")
+            event_log.info("bridge", "BRIDGE_TOKEN is not set; skipping stream.")
             return
         import threading
         import time
@@ -94,8 +109,9 @@ class BridgeClient:
                     url, headers=headers, timeout=self.timeout_s, stream=True
                 ) as response:
                     if response.status_code != 200:
-                        print(
-                            f"[Bridge] GET /state/stream failed: {response.status_code} {response.text}"
+                        event_log.warning(
+                            "bridge.stream", "GET /state/stream failed: {status} {body}",
+                            status=response.status_code, body=response.text,
                         )
                         if on_disconnect:
                             on_disconnect()
@@ -119,9 +135,11 @@ class BridgeClient:
                             except jsonlib.JSONDecodeError:
                                 continue
                             if isinstance(payload, dict):
+                                if self.recorder is not None:
+                                    self.recorder.record_snapshot(payload, source="stream")
                                 on_snapshot(payload)
             except requests.RequestException as exc:
-                print(f"[Bridge] Stream error: {exc}")
+                event_log.warning("bridge.stream", "Stream error: {exc}", exc=exc)
                 if on_disconnect:
                     on_disconnect()
                 time.sleep(retry_delay)
@@ -278,7 +296,7 @@ class BridgeClient:
         redact_fields: tuple[str, ...] = (),
     ) -> bool:
         if not self.enabled:
-            print("[Bridge] BRIDGE_TOKEN is not set; skipping command enqueue.")
+            event_log.info("bridge.command", "BRIDGE_TOKEN is not set; skipping command enqueue.")
             return False
         url = f"{self.base_url}/commands"
         cmd = _build_command_payload(command_type, payload, command_id=command_id)
@@ -286,24 +304,32 @@ class BridgeClient:
         headers["Content-Type"] = "application/json"
         try:
             if command_type == "set_initiative":
-                print(f"[Bridge][DBG] POST {url} type=set_initiative json={payload}")
+                event_log.debug("bridge.command", "POST {url} type=set_initiative json={payload}", url=url, payload=payload)
             response = requests.post(
                 url, json=cmd, headers=headers, timeout=self.timeout_s
             )
             if command_type == "set_initiative":
-                print(
-                    f"[Bridge][DBG] POST /commands status={response.status_code} body={response.text[:200]}"
+                event_log.debug(
+                    "bridge.command", "POST /commands status={status} body={body}",
+                    status=response.status_code, body=response.text[:200],
                 )
         except requests.RequestException as exc:
-            print(f"[Bridge] POST /commands failed: {exc}")
+            event_log.warning("bridge.command", "POST /commands failed: {exc}", exc=exc)
+            if self.recorder is not None:
+                self.recorder.record_command(cmd, status=None, ok=False)
             return False
-        if 200 <= response.status_code < 300:
+        ok = 200 <= response.status_code < 300
+        if self.recorder is not None:
+            self.recorder.record_command(cmd, status=response.status_code, ok=ok)
+        if ok:
             redacted = " ".join(f"{field}=<redacted>" for field in redact_fields)
-            print(
-                f"[Bridge] Enqueued {log_label} command {redacted} status={response.status_code}"
+            event_log.info(
+                "bridge.command", "Enqueued {label} command {redacted} status={status}",
+                label=log_label, redacted=redacted, status=response.status_code,
             )
             return True
-        print(
-            f"[Bridge] POST /commands failed: {response.status_code} {response.text}"
+        event_log.warning(
+            "bridge.command", "POST /commands failed: {status} {body}",
+            status=response.status_code, body=response.text,
         )
         return False
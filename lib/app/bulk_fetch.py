@@ -0,0 +1,49 @@
+# lib/app/bulk_fetch.py
+"""
+Bounded concurrent fetching for the storage backends' *_bulk readers.
+
+Loading a whole library one GET at a time is latency-bound: 2,000 items at
+~50 ms each is well over a minute. fetch_many() keeps a small pool of
+requests in flight instead. It's the fallback when the storage server has no
+bulk endpoint, and what LocalStorage uses directly.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def unique_keys(keys: Iterable[str]) -> List[str]:
+    return [k for k in dict.fromkeys(keys) if isinstance(k, str) and k]
+
+
+def fetch_many(
+    keys: Iterable[str],
+    fetch_one: Callable[[str], Optional[Dict[str, Any]]],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch every key with ``fetch_one``; return {key: data} for the hits.
+
+    Keys come back in input order. A key that is missing, empty, or whose
+    fetch raises is simply absent from the result, matching how callers
+    already treat a failed single get.
+    """
+    ordered = unique_keys(keys)
+    if not ordered:
+        return {}
+
+    def _safe(key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return fetch_one(key)
+        except Exception:
+            return None
+
+    workers = max(1, min(max_workers, len(ordered)))
+    if workers == 1:
+        results = [_safe(k) for k in ordered]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-bulk") as pool:
+            results = list(pool.map(_safe, ordered))
+    return {k: data for k, data in zip(ordered, results) if data}
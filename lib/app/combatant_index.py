@@ -0,0 +1,196 @@
+# lib/app/combatant_index.py
+"""
+Lookup index over the combatants in one Foundry bridge snapshot.
+
+Built once per snapshot and shared by everything that needs to go from a
+tracker creature to its Foundry combatant: snapshot apply, ignore-list
+pruning, the active-combatant lookup and the command-targeting paths.
+Foundry IDs are authoritative; the normalized name is only a fallback for
+creatures that haven't been bound to a combatant yet.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+@lru_cache(maxsize=2048)
+def normalize_bridge_name(name: str) -> str:
+    """Fold a combatant/creature name for matching ("Goblin #2" -> "goblin 2")."""
+    cleaned = re.sub(r"\s*#\s*(\d+)\s*$", r" \1", name or "")
+    return re.sub(r"\s+", " ", cleaned).strip().casefold()
+
+
+def _id_key(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str) and not value.strip():
+        return None
+    return str(value)
+
+
+class NameSearchIndex:
+    """Substring/prefix search over normalized combatant names.
+
+    Every name is indexed by all of its 1-3 character substrings, so a query
+    only verifies names sharing its n-grams instead of scanning every key.
+    Matches the rule the fuzzy fallback has always used: the query is a
+    substring of the name, or the name is a prefix of the query.
+    """
+
+    GRAM = 3
+
+    def __init__(self, names: Iterable[str]):
+        self.order: Dict[str, int] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        for name in names:
+            if not name or name in self.order:
+                continue
+            self.order[name] = len(self.order)
+            for size in range(1, self.GRAM + 1):
+                for start in range(len(name) - size + 1):
+                    self.grams.setdefault(name[start:start + size], set()).add(name)
+
+    def _containing(self, key: str) -> Set[str]:
+        if len(key) <= self.GRAM:
+            return self.grams.get(key, set())
+        found: Optional[Set[str]] = None
+        for start in range(len(key) - self.GRAM + 1):
+            posting = self.grams.get(key[start:start + self.GRAM])
+            if not posting:
+                return set()
+            found = set(posting) if found is None else found & posting
+            if not found:
+                return set()
+        return {name for name in (found or ()) if key in name}
+
+    def matches(self, key: str) -> List[str]:
+        """Indexed names overlapping ``key``, in the order they were indexed."""
+        if not key:
+            return []
+        found = set(self._containing(key))
+        # Names that are a prefix of the query ("chitra" for "chitra-ya").
+        for end in range(1, len(key) + 1):
+            if key[:end] in self.order:
+                found.add(key[:end])
+        return sorted(found, key=self.order.__getitem__)
+
+
+class CombatantIndex:
+    """combatantId / tokenId / actorId / normalized-name lookups for a snapshot.
+
+    combatantId and tokenId identify exactly one combatant. actorId and name
+    can be shared (unlinked tokens of one actor, several "Goblin"s), so those
+    map to lists in snapshot order.
+    """
+
+    def __init__(self, combatants: Iterable[Dict[str, Any]] = ()):
+        self.combatants: List[Dict[str, Any]] = []
+        self.by_combatant_id: Dict[str, Dict[str, Any]] = {}
+        self.by_token_id: Dict[str, Dict[str, Any]] = {}
+        self.by_actor_id: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self._name_search: Optional[NameSearchIndex] = None
+        self._fuzzy_memo: Dict[str, List[Dict[str, Any]]] = {}
+
+        for combatant in combatants or ():
+            if not isinstance(combatant, dict):
+                continue
+            self.combatants.append(combatant)
+            cid = _id_key(combatant.get("combatantId"))
+            if cid is not None:
+                self.by_combatant_id.setdefault(cid, combatant)
+            tid = _id_key(combatant.get("tokenId"))
+            if tid is not None:
+                self.by_token_id.setdefault(tid, combatant)
+            aid = _id_key(combatant.get("actorId"))
+            if aid is not None:
+                self.by_actor_id.setdefault(aid, []).append(combatant)
+            name = combatant.get("name")
+            if name:
+                key = normalize_bridge_name(str(name))
+                if key:
+                    self.by_name.setdefault(key, []).append(combatant)
+
+    def __len__(self) -> int:
+        return len(self.combatants)
+
+    def by_id(
+        self,
+        combatant_id: Any = None,
+        token_id: Any = None,
+        actor_id: Any = None,
+    ) -> Optional[Dict[str, Any]]:
+        """First combatant matching combatantId, then tokenId, then actorId."""
+        cid = _id_key(combatant_id)
+        if cid is not None and cid in self.by_combatant_id:
+            return self.by_combatant_id[cid]
+        tid = _id_key(token_id)
+        if tid is not None and tid in self.by_token_id:
+            return self.by_token_id[tid]
+        aid = _id_key(actor_id)
+        if aid is not None and self.by_actor_id.get(aid):
+            return self.by_actor_id[aid][0]
+        return None
+
+    def for_creature(self, creature: Any, use_actor_id: bool = True) -> Optional[Dict[str, Any]]:
+        """The combatant a tracker creature is bound to, by its stored Foundry IDs.
+
+        actorId is shared by every unlinked token of an actor, so callers that
+        need the exact combatant (rather than anything from the same actor) pass
+        use_actor_id=False.
+        """
+        return self.by_id(
+            getattr(creature, "foundry_combatant_id", None),
+            getattr(creature, "foundry_token_id", None),
+            getattr(creature, "foundry_actor_id", None) if use_actor_id else None,
+        )
+
+    def by_normalized_name(self, name: str) -> List[Dict[str, Any]]:
+        key = normalize_bridge_name(name)
+        if not key:
+            return []
+        return self.by_name.get(key, [])
+
+    @property
+    def name_search(self) -> NameSearchIndex:
+        if self._name_search is None:
+            self._name_search = NameSearchIndex(self.by_name)
+        return self._name_search
+
+    def share_name_search(self, previous: Optional["CombatantIndex"]) -> None:
+        """Reuse the previous snapshot's name search if the names are unchanged.
+
+        Most snapshots only change HP or the turn pointer, so the n-gram index
+        only needs rebuilding when combatants are added, removed or renamed.
+        """
+        search = getattr(previous, "_name_search", None)
+        if search is not None and search.order.keys() == self.by_name.keys():
+            self._name_search = search
+
+    def fuzzy_matches(self, key: str) -> List[Dict[str, Any]]:
+        """Combatants whose normalized name overlaps ``key``, de-duplicated.
+
+        Memoized for the lifetime of this index (one snapshot), since the same
+        creatures are resolved on every apply and every outgoing command.
+        """
+        cached = self._fuzzy_memo.get(key)
+        if cached is not None:
+            return cached
+        flat: List[Dict[str, Any]] = []
+        seen = set()
+        for indexed_key in self.name_search.matches(key):
+            for combatant in self.by_name.get(indexed_key, ()):
+                uniq = (
+                    combatant.get("combatantId")
+                    or combatant.get("tokenId")
+                    or combatant.get("actorId")
+                    or id(combatant)
+                )
+                if uniq in seen:
+                    continue
+                seen.add(uniq)
+                flat.append(combatant)
+        self._fuzzy_memo[key] = flat
+        return flat
@@ -33,6 +33,36 @@ def get_local_data_dir() -> str:
     """User-configured local data directory (empty = use default)."""
     return _settings.get("local_data_dir") or os.getenv("LOCAL_DATA_DIR", "")
 
+def get_local_storage_engine() -> str:
+    """How local data is stored: "files" (one JSON file each) or "sqlite"."""
+    engine = _settings.get("local_storage_engine") or os.getenv("LOCAL_STORAGE_ENGINE", "")
+    engine = engine.strip().lower()
+    return engine if engine in ("files", "sqlite") else "files"
+
+def storage_cache_enabled() -> bool:
+    return os.getenv("STORAGE_CACHE", "1").strip() not in ("", "0", "false", "False")
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        return default
+
+def get_storage_cache_max_bytes() -> int:
+    return int(_env_float("STORAGE_CACHE_MAX_MB", 64) * 1024 * 1024)
+
+def get_storage_cache_fresh_s() -> float:
+    return _env_float("STORAGE_CACHE_TTL", 300)
+
+def storage_mirror_enabled() -> bool:
+    return os.getenv("STORAGE_MIRROR", "1").strip() not in ("", "0", "false", "False")
+
+def get_storage_sync_interval_s() -> float:
+    return _env_float("STORAGE_SYNC_INTERVAL", 15)
+
+def save_compression_enabled() -> bool:
+    return os.getenv("SAVE_COMPRESS", "0").strip() not in ("", "0", "false", "False")
+
 # ---- Feature flags ----
 
 def local_bridge_enabled() -> bool:
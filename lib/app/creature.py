@@ -1,10 +1,33 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 import json
 from enum import Enum
 from app.exceptions import CreatureTypeError
 
+_SLOT_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def slot_values(obj: Any) -> Dict[str, Any]:
+    """What ``obj.__dict__`` would be if ``obj`` weren't slotted: every slot that is set."""
+    cls = type(obj)
+    names = _SLOT_NAMES.get(cls)
+    if names is None:
+        found: List[str] = []
+        for klass in cls.__mro__:
+            slots = vars(klass).get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in ("__dict__", "__weakref__"):
+                    found.append(name)
+        names = _SLOT_NAMES[cls] = tuple(found)
+    out = {}
+    for name in names:
+        try:
+            out[name] = getattr(obj, name)
+        except AttributeError:
+            pass
+    return out
+
 
 class CustomEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -12,6 +35,8 @@ class CustomEncoder(json.JSONEncoder):
             return obj.value
         if hasattr(obj, '__dict__'):
             return obj.__dict__
+        if hasattr(obj, '__slots__'):
+            return slot_values(obj)
         return super().default(obj)
 
 
@@ -24,8 +49,58 @@ class CreatureType(Enum):
         return str(self.name)
 
 
-@dataclass
-class I_Creature:
+class _NoResources(dict):
+    """The empty spell slot / innate / ability-use dict every creature without one shares.
+
+    Most monsters have no limited resources, so sharing one empty value saves
+    six dicts per creature. It is read-only; writable_resource() gives the
+    creature its own dict before anything is changed in place.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared empty resource dict is read-only; use I_Creature.writable_resource()")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> _NoResources:
+        return self
+
+    def __deepcopy__(self, memo) -> _NoResources:
+        return self
+
+    def __reduce__(self):
+        return (_NoResources, ())
+
+
+NO_RESOURCES: Dict[Any, int] = _NoResources()
+
+
+def _no_resources() -> Dict[Any, int]:
+    return NO_RESOURCES
+
+RESOURCE_FIELDS = (
+    "_spell_slots",
+    "_innate_slots",
+    "_spell_slots_used",
+    "_innate_slots_used",
+    "_ability_uses",
+    "_ability_uses_used",
+)
+
+
+class _BridgeBinding:
+    """Foundry IDs and effects the bridge attaches while a combat is synced.
+
+    They are runtime only: unset until reconcile binds the creature (read them
+    with getattr(..., None)) and never written by to_dict().
+    """
+    __slots__ = ("foundry_combatant_id", "foundry_token_id", "foundry_actor_id", "foundry_effects")
+
+
+@dataclass(slots=True)
+class I_Creature(_BridgeBinding):
     _type: CreatureType = field(default=CreatureType.BASE)
     _name: str = field(default="")
     _init: int = field(default=-1)
@@ -44,12 +119,12 @@ class I_Creature:
     _player_visible: bool = field(default=True)
     _conditions: List[str] = field(default_factory=list)
     _status_time: int = field(default=-1)
-    _spell_slots: dict[int, int] = field(default_factory=dict)
-    _innate_slots: dict[str, int] = field(default_factory=dict)
-    _spell_slots_used: dict[int, int] = field(default_factory=dict)
-    _innate_slots_used: dict[str, int] = field(default_factory=dict)
-    _ability_uses: dict[str, int] = field(default_factory=dict)
-    _ability_uses_used: dict[str, int] = field(default_factory=dict)
+    _spell_slots: dict[int, int] = field(default_factory=_no_resources)
+    _innate_slots: dict[str, int] = field(default_factory=_no_resources)
+    _spell_slots_used: dict[int, int] = field(default_factory=_no_resources)
+    _innate_slots_used: dict[str, int] = field(default_factory=_no_resources)
+    _ability_uses: dict[str, int] = field(default_factory=_no_resources)
+    _ability_uses_used: dict[str, int] = field(default_factory=_no_resources)
     _death_successes: int = field(default=0)
     _death_failures: int = field(default=0)
     _death_stable: bool = field(default=False)
@@ -354,8 +429,18 @@ class I_Creature:
     @statblock_override.setter
     def statblock_override(self, value: str): self._statblock_override = (value or "").strip()
 
+    def writable_resource(self, name: str) -> dict:
+        """Resource dict ``name`` (one of RESOURCE_FIELDS), safe to change in place."""
+        value = getattr(self, name)
+        if value is NO_RESOURCES:
+            value = {}
+            setattr(self, name, value)
+        return value
+
 
 class Monster(I_Creature):
+    __slots__ = ()
+
     def __init__(self, name, init=0, max_hp=0, max_hp_bonus=0, curr_hp=0, temp_hp=0, armor_class=0,
                  movement=0, action=False, bonus_action=False, reaction=False,
                  notes='', public_notes='', player_visible=True, conditions=None, status_time='',
@@ -382,10 +467,10 @@ class Monster(I_Creature):
             _player_visible=bool(player_visible),
             _conditions=(conditions or []),
             _status_time=status_time,
-            _spell_slots=spell_slots or {},
-            _innate_slots=innate_slots or {},
-            _spell_slots_used=spell_slots_used or {},
-            _innate_slots_used=innate_slots_used or {},
+            _spell_slots=spell_slots or NO_RESOURCES,
+            _innate_slots=innate_slots or NO_RESOURCES,
+            _spell_slots_used=spell_slots_used or NO_RESOURCES,
+            _innate_slots_used=innate_slots_used or NO_RESOURCES,
             _death_saves_prompt=bool(death_saves_prompt),
             _active=active,
             _foundry_combatant_id=foundry_combatant_id,
@@ -393,13 +478,15 @@ class Monster(I_Creature):
             _foundry_actor_id=foundry_actor_id,
             _is_lair_action=bool(is_lair_action),
             _lair_action_notes=str(lair_action_notes),
-            _ability_uses=ability_uses or {},
-            _ability_uses_used=ability_uses_used or {},
+            _ability_uses=ability_uses or NO_RESOURCES,
+            _ability_uses_used=ability_uses_used or NO_RESOURCES,
             _statblock_override=str(statblock_override or ""),
         )
 
 
 class Player(I_Creature):
+    __slots__ = ()
+
     def __init__(self, name, init=0, max_hp=0, max_hp_bonus=0, curr_hp=0, temp_hp=0, armor_class=0,
                  movement=0, action=False, bonus_action=False, reaction=False,
                  object_interaction=False, notes='', public_notes='', player_visible=True,
@@ -426,10 +513,10 @@ class Player(I_Creature):
             _player_visible=bool(player_visible),
             _conditions=(conditions or []),
             _status_time=status_time,
-            _spell_slots=spell_slots or {},
-            _innate_slots=innate_slots or {},
-            _spell_slots_used=spell_slots_used or {},
-            _innate_slots_used=innate_slots_used or {},
+            _spell_slots=spell_slots or NO_RESOURCES,
+            _innate_slots=innate_slots or NO_RESOURCES,
+            _spell_slots_used=spell_slots_used or NO_RESOURCES,
+            _innate_slots_used=innate_slots_used or NO_RESOURCES,
             _death_successes=death_successes,
             _death_failures=death_failures,
             _death_stable=death_stable,
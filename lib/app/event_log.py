@@ -0,0 +1,310 @@
+# lib/app/event_log.py
+"""
+Leveled, categorised event log backed by an in-memory ring buffer.
+
+The bridge used to print unconditionally: a line per creature per snapshot
+for HP, debug lines per poll and per POST. With a full combat and a busy
+stream, stdout became a real share of the snapshot-apply time. Everything now
+goes through EventLog instead:
+
+* Every record has a dotted category ("bridge", "bridge.hp", "statblock", ...)
+  and a level. Category levels inherit from their parents ("bridge.hp" falls
+  back to "bridge", then to the root level), like stdlib logging.
+* A record below its category's level is dropped after one dict lookup; the
+  message template is only formatted when something reads it, so a disabled
+  debug call costs no string formatting.
+* Categories can be sampled (keep 1 in N) for high-volume debug output.
+* Kept records go into a bounded deque (the Tools → Event Log viewer reads
+  it) and, at or above the echo level, are printed to stdout as before.
+
+Configuration comes from the environment:
+
+    EVENT_LOG_LEVELS="bridge.hp=DEBUG,bridge.poll=DEBUG"   per-category levels
+    EVENT_LOG_SAMPLE="bridge.hp=10"                          keep 1 in N
+    EVENT_LOG_ECHO=WARNING                                   stdout threshold
+    EVENT_LOG_CAPACITY=5000                                  ring buffer size
+
+bridge_service logs through stdlib logging; install_logging_bridge() routes a
+stdlib logger into the event log when the service runs inside the app.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+_NAMED_LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+_NAMED_LEVELS["WARN"] = WARNING
+
+ROOT = ""
+
+
+def parse_level(value: Any, default: int = INFO) -> int:
+    if isinstance(value, int):
+        return value
+    text = str(value or "").strip().upper()
+    if text.isdigit():
+        return int(text)
+    return _NAMED_LEVELS.get(text, default)
+
+
+def level_name(level: int) -> str:
+    return LEVEL_NAMES.get(level, str(level))
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    seq: int
+    ts: float
+    level: int
+    category: str
+    template: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def message(self) -> str:
+        if not self.fields:
+            return self.template
+        try:
+            return self.template.format(**self.fields)
+        except (KeyError, IndexError, ValueError):
+            return f"{self.template} {self.fields!r}"
+
+    def format_line(self) -> str:
+        stamp = time.strftime("%H:%M:%S", time.localtime(self.ts))
+        return f"{stamp} {level_name(self.level):<7} [{self.category}] {self.message}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "ts": self.ts,
+            "level": level_name(self.level),
+            "category": self.category,
+            "message": self.message,
+            "fields": {k: v if isinstance(v, (int, float, str, bool, type(None))) else repr(v)
+                       for k, v in self.fields.items()},
+        }
+
+
+class EventLog:
+    def __init__(
+        self,
+        capacity: int = 5000,
+        level: int = INFO,
+        echo_level: Optional[int] = INFO,
+    ):
+        self._lock = threading.Lock()
+        self._records: Deque[LogRecord] = deque(maxlen=max(1, int(capacity)))
+        self._seq = itertools.count(1)
+        self._levels: Dict[str, int] = {ROOT: level}
+        self._sample_rates: Dict[str, int] = {}
+        self._sample_counters: Dict[str, Iterator[int]] = {}
+        # Resolved category -> effective level; cleared whenever levels change.
+        self._effective: Dict[str, int] = {}
+        self.echo_level = echo_level
+
+    @classmethod
+    def from_env(cls) -> "EventLog":
+        try:
+            capacity = int(os.getenv("EVENT_LOG_CAPACITY", "5000"))
+        except ValueError:
+            capacity = 5000
+        echo = os.getenv("EVENT_LOG_ECHO", "").strip()
+        log = cls(capacity=capacity, echo_level=parse_level(echo) if echo else INFO)
+        for category, value in _parse_pairs(os.getenv("EVENT_LOG_LEVELS", "")):
+            log.set_level(category, parse_level(value))
+        for category, value in _parse_pairs(os.getenv("EVENT_LOG_SAMPLE", "")):
+            try:
+                log.set_sample_rate(category, int(value))
+            except ValueError:
+                continue
+        return log
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    @property
+    def capacity(self) -> int:
+        return self._records.maxlen or 0
+
+    def set_level(self, category: str, level: Any) -> None:
+        with self._lock:
+            self._levels[category] = parse_level(level)
+            self._effective = {}
+
+    def clear_level(self, category: str) -> None:
+        """Make ``category`` inherit its parent's level again."""
+        if category == ROOT:
+            return
+        with self._lock:
+            self._levels.pop(category, None)
+            self._effective = {}
+
+    def levels(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._levels)
+
+    def set_sample_rate(self, category: str, every: int) -> None:
+        """Keep one in ``every`` records for ``category`` (1 or less keeps all)."""
+        with self._lock:
+            if every <= 1:
+                self._sample_rates.pop(category, None)
+                self._sample_counters.pop(category, None)
+            else:
+                self._sample_rates[category] = every
+                self._sample_counters[category] = itertools.count()
+
+    def sample_rates(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._sample_rates)
+
+    def effective_level(self, category: str) -> int:
+        level = self._effective.get(category)
+        if level is not None:
+            return level
+        with self._lock:
+            name = category
+            while True:
+                if name in self._levels:
+                    level = self._levels[name]
+                    break
+                if not name:
+                    level = INFO
+                    break
+                name = name.rpartition(".")[0]
+            self._effective[category] = level
+        return level
+
+    def enabled(self, category: str, level: int) -> bool:
+        return level >= self.effective_level(category)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def log(self, level: int, category: str, template: str, **fields: Any) -> None:
+        if level < self.effective_level(category):
+            return
+        if category in self._sample_rates:
+            counter = self._sample_counters.get(category)
+            if counter is not None and next(counter) % self._sample_rates.get(category, 1):
+                return
+        with self._lock:
+            record = LogRecord(next(self._seq), time.time(), level, category, template, fields)
+            self._records.append(record)
+        echo = self.echo_level
+        if echo is not None and level >= echo:
+            print(f"[{category}] {record.message}" if level < WARNING
+                  else f"[{category}][{level_name(level)}] {record.message}")
+
+    def debug(self, category: str, template: str, **fields: Any) -> None:
+        self.log(DEBUG, category, template, **fields)
+
+    def info(self, category: str, template: str, **fields: Any) -> None:
+        self.log(INFO, category, template, **fields)
+
+    def warning(self, category: str, template: str, **fields: Any) -> None:
+        self.log(WARNING, category, template, **fields)
+
+    def error(self, category: str, template: str, **fields: Any) -> None:
+        self.log(ERROR, category, template, **fields)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def records(
+        self,
+        since_seq: int = 0,
+        min_level: int = DEBUG,
+        category: Optional[str] = None,
+    ) -> List[LogRecord]:
+        """Buffered records newer than ``since_seq``, optionally filtered.
+
+        ``category`` matches itself and its children ("bridge" includes
+        "bridge.hp").
+        """
+        with self._lock:
+            snapshot = list(self._records)
+        prefix = f"{category}." if category else ""
+        return [
+            r for r in snapshot
+            if r.seq > since_seq
+            and r.level >= min_level
+            and (not category or r.category == category or r.category.startswith(prefix))
+        ]
+
+    def categories(self) -> List[str]:
+        with self._lock:
+            seen = {r.category for r in self._records}
+        return sorted(seen | {c for c in self._levels if c})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def export(self, path: str, records: Optional[List[LogRecord]] = None) -> int:
+        """Write records to ``path`` (JSON lines for ``*.jsonl``, else text)."""
+        rows = self.records() if records is None else records
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                for r in rows:
+                    f.write(json.dumps(r.to_dict(), separators=(",", ":")) + "\n")
+            else:
+                for r in rows:
+                    f.write(r.format_line() + "\n")
+        return len(rows)
+
+
+def _parse_pairs(spec: str) -> List[tuple]:
+    pairs = []
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        key, _, value = part.partition("=")
+        pairs.append((key.strip(), value.strip()))
+    return pairs
+
+
+class EventLogHandler(logging.Handler):
+    """stdlib logging handler that forwards records into an EventLog."""
+
+    def __init__(self, event_log: "EventLog", category: Optional[str] = None):
+        super().__init__()
+        self.event_log = event_log
+        self.category = category
+
+    def emit(self, record: logging.LogRecord) -> None:
+        category = self.category or record.name
+        if not self.event_log.enabled(category, record.levelno):
+            return
+        try:
+            self.event_log.log(record.levelno, category, record.getMessage())
+        except Exception:
+            self.handleError(record)
+
+
+def install_logging_bridge(logger_name: str, category: Optional[str] = None) -> None:
+    """Route a stdlib logger (e.g. the in-process bridge_service) into the event log."""
+    logger = logging.getLogger(logger_name)
+    if any(isinstance(h, EventLogHandler) for h in logger.handlers):
+        return
+    logger.addHandler(EventLogHandler(event_log, category))
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+
+
+event_log = EventLog.from_env()
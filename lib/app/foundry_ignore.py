@@ -0,0 +1,125 @@
+# lib/app/foundry_ignore.py
+"""
+Compiled form of the Foundry ignore list (see app.settings.get_foundry_ignore).
+
+Every snapshot asks "should this combatant be skipped?" for every combatant,
+and the answer only changes when the settings do. IgnoreMatcher compiles the
+patterns once (wildcard-free patterns into a dict, globs into one combined
+regex) and caches each decision, so steady-state snapshots do no pattern
+matching at all. A new matcher, with a bumped version, is built whenever the
+ignore settings change.
+"""
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from app.combatant_index import normalize_bridge_name
+
+GLOB_CHARS = "*?["
+
+# Decisions are cached per distinct combatant; a long session sees a few
+# hundred at most, this just stops a pathological feed growing it forever.
+_CACHE_LIMIT = 4096
+
+
+class IgnoreMatcher:
+    def __init__(self, config: Optional[Dict[str, Any]] = None, version: int = 0):
+        config = config or {}
+        self.version = version
+        self.patterns = [str(p) for p in config.get("patterns", []) or []]
+        self.actor_ids = frozenset(str(a) for a in config.get("actor_ids", []) or [])
+        self.player_owned_npcs = bool(config.get("player_owned_npcs", True))
+
+        # Normalized exact pattern -> (list position, original pattern). The
+        # first occurrence wins, same as walking the list in order.
+        self._exact: Dict[str, Tuple[int, str]] = {}
+        self._glob_groups: Dict[str, Tuple[int, str]] = {}
+        alternatives = []
+        for position, pattern in enumerate(self.patterns):
+            norm = normalize_bridge_name(pattern)
+            if not norm:
+                continue
+            if any(ch in norm for ch in GLOB_CHARS):
+                group = f"ignore{position}"
+                self._glob_groups[group] = (position, pattern)
+                alternatives.append(f"(?P<{group}>{fnmatch.translate(norm)})")
+            else:
+                self._exact.setdefault(norm, (position, pattern))
+        # Alternatives are tried left to right, so the earliest glob in the
+        # list is the one reported.
+        self._glob_re = re.compile("|".join(alternatives)) if alternatives else None
+
+        self._name_cache: Dict[str, Optional[str]] = {}
+        self._decision_cache: Dict[tuple, Optional[str]] = {}
+
+    def ignores_actor(self, actor_id: Any) -> bool:
+        return bool(actor_id) and str(actor_id) in self.actor_ids
+
+    def match_name(self, name: str) -> Optional[str]:
+        """Return the pattern that matches this name, if any.
+
+        A pattern with no wildcard is an exact (case-insensitive) match, so
+        ignoring "Echo" never silently swallows "Echo Talonshade". When several
+        patterns match, the one listed first wins.
+        """
+        if not name:
+            return None
+        if name in self._name_cache:
+            return self._name_cache[name]
+        candidate = normalize_bridge_name(name)
+        best = self._exact.get(candidate)
+        if self._glob_re is not None:
+            found = self._glob_re.fullmatch(candidate)
+            if found:
+                for group, hit in self._glob_groups.items():
+                    if found.group(group) is not None:
+                        if best is None or hit[0] < best[0]:
+                            best = hit
+                        break
+        matched = best[1] if best else None
+        if len(self._name_cache) >= _CACHE_LIMIT:
+            self._name_cache.clear()
+        self._name_cache[name] = matched
+        return matched
+
+    def combatant_reason(self, combatant: Dict[str, Any]) -> Optional[str]:
+        """Why this Foundry combatant should be skipped, or None to track it."""
+        if not isinstance(combatant, dict):
+            return None
+        key = (
+            combatant.get("name"),
+            combatant.get("actorName"),
+            combatant.get("actorId"),
+            bool(combatant.get("excludeFromSync")),
+            combatant.get("actorType"),
+            combatant.get("actorHasPlayerOwner") is True,
+        )
+        try:
+            return self._decision_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable field from an odd feed; decide without caching.
+            return self._decide(combatant)
+        reason = self._decide(combatant)
+        if len(self._decision_cache) >= _CACHE_LIMIT:
+            self._decision_cache.clear()
+        self._decision_cache[key] = reason
+        return reason
+
+    def _decide(self, combatant: Dict[str, Any]) -> Optional[str]:
+        if combatant.get("excludeFromSync"):
+            return "excluded in Foundry"
+        if self.ignores_actor(combatant.get("actorId")):
+            return "ignored actor"
+        if self.player_owned_npcs:
+            actor_type = (combatant.get("actorType") or "").lower()
+            if actor_type == "npc" and combatant.get("actorHasPlayerOwner") is True:
+                return "player-owned NPC (summon/companion)"
+        for field in ("name", "actorName"):
+            matched = self.match_name((combatant.get(field) or "").strip())
+            if matched:
+                return f"matches '{matched}'"
+        return None
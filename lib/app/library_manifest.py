@@ -0,0 +1,140 @@
+# lib/app/library_manifest.py
+"""
+Per-collection summary manifests for the statblock/spell/item libraries.
+
+List views only need a few fields per entry (an item's name and cost, a
+spell's level) but the storage backends list bare keys, so showing anything
+better than a prettified filename meant loading every document. A manifest
+maps key -> summary for a whole collection and is fetched in one call.
+
+LocalStorage keeps one in each collection directory (``.manifest.json``),
+updated as entries are saved and deleted and reconciled against file mtimes
+when read, so files edited or copied in by hand are picked up too.
+StorageAPI asks the server for ``{collection}/manifest`` and builds it from
+the bulk reader when the server has no such endpoint.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = ".manifest.json"
+
+SUMMARY_FIELDS = {
+    "items": ("name", "cost", "rarity", "tags"),
+    "spells": ("name", "level", "school", "concentration"),
+    "statblocks": ("name", "challenge_rating", "type", "size"),
+}
+
+
+def summarize(collection: str, data: Any) -> Dict[str, Any]:
+    """The summary fields ``data`` has for ``collection``."""
+    if not isinstance(data, dict):
+        return {}
+    out: Dict[str, Any] = {}
+    for field in SUMMARY_FIELDS[collection]:
+        if field in data:
+            value = data[field]
+            out[field] = list(value) if isinstance(value, (list, tuple)) else value
+    return out
+
+
+class DirectoryManifest:
+    """Summaries for one directory of ``<key>.json`` files.
+
+    save/delete update the in-memory manifest; it's written back the next time
+    summaries() is read. A manifest that was never written (or is out of date
+    because the process exited first) is repaired by the mtime check.
+    """
+
+    def __init__(self, collection: str, dirpath: str):
+        self.collection = collection
+        self.dirpath = dirpath
+        self.path = os.path.join(dirpath, MANIFEST_FILENAME)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load_locked(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(raw, dict) or raw.get("version") != MANIFEST_VERSION:
+            return
+        for key, entry in (raw.get("entries") or {}).items():
+            if isinstance(entry, dict) and isinstance(entry.get("summary"), dict):
+                self._entries[key] = entry
+
+    def _save_locked(self) -> None:
+        payload = {"version": MANIFEST_VERSION, "entries": self._entries}
+        os.makedirs(self.dirpath, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".manifest.", dir=self.dirpath)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
+
+    def _mtime(self, key: str) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(self.dirpath, key)).st_mtime_ns
+        except OSError:
+            return None
+
+    def update(self, key: str, data: Any) -> None:
+        with self._lock:
+            if not self._loaded:
+                return
+            mtime = self._mtime(key)
+            if mtime is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = {"mtime": mtime, "summary": summarize(self.collection, data)}
+            self._dirty = True
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            if self._loaded and self._entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def summaries(
+        self, keys: list, read_one: Callable[[str], Optional[dict]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """{key: summary} for ``keys`` (the directory listing), refreshing stale entries."""
+        with self._lock:
+            if not self._loaded:
+                self._load_locked()
+            wanted = set(keys)
+            for key in [k for k in self._entries if k not in wanted]:
+                del self._entries[key]
+                self._dirty = True
+            for key in keys:
+                mtime = self._mtime(key)
+                entry = self._entries.get(key)
+                if entry is not None and entry.get("mtime") == mtime:
+                    continue
+                self._entries[key] = {
+                    "mtime": mtime,
+                    "summary": summarize(self.collection, read_one(key)),
+                }
+                self._dirty = True
+            if self._dirty:
+                try:
+                    self._save_locked()
+                except OSError:
+                    pass
+            return {k: dict(self._entries[k]["summary"]) for k in keys}
@@ -10,18 +10,58 @@ Directory layout under data_dir:
         <encounter>.json        ← encounters stored flat (backward-compat)
         players.json            ← player roster
         last_state.json         ← auto-saved combat state
+        .search_index.json      ← full-text index of the library (see search_index)
         statblocks/
             <name>.json
+            .manifest.json      ← summary fields per statblock (see library_manifest)
         spells/
             <name>.json
+        items/
+            <name>.json
+
+Writes inside ``with storage.batch():`` are staged next to their targets and
+only become files at commit, through atomic renames. A journal of those renames
+(.batch_journal.json) is written first, so a commit interrupted by a crash
+is finished the next time the directory is opened. Reads on the batch's thread
+see the staged documents; other threads keep reading and writing the committed
+files, and only wait for the lock while a write is staged or committed.
 """
 from __future__ import annotations
 
+import copy
 import json
 import os
-from typing import Any, List, Optional
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.autosave import write_json_atomic
+from app.bulk_fetch import fetch_many
+from app.library_manifest import DirectoryManifest
+from app.save_format import is_versioned
+from app.search_index import LibrarySearch, SearchHit
+from app.serialization import to_primitive
+from app.storage_changes import ChangeBatch, DirectoryWatcher
+
+
+SEARCH_INDEX_FILENAME = ".search_index.json"
+BATCH_JOURNAL_FILENAME = ".batch_journal.json"
+BATCH_STAGING_PREFIX = ".batch-"
+# Staged files older than this with no journal are leftovers of a crashed batch.
+STALE_STAGING_S = 3600
+LIBRARY_COLLECTIONS = ("statblocks", "spells", "items")
+
+_DELETED = object()
 
-from app.creature import CustomEncoder
+
+def open_local_storage(data_dir: str, engine: str = "files"):
+    """LocalStorage for ``data_dir``, or its SQLite counterpart for engine="sqlite"."""
+    if engine == "sqlite":
+        from app.sqlite_storage import SQLiteStorage
+        return SQLiteStorage.for_data_dir(data_dir)
+    return LocalStorage(data_dir)
 
 
 class LocalStorage:
@@ -29,10 +69,35 @@ class LocalStorage:
 
     def __init__(self, data_dir: str) -> None:
         self.data_dir = os.path.expanduser(data_dir)
+        self._lock = threading.RLock()
+        self._batch_free = threading.Condition(self._lock)
+        # thread running the open batch; only its writes are staged
+        self._batch_owner: Optional[int] = None
+        self._batch_depth = 0
+        # target path -> (collection, key, data or _DELETED, staged file or None)
+        self._staged: Dict[str, Tuple[str, str, Any, Optional[str]]] = {}
+        self._batch_dirs: set = set()
+        self._batch_token = ""
+        self._batch_seq = 0
         self._ensure_dirs()
+        self._recover_batch()
+        self._manifests = {
+            sub: DirectoryManifest(sub, os.path.join(self.data_dir, sub))
+            for sub in LIBRARY_COLLECTIONS
+        }
+        self._search = LibrarySearch(
+            self._stamps,
+            self._read_many,
+            path=os.path.join(self.data_dir, SEARCH_INDEX_FILENAME),
+            identity=os.path.abspath(self.data_dir),
+        )
+        self._watcher = DirectoryWatcher({
+            "encounters": self.data_dir,
+            **{sub: os.path.join(self.data_dir, sub) for sub in LIBRARY_COLLECTIONS},
+        })
 
     def _ensure_dirs(self) -> None:
-        for sub in ("statblocks", "spells", "items"):
+        for sub in LIBRARY_COLLECTIONS:
             os.makedirs(os.path.join(self.data_dir, sub), exist_ok=True)
         os.makedirs(self.data_dir, exist_ok=True)
 
@@ -50,8 +115,19 @@ class LocalStorage:
     def _item_path(self, key: str) -> str:
         return os.path.join(self.data_dir, "items", key)
 
-    @staticmethod
-    def _read_json(path: str) -> Optional[dict]:
+    def _path(self, collection: str, key: str) -> str:
+        if collection == "encounters":
+            return self._enc_path(key)
+        return os.path.join(self.data_dir, collection, key)
+
+    def _in_batch(self) -> bool:
+        return self._batch_owner == threading.get_ident()
+
+    def _read_json(self, path: str) -> Optional[dict]:
+        staged = self._staged.get(path) if self._in_batch() else None
+        if staged is not None:
+            data = staged[2]
+            return None if data is _DELETED else copy.deepcopy(data)
         try:
             with open(path, "r", encoding="utf-8") as f:
                 return json.load(f)
@@ -65,14 +141,238 @@ class LocalStorage:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
     @staticmethod
-    def _list_json(dirpath: str) -> List[str]:
+    def _mtime(path: str) -> Optional[int]:
         try:
-            return sorted(
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _stamps(self, collection: str) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        try:
+            with os.scandir(os.path.join(self.data_dir, collection)) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and not entry.name.startswith("."):
+                        try:
+                            out[entry.name] = entry.stat().st_mtime_ns
+                        except OSError:
+                            pass
+        except FileNotFoundError:
+            pass
+        return out
+
+    def _read_many(self, collection: str, keys: List[str]) -> Dict[str, dict]:
+        readers = {
+            "statblocks": self.get_statblocks_bulk,
+            "spells": self.get_spells_bulk,
+            "items": self.get_items_bulk,
+        }
+        return readers[collection](keys)
+
+    def _list_json(self, dirpath: str) -> List[str]:
+        try:
+            names = {
                 f for f in os.listdir(dirpath)
                 if f.endswith(".json") and not f.startswith(".")
-            )
+            }
         except FileNotFoundError:
-            return []
+            names = set()
+        if not self._in_batch():
+            return sorted(names)
+        for path, (_, key, data, _) in list(self._staged.items()):
+            if os.path.dirname(path) == dirpath:
+                if data is _DELETED:
+                    names.discard(key)
+                else:
+                    names.add(key)
+        return sorted(names)
+
+    # ---- writes ----
+
+    def _save(self, collection: str, key: str, data: Any) -> bool:
+        path = self._path(collection, key)
+        with self._lock:
+            if self._in_batch():
+                self._stage(collection, key, path, data)
+                return True
+            if collection == "encounters":
+                # Encounters (and the autosaved last_state.json) are replaced
+                # atomically. Versioned saves are written compact; other
+                # documents (players.json) stay indented for hand editing.
+                write_json_atomic(path, data, indent=None if is_versioned(data) else 2)
+            else:
+                self._write_json(path, data)
+            self._index(collection, key, data, path)
+        return True
+
+    def _remove(self, collection: str, key: str) -> bool:
+        path = self._path(collection, key)
+        with self._lock:
+            if self._in_batch():
+                self._stage(collection, key, path, _DELETED)
+                return True
+            if os.path.exists(path):
+                os.remove(path)
+            self._index(collection, key, _DELETED, path)
+        return True
+
+    def _index(self, collection: str, key: str, data: Any, path: str) -> None:
+        if collection not in self._manifests:
+            return
+        if data is _DELETED:
+            self._manifests[collection].remove(key)
+            self._search.remove(collection, key)
+        else:
+            self._manifests[collection].update(key, data)
+            self._search.update(collection, key, data, self._mtime(path))
+
+    # ---- batches ----
+
+    @contextmanager
+    def batch(self) -> Iterator["LocalStorage"]:
+        """Stage the enclosed writes and commit them together.
+
+        Nested batches join the outermost one. A batch on another thread
+        waits until it commits, but plain writes from other threads go
+        straight to disk. An exception discards everything staged.
+        """
+        with self._lock:
+            if not self._in_batch():
+                while self._batch_owner is not None:
+                    self._batch_free.wait()
+                self._batch_owner = threading.get_ident()
+                self._batch_token = f"{BATCH_STAGING_PREFIX}{os.getpid()}-{uuid.uuid4().hex[:8]}-"
+                self._batch_seq = 0
+            self._batch_depth += 1
+        # The lock is not held while the caller runs: a thread that writes here
+        # while holding a lock the batch's thread needs would otherwise deadlock.
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    try:
+                        self._discard_staged()
+                    finally:
+                        self._end_batch()
+            raise
+        with self._lock:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                try:
+                    self._commit()
+                finally:
+                    self._end_batch()
+
+    def _end_batch(self) -> None:
+        # Caller holds the lock.
+        self._batch_owner = None
+        self._batch_free.notify_all()
+
+    def _stage(self, collection: str, key: str, path: str, data: Any) -> None:
+        # Caller holds the lock.
+        tmp = None
+        if data is not _DELETED:
+            directory = os.path.dirname(path)
+            if directory not in self._batch_dirs:
+                os.makedirs(directory, exist_ok=True)
+                self._batch_dirs.add(directory)
+            indent = None if collection == "encounters" and is_versioned(data) else 2
+            self._batch_seq += 1
+            tmp = os.path.join(directory, f"{self._batch_token}{self._batch_seq}.tmp")
+            try:
+                with open(tmp, "x", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=indent)
+            except BaseException:
+                _unlink_quiet(tmp)
+                raise
+        previous = self._staged.pop(path, None)
+        if previous is not None and previous[3] is not None:
+            _unlink_quiet(previous[3])
+        self._staged[path] = (collection, key, data, tmp)
+
+    def _discard_staged(self) -> None:
+        staged, self._staged = self._staged, {}
+        self._batch_dirs.clear()
+        for _, _, _, tmp in staged.values():
+            if tmp is not None:
+                _unlink_quiet(tmp)
+
+    def _commit(self) -> None:
+        staged = self._staged
+        self._batch_dirs.clear()
+        if not staged:
+            return
+        journal = os.path.join(self.data_dir, BATCH_JOURNAL_FILENAME)
+        entries = [
+            [collection, key, os.path.basename(tmp) if tmp is not None else None]
+            for collection, key, _, tmp in staged.values()
+        ]
+        try:
+            write_json_atomic(journal, {"version": 1, "entries": entries})
+        except BaseException:
+            self._discard_staged()
+            raise
+        # From here on the batch is committed: if the renames are cut short,
+        # the journal finishes them the next time the directory is opened.
+        try:
+            self._apply_journal(entries)
+        finally:
+            self._staged = {}
+        _unlink_quiet(journal)
+
+        # The manifests and search index are written back lazily, as for
+        # single saves; only their in-memory entries change here.
+        for path, (collection, key, data, _) in staged.items():
+            self._index(collection, key, data, path)
+
+    def _apply_journal(self, entries: List[Any]) -> None:
+        for collection, key, tmp in entries:
+            target = self._path(collection, key)
+            if tmp is None:
+                _unlink_quiet(target)
+                continue
+            try:
+                os.replace(os.path.join(os.path.dirname(target), tmp), target)
+            except FileNotFoundError:
+                pass  # already renamed before the crash
+
+    def _recover_batch(self) -> None:
+        """Finish a commit that was cut short and sweep staging leftovers."""
+        journal = os.path.join(self.data_dir, BATCH_JOURNAL_FILENAME)
+        try:
+            with open(journal, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            raw = None
+        except (OSError, ValueError):
+            raw = {}  # unreadable: write_json_atomic means it never committed
+        if raw is not None:
+            entries = raw.get("entries") if isinstance(raw, dict) else None
+            if isinstance(entries, list):
+                self._apply_journal([
+                    e for e in entries
+                    if isinstance(e, list) and len(e) == 3
+                    and e[0] in ("encounters", *LIBRARY_COLLECTIONS)
+                    and isinstance(e[1], str) and os.path.basename(e[1]) == e[1]
+                    and (e[2] is None or isinstance(e[2], str) and os.path.basename(e[2]) == e[2])
+                ])
+            _unlink_quiet(journal)
+
+        cutoff = time.time() - STALE_STAGING_S
+        for directory in (self.data_dir, *(os.path.join(self.data_dir, c) for c in LIBRARY_COLLECTIONS)):
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name.startswith(BATCH_STAGING_PREFIX):
+                            try:
+                                if entry.stat().st_mtime < cutoff:
+                                    os.remove(entry.path)
+                            except OSError:
+                                pass
+            except FileNotFoundError:
+                pass
 
     # ---- Encounters (flat in data_dir) ----
 
@@ -83,16 +383,13 @@ class LocalStorage:
         return self._read_json(self._enc_path(key))
 
     def put(self, key: str, data: Any) -> None:
-        self._write_json(self._enc_path(key), data)
+        self._save("encounters", key, data)
 
     def delete(self, key: str) -> None:
-        path = self._enc_path(key)
-        if os.path.exists(path):
-            os.remove(path)
+        self._remove("encounters", key)
 
     def put_json(self, key: str, obj: dict) -> None:
-        text = json.dumps(obj, cls=CustomEncoder, ensure_ascii=False)
-        self._write_json(self._enc_path(key), json.loads(text))
+        self.put(key, to_primitive(obj))
 
     def get_json(self, key: str) -> Optional[dict]:
         return self.get(key)
@@ -106,14 +403,10 @@ class LocalStorage:
         return self._read_json(self._sb_path(key))
 
     def save_statblock(self, key: str, data: dict) -> bool:
-        self._write_json(self._sb_path(key), data)
-        return True
+        return self._save("statblocks", key, data)
 
     def delete_statblock(self, key: str) -> bool:
-        path = self._sb_path(key)
-        if os.path.exists(path):
-            os.remove(path)
-        return True
+        return self._remove("statblocks", key)
 
     # ---- Spells ----
 
@@ -124,14 +417,10 @@ class LocalStorage:
         return self._read_json(self._spell_path(key))
 
     def save_spell(self, key: str, data: dict) -> bool:
-        self._write_json(self._spell_path(key), data)
-        return True
+        return self._save("spells", key, data)
 
     def delete_spell(self, key: str) -> bool:
-        path = self._spell_path(key)
-        if os.path.exists(path):
-            os.remove(path)
-        return True
+        return self._remove("spells", key)
 
     # ---- Items ----
 
@@ -142,12 +431,66 @@ class LocalStorage:
         return self._read_json(self._item_path(key))
 
     def save_item(self, key: str, data: dict) -> bool:
-        self._write_json(self._item_path(key), data)
-        return True
+        return self._save("items", key, data)
 
     def delete_item(self, key: str) -> bool:
-        path = self._item_path(key)
-        if os.path.exists(path):
-            os.remove(path)
-        return True
+        return self._remove("items", key)
+
+    # ---- Bulk reads ----
+
+    def get_items_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        if keys is None:
+            keys = self.list_item_keys()
+        return fetch_many(keys, self.get_item)
+
+    def get_spells_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        if keys is None:
+            keys = self.list_spell_keys()
+        return fetch_many(keys, self.get_spell)
+
+    def get_statblocks_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        if keys is None:
+            keys = self.list_statblock_keys()
+        return fetch_many(keys, self.get_statblock)
+
+
+    # ---- Summary manifests ----
+
+    def get_item_manifest(self) -> Dict[str, dict]:
+        """{key: {name, cost, rarity, tags}} for every item."""
+        return self._manifests["items"].summaries(self.list_item_keys(), self.get_item)
+
+    def get_spell_manifest(self) -> Dict[str, dict]:
+        """{key: {name, level, school, concentration}} for every spell."""
+        return self._manifests["spells"].summaries(self.list_spell_keys(), self.get_spell)
+
+    def get_statblock_manifest(self) -> Dict[str, dict]:
+        """{key: {name, challenge_rating, type, size}} for every statblock."""
+        return self._manifests["statblocks"].summaries(
+            self.list_statblock_keys(), self.get_statblock
+        )
+
+    # ---- Search ----
+
+    def search(
+        self, query: str, collections: Optional[Iterable[str]] = None, limit: Optional[int] = 50
+    ) -> List[SearchHit]:
+        """Ranked library matches for ``query`` (see search_index for the syntax)."""
+        return self._search.search(query, collections, limit)
+
+    def sync_search_index(self) -> int:
+        """Build or refresh the search index now; returns entries (re)indexed."""
+        return self._search.sync(force=True)
+
+    # ---- Change feed ----
+
+    def changes_since(self, cursor: Optional[str] = None) -> ChangeBatch:
+        """Files added, rewritten or removed since ``cursor`` (by any process)."""
+        return self._watcher.changes_since(cursor)
+
 
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
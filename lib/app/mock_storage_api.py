@@ -0,0 +1,241 @@
+# lib/app/mock_storage_api.py
+"""
+In-process stand-in for the Storage service, for benchmarks and tests.
+
+Serves the endpoints StorageAPI expects (see its class docstring) for the
+encounters, statblocks, spells and items collections from memory:
+
+    GET    /v1/{collection}/items        -> {"items": [key, ...]}; with page_size,
+                                            {"items": [...], "next_cursor": ...}
+                                            and ?cursor= for the following pages
+    GET    /v1/{collection}/{key}        -> {"data": ...} with an ETag; honours If-None-Match
+    PUT    /v1/{collection}/{key}        <- {"data": ...}
+    DELETE /v1/{collection}/{key}
+    POST   /v1/{collection}/bulk         <- {"keys": [...]}  -> {"items": {key: data}}
+    POST   /v1/{collection}/bulk_put     <- {"items": {key: data}} -> {"saved": [...], "errors": {}}
+    GET    /v1/{collection}/manifest     -> {"items": {key: summary}}
+    GET    /v1/changes?since=<cursor>    -> {"cursor", "changes", "reset"}
+
+``latency_s`` is slept before every request to model a remote server.
+bulk/manifest/changes can be switched off to model an older server.
+``page_size`` makes key listings paginated.
+
+    with MockStorageServer(latency_s=0.005) as server:
+        api = StorageAPI(server.base_url)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app.library_manifest import summarize
+
+COLLECTIONS = ("encounters", "statblocks", "spells", "items")
+CHANGE_LOG_SIZE = 10000
+
+
+@dataclass
+class MemoryStore:
+    """Documents per collection, each with a version for its ETag."""
+
+    docs: Dict[str, Dict[str, Tuple[int, Any]]] = field(
+        default_factory=lambda: {c: {} for c in COLLECTIONS}
+    )
+    changes: List[Tuple[int, str, str, str]] = field(default_factory=list)
+    seq: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _log(self, collection: str, key: str, op: str) -> None:
+        self.seq += 1
+        self.changes.append((self.seq, collection, key, op))
+        if len(self.changes) > CHANGE_LOG_SIZE:
+            del self.changes[: len(self.changes) - CHANGE_LOG_SIZE]
+
+    def put(self, collection: str, key: str, data: Any) -> None:
+        with self.lock:
+            version = self.docs[collection].get(key, (0, None))[0] + 1
+            self.docs[collection][key] = (version, data)
+            self._log(collection, key, "put")
+
+    def delete(self, collection: str, key: str) -> bool:
+        with self.lock:
+            if self.docs[collection].pop(key, None) is None:
+                return False
+            self._log(collection, key, "delete")
+            return True
+
+    def get(self, collection: str, key: str) -> Optional[Tuple[int, Any]]:
+        with self.lock:
+            return self.docs[collection].get(key)
+
+    def keys(self, collection: str) -> List[str]:
+        with self.lock:
+            return sorted(self.docs[collection])
+
+
+def create_app(
+    store: Optional[MemoryStore] = None,
+    latency_s: float = 0.0,
+    bulk: bool = True,
+    manifest: bool = True,
+    changes: bool = True,
+    page_size: Optional[int] = None,
+) -> Flask:
+    app = Flask(__name__)
+    store = store if store is not None else MemoryStore()
+    app.config["STORE"] = store
+
+    def _collection_or_404(collection: str):
+        if collection not in COLLECTIONS:
+            return jsonify({"error": "unknown collection"}), 404
+        return None
+
+    @app.before_request
+    def simulate_latency() -> None:
+        if latency_s > 0:
+            time.sleep(latency_s)
+
+    @app.route("/v1/changes", methods=["GET"])
+    def list_changes() -> Any:
+        if not changes:
+            return jsonify({"error": "not found"}), 404
+        with store.lock:
+            cursor = str(store.seq)
+            since = request.args.get("since")
+            if since is None:
+                return jsonify({"cursor": cursor, "changes": [], "reset": False})
+            try:
+                since_seq = int(since)
+            except ValueError:
+                since_seq = -1
+            first = store.changes[0][0] if store.changes else store.seq + 1
+            if since_seq < 0 or since_seq > store.seq or since_seq < first - 1:
+                return jsonify({"cursor": cursor, "changes": [], "reset": True})
+            out = [
+                {"collection": c, "key": k, "op": op}
+                for seq, c, k, op in store.changes if seq > since_seq
+            ]
+        return jsonify({"cursor": cursor, "changes": out, "reset": False})
+
+    @app.route("/v1/<collection>/items", methods=["GET"])
+    def list_keys(collection: str) -> Any:
+        missing = _collection_or_404(collection)
+        if missing:
+            return missing
+        keys = store.keys(collection)
+        if not page_size:
+            return jsonify({"items": keys})
+        try:
+            start = max(0, int(request.args.get("cursor", 0)))
+        except ValueError:
+            return jsonify({"error": "bad cursor"}), 400
+        end = start + page_size
+        next_cursor = str(end) if end < len(keys) else None
+        return jsonify({"items": keys[start:end], "next_cursor": next_cursor})
+
+    @app.route("/v1/<collection>/bulk", methods=["POST"])
+    def bulk_get(collection: str) -> Any:
+        missing = _collection_or_404(collection)
+        if missing or not bulk:
+            return missing or (jsonify({"error": "not found"}), 404)
+        keys = (request.get_json(silent=True) or {}).get("keys") or []
+        items = {}
+        for key in keys:
+            entry = store.get(collection, key)
+            if entry is not None:
+                items[key] = entry[1]
+        return jsonify({"items": items})
+
+    @app.route("/v1/<collection>/bulk_put", methods=["POST"])
+    def bulk_put(collection: str) -> Any:
+        missing = _collection_or_404(collection)
+        if missing or not bulk:
+            return missing or (jsonify({"error": "not found"}), 404)
+        items = (request.get_json(silent=True) or {}).get("items")
+        if not isinstance(items, dict):
+            return jsonify({"error": "items must be an object"}), 400
+        saved, errors = [], {}
+        for key, data in items.items():
+            if isinstance(data, dict):
+                store.put(collection, key, data)
+                saved.append(key)
+            else:
+                errors[key] = "document must be an object"
+        return jsonify({"saved": saved, "errors": errors})
+
+    @app.route("/v1/<collection>/manifest", methods=["GET"])
+    def get_manifest(collection: str) -> Any:
+        missing = _collection_or_404(collection)
+        if missing or not manifest:
+            return missing or (jsonify({"error": "not found"}), 404)
+        with store.lock:
+            docs = dict(store.docs[collection])
+        return jsonify({"items": {k: summarize(collection, v[1]) for k, v in sorted(docs.items())}})
+
+    @app.route("/v1/<collection>/<key>", methods=["GET", "PUT", "DELETE"])
+    def document(collection: str, key: str) -> Any:
+        missing = _collection_or_404(collection)
+        if missing:
+            return missing
+        if request.method == "PUT":
+            body = request.get_json(silent=True)
+            data = body["data"] if isinstance(body, dict) and "data" in body else body
+            store.put(collection, key, data)
+            return jsonify({"ok": True})
+        if request.method == "DELETE":
+            if not store.delete(collection, key):
+                return jsonify({"error": "not found"}), 404
+            return ("", 204)
+        entry = store.get(collection, key)
+        if entry is None:
+            return jsonify({"error": "not found"}), 404
+        etag = f'"{key}-{entry[0]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return ("", 304, {"ETag": etag})
+        resp = jsonify({"data": entry[1]})
+        resp.headers["ETag"] = etag
+        return resp
+
+    return app
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+class MockStorageServer:
+    """Runs create_app() on a background thread; port 0 picks a free port."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **app_options: Any):
+        self.app = create_app(**app_options)
+        self.store: MemoryStore = self.app.config["STORE"]
+        self._server = make_server(
+            host, port, self.app, threaded=True, request_handler=_QuietHandler
+        )
+        self.base_url = f"http://{host}:{self._server.server_port}"
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MockStorageServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockStorageServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,164 @@
+# lib/app/pc_group_index.py
+"""
+Persisted inverted index of PC name -> saved PC groups.
+
+The Foundry party check needs to know which saved group best covers the PCs
+in a snapshot. Without an index that meant listing storage and loading every
+group (one GET each against a remote storage API) on the GUI thread. The
+index keeps each group's normalized roster, plus a name -> groups posting
+map, in ~/.dnd_tracker_config/pc_group_index.json. The app updates it whenever
+it saves, reads or deletes a group, so finding the best match is a few set
+lookups.
+
+An index belongs to one storage backend. If the storage it was built against
+changes (another API base or data dir), it starts over unbuilt and the app
+rebuilds it from storage once.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+INDEX_VERSION = 1
+
+
+class PCGroupIndex:
+    def __init__(self, path: str, storage_id: str = ""):
+        self.path = path
+        self.storage_id = storage_id
+        self.built = False
+        self._rosters: Dict[str, FrozenSet[str]] = {}
+        self._groups_by_name: Dict[str, Set[str]] = {}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, path: str, storage_id: str = "") -> "PCGroupIndex":
+        index = cls(path, storage_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if (
+            not isinstance(raw, dict)
+            or raw.get("version") != INDEX_VERSION
+            or raw.get("storage") != storage_id
+        ):
+            return index
+        for key, names in (raw.get("groups") or {}).items():
+            if isinstance(key, str) and isinstance(names, list):
+                index._put(key, (n for n in names if isinstance(n, str)))
+        index.built = bool(raw.get("built"))
+        return index
+
+    def save(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "storage": self.storage_id,
+            "built": self.built,
+            "groups": {key: sorted(names) for key, names in sorted(self._rosters.items())},
+        }
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".pc_group_index.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _put(self, key: str, names: Iterable[str]) -> None:
+        self._drop(key)
+        roster = frozenset(n for n in names if n)
+        self._rosters[key] = roster
+        for name in roster:
+            self._groups_by_name.setdefault(name, set()).add(key)
+
+    def _drop(self, key: str) -> None:
+        old = self._rosters.pop(key, None)
+        if not old:
+            return
+        for name in old:
+            keys = self._groups_by_name.get(name)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._groups_by_name[name]
+
+    def set_group(self, key: str, names: Iterable[str]) -> bool:
+        """Record a group's roster; True if it changed."""
+        roster = frozenset(n for n in names if n)
+        if self._rosters.get(key) == roster:
+            return False
+        self._put(key, roster)
+        return True
+
+    def remove_group(self, key: str) -> bool:
+        if key not in self._rosters:
+            return False
+        self._drop(key)
+        return True
+
+    def retain(self, keys: Iterable[str]) -> List[str]:
+        """Forget groups not in ``keys``; return the ``keys`` the index lacks."""
+        wanted = set(keys)
+        for key in [k for k in self._rosters if k not in wanted]:
+            self._drop(key)
+        return sorted(k for k in wanted if k not in self._rosters)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rosters
+
+    def __len__(self) -> int:
+        return len(self._rosters)
+
+    def keys(self) -> List[str]:
+        return sorted(self._rosters)
+
+    def roster(self, key: str) -> Optional[FrozenSet[str]]:
+        return self._rosters.get(key)
+
+    def groups_with(self, name: str) -> FrozenSet[str]:
+        return frozenset(self._groups_by_name.get(name, ()))
+
+    def best_match(
+        self,
+        names: Iterable[str],
+        exclude: Optional[str] = None,
+        min_cover: int = 0,
+    ) -> Tuple[Optional[str], int]:
+        """The group covering the most of ``names``, if it beats ``min_cover``.
+
+        Ties go to the alphabetically first key, so the answer is stable.
+        """
+        cover: Counter = Counter()
+        for name in set(names):
+            for key in self._groups_by_name.get(name, ()):
+                if key != exclude:
+                    cover[key] += 1
+        best_key: Optional[str] = None
+        best = min_cover
+        for key in sorted(cover):
+            if cover[key] > best:
+                best_key, best = key, cover[key]
+        return best_key, (best if best_key else 0)
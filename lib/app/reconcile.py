@@ -0,0 +1,835 @@
+# lib/app/reconcile.py
+"""
+Headless Foundry snapshot -> tracker reconciliation.
+
+BridgeReconciler owns everything between "a snapshot arrived" and "the UI
+needs to change": ignore-list filtering, combatant indexing, pruning, adding
+missing combatants, per-creature field sync, and round/turn bookkeeping. It
+takes a TrackerState plus a snapshot and returns the new state and a list of
+UI events; the Qt layer (Application._set_bridge_snapshot) only renders the
+events. Nothing here imports Qt, so the sync path can be tested and
+benchmarked without a display.
+
+Creature objects are updated in place: they are the tracker's model, shared
+with the table. Everything the UI would otherwise have to work out for itself
+(what was added, which rows changed, whose turn started) comes back as events.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.combatant_index import CombatantIndex, normalize_bridge_name
+from app.creature import CreatureType, I_Creature, Monster, Player
+from app.event_log import event_log
+from app.foundry_ignore import IgnoreMatcher
+from app.manager import CreatureManager
+from app.snapshot_diff import diff_snapshots
+
+
+# ---------------------------------------------------------------------------
+# State and events
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TrackerState:
+    """The slice of tracker state the bridge reads and writes."""
+    manager: Optional[CreatureManager]
+    round_counter: int = 1
+    current_creature_name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CreaturesPruned:
+    """Creatures removed because the ignore list now covers them."""
+    names: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CreaturesAdded:
+    """New Foundry combatants were added to the tracker (full table rebuild)."""
+
+
+@dataclass(frozen=True)
+class TurnOrderChanged:
+    """An initiative or the active combatant changed (re-sort, re-highlight)."""
+
+
+@dataclass(frozen=True)
+class CombatChanged:
+    """Round/turn labels need refreshing; order and rows are unchanged."""
+
+
+@dataclass(frozen=True)
+class RowsChanged:
+    """Creature name -> table fields to repaint, or None for the whole row."""
+    cells: Dict[str, Optional[FrozenSet[str]]]
+
+
+@dataclass(frozen=True)
+class RoundAdvanced:
+    round_counter: int
+    timers_ticked: bool
+
+
+@dataclass(frozen=True)
+class ShowStatblock:
+    name: str
+
+
+@dataclass(frozen=True)
+class PromptDeathSaves:
+    name: str
+
+
+@dataclass(frozen=True)
+class StatblockNeeded:
+    """A bridge monster has no slots/abilities yet; look up its statblock."""
+    creature: I_Creature
+    statblock_name: str
+
+
+# ---------------------------------------------------------------------------
+# Combatant helpers
+# ---------------------------------------------------------------------------
+
+def base_name(name: str) -> str:
+    """Creature name without a trailing instance number ("Goblin 2" -> "Goblin")."""
+    return re.sub(r'\s*(?:#\s*)?\d+\s*$', '', name or "").strip()
+
+
+def resolve_creature_type(combatant: Dict[str, Any]) -> Optional[CreatureType]:
+    if not isinstance(combatant, dict):
+        return None
+    actor_type = combatant.get("actorType")
+    has_player_owner = combatant.get("actorHasPlayerOwner")
+    # actorType wins over ownership: a player-owned "npc" is a summon or
+    # companion, not a PC, and typing it as one gives it death saves.
+    if isinstance(actor_type, str) and actor_type.lower() == "character":
+        return CreatureType.PLAYER
+    if actor_type:
+        return CreatureType.MONSTER
+    if has_player_owner is True:
+        return CreatureType.PLAYER
+    return None
+
+
+def extract_combatant_ac(combatant: Dict[str, Any]) -> Optional[int]:
+    ac_val = None
+    try:
+        # common: {"ac": {"value": 15}} or {"ac": 15}
+        ac_field = combatant.get("ac")
+        if isinstance(ac_field, dict):
+            ac_val = ac_field.get("value")
+        elif ac_field is not None:
+            ac_val = ac_field
+
+        # fallback shapes
+        if ac_val is None:
+            ac_val = combatant.get("armorClass")
+
+        if ac_val is None:
+            attrs = combatant.get("attributes", {})
+            if isinstance(attrs, dict):
+                ac_obj = attrs.get("ac", {})
+                if isinstance(ac_obj, dict):
+                    ac_val = ac_obj.get("value")
+    except Exception:
+        ac_val = None
+
+    if ac_val is None:
+        return None
+    try:
+        return int(ac_val)
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_id(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str) and not value.strip():
+        return None
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class BridgeReconciler:
+    def __init__(self, ignore: Optional[IgnoreMatcher] = None):
+        self.ignore = ignore or IgnoreMatcher()
+        self.ignore_logged: set = set()  # keeps the log to one line per name
+
+        # Unfiltered feed (the ignore dialog lists what's being dropped) and the
+        # filtered snapshot everything else sees, each with its lookup index.
+        self.raw_combatants: List[Dict[str, Any]] = []
+        self.raw_index = CombatantIndex()
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.index = CombatantIndex()
+        self.last_ignored: List[Dict[str, Any]] = []
+
+        # Last snapshot actually applied, and which combatantId each creature
+        # was synced against, so the next snapshot only touches what changed.
+        self.applied_snapshot: Optional[Dict[str, Any]] = None
+        self.synced: Dict[str, tuple] = {}
+        self.creature_names_by_combatant_id: Dict[str, str] = {}
+
+    # ---- ignore list ------------------------------------------------------
+
+    def filter_ignored(self, combatants: List[Dict[str, Any]]) -> tuple:
+        """Split a snapshot's combatants into (kept, ignored)."""
+        kept: List[Dict[str, Any]] = []
+        ignored: List[Dict[str, Any]] = []
+        for combatant in combatants:
+            reason = self.ignore.combatant_reason(combatant)
+            if reason:
+                ignored.append(combatant)
+                if combatant.get("name") not in self.ignore_logged:
+                    self.ignore_logged.add(combatant.get("name"))
+                    event_log.info(
+                        "bridge.ignore", "Ignoring '{name}' ({reason})",
+                        name=combatant.get("name"), reason=reason,
+                    )
+            else:
+                kept.append(combatant)
+        return kept, ignored
+
+    def raw_combatant_for_creature(self, creature: I_Creature) -> Optional[Dict[str, Any]]:
+        """Find the unfiltered snapshot entry a tracked creature came from."""
+        combatant = self.raw_index.for_creature(creature)
+        if combatant is not None:
+            return combatant
+        matches = self.raw_index.by_normalized_name(getattr(creature, "name", "") or "")
+        return matches[0] if matches else None
+
+    def creature_ignore_reason(self, creature: I_Creature) -> Optional[str]:
+        raw = self.raw_combatant_for_creature(creature)
+        if raw is not None:
+            return self.ignore.combatant_reason(raw)
+        if self.ignore.ignores_actor(getattr(creature, "foundry_actor_id", None)):
+            return "ignored actor"
+        for name in (getattr(creature, "name", ""), getattr(creature, "statblock_override", "")):
+            matched = self.ignore.match_name((name or "").strip())
+            if matched:
+                return f"matches '{matched}'"
+        return None
+
+    def prune(self, manager: CreatureManager) -> List[str]:
+        """Drop creatures the ignore list covers; returns their names."""
+        doomed = [
+            name for name, creature in manager.creatures.items()
+            if not getattr(creature, "_is_lair_action", False)
+            and self.creature_ignore_reason(creature)
+        ]
+        if doomed:
+            manager.rm_creatures(doomed)
+            manager.sort_creatures()
+        return doomed
+
+    # ---- resolution -------------------------------------------------------
+
+    def set_index(self, index: CombatantIndex) -> None:
+        index.share_name_search(self.index)
+        self.index = index
+
+    def resolve_name(self, creature_name: str) -> Optional[Dict[str, Any]]:
+        if not creature_name:
+            return None
+
+        key = normalize_bridge_name(creature_name)
+        if not key:
+            return None
+
+        # 1) Exact key match (current behavior)
+        matches = self.index.by_name.get(key, [])
+        if len(matches) == 1:
+            return matches[0]
+        if len(matches) > 1:
+            event_log.info(
+                "bridge.match", "Multiple combatants match '{name}', skipping command enqueue.",
+                name=creature_name,
+            )
+            return None
+
+        # 2) Fallback: prefix/contains match against indexed keys
+        # Example: "chitra" should match "chitraya" or "chitra-ya" after normalization.
+        # Flattened and de-duped by combatantId/tokenId (see CombatantIndex).
+        flat = self.index.fuzzy_matches(key)
+
+        if len(flat) == 1:
+            event_log.info(
+                "bridge.match", "Fuzzy matched '{name}' -> '{match}'",
+                name=creature_name, match=flat[0].get("name"),
+            )
+            return flat[0]
+
+        if len(flat) > 1:
+            event_log.info(
+                "bridge.match", "Fuzzy match ambiguous for '{name}' ({count} candidates), skipping.",
+                name=creature_name, count=len(flat),
+            )
+            return None
+
+        return None
+
+    def combatant_for(
+        self, creature_name: str, creature: Optional[I_Creature] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot combatant for a creature: by its Foundry IDs, else by name.
+
+        actorId isn't used here since every unlinked token of an actor shares
+        it; an unbound creature falls through to name resolution instead.
+        """
+        if creature is not None:
+            combatant = self.index.for_creature(creature, use_actor_id=False)
+            if combatant is not None:
+                return combatant
+        return self.resolve_name(creature_name)
+
+    # ---- reconciliation ---------------------------------------------------
+
+    def reconcile(
+        self, state: TrackerState, snapshot: Dict[str, Any]
+    ) -> Tuple[TrackerState, List[Any]]:
+        """Fold one snapshot into the tracker; returns (new state, UI events)."""
+        events: List[Any] = []
+        combatants = snapshot.get("combatants", [])
+        if not isinstance(combatants, list):
+            combatants = []
+        self.raw_combatants = list(combatants)
+        self.raw_index = CombatantIndex(self.raw_combatants)
+
+        # Drop ignored combatants once, here, so nothing downstream ever sees
+        # them: they can't be added to initiative, can't be matched by name, and
+        # can't sync HP/conditions. Filtering summons out also un-confuses name
+        # resolution for the PCs they're named after ("Surina's Echo" vs "Echo").
+        combatants, ignored = self.filter_ignored(combatants)
+        if ignored:
+            snapshot = dict(snapshot)
+            snapshot["combatants"] = combatants
+        self.last_ignored = ignored
+        self.snapshot = snapshot
+        self.set_index(CombatantIndex(combatants) if ignored else self.raw_index)
+
+        # Anything already in the tracker that the rules now cover (added before
+        # a rule existed, or restored from a saved state) goes too.
+        doomed = self.prune(state.manager) if state.manager is not None else []
+        if doomed:
+            for name in doomed:
+                event_log.info("bridge.ignore", "Dropped ignored '{name}' from initiative", name=name)
+            events.append(CreaturesPruned(tuple(doomed)))
+
+        if state.manager is not None and state.manager.creatures:
+            state = self._apply(state, snapshot, events)
+        return state, events
+
+    def _apply(
+        self, state: TrackerState, snapshot: Dict[str, Any], events: List[Any]
+    ) -> TrackerState:
+        manager = state.manager
+        combatants = snapshot.get("combatants", [])
+
+        # Only walk what changed since the last applied snapshot. A creature is
+        # re-applied in full when it isn't bound yet (new, renamed, rebound to
+        # another combatant); otherwise only the fields Foundry changed for its
+        # combatantId are copied over.
+        diff = diff_snapshots(self.applied_snapshot, snapshot)
+        self.applied_snapshot = snapshot
+
+        added_combatants = False
+        if diff.membership_changed or self.synced.keys() != manager.creatures.keys():
+            added_combatants = self.ensure_present(manager, combatants, events)
+        updated_initiative = False
+        updated_active = False
+
+        changes = diff.changes_by_id()
+        retry_unbound = diff.membership_changed
+        synced: Dict[str, tuple] = {}
+        touched: Dict[str, Optional[set]] = {}
+
+        for creature_name, creature in manager.creatures.items():
+            if getattr(creature, "_is_lair_action", False):
+                synced[creature_name] = (creature, None)
+                continue
+            cid = getattr(creature, "foundry_combatant_id", None)
+            previous = self.synced.get(creature_name)
+            if (
+                previous is None
+                or previous[0] is not creature
+                or previous[1] != cid
+                or (cid is None and retry_unbound)
+            ):
+                combatant = self.combatant_for(creature_name, creature)
+                fields = None
+            elif cid is not None and str(cid) in changes:
+                change = changes[str(cid)]
+                combatant = change.combatant
+                fields = change.fields
+            else:
+                synced[creature_name] = previous
+                continue
+
+            if not combatant:
+                synced[creature_name] = (creature, cid)
+                continue
+
+            initiative_changed, cells = self.apply_combatant(
+                creature_name, creature, combatant, fields, events
+            )
+            updated_initiative = updated_initiative or initiative_changed
+            if cells is None or cells:
+                touched[creature_name] = cells
+            synced[creature_name] = (creature, getattr(creature, "foundry_combatant_id", None))
+
+        self.synced = synced
+        by_cid: Dict[str, str] = {}
+        for name, (_creature, synced_cid) in synced.items():
+            if synced_cid is not None:
+                by_cid.setdefault(str(synced_cid), name)
+        self.creature_names_by_combatant_id = by_cid
+
+        old_round = state.round_counter
+        round_counter = state.round_counter
+        current_name = state.current_creature_name
+
+        combat = snapshot.get("combat", {})
+        if isinstance(combat, dict):
+            round_value = combat.get("round")
+            if isinstance(round_value, int):
+                round_counter = max(1, round_value)
+
+            active = combat.get("activeCombatant")
+            active_name = None
+
+            if isinstance(active, dict):
+                active_id = active.get("combatantId")
+                if active_id:
+                    active_name = self.creature_names_by_combatant_id.get(str(active_id))
+
+                active_label = None
+                if not active_name:
+                    active_label = active.get("name")
+                if active_label:
+                    active_name = active_label
+
+            current_cr = manager.creatures.get(current_name or "")
+            if (
+                active_name
+                and active_name != current_name
+                and not getattr(current_cr, "_is_lair_action", False)
+            ):
+                current_name = active_name
+                updated_active = True
+
+        state = replace(state, round_counter=round_counter, current_creature_name=current_name)
+
+        if added_combatants:
+            events.append(CreaturesAdded())
+        elif updated_initiative or updated_active:
+            events.append(TurnOrderChanged())
+        elif diff.combat_changed:
+            events.append(CombatChanged())
+        elif touched:
+            events.append(RowsChanged({
+                name: frozenset(cells) if cells is not None else None
+                for name, cells in touched.items()
+            }))
+
+        # --- Turn-change side effects (mirror what next_turn() does) ---
+
+        if round_counter > old_round:
+            # Reset action/bonus_action/object_interaction for ALL creatures at top of round
+            for cr in manager.creatures.values():
+                if hasattr(cr, "action"):
+                    cr.action = False
+                if hasattr(cr, "bonus_action"):
+                    cr.bonus_action = False
+                if hasattr(cr, "object_interaction"):
+                    cr.object_interaction = False
+
+            # Tick status timers
+            any_tick = False
+            for cr in manager.creatures.values():
+                st = getattr(cr, "status_time", None)
+                try:
+                    st_int = int(st) if st is not None else None
+                except (ValueError, TypeError):
+                    st_int = None
+                if st_int is not None and st_int > 0:
+                    cr.status_time = max(0, st_int - 6)
+                    any_tick = True
+            events.append(RoundAdvanced(round_counter, any_tick))
+
+        if updated_active and current_name:
+            cr = manager.creatures.get(current_name)
+            if cr:
+                # Reset reaction on creature's own turn
+                if hasattr(cr, "reaction"):
+                    cr.reaction = False
+                # Show statblock for monsters
+                if getattr(cr, "_type", None) == CreatureType.MONSTER:
+                    events.append(ShowStatblock(current_name))
+                events.append(PromptDeathSaves(current_name))
+
+        return state
+
+    def apply_combatant(
+        self,
+        creature_name: str,
+        creature: I_Creature,
+        combatant: Dict[str, Any],
+        fields: Optional[frozenset] = None,
+        events: Optional[List[Any]] = None,
+    ) -> tuple:
+        """Copy one Foundry combatant onto its tracker creature.
+
+        ``fields`` limits the update to the snapshot fields that changed (see
+        app.snapshot_diff); None applies everything, as for a newly bound
+        creature. Returns (initiative_changed, cells), where cells is the set of
+        table fields to repaint, or None to repaint the whole row.
+        """
+        def wants(*names: str) -> bool:
+            return fields is None or any(name in fields for name in names)
+
+        initiative_changed = False
+        cells: Optional[set] = set()
+
+        if wants("initiative"):
+            initiative = combatant.get("initiative")
+            if initiative is not None and initiative != getattr(creature, "initiative", None):
+                creature.initiative = initiative
+                initiative_changed = True
+
+        if wants("tokenId", "actorId"):
+            setattr(creature, "foundry_combatant_id", combatant.get("combatantId"))
+            setattr(creature, "foundry_token_id", combatant.get("tokenId"))
+            setattr(creature, "foundry_actor_id", combatant.get("actorId"))
+
+        # Auto-set statblock override from actor name if not already set by user
+        actor_name = (combatant.get("actorName") or "").strip()
+        if wants("actorName") and actor_name and not creature.statblock_override:
+            if actor_name != base_name(creature.name):
+                creature.statblock_override = actor_name
+
+        if wants("actorType", "actorHasPlayerOwner"):
+            resolved_type = resolve_creature_type(combatant)
+            if resolved_type and getattr(creature, "_type", None) == CreatureType.BASE:
+                creature._type = resolved_type
+                if resolved_type == CreatureType.PLAYER:
+                    creature.death_saves_prompt = True
+                cells = None
+
+        # Populate spell slots / innate spells / X-per-day abilities from the
+        # statblock library for bridge-sourced creatures whose resources are
+        # still empty. Only monsters/NPCs — players don't have statblocks.
+        if (
+            events is not None
+            and wants("actorName", "actorType", "actorHasPlayerOwner")
+            and getattr(creature, "_type", None) == CreatureType.MONSTER
+            and not (creature._spell_slots or creature._innate_slots or creature._ability_uses)
+        ):
+            sb_name = (
+                creature.statblock_override
+                or actor_name
+                or base_name(creature.name)
+            )
+            if sb_name:
+                events.append(StatblockNeeded(creature, sb_name))
+
+        if wants("effects"):
+            effects = combatant.get("effects", [])
+            if isinstance(effects, list):
+                setattr(creature, "foundry_effects", effects)
+                labels = [effect.get("label") for effect in effects if effect.get("label")]
+                creature.conditions = labels
+                if cells is not None:
+                    cells.add("_conditions")
+
+        # Sync HP from Foundry snapshot (covers player-initiated HP changes)
+        hp_data = combatant.get("hp", {}) if wants("hp") else None
+        if isinstance(hp_data, dict):
+            hp_value = hp_data.get("value")
+            hp_max = hp_data.get("max")
+            hp_temp = hp_data.get("temp")
+            hp_tempmax = hp_data.get("tempmax")
+            event_log.debug(
+                "bridge.hp", "{name!r}: value={value} max={max} temp={temp} tempmax={tempmax}",
+                name=creature_name, value=hp_value, max=hp_max, temp=hp_temp, tempmax=hp_tempmax,
+            )
+            if hp_value is not None:
+                try:
+                    new_hp = int(hp_value)
+                    if new_hp != getattr(creature, "curr_hp", None):
+                        creature.curr_hp = new_hp
+                except (TypeError, ValueError):
+                    pass
+            if hp_max is not None:
+                try:
+                    new_max = int(hp_max)
+                    if new_max != getattr(creature, "max_hp", None):
+                        creature.max_hp = new_max
+                except (TypeError, ValueError):
+                    pass
+            if hp_temp is not None:
+                try:
+                    new_temp = max(0, int(hp_temp))
+                    if new_temp != creature.temp_hp:
+                        creature.temp_hp = new_temp
+                except (TypeError, ValueError):
+                    pass
+            if hp_tempmax is not None:
+                try:
+                    new_bonus = int(hp_tempmax)
+                    if new_bonus != creature.max_hp_bonus:
+                        creature.max_hp_bonus = new_bonus
+                except (TypeError, ValueError):
+                    pass
+            # HP drives the row background, so the whole row repaints.
+            cells = None
+
+        if wants("ac", "armorClass", "attributes"):
+            ac_value = extract_combatant_ac(combatant)
+            if ac_value is not None:
+                try:
+                    creature.armor_class = int(ac_value)
+                except Exception:
+                    setattr(creature, "_armor_class", ac_value)
+                if cells is not None:
+                    cells.add("_armor_class")
+
+        return initiative_changed, cells
+
+    def ensure_present(
+        self,
+        manager: CreatureManager,
+        combatants: List[Dict[str, Any]],
+        events: Optional[List[Any]] = None,
+    ) -> bool:
+        """Add Foundry combatants the tracker doesn't have yet; True if any were added."""
+        if not manager.creatures:
+            return False
+
+        # Build indexes for creatures already in the app (dedupe keys).
+        # IMPORTANT: do NOT dedupe by actorId. Multiple tokens/combatants can share the same actorId.
+        existing_by_combatant_id: Dict[str, I_Creature] = {}
+        existing_by_token_id: Dict[str, I_Creature] = {}
+        matched_keys: set[str] = set()
+
+        for creature in manager.creatures.values():
+            cid = _normalize_id(
+                getattr(creature, "foundry_combatant_id", None)
+                or getattr(creature, "combatant_id", None)
+            )
+            tid = _normalize_id(
+                getattr(creature, "foundry_token_id", None)
+                or getattr(creature, "token_id", None)
+            )
+
+            if cid:
+                existing_by_combatant_id[cid] = creature
+                matched_keys.add(cid)
+            if tid:
+                existing_by_token_id[tid] = creature
+                matched_keys.add(tid)
+
+        # For creatures that have no IDs yet, try to resolve and attach IDs (no new creatures created here).
+        for creature in manager.creatures.values():
+            if getattr(creature, "_is_lair_action", False):
+                continue
+            has_any_id = bool(
+                getattr(creature, "foundry_combatant_id", None)
+                or getattr(creature, "foundry_token_id", None)
+                or getattr(creature, "combatant_id", None)
+                or getattr(creature, "token_id", None)
+            )
+            if has_any_id:
+                continue
+
+            resolved = self.resolve_name(getattr(creature, "name", ""))
+            if not resolved:
+                continue
+
+            rcid = _normalize_id(resolved.get("combatantId"))
+            rtid = _normalize_id(resolved.get("tokenId"))
+            raid = _normalize_id(resolved.get("actorId"))
+
+            if rcid:
+                setattr(creature, "foundry_combatant_id", rcid)
+                existing_by_combatant_id[rcid] = creature
+                matched_keys.add(rcid)
+            if rtid:
+                setattr(creature, "foundry_token_id", rtid)
+                existing_by_token_id[rtid] = creature
+                matched_keys.add(rtid)
+            if raid:
+                setattr(creature, "foundry_actor_id", raid)  # keep as metadata only
+
+        # Build sets of IDs currently present in the snapshot (for cross-scene orphan detection).
+        snapshot_combatant_ids = {
+            _normalize_id(c.get("combatantId"))
+            for c in combatants
+            if isinstance(c, dict) and _normalize_id(c.get("combatantId"))
+        }
+        snapshot_token_ids = {
+            _normalize_id(c.get("tokenId"))
+            for c in combatants
+            if isinstance(c, dict) and _normalize_id(c.get("tokenId"))
+        }
+
+        # Build actorId index for orphaned creatures (scene-transition fallback).
+        # Only include creatures whose stored combatantId/tokenId are absent from the current snapshot.
+        existing_by_actor_id: Dict[str, I_Creature] = {}
+        for creature in manager.creatures.values():
+            if getattr(creature, "_is_lair_action", False):
+                continue
+            aid = _normalize_id(getattr(creature, "foundry_actor_id", None))
+            if not aid:
+                continue
+            old_cid = _normalize_id(getattr(creature, "foundry_combatant_id", None))
+            old_tid = _normalize_id(getattr(creature, "foundry_token_id", None))
+            # Only eligible if old IDs are gone from snapshot (scene transition)
+            if old_cid in snapshot_combatant_ids or old_tid in snapshot_token_ids:
+                continue
+            existing_by_actor_id[aid] = creature
+
+        # Add missing Foundry combatants into the app (membership add-only).
+        added = False
+        for combatant in combatants:
+            if not isinstance(combatant, dict):
+                continue
+            if combatant.get("excludeFromSync"):
+                continue
+
+            name = (combatant.get("name") or "").strip()
+            if not name:
+                continue
+
+            cid = _normalize_id(combatant.get("combatantId"))
+            tid = _normalize_id(combatant.get("tokenId"))
+            aid = _normalize_id(combatant.get("actorId"))
+
+            # Skip if we've already matched this combatant by combatantId or tokenId.
+            if (cid and cid in matched_keys) or (tid and tid in matched_keys):
+                continue
+
+            # If an existing creature has matching IDs, attach missing metadata and skip creation.
+            existing = None
+            if cid and cid in existing_by_combatant_id:
+                existing = existing_by_combatant_id[cid]
+            elif tid and tid in existing_by_token_id:
+                existing = existing_by_token_id[tid]
+
+            if existing:
+                if cid and not getattr(existing, "foundry_combatant_id", None):
+                    setattr(existing, "foundry_combatant_id", cid)
+                    existing_by_combatant_id[cid] = existing
+                    matched_keys.add(cid)
+                if tid and not getattr(existing, "foundry_token_id", None):
+                    setattr(existing, "foundry_token_id", tid)
+                    existing_by_token_id[tid] = existing
+                    matched_keys.add(tid)
+                if aid and not getattr(existing, "foundry_actor_id", None):
+                    setattr(existing, "foundry_actor_id", aid)
+                resolved_type = resolve_creature_type(combatant)
+                if resolved_type and getattr(existing, "_type", None) == CreatureType.BASE:
+                    existing._type = resolved_type
+                    if resolved_type == CreatureType.PLAYER:
+                        existing.death_saves_prompt = True
+                continue
+
+            # Fallback: match by actorId for scene-transition orphans (old IDs gone from snapshot)
+            if aid and aid in existing_by_actor_id:
+                existing = existing_by_actor_id[aid]
+                if cid:
+                    setattr(existing, "foundry_combatant_id", cid)
+                    existing_by_combatant_id[cid] = existing
+                    matched_keys.add(cid)
+                if tid:
+                    setattr(existing, "foundry_token_id", tid)
+                    existing_by_token_id[tid] = existing
+                    matched_keys.add(tid)
+                del existing_by_actor_id[aid]
+                continue  # don't create new creature
+
+            # Create a new creature for this Foundry combatant using the proper subclass
+            # so it is included in save_state (which filters by isinstance(c, Monster/Player))
+            resolved_type = resolve_creature_type(combatant)
+            if resolved_type == CreatureType.PLAYER:
+                creature = Player(name=str(name))
+            elif resolved_type == CreatureType.MONSTER:
+                creature = Monster(name=str(name))
+            else:
+                creature = I_Creature(_name=str(name))
+
+            if cid:
+                setattr(creature, "foundry_combatant_id", cid)
+            if tid:
+                setattr(creature, "foundry_token_id", tid)
+            if aid:
+                setattr(creature, "foundry_actor_id", aid)
+
+            initiative = combatant.get("initiative")
+            if initiative is not None:
+                try:
+                    creature.initiative = int(initiative)
+                except (TypeError, ValueError):
+                    pass
+
+            hp = combatant.get("hp", {})
+            if isinstance(hp, dict):
+                curr_hp = hp.get("value")
+                max_hp = hp.get("max")
+                if curr_hp is not None:
+                    try:
+                        creature.curr_hp = int(curr_hp)
+                    except (TypeError, ValueError):
+                        pass
+                if max_hp is not None:
+                    try:
+                        creature.max_hp = int(max_hp)
+                    except (TypeError, ValueError):
+                        pass
+
+            # AC (Foundry schema can vary; support common shapes)
+            ac_value = extract_combatant_ac(combatant)
+            if ac_value is not None:
+                try:
+                    creature.armor_class = int(ac_value)
+                except Exception:
+                    setattr(creature, "_armor_class", ac_value)
+
+            effects = combatant.get("effects", [])
+            if isinstance(effects, list):
+                setattr(creature, "foundry_effects", effects)
+                labels = [e.get("label") for e in effects if isinstance(e, dict) and e.get("label")]
+                creature.conditions = labels
+
+            # Auto-set statblock override from actor name when token name differs
+            actor_name = (combatant.get("actorName") or "").strip()
+            if actor_name and actor_name != name:
+                creature.statblock_override = actor_name
+                if events is not None:
+                    events.append(StatblockNeeded(creature, actor_name))
+
+            # Ensure unique name in manager
+            base = creature.name
+            counter = 1
+            while creature.name in manager.creatures:
+                creature.name = f"{base}_{counter}"
+                counter += 1
+
+            manager.add_creature(creature)
+            added = True
+
+            # Update indexes + matched keys
+            if cid:
+                existing_by_combatant_id[cid] = creature
+                matched_keys.add(cid)
+            if tid:
+                existing_by_token_id[tid] = creature
+                matched_keys.add(tid)
+
+        return added
@@ -0,0 +1,248 @@
+# lib/app/resilience.py
+"""
+Failure handling for requests to the Storage service.
+
+StorageAPI used fixed 8-10 s timeouts with no memory of failures, so while
+the server was down every statblock lookup during a turn change waited out
+the whole timeout. StorageResilience wraps each request with:
+
+  AdaptiveTimeout  the read timeout follows observed latency (smoothed
+                   latency plus four deviations, as TCP does), clamped to
+                   [min_s, max_s] and doubled after each timeout
+  CircuitBreaker   opens after ``threshold`` failures in a row; requests then
+                   fail at once with CircuitOpenError until ``reset_s`` has
+                   passed, when one trial request decides whether it closes
+  retries          idempotent requests are retried on connection errors,
+                   timeouts and 502/503/504, with full-jitter backoff
+
+Failures are transport errors and 5xx answers; a 404 is a healthy server.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import requests
+
+from app.event_log import event_log
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+RETRY_STATUSES = (502, 503, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The breaker is open: the request was not sent."""
+
+
+class AdaptiveTimeout:
+    """A read timeout that tracks how fast the server usually answers."""
+
+    def __init__(self, initial_s: float = 8.0, min_s: float = 2.0, max_s: float = 30.0):
+        self.initial_s = initial_s
+        self.min_s = min_s
+        self.max_s = max_s
+        self._srtt: Optional[float] = None
+        self._rttvar = 0.0
+        self._backoff = 1.0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_s: float) -> None:
+        with self._lock:
+            if self._srtt is None:
+                self._srtt = elapsed_s
+                self._rttvar = elapsed_s / 2
+            else:
+                self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - elapsed_s)
+                self._srtt = 0.875 * self._srtt + 0.125 * elapsed_s
+            self._backoff = 1.0
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self._backoff = min(self._backoff * 2, self.max_s / self.min_s)
+
+    def current(self) -> float:
+        with self._lock:
+            base = self.initial_s if self._srtt is None else self._srtt + 4 * self._rttvar
+            return min(self.max_s, max(self.min_s, base) * self._backoff)
+
+    @property
+    def latency_s(self) -> Optional[float]:
+        return self._srtt
+
+
+class CircuitBreaker:
+    """Closed -> open after ``threshold`` failures -> half open after ``reset_s``."""
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        reset_s: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_change: Optional[Callable[[str], None]] = None,
+    ):
+        self.threshold = max(1, threshold)
+        self.reset_s = reset_s
+        self.on_change = on_change
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def retry_in_s(self) -> float:
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_s - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """May a request go out now? In half-open state only the one trial may."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_s:
+                self._state = HALF_OPEN
+                self._trial_running = False
+                changed = True
+            else:
+                changed = False
+            if self._state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                allowed = True
+            else:
+                allowed = False
+        if changed:
+            self._notify()
+        return allowed
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            changed = self._state != CLOSED
+            self._state = CLOSED
+        if changed:
+            self._notify()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            changed = self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.threshold
+            )
+            if changed:
+                self._state = OPEN
+                self._opened_at = self._clock()
+        if changed:
+            self._notify()
+
+    def _notify(self) -> None:
+        if self.on_change is not None:
+            self.on_change(self._state)
+
+
+class StorageResilience:
+    """Timeouts, retries and a circuit breaker shared by one StorageAPI's requests."""
+
+    def __init__(
+        self,
+        timeout: Optional[AdaptiveTimeout] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retries: int = 2,
+        backoff_s: float = 0.2,
+        max_backoff_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.timeout = timeout or AdaptiveTimeout()
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.breaker.on_change = self._on_breaker_change
+        self.retries = max(0, retries)
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.on_change: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+
+    def call(
+        self,
+        send: Callable[[Timeout], requests.Response],
+        idempotent: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> requests.Response:
+        """Send a request through the breaker. ``timeout`` overrides the adaptive one."""
+        attempts = 1 + (self.retries if idempotent else 0)
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"Storage service unavailable; retrying in {self.breaker.retry_in_s():.0f}s"
+                )
+            start = self._clock()
+            try:
+                r = send(timeout if timeout is not None else self.timeout.current())
+            except requests.RequestException as e:
+                self.breaker.record_failure()
+                if isinstance(e, requests.Timeout) and timeout is None:
+                    self.timeout.timed_out()
+                if attempt == attempts or self.breaker.state == OPEN:
+                    raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            else:
+                if r.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                    if timeout is None:
+                        self.timeout.observe(self._clock() - start)
+                if (
+                    r.status_code not in RETRY_STATUSES
+                    or attempt == attempts
+                    or self.breaker.state == OPEN
+                ):
+                    return r
+            ceiling = min(self.max_backoff_s, self.backoff_s * (2 ** (attempt - 1)))
+            self._sleep(self._rng() * ceiling)
+
+    def status(self) -> Dict[str, Any]:
+        latency = self.timeout.latency_s
+        return {
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "retry_in_s": round(self.breaker.retry_in_s(), 1),
+            "timeout_s": round(self.timeout.current(), 2),
+            "latency_ms": None if latency is None else round(latency * 1000),
+        }
+
+    def _on_breaker_change(self, state: str) -> None:
+        if state == OPEN:
+            event_log.warning(
+                "storage",
+                "Storage service unhealthy; failing fast for {seconds}s",
+                seconds=int(self.breaker.reset_s),
+            )
+        elif state == CLOSED:
+            event_log.info("storage", "Storage service healthy again")
+        if self.on_change is not None:
+            self.on_change(self.status())
@@ -0,0 +1,186 @@
+# lib/app/save_format.py
+"""
+Versioned save format for encounters, PC groups and last_state.json.
+
+The original format (version 1, unmarked) is GameState.to_dict(): every
+I_Creature field of every creature, defaults included. Version 2 marks the
+document and leaves out each creature field that still has its default:
+
+    {"format": "dnd-tracker/state", "version": 2,
+     "current_turn": 0, "round_counter": 3, "time_counter": 18,
+     "players":  [{"_type": 2, "_name": "Aria", "_init": 14, ...}, ...],
+     "monsters": [{"_type": 1, "_name": "Goblin", "_curr_hp": 4, ...}, ...]}
+
+The defaults are pinned in this module (CREATURE_DEFAULTS) rather than read
+from I_Creature, so changing a constructor default later can't change what an
+old file means. With ``compress=True`` the same document is deflated and
+wrapped as {"format", "version", "encoding": "zlib", "data": "<base64>"}.
+
+decode_state() reads any of these. Creatures are decoded lazily: the
+players and monsters lists build each creature the first time it's accessed,
+so adding an encounter's monsters never decodes its players.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.creature import I_Creature
+from app.serialization import from_primitive, to_primitive
+
+FORMAT = "dnd-tracker/state"
+FORMAT_VERSION = 2
+COMPRESSION_LEVEL = 6
+
+# Version 2 creature defaults. Never edit these in place: a new default means
+# a new FORMAT_VERSION, with the old table kept for decoding older files.
+CREATURE_DEFAULTS: Dict[str, Any] = {
+    "_init": -1,
+    "_max_hp": -1,
+    "_max_hp_bonus": 0,
+    "_curr_hp": -1,
+    "_temp_hp": 0,
+    "_armor_class": -1,
+    "_movement": -1,
+    "_action": False,
+    "_bonus_action": False,
+    "_reaction": False,
+    "_object_interaction": False,
+    "_notes": "",
+    "_public_notes": "",
+    "_player_visible": True,
+    "_conditions": [],
+    "_status_time": -1,
+    "_spell_slots": {},
+    "_innate_slots": {},
+    "_spell_slots_used": {},
+    "_innate_slots_used": {},
+    "_ability_uses": {},
+    "_ability_uses_used": {},
+    "_death_successes": 0,
+    "_death_failures": 0,
+    "_death_stable": False,
+    "_death_saves_prompt": False,
+    "_active": True,
+    "_foundry_combatant_id": None,
+    "_foundry_token_id": None,
+    "_foundry_actor_id": None,
+    "_is_lair_action": False,
+    "_lair_action_notes": "",
+    "_statblock_override": "",
+}
+_CONTAINER_DEFAULTS = {k: type(v) for k, v in CREATURE_DEFAULTS.items() if isinstance(v, (list, dict))}
+_MISSING = object()
+
+
+def is_versioned(raw: Any) -> bool:
+    """True for a version 2+ document (compressed or not)."""
+    return isinstance(raw, dict) and raw.get("format") == FORMAT
+
+
+# ----- Creatures -----
+
+def compact_creature(creature: I_Creature) -> Dict[str, Any]:
+    """``creature`` as JSON data without the fields still at their defaults."""
+    out: Dict[str, Any] = {}
+    for key, value in creature.to_dict().items():
+        default = CREATURE_DEFAULTS.get(key, _MISSING)
+        if default is _MISSING or value != default:
+            out[key] = to_primitive(value)
+    return out
+
+
+def expand_creature(data: Dict[str, Any]) -> Dict[str, Any]:
+    """A version 2 creature dict with every default filled back in."""
+    out = {**CREATURE_DEFAULTS, **data}
+    for key, kind in _CONTAINER_DEFAULTS.items():
+        if key not in data:
+            out[key] = kind()  # never share the default containers
+    return out
+
+
+class LazyCreatures(Sequence):
+    """A saved creature list that builds each creature on first access."""
+
+    def __init__(self, raw: Iterable[Any], compact: bool):
+        self._raw: List[Any] = list(raw)
+        self._compact = compact
+        self._decoded: List[Any] = [_MISSING] * len(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._raw)))]
+        item = self._decoded[index]
+        if item is _MISSING:
+            item = self._decoded[index] = self._decode(self._raw[index])
+        return item
+
+    def _decode(self, data: Any) -> Any:
+        if self._compact and isinstance(data, dict) and "_type" in data:
+            return I_Creature.from_dict(expand_creature(data))
+        return from_primitive(data)
+
+    def names(self) -> List[Optional[str]]:
+        """Creature names without decoding anything."""
+        return [d.get("_name") if isinstance(d, dict) else None for d in self._raw]
+
+    def __repr__(self) -> str:
+        decoded = sum(1 for d in self._decoded if d is not _MISSING)
+        return f"<LazyCreatures {len(self._raw)} creatures, {decoded} decoded>"
+
+
+# ----- Whole states -----
+
+def encode_state(state: Any, compress: bool = False) -> Dict[str, Any]:
+    """A GameState as a version 2 document, optionally deflated."""
+    doc = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "current_turn": state.current_turn,
+        "round_counter": state.round_counter,
+        "time_counter": state.time_counter,
+        "players": [compact_creature(p) for p in state.players],
+        "monsters": [compact_creature(m) for m in state.monsters],
+    }
+    if not compress:
+        return doc
+    body = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "encoding": "zlib",
+        "data": base64.b64encode(zlib.compress(body, COMPRESSION_LEVEL)).decode("ascii"),
+    }
+
+
+def decode_state(raw: Any) -> Any:
+    """
+    Read a saved state of any version. Returns a dict whose "players" and
+    "monsters" are LazyCreatures; anything that isn't a state dict is
+    decoded as before (from_primitive).
+    """
+    if not isinstance(raw, dict):
+        return from_primitive(raw)
+    compact = is_versioned(raw)
+    if compact:
+        version = raw.get("version")
+        if not isinstance(version, int) or version > FORMAT_VERSION:
+            raise ValueError(f"Save format version {version!r} is newer than this app supports")
+        encoding = raw.get("encoding")
+        if encoding == "zlib":
+            raw = json.loads(zlib.decompress(base64.b64decode(raw["data"])).decode("utf-8"))
+        elif encoding is not None:
+            raise ValueError(f"Unknown save encoding: {encoding!r}")
+    out = {
+        k: v for k, v in raw.items()
+        if k not in ("players", "monsters", "format", "version", "encoding")
+    }
+    out["players"] = LazyCreatures(raw.get("players") or [], compact)
+    out["monsters"] = LazyCreatures(raw.get("monsters") or [], compact)
+    return out
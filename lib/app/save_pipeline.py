@@ -0,0 +1,210 @@
+# lib/app/save_pipeline.py
+"""
+Concurrent saving for the bulk importers.
+
+Saving a 300-item paste one PUT at a time is latency-bound, and on the GUI
+thread it freezes the dialog for the whole run. SavePipeline.run() is meant
+to be called from a worker thread instead:
+
+  - with a bulk writer (StorageAPI.save_items_bulk and friends) documents go
+    up BULK_WRITE_CHUNK at a time; a server without the endpoint falls back
+    to single saves after the first call;
+  - otherwise single saves run on a bounded thread pool, or one after another
+    inside the backend's batch() where it has one (the local engines and the
+    mirror), since those serialise writes anyway. Their results are only
+    reported once the batch commits; if the commit fails, every key in the
+    batch is reported as failed;
+  - every call is retried with exponential backoff;
+  - cancel() stops new saves and cuts short any backoff wait. Keys that were
+    never attempted come back in SaveReport.cancelled.
+
+``on_result(key, error)`` fires once per finished key (error is None on
+success) from whichever thread saved it; Qt callers forward it through a
+signal.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.bulk_fetch import DEFAULT_MAX_WORKERS
+from app.event_log import event_log
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_S = 0.5
+MAX_BACKOFF_S = 8.0
+# Keys per bulk write call; small enough that progress arrives in steps.
+BULK_WRITE_CHUNK = 50
+
+_SAVE_ONE = {"statblocks": "save_statblock", "spells": "save_spell", "items": "save_item"}
+_SAVE_BULK = {
+    "statblocks": "save_statblocks_bulk",
+    "spells": "save_spells_bulk",
+    "items": "save_items_bulk",
+}
+
+
+class _Cancelled(Exception):
+    pass
+
+
+@dataclass
+class SaveReport:
+    saved: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    cancelled: List[str] = field(default_factory=list)
+
+
+def _message(exc: BaseException) -> str:
+    return str(exc) or type(exc).__name__
+
+
+class SavePipeline:
+    """Save many documents of one collection; see the module docstring."""
+
+    def __init__(
+        self,
+        storage: Any,
+        collection: str,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_s: float = DEFAULT_BACKOFF_S,
+        on_result: Optional[Callable[[str, Optional[str]], None]] = None,
+    ):
+        if collection not in _SAVE_ONE:
+            raise ValueError(f"Unknown collection: {collection!r}")
+        self.storage = storage
+        self.collection = collection
+        self.max_workers = max(1, max_workers)
+        self.retries = max(0, retries)
+        self.backoff_s = backoff_s
+        self.on_result = on_result
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Any] = {}
+        self._report = SaveReport()
+        # Results finished inside a batch(), held back until it commits.
+        self._held: Optional[List[Tuple[str, Optional[str]]]] = None
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # ----- Running -----
+
+    def run(self, docs: Iterable[Tuple[str, Any]]) -> SaveReport:
+        """Save every (key, data) pair; a repeated key keeps its last data."""
+        self._docs = dict(docs)
+        self._report = SaveReport()
+        keys = list(self._docs)
+
+        todo = keys
+        bulk = getattr(self.storage, _SAVE_BULK[self.collection], None)
+        if bulk is not None and keys:
+            chunks = [keys[i:i + BULK_WRITE_CHUNK] for i in range(0, len(keys), BULK_WRITE_CHUNK)]
+            # The first call tells us whether the server has the endpoint at all.
+            if self._save_chunk(bulk, chunks[0]):
+                done = self._map(lambda chunk: self._save_chunk(bulk, chunk), chunks[1:])
+                todo = [k for chunk, ok in zip(chunks[1:], done) if not ok for k in chunk]
+
+        if todo:
+            save_one = getattr(self.storage, _SAVE_ONE[self.collection])
+            batch = getattr(self.storage, "batch", None)
+            if batch is None:
+                self._map(lambda key: self._save_key(save_one, key), todo)
+            else:
+                self._save_batched(batch, save_one, todo)
+
+        with self._lock:
+            report = self._report
+            finished = set(report.saved) | set(report.failed)
+            report.cancelled = [k for k in keys if k not in finished]
+        if keys:
+            event_log.info(
+                "storage",
+                "Saved {saved} {collection} ({failed} failed, {cancelled} cancelled)",
+                saved=len(report.saved),
+                collection=self.collection,
+                failed=len(report.failed),
+                cancelled=len(report.cancelled),
+            )
+        return report
+
+    def _map(self, fn: Callable[[Any], Any], units: List[Any], workers: Optional[int] = None) -> List[Any]:
+        workers = max(1, min(workers or self.max_workers, len(units)))
+        if workers == 1:
+            return [fn(u) for u in units]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-save") as pool:
+            return list(pool.map(fn, units))
+
+    def _retry(self, call: Callable[[], Any]) -> Any:
+        for attempt in range(self.retries + 1):
+            if self._cancel.is_set():
+                raise _Cancelled()
+            try:
+                return call()
+            except Exception:
+                if attempt == self.retries:
+                    raise
+            delay = min(MAX_BACKOFF_S, self.backoff_s * (2 ** attempt))
+            if self._cancel.wait(delay):
+                raise _Cancelled()
+
+    def _save_key(self, save_one: Callable[[str, Any], Any], key: str) -> None:
+        try:
+            self._retry(lambda: save_one(key, self._docs[key]))
+        except _Cancelled:
+            return
+        except Exception as exc:
+            self._finish(key, _message(exc))
+        else:
+            self._finish(key, None)
+
+    def _save_batched(self, batch: Callable[[], Any], save_one: Callable[[str, Any], Any], keys: List[str]) -> None:
+        """Save ``keys`` one by one in a batch; nothing counts as saved until it commits."""
+        with self._lock:
+            self._held = []
+        commit_error: Optional[str] = None
+        try:
+            with batch():
+                self._map(lambda key: self._save_key(save_one, key), keys, 1)
+        except Exception as exc:
+            commit_error = _message(exc)
+        with self._lock:
+            held, self._held = self._held, None
+        for key, error in held:
+            self._finish(key, error if error is not None else commit_error)
+
+    def _save_chunk(self, bulk: Callable[[Dict[str, Any]], Any], keys: List[str]) -> bool:
+        """Save ``keys`` in one bulk call; False if the backend has no bulk endpoint."""
+        payload = {k: self._docs[k] for k in keys}
+        try:
+            errors = self._retry(lambda: bulk(payload))
+        except _Cancelled:
+            return True
+        except Exception as exc:
+            for key in keys:
+                self._finish(key, _message(exc))
+            return True
+        if errors is None:
+            return False
+        for key in keys:
+            self._finish(key, errors.get(key))
+        return True
+
+    def _finish(self, key: str, error: Optional[str]) -> None:
+        with self._lock:
+            if self._held is not None:
+                self._held.append((key, error))
+                return
+            if error is None:
+                self._report.saved.append(key)
+            else:
+                self._report.failed[key] = error
+        if self.on_result is not None:
+            self.on_result(key, error)
@@ -0,0 +1,611 @@
+# lib/app/search_index.py
+"""
+Full-text search over the spell, statblock and item libraries.
+
+LookupDialog used to filter by substring on prettified key names, rebuilding
+its lists on every keystroke, and couldn't see descriptions, damage types or
+tags. SearchIndex is an inverted index over the documents themselves:
+
+* every name, tag and text field is tokenized; names weigh most, then tags
+* the last word of a query (or any word ending in ``*``) matches as a prefix,
+  so results follow typing
+* ``field:value`` terms filter: ``in:spells``, ``level:3``, ``school:evocation``,
+  ``damage:fire``, ``tag:potion``, ``rarity:rare``, ``type:dragon``, ``cr:5``,
+  ``size:large``, ``resist:cold``, ``immune:poison``, ``attunement:yes``;
+  ``name:word`` matches the word in names only
+* hits are ranked by idf-weighted term weight, with a boost when the name
+  starts with the query
+
+LibrarySearch keeps an index in step with one storage backend. Backends call
+update()/remove() as they save and delete. sync() checks the backend's per-key
+stamps (file mtimes, row timestamps) and re-reads only the entries that
+changed; it can be slow over the network, so callers run it on a worker thread
+(LookupDialog does, at startup and when the change feed reports an edit).
+search() only ever consults the in-memory index, and isn't held up by a sync
+in progress. The index is saved beside the storage; loading it rebuilds the
+postings from per-document term weights, without re-reading the library.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.autosave import write_json_atomic
+
+INDEX_VERSION = 1
+COLLECTIONS = ("spells", "statblocks", "items")
+
+NAME_WEIGHT = 4.0
+TAG_WEIGHT = 2.0
+PREFIX_PENALTY = 0.8
+MAX_PREFIX_TERMS = 200
+
+DAMAGE_TYPES = frozenset((
+    "acid", "bludgeoning", "cold", "fire", "force", "lightning", "necrotic",
+    "piercing", "poison", "psychic", "radiant", "slashing", "thunder",
+))
+_STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "has",
+    "if", "in", "is", "it", "its", "of", "on", "or", "that", "the", "their",
+    "them", "then", "this", "to", "was", "when", "which", "with", "you", "your",
+))
+# Document fields that never hold searchable prose.
+_SKIP_FIELDS = frozenset(("name", "tags", "img", "image", "icon", "url", "source_url"))
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# query field -> document field(s), per collection
+_FACETS = {
+    "spells": {"level": ("level",), "school": ("school",), "concentration": ("concentration",),
+               "ritual": ("ritual",)},
+    "statblocks": {"type": ("type",), "size": ("size",), "cr": ("challenge_rating",),
+                   "alignment": ("alignment",), "resist": ("damage_resistances",),
+                   "immune": ("damage_immunities", "condition_immunities"),
+                   "vulnerable": ("damage_vulnerabilities",)},
+    "items": {"rarity": ("rarity",), "type": ("item_type", "type"), "subtype": ("subtype",),
+              "attunement": ("requires_attunement",)},
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        t for t in _TOKEN_RE.findall(text.lower())
+        if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())
+    ]
+
+
+def _strings(value: Any, out: List[str]) -> None:
+    if isinstance(value, str):
+        if value:
+            out.append(value)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            if k not in _SKIP_FIELDS:
+                _strings(v, out)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _strings(v, out)
+
+
+def _facet_values(value: Any) -> Set[str]:
+    """Normalized facet values: the whole value plus each of its words."""
+    out: Set[str] = set()
+    items = value if isinstance(value, (list, tuple)) else [value]
+    for item in items:
+        if isinstance(item, bool):
+            out.add("yes" if item else "no")
+        elif isinstance(item, (int, float)):
+            out.add(str(item))
+        elif isinstance(item, str) and item.strip():
+            text = item.strip().lower()
+            out.add(text)
+            out.update(_TOKEN_RE.findall(text))
+    return out
+
+
+def _damage_types(tokens: List[str]) -> Set[str]:
+    # "8d6 fire damage", "fire or cold damage", "takes lightning damage"
+    found = set()
+    for i, tok in enumerate(tokens):
+        if tok in DAMAGE_TYPES and "damage" in tokens[i + 1:i + 4]:
+            found.add(tok)
+    return found
+
+
+def analyze(collection: str, data: Any) -> Dict[str, Any]:
+    """Term weights, name terms and facets for one document."""
+    if not isinstance(data, dict):
+        data = {}
+    name = data.get("name") if isinstance(data.get("name"), str) else ""
+    name_tokens = tokenize(name)
+    tags = [t for t in data.get("tags") or [] if isinstance(t, str)]
+    tag_tokens = tokenize(" ".join(tags))
+    texts: List[str] = []
+    for field, value in data.items():
+        if field not in _SKIP_FIELDS:
+            _strings(value, texts)
+    text_tokens = tokenize(" ".join(texts))
+
+    counts: Dict[str, int] = {}
+    for tok in text_tokens:
+        counts[tok] = counts.get(tok, 0) + 1
+    terms: Dict[str, float] = {t: 1.0 + math.log(n) for t, n in counts.items()}
+    for tok in tag_tokens:
+        terms[tok] = terms.get(tok, 0.0) + TAG_WEIGHT
+    for tok in name_tokens:
+        terms[tok] = terms.get(tok, 0.0) + NAME_WEIGHT
+
+    facets: Dict[str, Set[str]] = {"in": {collection}}
+    if tags:
+        facets["tag"] = _facet_values(tags)
+    for query_field, fields in _FACETS.get(collection, {}).items():
+        values: Set[str] = set()
+        for field in fields:
+            if field in data:
+                values |= _facet_values(data[field])
+        if values:
+            facets[query_field] = values
+    damage = _damage_types(text_tokens)
+    if damage:
+        facets["damage"] = damage
+    return {
+        "name": name,
+        "terms": {t: round(w, 3) for t, w in terms.items()},
+        "name_terms": sorted(set(name_tokens)),
+        "facets": {k: sorted(v) for k, v in facets.items()},
+    }
+
+
+_COLLECTION_ALIASES = {
+    "spell": "spells", "monster": "statblocks", "monsters": "statblocks",
+    "statblock": "statblocks", "item": "items",
+}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    collection: str
+    key: str
+    name: str
+    score: float
+
+
+@dataclass
+class _Query:
+    terms: List[Tuple[str, bool, bool]]  # (term, prefix, name only)
+    filters: Dict[str, Set[str]]
+    text: str
+
+
+def parse_query(query: str) -> _Query:
+    words = query.split()
+    trailing_space = query[-1:].isspace()
+    terms: List[Tuple[str, bool, bool]] = []
+    filters: Dict[str, Set[str]] = {}
+    text_parts: List[str] = []
+    for i, word in enumerate(words):
+        last = i == len(words) - 1 and not trailing_space
+        field, sep, value = word.partition(":")
+        if sep and field and value:
+            field = field.lower()
+            if field == "name":
+                for tok in _TOKEN_RE.findall(value.lower()):
+                    terms.append((tok, last or value.endswith("*"), True))
+                continue
+            value = value.lower().rstrip("*")
+            if field == "in":
+                value = _COLLECTION_ALIASES.get(value, value)
+            filters.setdefault(field, set()).add(value)
+            continue
+        prefix = last or word.endswith("*")
+        toks = _TOKEN_RE.findall(word.lower())
+        text_parts.extend(toks)
+        for j, tok in enumerate(toks):
+            if tok in _STOPWORDS and not (prefix and j == len(toks) - 1):
+                continue
+            terms.append((tok, prefix and j == len(toks) - 1, False))
+    return _Query(terms, filters, " ".join(text_parts))
+
+
+class SearchIndex:
+    """In-memory inverted index keyed by (collection, key).
+
+    Documents get small integer ids internally so postings stay cheap to
+    hash and intersect.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 0
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._name_postings: Dict[str, Set[int]] = {}
+        self._facets: Dict[Tuple[str, str], Set[int]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        self._sorted_names: Optional[List[Tuple[str, int]]] = None
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc: Tuple[str, str]) -> bool:
+        return doc in self._ids
+
+    def stamp(self, collection: str, key: str) -> Any:
+        doc_id = self._ids.get((collection, key))
+        return self._docs[doc_id].get("stamp") if doc_id is not None else None
+
+    def keys(self, collection: str) -> List[str]:
+        return [k for c, k in self._ids if c == collection]
+
+    # ---- updates ----
+
+    def _add(self, collection: str, key: str, entry: Dict[str, Any]) -> None:
+        doc_id = self._next_id
+        self._next_id += 1
+        self._ids[(collection, key)] = doc_id
+        entry["collection"], entry["key"] = collection, key
+        self._docs[doc_id] = entry
+        for term, weight in entry["terms"].items():
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = postings = {}
+                self._sorted_terms = None
+            postings[doc_id] = weight
+        for term in entry["name_terms"]:
+            self._name_postings.setdefault(term, set()).add(doc_id)
+        for field, values in entry["facets"].items():
+            for value in values:
+                self._facets.setdefault((field, value), set()).add(doc_id)
+        self._sorted_names = None
+
+    def remove(self, collection: str, key: str) -> bool:
+        doc_id = self._ids.pop((collection, key), None)
+        if doc_id is None:
+            return False
+        entry = self._docs.pop(doc_id)
+        for term in entry["terms"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._sorted_terms = None
+        for term in entry["name_terms"]:
+            docs = self._name_postings.get(term)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._name_postings[term]
+        for field, values in entry["facets"].items():
+            for value in values:
+                docs = self._facets.get((field, value))
+                if docs is not None:
+                    docs.discard(doc_id)
+                    if not docs:
+                        del self._facets[(field, value)]
+        self._sorted_names = None
+        self.dirty = True
+        return True
+
+    def add(self, collection: str, key: str, data: Any, stamp: Any = None) -> None:
+        self.remove(collection, key)
+        entry = analyze(collection, data)
+        entry["stamp"] = stamp
+        self._add(collection, key, entry)
+        self.dirty = True
+
+    # ---- queries ----
+
+    def _expand(self, term: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Index terms matching ``term``, with a factor for inexact (prefix) matches."""
+        out = [(term, 1.0)] if term in self._postings else []
+        if not prefix:
+            return out
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        i = bisect_left(terms, term)
+        while i < len(terms) and terms[i].startswith(term) and len(out) < MAX_PREFIX_TERMS:
+            if terms[i] != term:
+                out.append((terms[i], PREFIX_PENALTY))
+            i += 1
+        return out
+
+    def _filter_docs(self, filters: Dict[str, Set[str]]) -> Optional[Set[int]]:
+        allowed: Optional[Set[int]] = None
+        for field, values in filters.items():
+            matched: Set[int] = set()
+            for value in values:
+                matched |= self._facets.get((field, value), set())
+            allowed = matched if allowed is None else allowed & matched
+            if not allowed:
+                return set()
+        return allowed
+
+    def _names(self) -> List[Tuple[str, int]]:
+        if self._sorted_names is None:
+            self._sorted_names = sorted(
+                (entry["name"].lower(), doc_id) for doc_id, entry in self._docs.items()
+            )
+        return self._sorted_names
+
+    def search(
+        self,
+        query: str,
+        collections: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 50,
+    ) -> List[SearchHit]:
+        parsed = parse_query(query)
+        if not parsed.terms and not parsed.filters:
+            return []
+        if collections is not None:
+            wanted = set(collections)
+            given = parsed.filters.get("in")
+            parsed.filters["in"] = wanted if given is None else given & wanted
+        allowed = self._filter_docs(parsed.filters)
+        if allowed is not None and not allowed:
+            return []
+        n_docs = max(len(self._docs), 1)
+
+        scores: Optional[Dict[int, float]] = None
+        for term, prefix, name_only in parsed.terms:
+            term_scores: Dict[int, float] = {}
+            for match, factor in self._expand(term, prefix):
+                postings = self._postings[match]
+                c = math.log(1.0 + n_docs / len(postings)) * factor
+                if name_only:
+                    pairs = [(d, postings[d]) for d in self._name_postings.get(match, ())]
+                elif scores is not None and len(scores) < len(postings):
+                    pairs = [(d, postings[d]) for d in scores if d in postings]
+                else:
+                    pairs = postings.items()
+                if not term_scores:
+                    term_scores = {d: w * c for d, w in pairs}
+                    continue
+                get = term_scores.get
+                for d, w in pairs:
+                    if w * c > get(d, 0.0):
+                        term_scores[d] = w * c
+            if scores is not None:
+                term_scores = {d: scores[d] + s for d, s in term_scores.items() if d in scores}
+            scores = term_scores
+            if not scores:
+                return []
+
+        docs = self._docs
+        if scores is None:
+            # Filters only: alphabetical.
+            ordered = [d for _, d in self._names() if d in allowed]
+            if limit is not None:
+                ordered = ordered[:limit]
+            return [
+                SearchHit(docs[d]["collection"], docs[d]["key"], docs[d]["name"], 0.0)
+                for d in ordered
+            ]
+        if allowed is not None:
+            scores = {d: s for d, s in scores.items() if d in allowed}
+
+        text = parsed.text
+        if text:
+            names = self._names()
+            i = bisect_left(names, (text,))
+            while i < len(names) and names[i][0].startswith(text):
+                d = names[i][1]
+                if d in scores:
+                    scores[d] += 100.0 if names[i][0] == text else 50.0
+                i += 1
+
+        if limit is not None and len(scores) > limit:
+            # Cheap cut by score first; ties at the cut-off are kept so the
+            # final (score, name) order is exact.
+            top = heapq.nlargest(limit, scores.values())
+            floor = top[-1]
+            scores = {d: s for d, s in scores.items() if s >= floor}
+        ranked = sorted(
+            scores.items(), key=lambda p: (-p[1], docs[p[0]]["name"].lower(), docs[p[0]]["key"])
+        )
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            SearchHit(docs[d]["collection"], docs[d]["key"], docs[d]["name"], round(s, 4))
+            for d, s in ranked
+        ]
+
+    # ---- persistence ----
+
+    def to_json(self, identity: str = "") -> Dict[str, Any]:
+        docs: Dict[str, Dict[str, Any]] = {}
+        for entry in self._docs.values():
+            stored = {k: v for k, v in entry.items() if k not in ("collection", "key")}
+            docs.setdefault(entry["collection"], {})[entry["key"]] = stored
+        return {"version": INDEX_VERSION, "identity": identity, "docs": docs}
+
+    @classmethod
+    def from_json(cls, raw: Any, identity: str = "") -> "SearchIndex":
+        index = cls()
+        if (
+            not isinstance(raw, dict)
+            or raw.get("version") != INDEX_VERSION
+            or raw.get("identity", "") != identity
+        ):
+            return index
+        for collection, entries in (raw.get("docs") or {}).items():
+            if not isinstance(entries, dict):
+                continue
+            for key, entry in entries.items():
+                if isinstance(entry, dict) and isinstance(entry.get("terms"), dict):
+                    entry.setdefault("facets", {})
+                    entry.setdefault("name_terms", [])
+                    entry.setdefault("name", "")
+                    index._add(collection, key, entry)
+        return index
+
+
+StampReader = Callable[[str], Dict[str, Any]]
+BulkReader = Callable[[str, List[str]], Dict[str, dict]]
+
+
+class LibrarySearch:
+    """A SearchIndex kept in step with one storage backend.
+
+    ``stamps(collection)`` returns {key: stamp} for every document, where the
+    stamp changes whenever the document does (or is constant when the backend
+    has none, in which case invalidate via remove()). ``read_many(collection,
+    keys)`` returns {key: data}. ``path`` (optional) is where the index is kept
+    between runs; ``identity`` guards against loading another library's index.
+    """
+
+    def __init__(
+        self,
+        stamps: StampReader,
+        read_many: BulkReader,
+        path: Optional[str] = None,
+        identity: str = "",
+        sync_interval_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._stamps = stamps
+        self._read_many = read_many
+        self.path = path
+        self.identity = identity
+        self.sync_interval_s = sync_interval_s
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._index: Optional[SearchIndex] = None
+        self._synced_at: Optional[float] = None
+        self._reread = False
+        self._generation = 0  # bumped by invalidate(); a sync that overlaps one stays due
+        # docs update()/remove() changed while a sync was reading the backend
+        self._touched: Optional[Set[Tuple[str, str]]] = None
+
+    def _loaded(self) -> SearchIndex:
+        if self._index is None:
+            raw = None
+            if self.path:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        raw = json.load(f)
+                except (OSError, ValueError):
+                    raw = None
+            self._index = SearchIndex.from_json(raw, self.identity)
+        return self._index
+
+    def update(self, collection: str, key: str, data: Any, stamp: Any = None) -> None:
+        if collection not in COLLECTIONS:
+            return
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add((collection, key))
+            if self._index is not None:
+                self._index.add(collection, key, data, stamp)
+
+    def remove(self, collection: str, key: str) -> None:
+        with self._lock:
+            if self._touched is not None:
+                self._touched.add((collection, key))
+            if self._index is not None:
+                self._index.remove(collection, key)
+
+    def reread_all(self) -> None:
+        """Re-read every entry on the next sync; searches use the old ones until then."""
+        with self._lock:
+            self._reread = True
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Re-check stamps on the next sync regardless of the interval."""
+        with self._lock:
+            self._synced_at = None
+            self._generation += 1
+
+    def sync(self, force: bool = False) -> int:
+        """Bring the index up to date; returns how many documents were (re)indexed.
+
+        The backend is read without holding the index lock, so searches keep
+        answering from the current entries meanwhile. Run it off the GUI thread.
+        """
+        with self._sync_lock:
+            with self._lock:
+                index = self._loaded()
+                if (
+                    not force
+                    and self._synced_at is not None
+                    and self._clock() - self._synced_at < self.sync_interval_s
+                ):
+                    return 0
+                reread, self._reread = self._reread, False
+                generation = self._generation
+                touched = self._touched = set()
+            try:
+                changed = self._sync_collections(index, touched, reread)
+            except BaseException:
+                with self._lock:
+                    self._reread = self._reread or reread
+                raise
+            finally:
+                with self._lock:
+                    self._touched = None
+            with self._lock:
+                if self._generation == generation:
+                    self._synced_at = self._clock()
+            if index.dirty:
+                self.save()
+            return changed
+
+    def _sync_collections(
+        self, index: SearchIndex, touched: Set[Tuple[str, str]], reread: bool
+    ) -> int:
+        # Entries saved or removed while the backend was being read are newer
+        # than what was read, so they are left alone.
+        changed = 0
+        for collection in COLLECTIONS:
+            stamps = self._stamps(collection)
+            with self._lock:
+                for key in index.keys(collection):
+                    if key not in stamps and (collection, key) not in touched:
+                        index.remove(collection, key)
+                stale = [
+                    k for k, s in stamps.items()
+                    if reread or (collection, k) not in index or index.stamp(collection, k) != s
+                ]
+            if not stale:
+                continue
+            docs = self._read_many(collection, stale)
+            with self._lock:
+                for key in stale:
+                    if (collection, key) in touched:
+                        continue
+                    if key in docs:
+                        index.add(collection, key, docs[key], stamps[key])
+                    else:
+                        index.remove(collection, key)
+            changed += len(stale)
+        return changed
+
+    def save(self) -> None:
+        with self._lock:
+            if self._index is None or not self._index.dirty or not self.path:
+                return
+            try:
+                write_json_atomic(self.path, self._index.to_json(self.identity))
+            except OSError:
+                return
+            self._index.dirty = False
+
+    def search(
+        self,
+        query: str,
+        collections: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 50,
+    ) -> List[SearchHit]:
+        """Ranked matches from the in-memory index; never reads the backend."""
+        with self._lock:
+            return self._loaded().search(query, collections, limit)
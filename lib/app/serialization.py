@@ -0,0 +1,87 @@
+# lib/app/serialization.py
+"""
+Single-pass conversion between tracker objects and JSON-ready primitives.
+
+Saving used to run ``json.dumps(obj, cls=CustomEncoder)`` and then
+``json.loads`` just to get plain dicts back, before the storage layer
+serialized the result a third time. Loading ran ``json.dumps`` over data that
+was already parsed, only so ``json.loads(object_hook=...)`` could rebuild the
+creatures. For a big encounter those extra passes cost more than the write.
+
+to_primitive() walks an object once and returns exactly what that
+dumps/loads round trip produced: enums become their value, other objects
+their ``__dict__`` (their set slots, for creatures), tuples become lists,
+and dict keys become strings the way the json module writes them. from_primitive() turns already-parsed data back
+into creatures, applying the same rule as the old object_hook: any dict with
+a ``_type`` becomes an I_Creature, innermost first.
+"""
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any
+
+from app.creature import I_Creature, slot_values
+
+_SCALARS = (str, int, float, bool, type(None))
+_SCALAR_TYPES = frozenset(_SCALARS)
+
+
+def _encode_key(key: Any) -> str:
+    # Mirrors json.dumps: True -> "true", None -> "null", 1 -> "1", 1.5 -> "1.5".
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    if isinstance(key, Enum):
+        return _encode_key(key.value)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def to_primitive(obj: Any) -> Any:
+    """``obj`` as dicts/lists/scalars, as CustomEncoder would have written it."""
+    # Exact-type checks first: they cover nearly every value in a save.
+    t = type(obj)
+    if t in _SCALAR_TYPES:
+        return obj
+    if t is dict:
+        return {
+            k if type(k) is str else _encode_key(k):
+                v if type(v) in _SCALAR_TYPES else to_primitive(v)
+            for k, v in obj.items()
+        }
+    if t is list:
+        return [v if type(v) in _SCALAR_TYPES else to_primitive(v) for v in obj]
+    if isinstance(obj, _SCALARS):
+        return obj
+    if isinstance(obj, dict):
+        return {_encode_key(k): to_primitive(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_primitive(v) for v in obj]
+    if isinstance(obj, Enum):
+        return to_primitive(obj.value)
+    if hasattr(obj, "__dict__"):
+        return to_primitive(obj.__dict__)
+    if hasattr(obj, "__slots__"):
+        return to_primitive(slot_values(obj))
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def from_primitive(data: Any) -> Any:
+    """Rebuild creatures in parsed JSON; returns new containers, never mutates ``data``."""
+    t = type(data)
+    if t is dict:
+        out = {k: v if type(v) in _SCALAR_TYPES else from_primitive(v) for k, v in data.items()}
+        if "_type" in out:
+            return I_Creature.from_dict(out)
+        return out
+    if t is list:
+        return [v if type(v) in _SCALAR_TYPES else from_primitive(v) for v in data]
+    return data
@@ -0,0 +1,146 @@
+# lib/app/session_recorder.py
+"""
+Record Foundry bridge traffic to a gzip-compressed JSONL session file.
+
+Set BRIDGE_RECORD_PATH to a file (``*.jsonl.gz``) or a directory and
+BridgeClient writes every snapshot it receives and every command it posts,
+each stamped with seconds since the session started. Recordings of real
+sessions feed scripts/replay_bridge_session.py, which pushes them back through
+the snapshot-apply path to measure it.
+
+Line format (one JSON object per line):
+
+    {"kind": "session", "version": 1, "started": "<iso time>"}
+    {"kind": "snapshot", "t": 1.234, "source": "stream", "data": {...}}
+    {"kind": "command", "t": 2.5, "data": {...}, "status": 200, "ok": true}
+
+Recording must never break the bridge: a write error is logged once and the
+recorder switches itself off.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from app.event_log import event_log
+
+SESSION_FORMAT_VERSION = 1
+
+
+def _default_session_path(directory: str) -> str:
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"bridge-session-{stamp}.jsonl.gz")
+
+
+class SessionRecorder:
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.monotonic,
+        flush_interval_s: float = 1.0,
+    ):
+        self.path = path
+        self._clock = clock
+        self._flush_interval_s = flush_interval_s
+        self._lock = threading.Lock()
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._fh: Optional[gzip.GzipFile] = gzip.open(path, "wb")
+        self._started = clock()
+        self._last_flush = self._started
+        self._write({
+            "kind": "session",
+            "version": SESSION_FORMAT_VERSION,
+            "started": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionRecorder"]:
+        path = os.getenv("BRIDGE_RECORD_PATH", "").strip()
+        if not path:
+            return None
+        path = os.path.expanduser(path)
+        if os.path.isdir(path) or path.endswith(os.sep):
+            path = _default_session_path(path)
+        try:
+            recorder = cls(path)
+        except OSError as exc:
+            event_log.warning(
+                "bridge", "Could not open session recording {path!r}: {exc}", path=path, exc=exc
+            )
+            return None
+        event_log.info("bridge", "Recording bridge session to {path}", path=path)
+        return recorder
+
+    @property
+    def active(self) -> bool:
+        return self._fh is not None
+
+    def record_snapshot(self, snapshot: Dict[str, Any], source: str) -> None:
+        self._write({"kind": "snapshot", "source": source, "data": snapshot}, stamp=True)
+
+    def record_command(
+        self, command: Dict[str, Any], status: Optional[int], ok: bool
+    ) -> None:
+        self._write(
+            {"kind": "command", "data": command, "status": status, "ok": ok}, stamp=True
+        )
+
+    def _write(self, record: Dict[str, Any], stamp: bool = False) -> None:
+        if self._fh is None:
+            return
+        try:
+            with self._lock:
+                if self._fh is None:
+                    return
+                now = self._clock()
+                if stamp:
+                    record["t"] = round(now - self._started, 4)
+                line = json.dumps(record, separators=(",", ":"), default=str)
+                self._fh.write(line.encode("utf-8") + b"\n")
+                # Sync-flush periodically so a crash loses at most a second of
+                # the session instead of the whole compressor buffer.
+                if now - self._last_flush >= self._flush_interval_s:
+                    self._fh.flush(zlib.Z_SYNC_FLUSH)
+                    self._last_flush = now
+        except (OSError, TypeError, ValueError) as exc:
+            event_log.warning("bridge", "Session recording stopped: {exc}", exc=exc)
+            self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
+
+def read_session(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a session file, tolerating a truncated tail.
+
+    A session from a crashed or killed app ends mid-stream; everything up to
+    the last complete line is still returned.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        try:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    return
+                if isinstance(record, dict):
+                    yield record
+        except (EOFError, zlib.error):
+            return
@@ -0,0 +1,139 @@
+# lib/app/snapshot_diff.py
+"""
+Diffing for Foundry bridge snapshots.
+
+Foundry pushes the whole combat every time anything in it changes, but most
+snapshots only move one or two combatants (a hit, a condition, the turn
+pointer). diff_snapshots() compares a snapshot against the previously applied
+one, keyed by combatantId, so the tracker only touches what actually changed.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional
+
+# Top-level combatant fields the tracker reads. Anything else Foundry sends
+# (images, flags, ...) is left out so cosmetic churn doesn't count as a change.
+SYNCED_FIELDS: tuple = (
+    "name",
+    "initiative",
+    "hp",
+    "effects",
+    "ac",
+    "armorClass",
+    "attributes",
+    "actorName",
+    "actorType",
+    "actorHasPlayerOwner",
+    "tokenId",
+    "actorId",
+    "excludeFromSync",
+)
+
+ALL_FIELDS: FrozenSet[str] = frozenset(SYNCED_FIELDS)
+
+
+@dataclass
+class CombatantChange:
+    """One added or modified combatant and the fields that differ."""
+    combatant_id: str
+    combatant: Dict[str, Any]
+    fields: FrozenSet[str]
+
+
+@dataclass
+class SnapshotDiff:
+    added: List[CombatantChange] = field(default_factory=list)
+    changed: List[CombatantChange] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # Combatants without a combatantId can't be matched across snapshots, so
+    # they are always treated as changed.
+    unkeyed: List[Dict[str, Any]] = field(default_factory=list)
+    combat_changed: bool = False
+
+    @property
+    def is_empty(self) -> bool:
+        return not (
+            self.added or self.changed or self.removed or self.unkeyed or self.combat_changed
+        )
+
+    @property
+    def membership_changed(self) -> bool:
+        """True when combatants came or went, or one was renamed."""
+        if self.added or self.removed or self.unkeyed:
+            return True
+        return any("name" in change.fields for change in self.changed)
+
+    def changes_by_id(self) -> Dict[str, CombatantChange]:
+        """Added and changed combatants, keyed by combatantId."""
+        out = {change.combatant_id: change for change in self.added}
+        out.update((change.combatant_id, change) for change in self.changed)
+        return out
+
+
+def combatant_key(combatant: Any) -> Optional[str]:
+    """The combatantId as a string, or None if the combatant has none."""
+    if not isinstance(combatant, dict):
+        return None
+    cid = combatant.get("combatantId")
+    if cid is None or (isinstance(cid, str) and not cid.strip()):
+        return None
+    return str(cid)
+
+
+def changed_fields(previous: Dict[str, Any], current: Dict[str, Any]) -> FrozenSet[str]:
+    """Synced fields whose value differs between two versions of a combatant."""
+    return frozenset(
+        name for name in SYNCED_FIELDS if previous.get(name) != current.get(name)
+    )
+
+
+def _index_by_id(combatants: Any) -> tuple:
+    keyed: Dict[str, Dict[str, Any]] = {}
+    unkeyed: List[Dict[str, Any]] = []
+    if not isinstance(combatants, list):
+        return keyed, unkeyed
+    for combatant in combatants:
+        if not isinstance(combatant, dict):
+            continue
+        cid = combatant_key(combatant)
+        if cid is None:
+            unkeyed.append(combatant)
+        else:
+            keyed[cid] = combatant
+    return keyed, unkeyed
+
+
+def diff_snapshots(
+    previous: Optional[Dict[str, Any]], current: Dict[str, Any]
+) -> SnapshotDiff:
+    """Minimal change set that turns ``previous`` into ``current``.
+
+    With no previous snapshot every combatant counts as added and the combat
+    block as changed, so the first snapshot is applied in full.
+    """
+    current_by_id, unkeyed = _index_by_id(current.get("combatants"))
+    diff = SnapshotDiff(unkeyed=unkeyed)
+
+    if not isinstance(previous, dict):
+        diff.added = [
+            CombatantChange(cid, combatant, ALL_FIELDS)
+            for cid, combatant in current_by_id.items()
+        ]
+        diff.combat_changed = True
+        return diff
+
+    previous_by_id, _ = _index_by_id(previous.get("combatants"))
+    for cid, combatant in current_by_id.items():
+        before = previous_by_id.get(cid)
+        if before is None:
+            diff.added.append(CombatantChange(cid, combatant, ALL_FIELDS))
+            continue
+        if before is combatant:
+            continue
+        fields = changed_fields(before, combatant)
+        if fields:
+            diff.changed.append(CombatantChange(cid, combatant, fields))
+    diff.removed = [cid for cid in previous_by_id if cid not in current_by_id]
+    diff.combat_changed = previous.get("combat") != current.get("combat")
+    return diff
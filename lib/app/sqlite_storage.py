@@ -0,0 +1,444 @@
+# lib/app/sqlite_storage.py
+"""
+Single-file SQLite storage backend.
+
+Same public interface as LocalStorage/StorageAPI, but every encounter,
+statblock, spell and item lives in one database (``library.sqlite`` in the
+data dir) instead of one JSON file each. Listing a collection is an index
+scan rather than os.listdir + sort, and bulk reads are a handful of SELECTs
+instead of thousands of small-file opens.
+
+Schema:
+    documents(collection, key, name, body, summary, updated_at)
+        primary key (collection, key); name is indexed case-insensitively
+    tags(collection, key, tag)
+        one row per entry in a document's "tags" list, indexed by tag
+    meta(name, value)
+    changes(seq, collection, key, op)
+        append-only write log behind changes_since(); trimmed to the newest
+        CHANGE_LOG_SIZE rows
+
+Writes are transactional. Wrap a run of saves in ``with storage.batch():`` to
+commit them together (and much faster than one commit each).
+
+migrate_directory() copies an existing LocalStorage directory in. It is run
+once automatically by ``SQLiteStorage.for_data_dir``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.bulk_fetch import unique_keys
+from app.library_manifest import SUMMARY_FIELDS, summarize
+from app.search_index import LibrarySearch, SearchHit
+from app.serialization import to_primitive
+from app.storage_changes import Change, ChangeBatch
+
+DB_FILENAME = "library.sqlite"
+CHANGE_LOG_SIZE = 10000
+SEARCH_INDEX_SUFFIX = ".search.json"
+
+# Keys per SELECT ... IN (...) so we stay under SQLite's variable limit.
+_IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    name       TEXT COLLATE NOCASE,
+    body       TEXT NOT NULL,
+    summary    TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (collection, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS documents_name ON documents (collection, name);
+CREATE TABLE IF NOT EXISTS tags (
+    collection TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    tag        TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (collection, key, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_tag ON tags (collection, tag);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    op         TEXT NOT NULL
+);
+"""
+
+
+class SQLiteStorage:
+    """SQLite backend with the same interface as LocalStorage."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._search = LibrarySearch(
+            self._stamps,
+            self._get_many,
+            path=None if self.path == ":memory:" else self.path + SEARCH_INDEX_SUFFIX,
+            identity=os.path.abspath(self.path),
+        )
+
+    @classmethod
+    def for_data_dir(cls, data_dir: str) -> "SQLiteStorage":
+        """Open ``<data_dir>/library.sqlite``, importing the JSON files there once."""
+        data_dir = os.path.expanduser(data_dir)
+        storage = cls(os.path.join(data_dir, DB_FILENAME))
+        if storage.get_meta("migrated_from") is None:
+            migrate_directory(data_dir, storage)
+        return storage
+
+    def close(self) -> None:
+        with self._lock:
+            self._search.save()
+            self._db.close()
+
+    # ---- transactions ----
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteStorage"]:
+        """Run the enclosed writes in one transaction.
+
+        Nested batches join the outermost one. Other threads wait until it
+        commits.
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                self._db.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._db.execute("COMMIT")
+
+    # ---- internal helpers ----
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE name=?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value)
+            )
+
+    def _keys(self, collection: str) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM documents WHERE collection=? ORDER BY key", (collection,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def _get(self, collection: str, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM documents WHERE collection=? AND key=?", (collection, key)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def _put(self, collection: str, key: str, data: Any) -> None:
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        name = data.get("name") if isinstance(data, dict) else None
+        summary = None
+        if collection in SUMMARY_FIELDS:
+            summary = json.dumps(summarize(collection, data), ensure_ascii=False)
+        tags = data.get("tags") if isinstance(data, dict) else None
+        tag_rows = []
+        if isinstance(tags, (list, tuple)):
+            tag_rows = [(collection, key, t) for t in dict.fromkeys(tags) if isinstance(t, str) and t]
+        now = time.time()
+        with self.batch():
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents"
+                " (collection, key, name, body, summary, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (collection, key, name if isinstance(name, str) else None, body, summary, now),
+            )
+            self._db.execute("DELETE FROM tags WHERE collection=? AND key=?", (collection, key))
+            if tag_rows:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO tags (collection, key, tag) VALUES (?, ?, ?)", tag_rows
+                )
+            self._log_change(collection, key, "put")
+        self._search.update(collection, key, data, now)
+
+    def _delete(self, collection: str, key: str) -> None:
+        with self.batch():
+            self._db.execute(
+                "DELETE FROM documents WHERE collection=? AND key=?", (collection, key)
+            )
+            self._db.execute("DELETE FROM tags WHERE collection=? AND key=?", (collection, key))
+            self._log_change(collection, key, "delete")
+        self._search.remove(collection, key)
+
+    def _log_change(self, collection: str, key: str, op: str) -> None:
+        self._db.execute(
+            "INSERT INTO changes (collection, key, op) VALUES (?, ?, ?)", (collection, key, op)
+        )
+
+    def _get_many(self, collection: str, keys: Optional[Iterable[str]]) -> Dict[str, dict]:
+        with self._lock:
+            if keys is None:
+                rows = self._db.execute(
+                    "SELECT key, body FROM documents WHERE collection=? ORDER BY key",
+                    (collection,),
+                ).fetchall()
+                ordered = None
+            else:
+                ordered = unique_keys(keys)
+                rows = []
+                for start in range(0, len(ordered), _IN_CHUNK):
+                    chunk = ordered[start:start + _IN_CHUNK]
+                    rows.extend(self._db.execute(
+                        "SELECT key, body FROM documents WHERE collection=?"
+                        f" AND key IN ({','.join('?' * len(chunk))})",
+                        (collection, *chunk),
+                    ).fetchall())
+        found: Dict[str, dict] = {}
+        for key, body in rows:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                continue
+            if data:
+                found[key] = data
+        if ordered is None:
+            return found
+        return {k: found[k] for k in ordered if k in found}
+
+    def _stamps(self, collection: str) -> Dict[str, float]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, updated_at FROM documents WHERE collection=?", (collection,)
+            ).fetchall()
+        return dict(rows)
+
+    def _manifest(self, collection: str) -> Dict[str, dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, summary FROM documents WHERE collection=? ORDER BY key",
+                (collection,),
+            ).fetchall()
+        return {key: json.loads(summary) if summary else {} for key, summary in rows}
+
+    # ---- Encounters ----
+
+    def list(self) -> List[str]:
+        return self._keys("encounters")
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._get("encounters", key)
+
+    def put(self, key: str, data: Any) -> None:
+        self._put("encounters", key, data)
+
+    def delete(self, key: str) -> None:
+        self._delete("encounters", key)
+
+    def put_json(self, key: str, obj: dict) -> None:
+        self._put("encounters", key, to_primitive(obj))
+
+    def get_json(self, key: str) -> Optional[dict]:
+        return self.get(key)
+
+    # ---- Statblocks ----
+
+    def list_statblock_keys(self) -> List[str]:
+        return self._keys("statblocks")
+
+    def get_statblock(self, key: str) -> Optional[dict]:
+        return self._get("statblocks", key)
+
+    def save_statblock(self, key: str, data: dict) -> bool:
+        self._put("statblocks", key, data)
+        return True
+
+    def delete_statblock(self, key: str) -> bool:
+        self._delete("statblocks", key)
+        return True
+
+    # ---- Spells ----
+
+    def list_spell_keys(self) -> List[str]:
+        return self._keys("spells")
+
+    def get_spell(self, key: str) -> Optional[dict]:
+        return self._get("spells", key)
+
+    def save_spell(self, key: str, data: dict) -> bool:
+        self._put("spells", key, data)
+        return True
+
+    def delete_spell(self, key: str) -> bool:
+        self._delete("spells", key)
+        return True
+
+    # ---- Items ----
+
+    def list_item_keys(self) -> List[str]:
+        return self._keys("items")
+
+    def get_item(self, key: str) -> Optional[dict]:
+        return self._get("items", key)
+
+    def save_item(self, key: str, data: dict) -> bool:
+        self._put("items", key, data)
+        return True
+
+    def delete_item(self, key: str) -> bool:
+        self._delete("items", key)
+        return True
+
+    # ---- Bulk reads ----
+
+    def get_items_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self._get_many("items", keys)
+
+    def get_spells_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self._get_many("spells", keys)
+
+    def get_statblocks_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self._get_many("statblocks", keys)
+
+    # ---- Summary manifests ----
+
+    def get_item_manifest(self) -> Dict[str, dict]:
+        return self._manifest("items")
+
+    def get_spell_manifest(self) -> Dict[str, dict]:
+        return self._manifest("spells")
+
+    def get_statblock_manifest(self) -> Dict[str, dict]:
+        return self._manifest("statblocks")
+
+    # ---- Indexed lookups (SQLite only) ----
+
+    def keys_named(self, collection: str, prefix: str) -> List[str]:
+        """Keys in ``collection`` whose name starts with ``prefix`` (case-insensitive)."""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM documents WHERE collection=? AND name LIKE ? ESCAPE '\\'"
+                " ORDER BY name",
+                (collection, pattern),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def keys_with_tag(self, collection: str, tag: str) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key FROM tags WHERE collection=? AND tag=? ORDER BY key",
+                (collection, tag),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    # ---- Search ----
+
+    def search(
+        self, query: str, collections: Optional[Iterable[str]] = None, limit: Optional[int] = 50
+    ) -> List[SearchHit]:
+        """Ranked library matches for ``query`` (see search_index for the syntax)."""
+        return self._search.search(query, collections, limit)
+
+    def sync_search_index(self) -> int:
+        """Build or refresh the search index now; returns entries (re)indexed."""
+        return self._search.sync(force=True)
+
+    # ---- Change feed ----
+
+    def changes_since(self, cursor: Optional[str] = None) -> ChangeBatch:
+        """Writes logged since ``cursor``, from this or any other connection."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES ('store_id', ?)",
+                (uuid.uuid4().hex[:12],),
+            )
+            store_id = self.get_meta("store_id")
+            self._db.execute(
+                "DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?",
+                (CHANGE_LOG_SIZE,),
+            )
+            first, last = self._db.execute("SELECT MIN(seq), MAX(seq) FROM changes").fetchone()
+            if last is None:
+                row = self._db.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name='changes'"
+                ).fetchone()
+                last = row[0] if row else 0
+            current = f"{store_id}:{last}"
+            if cursor is None:
+                return ChangeBatch(current)
+            prefix, _, seq = cursor.rpartition(":")
+            try:
+                since = int(seq)
+            except ValueError:
+                since = -1
+            if prefix != store_id or since < 0 or since > last or (
+                first is not None and since < first - 1
+            ):
+                return ChangeBatch(current, reset=True)
+            rows = self._db.execute(
+                "SELECT collection, key, op FROM changes WHERE seq > ? ORDER BY seq", (since,)
+            ).fetchall()
+        return ChangeBatch(current, [Change(*row) for row in rows])
+
+
+def migrate_directory(data_dir: str, storage: SQLiteStorage) -> Dict[str, int]:
+    """Copy a LocalStorage directory layout into ``storage``; return counts per collection.
+
+    The JSON files are left in place. Existing keys in ``storage`` are overwritten.
+    """
+    from app.local_storage import LocalStorage
+
+    source = LocalStorage(data_dir)
+    counts: Dict[str, int] = {}
+    with storage.batch():
+        encounters = 0
+        for key in source.list():
+            data = source.get(key)
+            if data is not None:
+                storage.put(key, data)
+                encounters += 1
+        counts["encounters"] = encounters
+        for collection, reader, writer in (
+            ("statblocks", source.get_statblocks_bulk, storage.save_statblock),
+            ("spells", source.get_spells_bulk, storage.save_spell),
+            ("items", source.get_items_bulk, storage.save_item),
+        ):
+            loaded = reader()
+            for key, data in loaded.items():
+                writer(key, data)
+            counts[collection] = len(loaded)
+        storage.set_meta("migrated_from", os.path.abspath(os.path.expanduser(data_dir)))
+    return counts
@@ -0,0 +1,109 @@
+# lib/app/statblock_prefetch.py
+"""
+Background statblock fetching for bridge-sourced monsters.
+
+A Foundry snapshot can bring a dozen new monsters at once, and looking up each
+one's statblock is a blocking storage GET. Doing that on the GUI thread froze
+the tracker until the storage server answered every one. StatblockPrefetcher
+runs the lookups on a small worker pool and hands results back through a
+dispatch callable (which the app points at the GUI thread).
+
+Concurrent requests for the same key share one fetch, and misses are
+remembered for a while so monsters with no library statblock don't trigger a
+lookup on every snapshot.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.event_log import event_log
+
+Callback = Callable[[Dict[str, Any]], None]
+
+
+class StatblockPrefetcher:
+    def __init__(
+        self,
+        fetch: Callable[[str], Optional[Dict[str, Any]]],
+        dispatch: Callable[[Callable[[], None]], None],
+        max_workers: int = 4,
+        miss_ttl_s: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self._dispatch = dispatch
+        self._max_workers = max_workers
+        self.miss_ttl_s = miss_ttl_s
+        self._clock = clock
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, List[Callback]] = {}
+        self._misses: Dict[str, float] = {}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="statblock"
+            )
+        return self._executor
+
+    def is_known_miss(self, key: str) -> bool:
+        with self._lock:
+            return self._is_known_miss(key)
+
+    def _is_known_miss(self, key: str) -> bool:
+        expires = self._misses.get(key)
+        if expires is None:
+            return False
+        if self._clock() >= expires:
+            del self._misses[key]
+            return False
+        return True
+
+    def request(self, key: str, callback: Callback) -> bool:
+        """Fetch ``key`` in the background and dispatch ``callback(data)`` on a hit.
+
+        Returns False without scheduling anything if the key is empty or a
+        recent miss. Misses never invoke the callback.
+        """
+        if not key:
+            return False
+        with self._lock:
+            if self._is_known_miss(key):
+                return False
+            waiters = self._inflight.get(key)
+            if waiters is not None:
+                waiters.append(callback)
+                return True
+            self._inflight[key] = [callback]
+        self._pool().submit(self._run, key)
+        return True
+
+    def _run(self, key: str) -> None:
+        try:
+            data = self._fetch(key)
+        except Exception as exc:
+            event_log.warning("statblock", "Prefetch failed for {key!r}: {exc}", key=key, exc=exc)
+            data = None
+        with self._lock:
+            waiters = self._inflight.pop(key, [])
+            if not data:
+                self._misses[key] = self._clock() + self.miss_ttl_s
+        if not data:
+            return
+        for callback in waiters:
+            self._dispatch(functools.partial(callback, data))
+
+    def forget_misses(self) -> None:
+        """Drop remembered misses, e.g. after a statblock import or a storage switch."""
+        with self._lock:
+            self._misses.clear()
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
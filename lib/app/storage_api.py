@@ -1,13 +1,27 @@
 # app/storage_api.py
 from __future__ import annotations
 import json
-from typing import Optional, Any, Dict, Iterable, List
+from itertools import chain
+from typing import Optional, Any, Dict, Iterable, Iterator, List
 import os
+from urllib.parse import parse_qsl, urlencode, urljoin
 
 import requests
 from requests import Response
 
-from app.creature import CustomEncoder
+from app.bulk_fetch import DEFAULT_MAX_WORKERS, fetch_many, unique_keys
+from app.serialization import to_primitive
+from app.library_manifest import summarize
+from app.resilience import StorageResilience, Timeout
+from app.search_index import LibrarySearch, SearchHit
+from app.storage_cache import StorageCache
+from app.storage_changes import ChangeBatch, parse_change_batch
+
+# Keys per POST {collection}/bulk request.
+BULK_CHUNK_SIZE = 200
+# (connect, read) timeout for each page of a key listing.
+LIST_PAGE_TIMEOUT = (5, 30)
+LIST_COLLECTIONS = ("encounters", "statblocks", "spells", "items")
 
 
 class StorageAPI:
@@ -15,23 +29,88 @@ class StorageAPI:
     Minimal, robust client for your Storage service.
 
     Expected endpoints (tolerant to minor variants):
-      - GET  {base}/v1/encounters/items      -> list of keys or {"items":[...]} or {"data":[...]}
+      - GET  {base}/v1/encounters/items      -> list of keys or {"items":[...]} or {"data":[...]},
+                                                optionally one page at a time (next
+                                                URL/cursor, offset or a Link header;
+                                                see _next_page_url)
       - GET  {base}/v1/encounters/{key}      -> JSON (raw or {"data": ...})
       - PUT  {base}/v1/encounters/{key}      -> accepts JSON (raw or {"data": ...})
       - DEL  {base}/v1/encounters/{key}
+
+    Optional, for the *_bulk readers:
+      - POST {base}/v1/{collection}/bulk {"keys": [...]}
+                                             -> {"items": {key: data}} (or a list of
+                                                {"key": ..., "data": ...}), optionally
+                                                wrapped in {"data": ...}
+    Servers without it answer 404/405/501 and the client falls back to
+    concurrent single GETs.
+      - POST {base}/v1/{collection}/bulk_put {"items": {key: data}}
+                                             -> {"errors": {key: message}} for
+                                                rejected keys (and/or "saved":
+                                                [...]); the save_*_bulk writers
+                                                return None without it
+      - GET  {base}/v1/{collection}/manifest -> {key: summary} (same shapes as bulk);
+                                                without it the manifest is built
+                                                from the bulk reader
+      - GET  {base}/v1/changes?since=<cursor>
+                                             -> {"cursor": "...", "reset": false,
+                                                 "changes": [{"collection": "spells",
+                                                 "key": "fireball.json",
+                                                 "op": "put"|"delete"}, ...]}
+                                                Without ``since`` only the current
+                                                cursor; reset=true when the cursor
+                                                has expired. Without the endpoint
+                                                the change feed is simply off.
+
+    With a StorageCache, statblock/spell/item reads are served from disk while
+    fresh and revalidated with the server's ETag/Last-Modified after that;
+    this client's own saves and deletes invalidate the cached copy.
+
+    Every request goes through ``resilience`` (see app.resilience): document
+    reads and writes use an adaptive timeout, GETs are retried with jitter,
+    and while the server is unhealthy requests fail fast with
+    CircuitOpenError. A cached document is served stale rather than failing.
+
+    search() runs against a local index built from the bulk readers and kept
+    at ``search_index_path``. Entries are dropped by this client's writes and by
+    the change feed, and are re-read on the next search.
     """
 
-    def __init__(self, base_url: str, session: Optional[requests.Session] = None):
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        cache: Optional[StorageCache] = None,
+        search_index_path: Optional[str] = None,
+        resilience: Optional[StorageResilience] = None,
+    ):
         if not base_url:
             raise ValueError("StorageAPI base_url is required")
         self.base_url = base_url.rstrip("/")
         self.session = session or requests.Session()
+        self.cache = cache
+        self.resilience = resilience or StorageResilience()
         self.api_key = os.getenv("STORAGE_API_KEY", "").strip()
 
         # ✅ attach API key for every request made by this Session
         if self.api_key:
             self.session.headers.update({"X-Api-Key": self.api_key})
 
+        self.bulk_max_workers = DEFAULT_MAX_WORKERS
+        # collection URL -> False once the server has said it has no bulk endpoint
+        self._bulk_supported: Dict[str, bool] = {}
+        # ... and likewise for {collection}/manifest and {collection}/bulk_put
+        self._manifest_supported: Dict[str, bool] = {}
+        self._bulk_write_supported: Dict[str, bool] = {}
+        self._changes_supported = True
+        self._search = LibrarySearch(
+            self._search_stamps,
+            self._search_read_many,
+            path=search_index_path,
+            identity=self.base_url,
+            sync_interval_s=60.0,
+        )
+
     # ----- URL helpers -----
 
     def _encounters_url(self) -> str:
@@ -57,6 +136,24 @@ class StorageAPI:
             return {"X-Api-Key": self.api_key}
         return {}
 
+    # ----- Requests -----
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Timeout] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """Send through the resilience layer; ``timeout`` None means adaptive."""
+        send = getattr(self.session, method.lower())
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        return self.resilience.call(
+            lambda t: send(url, timeout=t, **kwargs), idempotent=idempotent, timeout=timeout
+        )
+
     # ----- Response helpers -----
 
     @staticmethod
@@ -77,86 +174,183 @@ class StorageAPI:
         """
         return {"data": data}  # change to {"data": data} if your server expects wrapper
 
-    def _list_from_candidates(self, candidates: Iterable[str]) -> List[str]:
-        import requests
-        from requests import HTTPError
+    @staticmethod
+    def _keys_from_page(payload: Any) -> Optional[List[str]]:
+        """Keys in one listing response, or None if the shape isn't recognized."""
+        def _names(objs: list) -> List[str]:
+            out: List[str] = []
+            for obj in objs:
+                for name_key in ("key", "name", "filename", "path", "id"):
+                    if name_key in obj and isinstance(obj[name_key], str):
+                        out.append(obj[name_key])
+                        break
+            return out
+
+        # 1) Direct list of strings
+        if isinstance(payload, list) and all(isinstance(x, str) for x in payload):
+            return [str(x) for x in payload]
+
+        # 2) Dict with items/keys
+        if isinstance(payload, dict):
+            # common keys
+            for k in ("items", "keys", "data", "results", "list"):
+                if k in payload:
+                    inner = payload[k]
+                    # inner might be list[str] or list[dict]
+                    if isinstance(inner, list):
+                        # list of strings (an empty last page included)
+                        if all(isinstance(x, str) for x in inner):
+                            return [str(x) for x in inner]
+                        # list of dicts -> pull common name fields
+                        if all(isinstance(x, dict) for x in inner):
+                            out = _names(inner)
+                            if out:
+                                return out
+
+        # 3) List of dicts at top level
+        if isinstance(payload, list) and all(isinstance(x, dict) for x in payload):
+            out = _names(payload)
+            if out:
+                return out
+        return None
 
-        last_err = None
+    @staticmethod
+    def _next_page_url(url: str, r: Response, body: Any, count: int) -> Optional[str]:
+        """
+        Where the rest of a listing lives, or None on the last page. Understands
+        a ``Link: <...>; rel="next"`` header and, in the body (or its "data"):
+          - {"next": "<url>"}                      (absolute or relative)
+          - {"next": "<token>"} / {"next_cursor": "<token>"} / {"cursor": "<token>"}
+                                                   -> same URL with ?cursor=<token>
+          - {"offset": 0, "limit": 500, "total": 1200}
+                                                   -> same URL with ?offset=500&limit=500
+        {"has_more": false} ends the listing whatever else the page says.
+        """
+        link = (getattr(r, "links", None) or {}).get("next", {}).get("url")
+        if link:
+            return urljoin(url, link)
+        meta: Dict[str, Any] = {}
+        for part in (body, StorageAPI._unwrap_data(body)):
+            if isinstance(part, dict):
+                meta.update({k: v for k, v in part.items() if v is not None})
+        if meta.get("has_more", meta.get("hasMore")) is False:
+            return None
+        base, _, query = url.partition("?")
+        params = dict(parse_qsl(query))
+
+        nxt = meta.get("next") or meta.get("next_url") or meta.get("nextUrl")
+        if isinstance(nxt, str) and nxt:
+            if nxt.startswith(("http://", "https://", "/", "?")):
+                return urljoin(url, nxt)
+            params["cursor"] = nxt
+            return f"{base}?{urlencode(params)}"
+        for k in ("next_cursor", "nextCursor", "next_page_token", "nextPageToken", "cursor"):
+            token = meta.get(k)
+            if isinstance(token, (str, int)) and not isinstance(token, bool) and token != "":
+                if str(token) == params.get("cursor"):
+                    return None  # the server echoed our own cursor back
+                params["cursor"] = str(token)
+                return f"{base}?{urlencode(params)}"
+
+        offset = meta.get("offset")
+        if isinstance(offset, int) and not isinstance(offset, bool) and count:
+            limit, total = meta.get("limit"), meta.get("total")
+            nxt_offset = offset + count
+            if isinstance(total, int) and nxt_offset >= total:
+                return None
+            if not isinstance(total, int) and isinstance(limit, int) and count < limit:
+                return None
+            params["offset"] = str(nxt_offset)
+            if isinstance(limit, int):
+                params["limit"] = str(limit)
+            return f"{base}?{urlencode(params)}"
+        return None
+
+    def _iter_list_pages(self, candidates: Iterable[str]) -> Iterator[List[str]]:
+        """
+        Yield the keys of a collection one server page at a time. The first
+        candidate URL that answers with a recognizable listing is followed
+        through its pages; servers that return everything at once give one page.
+        With offset paging, a record added in front of the current offset between
+        requests pushes keys from the end of one page onto the next, so keys
+        already in the previous page are skipped. Only that one page is kept, so
+        memory stays bounded by the page size.
+        """
+        last_err: Optional[Exception] = None
         for url in candidates:
             try:
-                r = self.session.get(url, timeout=8)
+                r = self._request("GET", url, timeout=LIST_PAGE_TIMEOUT)
                 r.raise_for_status()
-                payload = r.json()
-                payload = self._unwrap_data(payload)
-
-                # ---- normalize shapes ----
-                # 1) Direct list of strings
-                if isinstance(payload, list) and all(isinstance(x, str) for x in payload):
-                    return [str(x) for x in payload]
-
-                # 2) Dict with items/keys
-                if isinstance(payload, dict):
-                    # common keys
-                    for k in ("items", "keys", "data", "results", "list"):
-                        if k in payload:
-                            inner = payload[k]
-                            # inner might be list[str] or list[dict]
-                            if isinstance(inner, list):
-                                # list of strings
-                                if all(isinstance(x, str) for x in inner):
-                                    return [str(x) for x in inner]
-                                # list of dicts -> pull common name fields
-                                if all(isinstance(x, dict) for x in inner):
-                                    out: List[str] = []
-                                    for obj in inner:
-                                        for name_key in ("key", "name", "filename", "path", "id"):
-                                            if name_key in obj and isinstance(obj[name_key], str):
-                                                out.append(obj[name_key])
-                                                break
-                                    if out:
-                                        return out
-
-                # 3) List of dicts at top level
-                if isinstance(payload, list) and all(isinstance(x, dict) for x in payload):
-                    out: List[str] = []
-                    for obj in payload:
-                        for name_key in ("key", "name", "filename", "path", "id"):
-                            if name_key in obj and isinstance(obj[name_key], str):
-                                out.append(obj[name_key])
-                                break
-                    if out:
-                        return out
-
-                # If we reach here, shape wasn't recognized; fall through to next candidate
-                last_err = RuntimeError(f"Unrecognized list payload shape from {url}: {str(payload)[:200]}")
-
-            except HTTPError as e:
-                last_err = e
+                body = r.json()
+                keys = self._keys_from_page(self._unwrap_data(body))
+                if keys is None:
+                    # Shape wasn't recognized; fall through to next candidate
+                    raise RuntimeError(
+                        f"Unrecognized list payload shape from {url}: {str(body)[:200]}"
+                    )
             except Exception as e:
                 last_err = e
+                continue
+
+            previous: set = set()
+            visited = {url}
+            while True:
+                fresh = [k for k in keys if k not in previous]
+                previous = set(keys)
+                if fresh:
+                    yield fresh
+                url = self._next_page_url(url, r, body, len(keys))
+                if url is None or url in visited:
+                    return
+                visited.add(url)
+                try:
+                    r = self._request("GET", url, timeout=LIST_PAGE_TIMEOUT)
+                    r.raise_for_status()
+                    body = r.json()
+                except Exception as e:
+                    raise RuntimeError(f"StorageAPI listing failed at {url}: {e}") from e
+                keys = self._keys_from_page(self._unwrap_data(body))
+                if keys is None:
+                    raise RuntimeError(
+                        f"Unrecognized list payload shape from {url}: {str(body)[:200]}"
+                    )
 
         # None of the candidates worked
         raise RuntimeError(f"StorageAPI.list() failed: {last_err}")
 
+    def _list_candidates(self, collection: str) -> List[str]:
+        if collection not in LIST_COLLECTIONS:
+            raise ValueError(f"unknown collection: {collection!r}")
+        # Candidate endpoints your server might expose. These must stay scoped to
+        # the collection — /v1/items is the equipment collection, not encounters.
+        collection_url = f"{self.base_url}/v1/{collection}"
+        return [f"{collection_url}/items", collection_url]
+
+    def iter_key_pages(self, collection: str) -> Iterator[List[str]]:
+        """
+        Yield a collection's keys a page at a time as the server returns them,
+        so callers can show the first keys before the whole listing arrives.
+        ``collection`` is one of encounters, statblocks, spells, items.
+        """
+        return self._iter_list_pages(self._list_candidates(collection))
+
+    def iter_keys(self, collection: str) -> Iterator[str]:
+        """Yield a collection's keys one at a time (see iter_key_pages)."""
+        return chain.from_iterable(self.iter_key_pages(collection))
+
     def list(self) -> List[str]:
         """
         Return a list of item keys (e.g., ["Goblin_Caves.json", "players.json", ...]).
         Tries multiple endpoints and normalizes a variets of response shapes.
         """
-        # Candidate endpoints your server might expose. These must stay scoped to
-        # /v1/encounters — /v1/items is the equipment collection, not encounters.
-        candidates = [
-            self._encounters_items_url(),  # .../v1/encounters/items
-            self._encounters_url(),        # .../v1/encounters (often used for listing)
-        ]
-        return self._list_from_candidates(candidates)
+        return list(self.iter_keys("encounters"))
 
     def get(self, key: str) -> Optional[dict]:
         """
         GET the JSON object for a given key. Returns dict or None if 404.
         """
         try:
-            r: Response = self.session.get(self._item_url(key), timeout=8)
+            r: Response = self._request("GET", self._item_url(key))
             if r.status_code == 404:
                 return None
             r.raise_for_status()
@@ -181,7 +375,7 @@ class StorageAPI:
         """
         try:
             body = self._wrap_for_put(data)
-            r: Response = self.session.put(self._item_url(key), json=body, timeout=10)
+            r: Response = self._request("PUT", self._item_url(key), json=body)
             r.raise_for_status()
         except Exception as e:
             raise RuntimeError(f"StorageAPI.put({key}) failed: {e}") from e
@@ -191,19 +385,290 @@ class StorageAPI:
         DELETE a key.
         """
         try:
-            r: Response = self.session.delete(self._item_url(key), timeout=8)
+            r: Response = self._request("DELETE", self._item_url(key))
             if r.status_code not in (200, 204, 404):
                 r.raise_for_status()
         except Exception as e:
             raise RuntimeError(f"StorageAPI.delete({key}) failed: {e}") from e
 
+    # ----- Cached library reads -----
+
+    def _cached_get(self, collection: str, url: str, key: str) -> Any:
+        """GET a library document (unwrapped), through the cache if there is one.
+
+        Returns None on 404. Raises on other HTTP errors.
+        """
+        cache = self.cache
+        entry = cache.lookup(collection, key) if cache is not None else None
+        if entry is not None and cache.is_fresh(entry):
+            cache.count("hits")
+            return entry.body
+
+        headers = entry.validators() if entry is not None else {}
+        try:
+            r: Response = self._request("GET", url, headers=headers or None)
+        except requests.RequestException:
+            if entry is None:
+                raise
+            # Server down or failing fast: an old copy beats no statblock.
+            cache.count("stale")
+            return entry.body
+        if r.status_code == 304 and entry is not None:
+            cache.touch(collection, key)
+            cache.count("revalidated")
+            return entry.body
+        if r.status_code == 404:
+            if entry is not None:
+                cache.invalidate(collection, key)
+            return None
+        r.raise_for_status()
+        body = self._unwrap_data(r.json())
+        if cache is not None:
+            cache.count("misses")
+            if body:
+                cache.store(
+                    collection, key, body,
+                    etag=r.headers.get("ETag"),
+                    modified=r.headers.get("Last-Modified"),
+                )
+        return body
+
+    def _invalidate(self, collection: str, key: str) -> None:
+        self._search.remove(collection, key)
+        self._search.invalidate()
+        if self.cache is not None:
+            self.cache.invalidate(collection, key)
+            self.cache.invalidate("manifests", collection)
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    # ----- Bulk reads -----
+
+    def _parse_bulk_payload(self, payload: Any) -> Dict[str, Any]:
+        payload = self._unwrap_data(payload)
+        if isinstance(payload, dict) and "items" in payload:
+            payload = payload["items"]
+        out: Dict[str, Any] = {}
+        if isinstance(payload, dict):
+            for key, value in payload.items():
+                value = self._unwrap_data(value)
+                if isinstance(key, str) and value:
+                    out[key] = value
+        elif isinstance(payload, list):
+            for entry in payload:
+                if not isinstance(entry, dict) or not isinstance(entry.get("key"), str):
+                    continue
+                value = self._unwrap_data(entry.get("data", entry.get("value")))
+                if value:
+                    out[entry["key"]] = value
+        return out
+
+    def _post_bulk(self, collection_url: str, keys: List[str]) -> Optional[Dict[str, Any]]:
+        """Fetch keys through {collection}/bulk; None if the server has no such endpoint."""
+        out: Dict[str, Any] = {}
+        for start in range(0, len(keys), BULK_CHUNK_SIZE):
+            chunk = keys[start:start + BULK_CHUNK_SIZE]
+            # A bulk read changes nothing, so it may be retried like a GET.
+            r: Response = self._request(
+                "POST", f"{collection_url}/bulk", timeout=30, idempotent=True,
+                json={"keys": chunk},
+            )
+            if r.status_code in (404, 405, 501):
+                return None
+            r.raise_for_status()
+            out.update(self._parse_bulk_payload(r.json()))
+        return {k: out[k] for k in keys if k in out}
+
+    def _get_bulk(
+        self, collection: str, collection_url: str, keys: Iterable[str], fetch_one
+    ) -> Dict[str, Any]:
+        ordered = unique_keys(keys)
+        if not ordered:
+            return {}
+        found: Dict[str, Any] = {}
+        if self.cache is not None:
+            found = self.cache.fresh_many(collection, ordered)
+        wanted = [k for k in ordered if k not in found]
+        if wanted:
+            found.update(self._fetch_bulk(collection, collection_url, wanted, fetch_one))
+        return {k: found[k] for k in ordered if k in found}
+
+    def _fetch_bulk(
+        self, collection: str, collection_url: str, keys: List[str], fetch_one
+    ) -> Dict[str, Any]:
+        if self._bulk_supported.get(collection_url, True):
+            try:
+                result = self._post_bulk(collection_url, keys)
+            except Exception:
+                # A failing bulk call shouldn't take the library down with it;
+                # per-key GETs still work. Try the endpoint again next time.
+                result = None
+            else:
+                if result is None:
+                    self._bulk_supported[collection_url] = False
+            if result is not None:
+                if self.cache is not None:
+                    self.cache.count("misses", len(keys))
+                    for key, body in result.items():
+                        self.cache.store(collection, key, body)
+                return result
+        return fetch_many(keys, fetch_one, self.bulk_max_workers)
+
+    def get_items_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """Return {key: item} for ``keys`` (default: every item). Misses are omitted."""
+        if keys is None:
+            keys = self.list_item_keys()
+        return self._get_bulk("items", self._items_url(), keys, self.get_item)
+
+    def get_spells_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """Return {key: spell} for ``keys`` (default: every spell). Misses are omitted."""
+        if keys is None:
+            keys = self.list_spell_keys()
+        return self._get_bulk("spells", self._spells_url(), keys, self.get_spell)
+
+    def get_statblocks_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """Return {key: statblock} for ``keys`` (default: all). Misses are omitted."""
+        if keys is None:
+            keys = self.list_statblock_keys()
+        return self._get_bulk("statblocks", self._statblocks_url(), keys, self.get_statblock)
+
+    # ----- Bulk writes -----
+
+    def _put_bulk(
+        self, collection: str, collection_url: str, docs: Dict[str, Any]
+    ) -> Optional[Dict[str, str]]:
+        """Write docs through {collection}/bulk_put.
+
+        Returns {key: error} for the keys the server didn't store (empty when
+        all were), or None if the server has no such endpoint. Raises on
+        other failures; keys of earlier chunks are stored by then.
+        """
+        if not self._bulk_write_supported.get(collection_url, True):
+            return None
+        keys = list(docs)
+        errors: Dict[str, str] = {}
+        for start in range(0, len(keys), BULK_CHUNK_SIZE):
+            chunk = keys[start:start + BULK_CHUNK_SIZE]
+            r: Response = self._request(
+                "POST", f"{collection_url}/bulk_put", timeout=30,
+                json={"items": {k: docs[k] for k in chunk}},
+            )
+            for key in chunk:
+                self._invalidate(collection, key)
+            if r.status_code in (404, 405, 501) and start == 0:
+                self._bulk_write_supported[collection_url] = False
+                return None
+            r.raise_for_status()
+            body = self._unwrap_data(r.json()) if r.content else {}
+            body = body if isinstance(body, dict) else {}
+            rejected = body.get("errors") if isinstance(body.get("errors"), dict) else {}
+            saved = body.get("saved")
+            for key in chunk:
+                if key in rejected:
+                    errors[key] = str(rejected[key])
+                elif isinstance(saved, list) and key not in saved:
+                    errors[key] = "not saved by the server"
+        return errors
+
+    def save_items_bulk(self, docs: Dict[str, dict]) -> Optional[Dict[str, str]]:
+        """Save {key: item} in as few requests as possible; see _put_bulk."""
+        return self._put_bulk("items", self._items_url(), docs)
+
+    def save_spells_bulk(self, docs: Dict[str, dict]) -> Optional[Dict[str, str]]:
+        """Save {key: spell} in as few requests as possible; see _put_bulk."""
+        return self._put_bulk("spells", self._spells_url(), docs)
+
+    def save_statblocks_bulk(self, docs: Dict[str, dict]) -> Optional[Dict[str, str]]:
+        """Save {key: statblock} in as few requests as possible; see _put_bulk."""
+        return self._put_bulk("statblocks", self._statblocks_url(), docs)
+
+    # ----- Summary manifests -----
+
+    def _get_manifest(self, collection: str, collection_url: str, bulk_reader) -> Dict[str, dict]:
+        if self._manifest_supported.get(collection_url, True):
+            try:
+                payload = self._cached_get("manifests", f"{collection_url}/manifest", collection)
+            except Exception:
+                payload = None  # transient; ask again next time
+            else:
+                if payload is None:
+                    self._manifest_supported[collection_url] = False
+            if payload is not None:
+                manifest = self._parse_bulk_payload(payload)
+                return {k: manifest[k] for k in sorted(manifest)}
+        loaded = bulk_reader()
+        return {k: summarize(collection, loaded[k]) for k in sorted(loaded)}
+
+    def get_item_manifest(self) -> Dict[str, dict]:
+        """{key: {name, cost, rarity, tags}} for every item."""
+        return self._get_manifest("items", self._items_url(), self.get_items_bulk)
+
+    def get_spell_manifest(self) -> Dict[str, dict]:
+        """{key: {name, level, school, concentration}} for every spell."""
+        return self._get_manifest("spells", self._spells_url(), self.get_spells_bulk)
+
+    def get_statblock_manifest(self) -> Dict[str, dict]:
+        """{key: {name, challenge_rating, type, size}} for every statblock."""
+        return self._get_manifest("statblocks", self._statblocks_url(), self.get_statblocks_bulk)
+
+    # ----- Search -----
+
+    def _search_stamps(self, collection: str) -> Dict[str, None]:
+        # No per-key versions in the listing: entries stay until invalidated.
+        return dict.fromkeys(self.iter_keys(collection))
+
+    def _search_read_many(self, collection: str, keys: List[str]) -> Dict[str, dict]:
+        readers = {
+            "statblocks": self.get_statblocks_bulk,
+            "spells": self.get_spells_bulk,
+            "items": self.get_items_bulk,
+        }
+        return readers[collection](keys)
+
+    def search(
+        self, query: str, collections: Optional[Iterable[str]] = None, limit: Optional[int] = 50
+    ) -> List[SearchHit]:
+        """Ranked library matches for ``query`` (see search_index for the syntax)."""
+        return self._search.search(query, collections, limit)
+
+    def sync_search_index(self) -> int:
+        """Build or refresh the search index now; returns entries (re)indexed."""
+        return self._search.sync(force=True)
+
+    # ----- Change feed -----
+
+    def changes_since(self, cursor: Optional[str] = None) -> Optional[ChangeBatch]:
+        """Library changes since ``cursor``; None if the server has no changes endpoint.
+
+        Changed keys are dropped from the StorageCache and search index before returning.
+        """
+        if not self._changes_supported:
+            return None
+        url = f"{self.base_url}/v1/changes"
+        if cursor is not None:
+            url = f"{url}?{urlencode({'since': cursor})}"
+        r: Response = self._request("GET", url)
+        if r.status_code in (404, 405, 501):
+            self._changes_supported = False
+            return None
+        r.raise_for_status()
+        batch = parse_change_batch(self._unwrap_data(r.json()))
+        if batch is None:
+            raise RuntimeError("StorageAPI.changes_since: malformed response")
+        if batch.reset:
+            self._search.reread_all()
+            if self.cache is not None:
+                self.cache.clear()
+        for change in batch.changes:
+            self._invalidate(change.collection, change.key)
+        return batch
+
     # ----- Helpers tailored to your app’s JSON encoding -----
 
     def put_json(self, key: str, obj: dict) -> None:
-        """PUT using your CustomEncoder to preserve dataclasses, etc."""
-        text = json.dumps(obj, cls=CustomEncoder, ensure_ascii=False)
-        payload = json.loads(text)
-        self.put(key, payload)
+        """PUT tracker objects (creatures, enums) as the JSON CustomEncoder would write."""
+        self.put(key, to_primitive(obj))
 
     def get_json(self, key: str) -> Optional[dict]:
         """GET and ensure dict result (or None)."""
@@ -213,21 +678,12 @@ class StorageAPI:
 
     def list_statblock_keys(self) -> List[str]:
         """Return list of statblock keys (e.g. ['goblin.json', 'mage.json'])."""
-        candidates = [
-            self._statblocks_items_url(),
-            self._statblocks_url(),
-        ]
-        return self._list_from_candidates(candidates)
+        return list(self.iter_keys("statblocks"))
 
     def get_statblock(self, key: str) -> Optional[dict]:
         """GET a statblock by key. Returns dict or None if not found."""
         try:
-            r: Response = self.session.get(self._statblock_item_url(key), timeout=8)
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            payload = r.json()
-            return self._unwrap_data(payload)
+            return self._cached_get("statblocks", self._statblock_item_url(key), key)
         except Exception as e:
             raise RuntimeError(f"StorageAPI.get_statblock({key}) failed: {e}") from e
 
@@ -235,10 +691,10 @@ class StorageAPI:
         """PUT a statblock. Returns True on success."""
         try:
             body = self._wrap_for_put(data)
-            r: Response = self.session.put(
-                self._statblock_item_url(key), json=body, timeout=10
-            )
+            r: Response = self._request("PUT", self._statblock_item_url(key), json=body)
+            self._invalidate("statblocks", key)
             r.raise_for_status()
+            self._search.update("statblocks", key, data)
             return True
         except Exception as e:
             raise RuntimeError(f"StorageAPI.save_statblock({key}) failed: {e}") from e
@@ -246,7 +702,8 @@ class StorageAPI:
     def delete_statblock(self, key: str) -> bool:
         """DELETE a statblock. Returns True on success."""
         try:
-            r: Response = self.session.delete(self._statblock_item_url(key), timeout=8)
+            r: Response = self._request("DELETE", self._statblock_item_url(key))
+            self._invalidate("statblocks", key)
             if r.status_code not in (200, 204, 404):
                 r.raise_for_status()
             return True
@@ -266,27 +723,24 @@ class StorageAPI:
 
     def list_spell_keys(self) -> List[str]:
         """Return list of spell keys (e.g. ['fireball.json', 'shield.json'])."""
-        candidates = [self._spells_items_url(), self._spells_url()]
-        return self._list_from_candidates(candidates)
+        return list(self.iter_keys("spells"))
 
     def get_spell(self, key: str) -> Optional[dict]:
         """GET a spell by key. Returns dict or None if not found."""
         try:
-            r: Response = self.session.get(self._spell_item_url(key), timeout=8)
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            return self._unwrap_data(r.json())
+            return self._cached_get("spells", self._spell_item_url(key), key)
         except Exception as e:
             raise RuntimeError(f"StorageAPI.get_spell({key}) failed: {e}") from e
 
     def save_spell(self, key: str, data: dict) -> bool:
         """PUT a spell. Returns True on success."""
         try:
-            r: Response = self.session.put(
-                self._spell_item_url(key), json=self._wrap_for_put(data), timeout=10
+            r: Response = self._request(
+                "PUT", self._spell_item_url(key), json=self._wrap_for_put(data)
             )
+            self._invalidate("spells", key)
             r.raise_for_status()
+            self._search.update("spells", key, data)
             return True
         except Exception as e:
             raise RuntimeError(f"StorageAPI.save_spell({key}) failed: {e}") from e
@@ -294,7 +748,8 @@ class StorageAPI:
     def delete_spell(self, key: str) -> bool:
         """DELETE a spell. Returns True on success."""
         try:
-            r: Response = self.session.delete(self._spell_item_url(key), timeout=8)
+            r: Response = self._request("DELETE", self._spell_item_url(key))
+            self._invalidate("spells", key)
             if r.status_code not in (200, 204, 404):
                 r.raise_for_status()
             return True
@@ -314,27 +769,24 @@ class StorageAPI:
 
     def list_item_keys(self) -> List[str]:
         """Return list of item keys (e.g. ['longsword.json', 'potion_of_healing.json'])."""
-        candidates = [self._items_items_url(), self._items_url()]
-        return self._list_from_candidates(candidates)
+        return list(self.iter_keys("items"))
 
     def get_item(self, key: str) -> Optional[dict]:
         """GET an item by key. Returns dict or None if not found."""
         try:
-            r: Response = self.session.get(self._item_item_url(key), timeout=8)
-            if r.status_code == 404:
-                return None
-            r.raise_for_status()
-            return self._unwrap_data(r.json())
+            return self._cached_get("items", self._item_item_url(key), key)
         except Exception as e:
             raise RuntimeError(f"StorageAPI.get_item({key}) failed: {e}") from e
 
     def save_item(self, key: str, data: dict) -> bool:
         """PUT an item. Returns True on success."""
         try:
-            r: Response = self.session.put(
-                self._item_item_url(key), json=self._wrap_for_put(data), timeout=10
+            r: Response = self._request(
+                "PUT", self._item_item_url(key), json=self._wrap_for_put(data)
             )
+            self._invalidate("items", key)
             r.raise_for_status()
+            self._search.update("items", key, data)
             return True
         except Exception as e:
             raise RuntimeError(f"StorageAPI.save_item({key}) failed: {e}") from e
@@ -342,7 +794,8 @@ class StorageAPI:
     def delete_item(self, key: str) -> bool:
         """DELETE an item. Returns True on success."""
         try:
-            r: Response = self.session.delete(self._item_item_url(key), timeout=8)
+            r: Response = self._request("DELETE", self._item_item_url(key))
+            self._invalidate("items", key)
             if r.status_code not in (200, 204, 404):
                 r.raise_for_status()
             return True
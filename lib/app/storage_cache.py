@@ -0,0 +1,230 @@
+# lib/app/storage_cache.py
+"""
+Disk-backed read-through cache for StorageAPI library lookups.
+
+Statblocks, spells and items rarely change but were fetched over the network
+on every use: the active monster's statblock every turn, spells whenever a
+tooltip missed, the whole item library for each shop. StorageCache keeps the
+last response for each (server, collection, key) in a single SQLite file
+under the config dir:
+
+* Entries checked within ``fresh_s`` are served without touching the network.
+* Older entries are revalidated with If-None-Match / If-Modified-Since (when
+  the server sent an ETag / Last-Modified); a 304 refreshes them for free.
+* Local saves and deletes invalidate the key, so this client never reads its
+  own stale write.
+* Total body size is bounded; least-recently-used entries are evicted first.
+
+Hit/miss counters are kept in memory for the session (see stats()).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_FRESH_S = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace   TEXT NOT NULL,
+    collection  TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    body        TEXT NOT NULL,
+    etag        TEXT,
+    modified    TEXT,
+    size        INTEGER NOT NULL,
+    checked_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, collection, key)
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at);
+"""
+
+
+@dataclass
+class CacheEntry:
+    body: Any
+    etag: Optional[str]
+    modified: Optional[str]
+    checked_at: float
+
+    def validators(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.modified:
+            headers["If-Modified-Since"] = self.modified
+        return headers
+
+
+class StorageCache:
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "",
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        fresh_s: float = DEFAULT_FRESH_S,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.fresh_s = fresh_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        # Bytes across the whole table, kept up to date by every write so
+        # store() only runs the eviction query once the cache is over budget.
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, collection: str, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, modified, checked_at FROM entries"
+                " WHERE namespace=? AND collection=? AND key=?",
+                (self.namespace, collection, key),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at=? WHERE namespace=? AND collection=? AND key=?",
+                (self._clock(), self.namespace, collection, key),
+            )
+        try:
+            body = json.loads(row[0])
+        except ValueError:
+            self.invalidate(collection, key)
+            return None
+        return CacheEntry(body, row[1], row[2], row[3])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return self._clock() - entry.checked_at < self.fresh_s
+
+    def fresh_many(self, collection: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Bodies of the given keys that can be served without revalidation."""
+        out: Dict[str, Any] = {}
+        for key in keys:
+            entry = self.lookup(collection, key)
+            if entry is not None and self.is_fresh(entry):
+                out[key] = entry.body
+        if out:
+            self.count("hits", len(out))
+        return out
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def store(
+        self,
+        collection: str,
+        key: str,
+        body: Any,
+        etag: Optional[str] = None,
+        modified: Optional[str] = None,
+    ) -> None:
+        text = json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = self._clock()
+        with self._lock:
+            replaced = self._size_locked(self.namespace, collection, key)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (namespace, collection, key, body, etag, modified, size, checked_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, collection, key, text, etag, modified, size, now, now),
+            )
+            self._total += size - replaced
+            if self._total > self.max_bytes:
+                self._evict_locked()
+
+    def touch(self, collection: str, key: str) -> None:
+        """Mark an entry as just revalidated (a 304)."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET checked_at=?, accessed_at=?"
+                " WHERE namespace=? AND collection=? AND key=?",
+                (now, now, self.namespace, collection, key),
+            )
+
+    def invalidate(self, collection: str, key: str) -> None:
+        with self._lock:
+            size = self._size_locked(self.namespace, collection, key)
+            cur = self._db.execute(
+                "DELETE FROM entries WHERE namespace=? AND collection=? AND key=?",
+                (self.namespace, collection, key),
+            )
+            if cur.rowcount:
+                self._stats["invalidations"] += cur.rowcount
+                self._total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE namespace=?", (self.namespace,))
+            self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _size_locked(self, namespace: str, collection: str, key: str) -> int:
+        row = self._db.execute(
+            "SELECT size FROM entries WHERE namespace=? AND collection=? AND key=?",
+            (namespace, collection, key),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _evict_locked(self) -> None:
+        total = self._total
+        # Evict down to 90% so a full cache doesn't evict on every store.
+        target = int(self.max_bytes * 0.9)
+        rows = self._db.execute(
+            "SELECT namespace, collection, key, size FROM entries ORDER BY accessed_at"
+        )
+        doomed = []
+        for ns, collection, key, size in rows:
+            if total <= target:
+                break
+            doomed.append((ns, collection, key))
+            total -= size
+        self._db.executemany(
+            "DELETE FROM entries WHERE namespace=? AND collection=? AND key=?", doomed
+        )
+        self._total = total
+        self._stats["evictions"] += len(doomed)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def count(self, stat: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[stat] = self._stats.get(stat, 0) + n
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            row = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        out["entries"], out["bytes"] = int(row[0]), int(row[1])
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,244 @@
+# lib/app/storage_changes.py
+"""
+Change notifications for the storage backends.
+
+Spell tooltips, the lookup lists and the PC group index all keep copies of
+library data, and nothing told them when another device or a script (say,
+scripts/reenrich_items.py) changed it. Each backend now answers
+``changes_since(cursor) -> ChangeBatch | None``:
+
+* LocalStorage keeps an mtime index of its directories (DirectoryWatcher) and
+  diffs it on each call.
+* SQLiteStorage logs every write in a ``changes`` table.
+* StorageAPI asks the server: ``GET {base}/v1/changes?since=<cursor>``.
+
+A cursor is an opaque string. Passing None returns the current cursor and no
+changes. ``reset`` is set when a cursor is too old or belongs to another
+store; the caller should then drop everything it has cached. None means the
+backend can't report changes at all.
+
+ChangeFeed polls a backend on a worker thread and hands each subscriber the
+changed keys of the collections it cares about, so caches can drop just
+those entries.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.event_log import event_log
+
+COLLECTIONS = ("encounters", "statblocks", "spells", "items")
+DEFAULT_INTERVAL_S = 5.0
+DEFAULT_LOG_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Change:
+    collection: str
+    key: str
+    op: str  # "put" or "delete"
+
+
+@dataclass
+class ChangeBatch:
+    cursor: str
+    changes: List[Change] = field(default_factory=list)
+    reset: bool = False
+
+
+def parse_change_batch(payload: Any) -> Optional[ChangeBatch]:
+    """Read the {"cursor", "changes", "reset"} shape the changes endpoint returns."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("cursor"), (str, int)):
+        return None
+    changes: List[Change] = []
+    for entry in payload.get("changes") or []:
+        if not isinstance(entry, dict):
+            continue
+        collection, key = entry.get("collection"), entry.get("key")
+        if isinstance(collection, str) and isinstance(key, str) and key:
+            op = "delete" if entry.get("op") == "delete" else "put"
+            changes.append(Change(collection, key, op))
+    return ChangeBatch(str(payload["cursor"]), changes, bool(payload.get("reset")))
+
+
+def _split_cursor(cursor: Optional[str]) -> Tuple[str, int]:
+    if not cursor or ":" not in cursor:
+        return "", -1
+    epoch, _, seq = cursor.rpartition(":")
+    try:
+        return epoch, int(seq)
+    except ValueError:
+        return "", -1
+
+
+class DirectoryWatcher:
+    """mtime index over ``{collection: directory}``, diffed on each scan.
+
+    Cursors are only meaningful to the watcher that issued them; a new
+    watcher (e.g. after a restart) answers old cursors with reset.
+    """
+
+    def __init__(self, roots: Dict[str, str], log_size: int = DEFAULT_LOG_SIZE):
+        self.roots = dict(roots)
+        self.log_size = log_size
+        self._epoch = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._log: List[Tuple[int, Change]] = []
+        self._seq = 0
+        self._dropped_through = 0  # log entries with seq <= this were trimmed
+
+    @staticmethod
+    def _stat_dir(dirpath: str) -> Dict[str, Tuple[int, int]]:
+        out: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith(".json") or name.startswith("."):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    out[name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return out
+
+    def _scan_locked(self) -> None:
+        for collection, dirpath in self.roots.items():
+            current = self._stat_dir(dirpath)
+            previous = self._index.get(collection)
+            self._index[collection] = current
+            if previous is None:
+                continue
+            for key, stamp in current.items():
+                if previous.get(key) != stamp:
+                    self._seq += 1
+                    self._log.append((self._seq, Change(collection, key, "put")))
+            for key in previous.keys() - current.keys():
+                self._seq += 1
+                self._log.append((self._seq, Change(collection, key, "delete")))
+        if len(self._log) > self.log_size:
+            cut = len(self._log) - self.log_size
+            self._dropped_through = self._log[cut - 1][0]
+            del self._log[:cut]
+
+    def changes_since(self, cursor: Optional[str]) -> ChangeBatch:
+        with self._lock:
+            self._scan_locked()
+            current = f"{self._epoch}:{self._seq}"
+            if cursor is None:
+                return ChangeBatch(current)
+            epoch, seq = _split_cursor(cursor)
+            if epoch != self._epoch or seq < self._dropped_through or seq > self._seq:
+                return ChangeBatch(current, reset=True)
+            return ChangeBatch(current, [c for s, c in self._log if s > seq])
+
+
+Subscriber = Callable[[str, Set[str], bool], None]
+
+
+class ChangeFeed:
+    """Polls ``source(cursor)`` and fans changes out to subscribers.
+
+    Callbacks get ``(collection, keys, reset)`` and run through ``dispatch``
+    (pass the GUI-thread trampoline so they land on the GUI thread). With
+    reset, keys is empty and everything from that collection should go.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[Optional[str]], Optional[ChangeBatch]],
+        dispatch: Callable[[Callable[[], None]], None] = lambda fn: fn(),
+        interval_s: float = DEFAULT_INTERVAL_S,
+    ):
+        self._source = source
+        self._dispatch = dispatch
+        self.interval_s = interval_s
+        self.cursor: Optional[str] = None
+        self.supported = True
+        self._subscribers: List[Tuple[Optional[frozenset], Subscriber]] = []
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(
+        self, collections: Optional[Iterable[str]], callback: Subscriber
+    ) -> Callable[[], None]:
+        """Call ``callback`` for changes in ``collections`` (None = all). Returns unsubscribe."""
+        entry = (frozenset(collections) if collections is not None else None, callback)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return _unsubscribe
+
+    def poll(self) -> int:
+        """Fetch and deliver one round of changes; returns how many keys changed."""
+        with self._poll_lock:
+            batch = self._source(self.cursor)
+            if batch is None:
+                self.supported = False
+                return 0
+            first = self.cursor is None
+            self.cursor = batch.cursor
+            if first and not batch.reset:
+                return 0
+            by_collection: Dict[str, Set[str]] = defaultdict(set)
+            for change in batch.changes:
+                by_collection[change.collection].add(change.key)
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for wanted, callback in subscribers:
+                names = (wanted if wanted is not None else COLLECTIONS) if batch.reset \
+                    else [c for c in by_collection if wanted is None or c in wanted]
+                for collection in names:
+                    keys = set() if batch.reset else set(by_collection[collection])
+                    self._dispatch(
+                        lambda cb=callback, c=collection, k=keys, r=batch.reset: cb(c, k, r)
+                    )
+            if batch.changes or batch.reset:
+                event_log.debug(
+                    "storage", "{count} storage change(s){reset}",
+                    count=len(batch.changes), reset=" (reset)" if batch.reset else "",
+                )
+            return len(batch.changes)
+
+    # ---- background polling ----
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-changes", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _run(self) -> None:
+        while not self._stop.is_set() and self.supported:
+            try:
+                self.poll()
+            except Exception as e:
+                event_log.debug("storage", "Change poll failed: {exc}", exc=e)
+            self._stop.wait(self.interval_s)
+        if not self.supported:
+            event_log.info("storage", "Storage backend does not report changes; watcher stopped.")
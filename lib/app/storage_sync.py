@@ -0,0 +1,603 @@
+# lib/app/storage_sync.py
+"""
+Offline-first mirror of the Storage service.
+
+MirroredStorage has the StorageAPI interface but reads from, and writes to, a
+local backend (LocalStorage or SQLiteStorage). A background thread pushes the
+queued writes to the server and pulls the server's changes into the mirror, so
+lookups, renders and saves never wait on the network and keep working while
+it is down.
+
+Every synced record has a version stamp: a hash of the content last seen on
+the server. Before pushing, the server's current copy is read. If its stamp
+differs from the one recorded when the local edit was made, somebody else has
+changed the record meanwhile. The mirror then takes the server's copy, keeps
+the local one in conflicts(), and lets the user choose with resolve_conflict().
+
+Remote changes come from the server's change feed (StorageAPI.changes_since).
+Without a feed, or when the feed's cursor has expired, the whole library is
+compared instead (at startup and every FULL_RESYNC_S).
+
+Sync state (cursor, stamps, queued writes, conflicts) lives in
+``<mirror>/.sync_state.json`` so queued writes survive a restart. It is saved
+as soon as a write is queued (once per batch()), not just after a sync round,
+so a write made after stop() is still uploaded on the next start. Writes made
+inside batch() are queued when it commits, so a sync never uploads a row that
+could still be rolled back.
+
+The mirror's lock only guards its own bookkeeping and is never held while the
+local backend is called, whose batches may hold that backend's lock for a
+whole save. A pulled copy and a user write to the same record can therefore
+overlap; _writing and _applying track both sides so the user's write always
+ends up in the mirror.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.autosave import write_json_atomic
+from app.bulk_fetch import fetch_many
+from app.event_log import event_log
+from app.search_index import SearchHit
+from app.serialization import to_primitive
+from app.storage_changes import ChangeBatch
+
+STATE_FILENAME = ".sync_state.json"
+STATE_VERSION = 1
+DEFAULT_INTERVAL_S = 15.0
+FULL_RESYNC_S = 600.0
+MAX_BACKOFF_S = 60.0
+
+# collection -> (list, get, save, delete) method names; the same on every backend
+_METHODS: Dict[str, Tuple[str, str, str, str]] = {
+    "encounters": ("list", "get", "put", "delete"),
+    "statblocks": ("list_statblock_keys", "get_statblock", "save_statblock", "delete_statblock"),
+    "spells": ("list_spell_keys", "get_spell", "save_spell", "delete_spell"),
+    "items": ("list_item_keys", "get_item", "save_item", "delete_item"),
+}
+_BULK = {
+    "statblocks": "get_statblocks_bulk",
+    "spells": "get_spells_bulk",
+    "items": "get_items_bulk",
+}
+COLLECTIONS = tuple(_METHODS)
+
+Key = Tuple[str, str]
+
+
+def stamp(data: Any) -> Optional[str]:
+    """Version stamp of a record's content; None for a missing record."""
+    if data is None:
+        return None
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def mirror_dir_name(base_url: str) -> str:
+    """Directory name for one server's mirror, so switching servers never mixes them."""
+    return hashlib.sha1(base_url.rstrip("/").encode("utf-8")).hexdigest()[:12]
+
+
+class MirroredStorage:
+    """StorageAPI-compatible storage served from a local mirror of ``remote``."""
+
+    def __init__(
+        self,
+        remote: Any,
+        local: Any,
+        state_path: Optional[str] = None,
+        interval_s: float = DEFAULT_INTERVAL_S,
+        on_status: Optional[Callable[[Dict[str, Any]], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.remote = remote
+        self.local = local
+        if state_path is None:
+            data_dir = getattr(local, "data_dir", None) or os.path.dirname(local.path)
+            state_path = os.path.join(data_dir, STATE_FILENAME)
+        self.state_path = state_path
+        self.interval_s = interval_s
+        self.on_status = on_status
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._cursor: Optional[str] = None
+        self._feed_supported = True
+        self._full_sync_at = 0.0
+        self._base: Dict[str, Dict[str, str]] = {c: {} for c in COLLECTIONS}
+        # (collection, key) -> write sequence; a newer local write bumps it
+        self._outbox: Dict[Key, int] = {}
+        self._seq = 0
+        self._conflicts: Dict[Key, Dict[str, Any]] = {}
+        self._dirty = False
+        # thread -> depth and keys written in its open batch(), queued at commit
+        self._batch_depth: Dict[int, int] = {}
+        self._held: Dict[int, Dict[Key, None]] = {}
+        # keys with a user write in progress (count), and keys a pulled copy is
+        # being written to (with a user write that overlapped it, to redo)
+        self._writing: Dict[Key, int] = {}
+        self._applying: Dict[Key, Optional[Tuple[Any]]] = {}
+        self.online: Optional[bool] = None
+        self.last_sync: Optional[float] = None
+        self._last_status: Optional[Dict[str, Any]] = None
+        self._load_state()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- State file -----
+
+    def _remote_id(self) -> str:
+        return str(getattr(self.remote, "base_url", ""))
+
+    def _load_state(self) -> None:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(raw, dict)
+            or raw.get("version") != STATE_VERSION
+            or raw.get("remote") != self._remote_id()
+        ):
+            return
+        self._cursor = raw.get("cursor")
+        for collection, stamps in (raw.get("base") or {}).items():
+            if collection in self._base and isinstance(stamps, dict):
+                self._base[collection] = dict(stamps)
+        for collection, key in raw.get("outbox") or []:
+            if collection in _METHODS:
+                self._seq += 1
+                self._outbox[(collection, key)] = self._seq
+        for entry in raw.get("conflicts") or []:
+            if isinstance(entry, dict) and entry.get("collection") in _METHODS:
+                self._conflicts[(entry["collection"], entry["key"])] = entry
+
+    def save_state(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            raw = {
+                "version": STATE_VERSION,
+                "remote": self._remote_id(),
+                "cursor": self._cursor,
+                "base": self._base,
+                "outbox": [list(k) for k in self._outbox],
+                "conflicts": list(self._conflicts.values()),
+            }
+            write_json_atomic(self.state_path, raw)
+            self._dirty = False
+
+    # ----- Local side -----
+
+    def _local_call(self, collection: str, op: int, *args: Any) -> Any:
+        return getattr(self.local, _METHODS[collection][op])(*args)
+
+    def _local_write(self, collection: str, key: str, data: Any) -> None:
+        if data is None:
+            self._local_call(collection, 3, key)
+        else:
+            self._local_call(collection, 2, key, data)
+
+    def _write(self, collection: str, key: str, data: Any) -> None:
+        """Apply a user write to the mirror and queue it for the server (data=None deletes)."""
+        record = (collection, key)
+        with self._lock:
+            self._writing[record] = self._writing.get(record, 0) + 1
+            racing = record in self._applying
+        try:
+            self._local_write(collection, key, data)
+            if racing:
+                # A pulled copy was being written too and may have landed last.
+                with self._lock:
+                    if record in self._applying:
+                        self._applying[record] = (data,)  # the sync thread redoes ours
+                        racing = False
+                if racing:
+                    self._local_write(collection, key, data)
+        finally:
+            with self._lock:
+                if self._writing[record] == 1:
+                    del self._writing[record]
+                else:
+                    self._writing[record] -= 1
+        with self._lock:
+            held = self._held.get(threading.get_ident())
+            if held is not None:
+                held[record] = None
+            else:
+                self._seq += 1
+                self._outbox[record] = self._seq
+                self._dirty = True
+        if held is None:
+            self._persist()
+            self._wake.set()
+
+    def _persist(self) -> None:
+        try:
+            self.save_state()
+        except OSError as e:
+            event_log.warning("storage", "Could not save sync state: {error}", error=e)
+
+    def _pending(self, record: Key) -> bool:
+        # Caller holds the lock.
+        return (
+            record in self._outbox
+            or record in self._writing
+            or any(record in held for held in self._held.values())
+        )
+
+    def _apply_remote(self, collection: str, key: str, data: Any, version: Optional[str]) -> None:
+        """Write the server's copy into the mirror unless a local write to it is pending."""
+        record = (collection, key)
+        with self._lock:
+            if self._pending(record):
+                return
+            self._applying[record] = None
+            base = self._base[collection].get(key)
+        try:
+            if data is None:
+                if self._local_call(collection, 1, key) is not None:
+                    self._local_call(collection, 3, key)
+            elif base != version or self._local_call(collection, 1, key) is None:
+                self._local_call(collection, 2, key, data)
+        finally:
+            with self._lock:
+                overlapped = self._applying.pop(record)
+            if overlapped is not None:
+                self._local_write(collection, key, overlapped[0])
+        with self._lock:
+            if data is None:
+                self._base[collection].pop(key, None)
+            else:
+                self._base[collection][key] = version
+            self._dirty = True
+
+    # ----- Push -----
+
+    def _push(self) -> None:
+        with self._lock:
+            queued = list(self._outbox.items())
+        for (collection, key), seq in queued:
+            data = self._local_call(collection, 1, key)
+            with self._lock:
+                base = self._base[collection].get(key)
+            remote_data = getattr(self.remote, _METHODS[collection][1])(key)
+            remote_version = stamp(remote_data)
+            local_version = stamp(data)
+
+            with self._lock:
+                if self._outbox.get((collection, key)) != seq:
+                    continue  # edited again meanwhile; push the newer copy next round
+                conflict = remote_version not in (base, local_version)
+                if conflict:
+                    self._conflicts[(collection, key)] = {
+                        "collection": collection,
+                        "key": key,
+                        "local": data,
+                        "at": self._clock(),
+                    }
+                    del self._outbox[(collection, key)]
+                    self._dirty = True
+            if conflict:
+                self._apply_remote(collection, key, remote_data, remote_version)
+                event_log.warning(
+                    "storage",
+                    "Conflict on {collection}/{key}: kept the server copy",
+                    collection=collection, key=key,
+                )
+                continue
+
+            if remote_version != local_version:
+                if data is None:
+                    getattr(self.remote, _METHODS[collection][3])(key)
+                else:
+                    getattr(self.remote, _METHODS[collection][2])(key, data)
+
+            with self._lock:
+                if local_version is None:
+                    self._base[collection].pop(key, None)
+                else:
+                    self._base[collection][key] = local_version
+                if self._outbox.get((collection, key)) == seq:
+                    del self._outbox[(collection, key)]
+                self._dirty = True
+
+    # ----- Pull -----
+
+    def _read_remote(self, collection: str, keys: List[str]) -> Dict[str, Any]:
+        bulk = _BULK.get(collection)
+        if bulk is not None and hasattr(self.remote, bulk):
+            return getattr(self.remote, bulk)(keys)
+        return fetch_many(keys, getattr(self.remote, _METHODS[collection][1]))
+
+    def _pull_keys(self, collection: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            keys = [k for k in keys if not self._pending((collection, k))]
+        if not keys:
+            return
+        found = self._read_remote(collection, keys)
+        for key in keys:
+            # Skipped if it was edited locally while we were fetching.
+            data = found.get(key)
+            self._apply_remote(collection, key, data, stamp(data))
+
+    def _full_sync(self) -> None:
+        """Compare every collection with the server and fix up the mirror."""
+        for collection in COLLECTIONS:
+            remote_keys = set(getattr(self.remote, _METHODS[collection][0])())
+            found = self._read_remote(collection, sorted(remote_keys))
+            local_keys = set(self._local_call(collection, 0))
+            for key, data in found.items():
+                self._apply_remote(collection, key, data, stamp(data))
+            for key in local_keys - remote_keys:
+                with self._lock:
+                    if self._pending((collection, key)):
+                        continue
+                    deleted = key in self._base[collection]
+                    if not deleted:
+                        self._seq += 1
+                        self._outbox[(collection, key)] = self._seq  # only ever local
+                        self._dirty = True
+                if deleted:
+                    self._apply_remote(collection, key, None, None)  # deleted on the server
+            with self._lock:
+                gone = set(self._base[collection]) - remote_keys - local_keys
+                for key in gone:
+                    self._base[collection].pop(key, None)
+        self._full_sync_at = self._clock()
+
+    def _pull(self) -> None:
+        changes_since = getattr(self.remote, "changes_since", None)
+        batch: Optional[ChangeBatch] = None
+        if changes_since is not None and self._feed_supported:
+            batch = changes_since(self._cursor)
+            if batch is None:
+                self._feed_supported = False
+        if batch is None:
+            if self._clock() - self._full_sync_at >= FULL_RESYNC_S:
+                self._full_sync()
+            return
+        if batch.reset or self._cursor is None:
+            self._full_sync()
+        else:
+            changed: Dict[str, set] = {}
+            for change in batch.changes:
+                if change.collection in _METHODS:
+                    changed.setdefault(change.collection, set()).add(change.key)
+            for collection, keys in changed.items():
+                self._pull_keys(collection, sorted(keys))
+        with self._lock:
+            if batch.cursor != self._cursor:
+                self._cursor = batch.cursor
+                self._dirty = True
+
+    # ----- Sync loop -----
+
+    def sync_once(self) -> bool:
+        """Push queued writes, then pull remote changes. False if the server was unreachable."""
+        try:
+            self._push()
+            self._pull()
+        except Exception as e:
+            if self.online is not False:
+                event_log.warning("storage", "Storage service unreachable: {error}", error=e)
+            self.online = False
+        else:
+            if self.online is False:
+                event_log.info("storage", "Storage service reachable again")
+            self.online = True
+            self.last_sync = self._clock()
+        self._persist()
+        self._report_status()
+        return bool(self.online)
+
+    def _run(self) -> None:
+        backoff = 0.0
+        while not self._stop.is_set():
+            if self.sync_once():
+                backoff = 0.0
+                self._wake.wait(self.interval_s)
+                self._wake.clear()
+            else:
+                # Offline: local writes don't cut the wait short.
+                backoff = min(max(backoff * 2, 1.0), MAX_BACKOFF_S)
+                self._stop.wait(backoff)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.save_state()
+
+    def close(self) -> None:
+        self.stop()
+        close = getattr(self.local, "close", None)
+        if close is not None:
+            close()
+
+    # ----- Status and conflicts -----
+
+    def status(self) -> Dict[str, Any]:
+        """{"online", "pending", "conflicts", "last_sync"} for the status bar."""
+        with self._lock:
+            return {
+                "online": self.online,
+                "pending": len(self._outbox),
+                "conflicts": len(self._conflicts),
+                "last_sync": self.last_sync,
+            }
+
+    def _report_status(self) -> None:
+        status = self.status()
+        changed = {k: v for k, v in status.items() if k != "last_sync"}
+        if self.on_status is not None and changed != self._last_status:
+            self._last_status = changed
+            self.on_status(status)
+
+    def conflicts(self) -> List[Dict[str, Any]]:
+        """Local edits that lost to a newer server copy: {collection, key, local, at}."""
+        with self._lock:
+            return [dict(c) for c in self._conflicts.values()]
+
+    def resolve_conflict(self, collection: str, key: str, keep_local: bool) -> None:
+        """Drop a conflict; with keep_local, write the local copy back over the server's."""
+        with self._lock:
+            entry = self._conflicts.pop((collection, key), None)
+            self._dirty = True
+        if entry is not None and keep_local:
+            self._write(collection, key, entry.get("local"))
+        self._report_status()
+
+    # ----- Encounters -----
+
+    def list(self) -> List[str]:
+        return self.local.list()
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.local.get(key)
+
+    def put(self, key: str, data: Any) -> None:
+        self._write("encounters", key, data)
+
+    def delete(self, key: str) -> None:
+        self._write("encounters", key, None)
+
+    def put_json(self, key: str, obj: dict) -> None:
+        self.put(key, to_primitive(obj))
+
+    def get_json(self, key: str) -> Optional[dict]:
+        return self.get(key)
+
+    # ----- Statblocks -----
+
+    def list_statblock_keys(self) -> List[str]:
+        return self.local.list_statblock_keys()
+
+    def get_statblock(self, key: str) -> Optional[dict]:
+        return self.local.get_statblock(key)
+
+    def save_statblock(self, key: str, data: dict) -> bool:
+        self._write("statblocks", key, data)
+        return True
+
+    def delete_statblock(self, key: str) -> bool:
+        self._write("statblocks", key, None)
+        return True
+
+    # ----- Spells -----
+
+    def list_spell_keys(self) -> List[str]:
+        return self.local.list_spell_keys()
+
+    def get_spell(self, key: str) -> Optional[dict]:
+        return self.local.get_spell(key)
+
+    def save_spell(self, key: str, data: dict) -> bool:
+        self._write("spells", key, data)
+        return True
+
+    def delete_spell(self, key: str) -> bool:
+        self._write("spells", key, None)
+        return True
+
+    # ----- Items -----
+
+    def list_item_keys(self) -> List[str]:
+        return self.local.list_item_keys()
+
+    def get_item(self, key: str) -> Optional[dict]:
+        return self.local.get_item(key)
+
+    def save_item(self, key: str, data: dict) -> bool:
+        self._write("items", key, data)
+        return True
+
+    def delete_item(self, key: str) -> bool:
+        self._write("items", key, None)
+        return True
+
+    # ----- Bulk reads, manifests, search, change feed (all local) -----
+
+    def get_items_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self.local.get_items_bulk(keys)
+
+    def get_spells_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self.local.get_spells_bulk(keys)
+
+    def get_statblocks_bulk(self, keys: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        return self.local.get_statblocks_bulk(keys)
+
+    def get_item_manifest(self) -> Dict[str, dict]:
+        return self.local.get_item_manifest()
+
+    def get_spell_manifest(self) -> Dict[str, dict]:
+        return self.local.get_spell_manifest()
+
+    def get_statblock_manifest(self) -> Dict[str, dict]:
+        return self.local.get_statblock_manifest()
+
+    def search(
+        self, query: str, collections: Optional[Iterable[str]] = None, limit: Optional[int] = 50
+    ) -> List[SearchHit]:
+        return self.local.search(query, collections, limit)
+
+    def sync_search_index(self) -> int:
+        return self.local.sync_search_index()
+
+    def changes_since(self, cursor: Optional[str] = None) -> Optional[ChangeBatch]:
+        """The mirror's own change feed, so pulled changes reach the app's caches."""
+        return self.local.changes_since(cursor)
+
+    @contextmanager
+    def batch(self) -> Iterator["MirroredStorage"]:
+        """Group writes in the local backend's transaction where it has one.
+
+        The writes are queued for the server when the batch commits, and
+        dropped from the queue if it rolls back.
+        """
+        inner = getattr(self.local, "batch", None)
+        me = threading.get_ident()
+        with self._lock:
+            depth = self._batch_depth.get(me, 0)
+            self._batch_depth[me] = depth + 1
+            if depth == 0:
+                self._held[me] = {}
+        committed = False
+        try:
+            with inner() if inner is not None else nullcontext():
+                yield self
+            committed = True
+        finally:
+            with self._lock:
+                self._batch_depth[me] -= 1
+                outermost = self._batch_depth[me] == 0
+                if outermost:
+                    del self._batch_depth[me]
+                    held = self._held.pop(me)
+                    if committed and held:
+                        for record in held:
+                            self._seq += 1
+                            self._outbox[record] = self._seq
+                        self._dirty = True
+            if outermost:
+                self._persist()
+                if committed and held:
+                    self._wake.set()
@@ -66,4 +66,4 @@ class AbilityUsesDropdown(QWidget):
 
     def _update_usage(self, name):
         checked = sum(1 for cb in self.ability_checkboxes.get(name, []) if cb.isChecked())
-        self.creature._ability_uses_used[name] = checked
+        self.creature.writable_resource("_ability_uses_used")[name] = checked
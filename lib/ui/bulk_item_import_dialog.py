@@ -5,6 +5,8 @@ results, and save selected items to storage.
 
 Legacy items are included when no non-legacy counterpart exists in the paste.
 Items without a "View Details Page" line (unowned sourcebook) are skipped.
+Saving runs on a SavePipeline in a worker thread: rows update as each item
+lands, and Cancel stops the items not yet sent.
 
 Usage:
     dlg = BulkItemImportDialog(storage_api=self.storage_api, parent=self)
@@ -12,15 +14,17 @@ Usage:
 """
 from __future__ import annotations
 
+import threading
 from typing import Optional
 
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
-    QCheckBox, QDialog, QFrame, QHBoxLayout, QLabel, QPlainTextEdit,
+    QCheckBox, QDialog, QFrame, QHBoxLayout, QLabel, QPlainTextEdit, QProgressBar,
     QPushButton, QScrollArea, QSizePolicy, QVBoxLayout, QWidget,
 )
 
 from app.bulk_item_import import ParsedItemBlock, dedupe_prefer_non_legacy, parse_bulk_items
+from app.save_pipeline import SavePipeline, SaveReport
 
 
 # ── Colours ───────────────────────────────────────────────────────────────────
@@ -85,11 +89,24 @@ class _ItemRow(QWidget):
         row.addWidget(status_lbl)
 
         self._status_lbl = status_lbl
+        self.saved = False
 
     def is_selected(self) -> bool:
         return self.checkbox.isChecked()
 
+    def is_pending(self) -> bool:
+        return self.checkbox.isChecked() and not self.saved
+
+    def mark_saving(self) -> None:
+        self._status_lbl.setText("Saving…")
+        self._status_lbl.setStyleSheet("color: #555; font-style: italic;")
+
+    def mark_cancelled(self) -> None:
+        self._status_lbl.setText("Not saved")
+        self._status_lbl.setStyleSheet(f"color: {_WARN_FG};")
+
     def mark_saved(self) -> None:
+        self.saved = True
         self.checkbox.setEnabled(False)
         self._status_lbl.setText("Saved")
         self._status_lbl.setStyleSheet(f"color: {_OK_FG}; font-weight: bold;")
@@ -102,10 +119,15 @@ class _ItemRow(QWidget):
 class BulkItemImportDialog(QDialog):
     """Dialog for bulk-importing D&D Beyond items via paste-and-parse."""
 
+    _item_saved = pyqtSignal(str, object)     # key, error message | None
+    _save_finished = pyqtSignal(object)       # SaveReport
+
     def __init__(self, storage_api=None, parent=None) -> None:
         super().__init__(parent)
         self.storage_api = storage_api
         self._rows: list[_ItemRow] = []
+        self._pipeline: Optional[SavePipeline] = None
+        self._saving_rows: dict[str, _ItemRow] = {}
 
         self.setWindowTitle("Bulk Item Import")
         self.resize(680, 640)
@@ -119,6 +141,8 @@ class BulkItemImportDialog(QDialog):
         self._parse_timer.setInterval(600)
         self._parse_timer.timeout.connect(self._do_parse)
         self.text_edit.textChanged.connect(self._on_text_changed)
+        self._item_saved.connect(self._on_item_saved)
+        self._save_finished.connect(self._on_save_finished)
 
     # ── Layout ────────────────────────────────────────────────────────────────
 
@@ -189,6 +213,12 @@ class BulkItemImportDialog(QDialog):
         self._scroll.setWidget(self._list_container)
         layout.addWidget(self._scroll, stretch=1)
 
+        self._progress = QProgressBar()
+        self._progress.setTextVisible(True)
+        self._progress.setFormat("%v / %m")
+        self._progress.hide()
+        layout.addWidget(self._progress)
+
         # ---- Bottom bar ----
         bottom = QHBoxLayout()
         bottom.setSpacing(6)
@@ -213,6 +243,11 @@ class BulkItemImportDialog(QDialog):
         self._save_btn.clicked.connect(self._save_selected)
         bottom.addWidget(self._save_btn)
 
+        self._cancel_btn = QPushButton("Cancel")
+        self._cancel_btn.clicked.connect(self._cancel_save)
+        self._cancel_btn.hide()
+        bottom.addWidget(self._cancel_btn)
+
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.accept)
         bottom.addWidget(close_btn)
@@ -319,37 +354,94 @@ class BulkItemImportDialog(QDialog):
             )
             return
 
-        selected = [row for row in self._rows if row.is_selected()]
+        selected = [row for row in self._rows if row.is_pending()]
         if not selected:
             self._show_warning("No items selected.")
             return
 
-        saved = 0
-        errors = 0
+        self._warning.hide()
+        self._saving_rows = {row.block.key: row for row in selected}
         for row in selected:
-            block = row.block
+            row.mark_saving()
+        self._set_saving(True)
+        self._progress.setRange(0, len(self._saving_rows))
+        self._progress.setValue(0)
+        n = len(self._saving_rows)
+        self._summary_lbl.setText(f"Saving {n} item{'s' if n != 1 else ''}…")
+        self._summary_lbl.setStyleSheet("color: #555; font-style: italic;")
+
+        pipeline = SavePipeline(
+            self.storage_api, "items",
+            on_result=lambda key, error: self._item_saved.emit(key, error),
+        )
+        self._pipeline = pipeline
+        docs = [(row.block.key, row.block.data) for row in selected]
+
+        def _run() -> None:
             try:
-                self.storage_api.save_item(block.key, block.data)
-                row.mark_saved()
-                saved += 1
+                report = pipeline.run(docs)
             except Exception as exc:
-                row.mark_error(str(exc)[:60])
-                errors += 1
+                report = SaveReport(failed={key: str(exc) for key, _ in docs})
+            self._save_finished.emit(report)
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _set_saving(self, saving: bool) -> None:
+        self._save_btn.setEnabled(not saving)
+        self._select_all_btn.setEnabled(not saving)
+        self._deselect_all_btn.setEnabled(not saving)
+        self.text_edit.setReadOnly(saving)
+        self._cancel_btn.setEnabled(True)
+        self._cancel_btn.setVisible(saving)
+        self._progress.setVisible(saving)
+        for row in self._rows:
+            row.checkbox.setEnabled(not saving and not row.saved)
+
+    def _cancel_save(self) -> None:
+        if self._pipeline is not None:
+            self._pipeline.cancel()
+            self._cancel_btn.setEnabled(False)
+            self._summary_lbl.setText("Cancelling…")
+
+    def _on_item_saved(self, key: str, error: Optional[str]) -> None:
+        row = self._saving_rows.get(key)
+        if row is None:
+            return
+        if error is None:
+            row.mark_saved()
+        else:
+            row.mark_error(error[:60])
+        self._progress.setValue(self._progress.value() + 1)
+
+    def _on_save_finished(self, report: SaveReport) -> None:
+        self._pipeline = None
+        for key in report.cancelled:
+            row = self._saving_rows.get(key)
+            if row is not None:
+                row.mark_cancelled()
+        self._saving_rows = {}
+        self._set_saving(False)
 
         parts = []
-        if saved:
-            parts.append(f"{saved} saved")
-        if errors:
-            parts.append(f"{errors} failed")
+        if report.saved:
+            parts.append(f"{len(report.saved)} saved")
+        if report.failed:
+            parts.append(f"{len(report.failed)} failed")
+        if report.cancelled:
+            parts.append(f"{len(report.cancelled)} cancelled")
         self._summary_lbl.setText("  •  ".join(parts))
         self._summary_lbl.setStyleSheet(
-            f"color: {_ERR_FG};" if errors else f"color: {_OK_FG}; font-weight: bold;"
+            f"color: {_ERR_FG};" if report.failed or report.cancelled
+            else f"color: {_OK_FG}; font-weight: bold;"
         )
 
         # Disable save button if everything was saved (no un-saved rows left)
-        still_pending = any(
-            row.is_selected() and row.checkbox.isEnabled()
-            for row in self._rows
-        )
+        still_pending = any(row.is_pending() for row in self._rows)
         if not still_pending:
             self._save_btn.setEnabled(False)
+
+    def done(self, result: int) -> None:
+        # Closing mid-save stops the items not yet sent.
+        if self._pipeline is not None:
+            self._pipeline.cancel()
+        super().done(result)
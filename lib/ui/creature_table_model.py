@@ -514,6 +514,33 @@ class CreatureTableModel(QAbstractTableModel):
             [Qt.BackgroundRole],
         )
 
+    def refresh_rows(self, changes):
+        """Repaint only the given creatures' cells, without a layout change.
+
+        ``changes`` maps creature name -> iterable of field names to repaint,
+        or None to repaint the whole row (HP drives the row background, so HP
+        changes need the full row). Row order and membership must be unchanged;
+        use refresh() when creatures were added, removed or re-sorted.
+        """
+        if not changes or self.rowCount() <= 0 or self.columnCount() <= 0:
+            return
+        last_col = self.columnCount() - 1
+        for row, name in enumerate(self.creature_names):
+            if name not in changes:
+                continue
+            attrs = changes[name]
+            if attrs is None:
+                self.dataChanged.emit(
+                    self.index(row, 0),
+                    self.index(row, last_col),
+                    [Qt.DisplayRole, Qt.BackgroundRole],
+                )
+                continue
+            for attr in attrs:
+                if attr in self.fields:
+                    idx = self.index(row, self.fields.index(attr))
+                    self.dataChanged.emit(idx, idx, [Qt.DisplayRole, Qt.ToolTipRole])
+
     def set_creatures(self, creatures):
         # Keep the model consistent with how everything else reads creatures
         self.manager.creatures = creatures
@@ -0,0 +1,235 @@
+# lib/ui/event_log_dialog.py
+from __future__ import annotations
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit,
+    QPlainTextEdit, QPushButton, QCheckBox, QGroupBox, QSpinBox,
+    QFileDialog, QMessageBox,
+)
+
+from app.event_log import DEBUG, INFO, WARNING, ERROR, LEVEL_NAMES, event_log, level_name
+
+_LEVELS = [DEBUG, INFO, WARNING, ERROR]
+_ALL = "All categories"
+_ROOT = "(default)"
+_INHERIT = "(inherit)"
+
+
+class EventLogDialog(QDialog):
+    """Live view of the in-memory event log, with filtering and export.
+
+    The log itself lives in app.event_log; this only reads it. Records are
+    polled on a timer (the log is written from worker threads too), and the
+    per-category controls at the bottom change what gets recorded at all.
+    """
+
+    POLL_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Event Log")
+        self.resize(900, 560)
+        self._last_seq = 0
+
+        layout = QVBoxLayout(self)
+
+        # --- Filters ---
+        filters = QHBoxLayout()
+        filters.addWidget(QLabel("Show:"))
+        self.level_combo = QComboBox()
+        for level in _LEVELS:
+            self.level_combo.addItem(f"{level_name(level)} and above", level)
+        self.level_combo.setCurrentIndex(_LEVELS.index(DEBUG))
+        self.level_combo.currentIndexChanged.connect(self.reload)
+        filters.addWidget(self.level_combo)
+
+        self.category_combo = QComboBox()
+        self.category_combo.setMinimumWidth(160)
+        self.category_combo.currentIndexChanged.connect(self.reload)
+        filters.addWidget(self.category_combo)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Filter text…")
+        self.search_edit.textChanged.connect(self.reload)
+        filters.addWidget(self.search_edit, 1)
+
+        self.pause_check = QCheckBox("Pause")
+        filters.addWidget(self.pause_check)
+        layout.addLayout(filters)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.view.setMaximumBlockCount(event_log.capacity)
+        mono = QFont("Monospace")
+        mono.setStyleHint(QFont.TypeWriter)
+        self.view.setFont(mono)
+        layout.addWidget(self.view, 1)
+
+        # --- Recording controls ---
+        record_box = QGroupBox("Recording")
+        record_row = QHBoxLayout(record_box)
+        record_row.addWidget(QLabel("Category:"))
+        self.record_category = QComboBox()
+        self.record_category.setEditable(True)
+        self.record_category.setMinimumWidth(160)
+        self.record_category.currentTextChanged.connect(self._load_record_settings)
+        record_row.addWidget(self.record_category)
+        record_row.addWidget(QLabel("Level:"))
+        self.record_level = QComboBox()
+        self.record_level.addItem(_INHERIT, None)
+        for level in _LEVELS:
+            self.record_level.addItem(LEVEL_NAMES[level], level)
+        record_row.addWidget(self.record_level)
+        record_row.addWidget(QLabel("Keep 1 in"))
+        self.sample_spin = QSpinBox()
+        self.sample_spin.setRange(1, 1000)
+        self.sample_spin.setToolTip("Sample high-volume categories (1 keeps everything)")
+        record_row.addWidget(self.sample_spin)
+        apply_btn = QPushButton("Apply")
+        apply_btn.clicked.connect(self.on_apply_record_settings)
+        record_row.addWidget(apply_btn)
+        record_row.addStretch(1)
+        layout.addWidget(record_box)
+
+        # --- Buttons ---
+        buttons = QHBoxLayout()
+        self.count_label = QLabel()
+        buttons.addWidget(self.count_label)
+        buttons.addStretch(1)
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.on_clear)
+        buttons.addWidget(clear_btn)
+        export_btn = QPushButton("Export…")
+        export_btn.clicked.connect(self.on_export)
+        buttons.addWidget(export_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self._populate_categories()
+        self.reload()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(self.POLL_MS)
+
+    # ------------------------------------------------------------------
+
+    def _populate_categories(self):
+        categories = event_log.categories()
+        for combo, first in ((self.category_combo, _ALL), (self.record_category, _ROOT)):
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(first)
+            combo.addItems(categories)
+            idx = combo.findText(current)
+            combo.setCurrentIndex(idx if idx >= 0 else 0)
+            combo.blockSignals(False)
+        self._load_record_settings()
+
+    def _selected_category(self):
+        text = self.category_combo.currentText()
+        return None if text in ("", _ALL) else text
+
+    def _accepts(self, record):
+        if record.level < (self.level_combo.currentData() or DEBUG):
+            return False
+        category = self._selected_category()
+        if category and not (
+            record.category == category or record.category.startswith(category + ".")
+        ):
+            return False
+        needle = self.search_edit.text().strip().lower()
+        return not needle or needle in record.format_line().lower()
+
+    def _matching(self):
+        return [r for r in event_log.records() if self._accepts(r)]
+
+    def reload(self):
+        records = event_log.records()
+        if records:
+            self._last_seq = records[-1].seq
+        self.view.setPlainText(
+            "\n".join(r.format_line() for r in records if self._accepts(r))
+        )
+        self._scroll_to_end()
+        self._update_count()
+
+    def poll(self):
+        if self.pause_check.isChecked():
+            return
+        fresh = event_log.records(since_seq=self._last_seq)
+        if not fresh:
+            return
+        self._last_seq = fresh[-1].seq
+        for record in fresh:
+            if self._accepts(record):
+                self.view.appendPlainText(record.format_line())
+        known = self._known_categories()
+        if any(r.category not in known for r in fresh):
+            self._populate_categories()
+        self._scroll_to_end()
+        self._update_count()
+
+    def _known_categories(self):
+        return {self.category_combo.itemText(i) for i in range(self.category_combo.count())}
+
+    def _scroll_to_end(self):
+        bar = self.view.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def _update_count(self):
+        total = len(event_log.records())
+        self.count_label.setText(f"{total} buffered (max {event_log.capacity})")
+
+    def _record_category_key(self):
+        text = self.record_category.currentText().strip()
+        return "" if text == _ROOT else text
+
+    def _load_record_settings(self, *_):
+        category = self._record_category_key()
+        levels = event_log.levels()
+        level = levels.get(category)
+        idx = self.record_level.findData(level) if level is not None else 0
+        self.record_level.setCurrentIndex(max(idx, 0))
+        self.sample_spin.setValue(event_log.sample_rates().get(category, 1))
+
+    # ------------------------------------------------------------------
+
+    def on_apply_record_settings(self):
+        category = self._record_category_key()
+        level = self.record_level.currentData()
+        if level is None:
+            event_log.clear_level(category)
+        else:
+            event_log.set_level(category, level)
+        event_log.set_sample_rate(category, self.sample_spin.value())
+        self._populate_categories()
+
+    def on_clear(self):
+        event_log.clear()
+        self.view.clear()
+        self._update_count()
+
+    def on_export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Event Log", "event_log.txt",
+            "Text (*.txt);;JSON Lines (*.jsonl)",
+        )
+        if not path:
+            return
+        try:
+            count = event_log.export(path, self._matching())
+        except OSError as exc:
+            QMessageBox.warning(self, "Export Failed", str(exc))
+            return
+        QMessageBox.information(self, "Export Complete", f"Wrote {count} entries to {path}.")
+
+    def done(self, result):
+        self.timer.stop()
+        super().done(result)
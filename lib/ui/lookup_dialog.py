@@ -28,6 +28,9 @@ _RED    = "#7A1F1F"
 _ORANGE = "#C9801A"
 _TEXT   = "#1a1a1a"
 
+# Most hits a search puts in a list.
+_SEARCH_LIMIT = 500
+
 _SPELL_ORDINALS = {
     0: "Cantrip", 1: "1st", 2: "2nd", 3: "3rd",
     4: "4th", 5: "5th", 6: "6th", 7: "7th", 8: "8th", 9: "9th",
@@ -301,12 +304,13 @@ class LookupDialog(QDialog):
     and monster tabs display a configuration notice.
     """
 
-    _spell_keys_ready   = pyqtSignal(list)
-    _monster_keys_ready = pyqtSignal(list)
-    _items_ready        = pyqtSignal(list)   # list of (key, data) tuples
+    _spells_ready       = pyqtSignal(list)   # list of (key, summary) tuples
+    _monster_keys_page  = pyqtSignal(int, list, bool)  # generation, keys, first page
+    _items_ready        = pyqtSignal(list)   # list of (key, summary) tuples
     _spell_loaded       = pyqtSignal(object)    # dict | None
     _monster_loaded     = pyqtSignal(object)    # dict | None
     _item_loaded        = pyqtSignal(object)    # dict | None
+    _search_index_ready = pyqtSignal(bool)  # synced without error
 
     def __init__(self, storage_api, parent=None):
         super().__init__(parent)
@@ -320,8 +324,13 @@ class LookupDialog(QDialog):
         self._all_spell_keys:    list[str] = []
         self._spell_display_names: dict[str, str] = {}
         self._all_monster_keys: list[str] = []
+        self._monster_generation = 0
         self._all_item_keys:    list[str] = []
-        self._all_item_data:    dict[str, dict] = {}
+        self._item_summaries:   dict[str, dict] = {}
+        self._item_details:     dict[str, dict] = {}
+        self._search_ready = False
+        self._index_syncing = False
+        self._index_resync = False
 
         self._current_spell_key:    str | None  = None
         self._current_spell_data:   dict | None = None
@@ -402,12 +411,13 @@ class LookupDialog(QDialog):
     # ── Signal wiring ────────────────────────────────────────────────────────
 
     def _connect_signals(self):
-        self._spell_keys_ready.connect(self._on_spell_keys_loaded)
-        self._monster_keys_ready.connect(self._on_monster_keys_loaded)
+        self._spells_ready.connect(self._on_spells_loaded)
+        self._monster_keys_page.connect(self._on_monster_keys_page)
         self._items_ready.connect(self._on_items_loaded)
         self._spell_loaded.connect(self._on_spell_loaded)
         self._monster_loaded.connect(self._on_monster_loaded)
         self._item_loaded.connect(self._on_item_loaded)
+        self._search_index_ready.connect(self._on_search_index_ready)
 
         self._spell_tab.search.textChanged.connect(self._filter_spells)
         self._monster_tab.search.textChanged.connect(self._filter_monsters)
@@ -430,52 +440,132 @@ class LookupDialog(QDialog):
     def _start_background_loads(self):
         if self._api is None:
             return
+        for collection in ("spells", "statblocks", "items"):
+            self._reload(collection)
+        if hasattr(self._api, "search"):
+            self._refresh_search_index()
+
+    def _refresh_search_index(self):
+        """Sync the search index on a worker thread; searches never touch storage."""
+        if self._index_syncing:
+            self._index_resync = True  # run again once this one finishes
+            return
+        self._index_syncing = True
 
-        def _load_spells():
-            try:
-                keys = self._api.list_spell_keys()
-                self._spell_keys_ready.emit(sorted(keys))
-            except Exception:
-                self._spell_keys_ready.emit([])
-
-        def _load_monsters():
-            try:
-                keys = self._api.list_statblock_keys()
-                self._monster_keys_ready.emit(sorted(keys))
-            except Exception:
-                self._monster_keys_ready.emit([])
-
-        def _load_items():
+        def _build_index():
             try:
-                keys = sorted(self._api.list_item_keys())
-                pairs = []
-                for key in keys:
-                    try:
-                        data = self._api.get_item(key) or {}
-                    except Exception:
-                        data = {}
-                    pairs.append((key, data))
-                self._items_ready.emit(pairs)
+                self._api.sync_search_index()
             except Exception:
-                self._items_ready.emit([])
+                self._search_index_ready.emit(False)
+                return
+            self._search_index_ready.emit(True)
+
+        threading.Thread(target=_build_index, daemon=True).start()
+
+    def _on_search_index_ready(self, ok: bool):
+        self._index_syncing = False
+        if self._index_resync:
+            self._index_resync = False
+            self._refresh_search_index()
+        if not ok:
+            return  # keep filtering by name, or by the index as last synced
+        tabs = (
+            (self._spell_tab, self._filter_spells),
+            (self._monster_tab, self._filter_monsters),
+            (self._item_tab, self._filter_items),
+        )
+        first = not self._search_ready
+        self._search_ready = True
+        for tab, refilter in tabs:
+            if first:
+                tab.search.setPlaceholderText("Search text, tags, level:3, damage:fire\u2026")
+            if first or tab.search.text().strip():
+                refilter(tab.search.text())
+
+    def _reload(self, collection: str):
+        """Re-read one collection's list on a worker thread."""
+        if collection == "spells":
+            def _load():
+                try:
+                    self._spells_ready.emit(sorted(self._api.get_spell_manifest().items()))
+                except Exception:
+                    self._spells_ready.emit([])
+        elif collection == "statblocks":
+            # Pages from an older reload are dropped once this one starts.
+            self._monster_generation += 1
+            generation = self._monster_generation
 
-        threading.Thread(target=_load_spells,   daemon=True).start()
-        threading.Thread(target=_load_monsters, daemon=True).start()
-        threading.Thread(target=_load_items,    daemon=True).start()
+            def _load():
+                first = True
+                try:
+                    if hasattr(self._api, "iter_key_pages"):
+                        pages = self._api.iter_key_pages("statblocks")
+                    else:
+                        pages = iter([self._api.list_statblock_keys()])
+                    for keys in pages:
+                        self._monster_keys_page.emit(generation, keys, first)
+                        first = False
+                except Exception:
+                    pass  # keep whatever pages arrived
+                if first:
+                    self._monster_keys_page.emit(generation, [], True)
+        elif collection == "items":
+            def _load():
+                try:
+                    self._items_ready.emit(sorted(self._api.get_item_manifest().items()))
+                except Exception:
+                    self._items_ready.emit([])
+        else:
+            return
+        threading.Thread(target=_load, daemon=True).start()
 
-    def _on_spell_keys_loaded(self, keys: list):
+    def on_library_changed(self, collection: str, keys: set, reset: bool):
+        """ChangeFeed subscriber: drop stale copies, re-list ``collection``, re-sync search."""
+        if self._api is None:
+            return
+        if collection == "items":
+            if reset:
+                self._item_details.clear()
+            for key in keys:
+                self._item_details.pop(key, None)
+        elif collection == "spells":
+            self._monster_widget.invalidate_spells(keys, reset)
+        self._reload(collection)
+        if hasattr(self._api, "search"):
+            self._refresh_search_index()
+
+    def _on_spells_loaded(self, pairs: list):
+        keys = [key for key, _ in pairs]
         self._all_spell_keys = keys
-        self._spell_display_names = {key: _key_to_display(key) for key in keys}
-        self._populate_spell_list(keys)
-
-    def _on_monster_keys_loaded(self, keys: list):
-        self._all_monster_keys = keys
-        self._populate_list(self._monster_tab.list, keys)
+        self._spell_display_names = {
+            key: summary.get("name") or _key_to_display(key) for key, summary in pairs
+        }
+        self._filter_spells(self._spell_tab.search.text())
+
+    def _on_monster_keys_page(self, generation: int, keys: list, first: bool):
+        """Show one page of statblock keys as soon as it arrives."""
+        if generation != self._monster_generation:
+            return
+        keys = sorted(keys)
+        text = self._monster_tab.search.text()
+        if first:
+            self._all_monster_keys = keys
+            self._filter_monsters(text)
+            return
+        in_order = not keys or not self._all_monster_keys or keys[0] > self._all_monster_keys[-1]
+        if not in_order:
+            self._all_monster_keys = sorted(self._all_monster_keys + keys)
+            self._filter_monsters(text)
+            return
+        self._all_monster_keys.extend(keys)
+        if not (self._search_ready and text.strip()):
+            # Append instead of rebuilding so the selection and scroll survive.
+            self._append_filtered(self._monster_tab.list, keys, text)
 
     def _on_items_loaded(self, pairs: list):
         self._all_item_keys = [key for key, _ in pairs]
-        self._all_item_data = {key: data for key, data in pairs}
-        self._populate_item_list(pairs)
+        self._item_summaries = {key: summary for key, summary in pairs}
+        self._filter_items(self._item_tab.search.text())
 
     def _populate_item_list(self, pairs: list):
         self._item_tab.list.clear()
@@ -505,7 +595,21 @@ class LookupDialog(QDialog):
 
     # ── Filtering ────────────────────────────────────────────────────────────
 
+    def _search_keys(self, collection: str, text: str) -> Optional[list]:
+        """Ranked keys from the storage search index, or None to fall back to names."""
+        if not self._search_ready or not text.strip():
+            return None
+        try:
+            hits = self._api.search(text, collections=(collection,), limit=_SEARCH_LIMIT)
+        except Exception:
+            return None
+        return [hit.key for hit in hits]
+
     def _filter_spells(self, text: str):
+        ranked = self._search_keys("spells", text)
+        if ranked is not None:
+            self._populate_spell_list(ranked)
+            return
         text = text.lower().strip()
         filtered = [
             key for key in self._all_spell_keys
@@ -514,13 +618,21 @@ class LookupDialog(QDialog):
         self._populate_spell_list(filtered)
 
     def _filter_monsters(self, text: str):
+        ranked = self._search_keys("statblocks", text)
+        if ranked is not None:
+            self._populate_list(self._monster_tab.list, ranked)
+            return
         self._apply_filter(self._monster_tab.list, self._all_monster_keys, text)
 
     @staticmethod
     def _apply_filter(widget: QListWidget, all_keys: list, text: str):
-        text = text.lower().strip()
         widget.clear()
-        for key in all_keys:
+        LookupDialog._append_filtered(widget, all_keys, text)
+
+    @staticmethod
+    def _append_filtered(widget: QListWidget, keys: list, text: str):
+        text = text.lower().strip()
+        for key in keys:
             display = _key_to_display(key)
             if text in display.lower():
                 item = QListWidgetItem(display)
@@ -528,11 +640,15 @@ class LookupDialog(QDialog):
                 widget.addItem(item)
 
     def _filter_items(self, text: str):
+        ranked = self._search_keys("items", text)
+        if ranked is not None:
+            self._populate_item_list([(key, self._item_summaries.get(key, {})) for key in ranked])
+            return
         text = text.lower().strip()
         pairs = [
-            (key, self._all_item_data.get(key, {}))
+            (key, self._item_summaries.get(key, {}))
             for key in self._all_item_keys
-            if text in (self._all_item_data.get(key, {}).get("name") or _key_to_display(key)).lower()
+            if text in (self._item_summaries.get(key, {}).get("name") or _key_to_display(key)).lower()
         ]
         self._populate_item_list(pairs)
 
@@ -597,7 +713,7 @@ class LookupDialog(QDialog):
             return
         key = current.data(Qt.UserRole)
         self._current_item_key = key
-        cached = self._all_item_data.get(key)
+        cached = self._item_details.get(key)
         if cached:
             self._item_loaded.emit(cached)
         else:
@@ -658,6 +774,8 @@ class LookupDialog(QDialog):
     def _on_item_loaded(self, data):
         if data:
             self._current_item_data = data
+            if self._current_item_key:
+                self._item_details[self._current_item_key] = data
             self._item_browser.setHtml(_build_item_html(data))
             self._item_delete_btn.setEnabled(True)
         else:
@@ -813,7 +931,8 @@ class LookupDialog(QDialog):
                 break
         if key in self._all_item_keys:
             self._all_item_keys.remove(key)
-        self._all_item_data.pop(key, None)
+        self._item_summaries.pop(key, None)
+        self._item_details.pop(key, None)
         self._current_item_key  = None
         self._current_item_data = None
         self._item_browser.setHtml(_placeholder_html("No item selected."))
@@ -12,6 +12,7 @@ import os
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
     QButtonGroup,
+    QCheckBox,
     QDialog,
     QFileDialog,
     QFrame,
@@ -73,14 +74,23 @@ class SetupWizard(QDialog):
 
         # --- Local section ---
         self.local_box = QGroupBox("Local Data Directory")
-        local_layout = QHBoxLayout(self.local_box)
+        local_layout = QVBoxLayout(self.local_box)
+        row_dir = QHBoxLayout()
         self.local_dir_edit = QLineEdit()
         self.local_dir_edit.setPlaceholderText(_DEFAULT_DATA_DIR)
         browse_btn = QPushButton("Browse…")
         browse_btn.setFixedWidth(80)
         browse_btn.clicked.connect(self._browse)
-        local_layout.addWidget(self.local_dir_edit)
-        local_layout.addWidget(browse_btn)
+        row_dir.addWidget(self.local_dir_edit)
+        row_dir.addWidget(browse_btn)
+        local_layout.addLayout(row_dir)
+        self.sqlite_check = QCheckBox(
+            "Keep the library in a single database file (faster for large libraries)"
+        )
+        self.sqlite_check.setToolTip(
+            "Existing JSON files in the data directory are imported the first time."
+        )
+        local_layout.addWidget(self.sqlite_check)
         root.addWidget(self.local_box)
 
         # --- API section ---
@@ -148,10 +158,12 @@ class SetupWizard(QDialog):
             self._on_mode_changed(False)
 
         local_dir = settings.get("local_data_dir") or os.getenv("LOCAL_DATA_DIR", "")
+        engine = settings.get("local_storage_engine") or os.getenv("LOCAL_STORAGE_ENGINE", "")
         api_url = settings.get("storage_api_base") or os.getenv("STORAGE_API_BASE", "")
         api_key = settings.get("storage_api_key") or os.getenv("STORAGE_API_KEY", "")
 
         self.local_dir_edit.setText(local_dir)
+        self.sqlite_check.setChecked(engine.strip().lower() == "sqlite")
         self.api_url_edit.setText(api_url)
         self.api_key_edit.setText(api_key)
 
@@ -170,5 +182,6 @@ class SetupWizard(QDialog):
             settings.save({
                 "storage_mode": "local",
                 "local_data_dir": self.local_dir_edit.text().strip(),
+                "local_storage_engine": "sqlite" if self.sqlite_check.isChecked() else "files",
             })
         self.accept()
@@ -157,21 +157,12 @@ class ShopGeneratorDialog(QDialog):
             return
 
         try:
-            keys = self.storage_api.list_item_keys()
+            items = self.storage_api.get_items_bulk()
         except Exception as exc:
             self._status.showMessage(f"Failed to load items: {exc}")
             return
 
-        items: list[dict] = []
-        for key in keys:
-            try:
-                item = self.storage_api.get_item(key)
-                if item:
-                    items.append(item)
-            except Exception:
-                pass
-
-        self._items = items
+        self._items = list(items.values())
 
     # ── Generate ─────────────────────────────────────────────────────
 
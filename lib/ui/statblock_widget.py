@@ -133,6 +133,14 @@ class StatblockWidget(QTextBrowser):
         self._storage_api = api
         self._spell_cache.clear()
 
+    def invalidate_spells(self, keys, reset: bool = False) -> None:
+        """Forget cached tooltip data for changed spell keys ("fireball.json" or "fireball")."""
+        if reset:
+            self._spell_cache.clear()
+            return
+        for key in keys:
+            self._spell_cache.pop(key[:-5] if key.endswith(".json") else key, None)
+
     # ── Public API ───────────────────────────────────────────────────
 
     def load_statblock(self, data: dict) -> None:
@@ -1,3 +1,4 @@
+import time
 from typing import Optional
 from PyQt5.QtWidgets import (
     QApplication, QVBoxLayout, QLabel, QLineEdit,
@@ -42,6 +43,8 @@ class InitiativeTracker(QMainWindow, Application):
             self.pop_lists()
         except Exception as e:
             print(f"[Startup] Failed to load last state: {e}")
+        self.arm_autosave()
+        self.start_storage_changes()
         self.start_bridge_polling()
 
     def initUI(self):
@@ -235,6 +238,17 @@ class InitiativeTracker(QMainWindow, Application):
         self.bridge_status_label = QLabel("● Bridge: Disabled")
         self.bridge_status_label.setStyleSheet("padding: 0 8px; color: #888;")
         self.status_bar.addPermanentWidget(self.bridge_status_label)
+        self.autosave_label = QLabel("Not saved yet")
+        self.autosave_label.setStyleSheet("padding: 0 8px; color: #888;")
+        self.status_bar.addPermanentWidget(self.autosave_label)
+        if getattr(self, "storage_sync", None) is not None:
+            self.sync_status_label = QLabel("● Sync: Starting")
+            self.sync_status_label.setStyleSheet("padding: 0 8px; color: #888;")
+            self.status_bar.addPermanentWidget(self.sync_status_label)
+        if getattr(self, "storage_health", None) is not None:
+            self.storage_health_label = QLabel()
+            self.status_bar.addPermanentWidget(self.storage_health_label)
+            self.set_storage_health(self.storage_health.status())
 
     def show_status_message(self, msg: str, timeout_ms: int = 4000):
         if hasattr(self, "status_bar"):
@@ -306,6 +320,10 @@ class InitiativeTracker(QMainWindow, Application):
         from ui.foundry_ignore_dialog import FoundryIgnoreDialog
         FoundryIgnoreDialog(self).exec_()
 
+    def open_event_log(self):
+        from ui.event_log_dialog import EventLogDialog
+        EventLogDialog(self).exec_()
+
     def new_pc_group(self):
         """Straight to the 'name it, then build the roster' flow."""
         from ui.pc_groups_dialog import create_new_pc_group
@@ -324,6 +342,64 @@ class InitiativeTracker(QMainWindow, Application):
             self.bridge_status_label.setText("● Bridge: Disabled")
             self.bridge_status_label.setStyleSheet("padding: 0 8px; color: #888;")
 
+    def set_autosave_status(self, saved_at, error: str = "") -> None:
+        if not hasattr(self, "autosave_label"):
+            return
+        if error:
+            self.autosave_label.setText("Autosave failed")
+            self.autosave_label.setToolTip(error)
+            self.autosave_label.setStyleSheet("padding: 0 8px; color: #e74c3c;")
+        else:
+            stamp = time.strftime("%H:%M:%S", time.localtime(saved_at))
+            self.autosave_label.setText(f"Saved {stamp}")
+            self.autosave_label.setToolTip("Last successful save of the combat state")
+            self.autosave_label.setStyleSheet("padding: 0 8px; color: #888;")
+
+    def set_sync_status(self, status: dict) -> None:
+        if not hasattr(self, "sync_status_label"):
+            return
+        pending, conflicts = status.get("pending", 0), status.get("conflicts", 0)
+        if conflicts:
+            self.sync_status_label.setText(f"● Sync: {conflicts} conflict(s)")
+            self.sync_status_label.setToolTip(
+                "Edits made here lost to newer copies on the server; "
+                "the server copies are shown and yours were kept aside."
+            )
+            self.sync_status_label.setStyleSheet("padding: 0 8px; color: #e67e22;")
+        elif status.get("online") is False:
+            self.sync_status_label.setText(f"● Sync: Offline ({pending} waiting)")
+            self.sync_status_label.setToolTip("Working from the local copy; changes upload when the server is back")
+            self.sync_status_label.setStyleSheet("padding: 0 8px; color: #e74c3c;")
+        else:
+            text = f"● Sync: {pending} waiting" if pending else "● Sync: Up to date"
+            self.sync_status_label.setText(text)
+            self.sync_status_label.setToolTip("Local copy of the Storage service")
+            self.sync_status_label.setStyleSheet("padding: 0 8px; color: #2ecc71;")
+
+    def set_storage_health(self, status: dict) -> None:
+        if not hasattr(self, "storage_health_label"):
+            return
+        state = status.get("state")
+        if state == "open":
+            self.storage_health_label.setText("● Storage: Unreachable")
+            self.storage_health_label.setToolTip(
+                "Requests fail straight away instead of waiting for a timeout; "
+                f"the next attempt is in {status.get('retry_in_s', 0):.0f}s"
+            )
+            self.storage_health_label.setStyleSheet("padding: 0 8px; color: #e74c3c;")
+        elif state == "half_open":
+            self.storage_health_label.setText("● Storage: Reconnecting")
+            self.storage_health_label.setToolTip("Checking whether the Storage service is back")
+            self.storage_health_label.setStyleSheet("padding: 0 8px; color: #e67e22;")
+        else:
+            latency = status.get("latency_ms")
+            self.storage_health_label.setText("● Storage: Online")
+            self.storage_health_label.setToolTip(
+                f"Typical response {latency} ms, timeout {status.get('timeout_s')}s"
+                if latency is not None else "Storage service"
+            )
+            self.storage_health_label.setStyleSheet("padding: 0 8px; color: #2ecc71;")
+
     def _monster_list_context_menu(self, pos):
         menu = QMenu(self)
         import_action = menu.addAction("Import Statblock...")
@@ -445,6 +521,11 @@ class InitiativeTracker(QMainWindow, Application):
         self.foundry_ignore_action.triggered.connect(self.open_foundry_ignore)
         self.tools_menu.addAction(self.foundry_ignore_action)
 
+        self.event_log_action = QAction("Event Log…", self)
+        self.event_log_action.setToolTip("Recent bridge and app events, with filtering and export")
+        self.event_log_action.triggered.connect(self.open_event_log)
+        self.tools_menu.addAction(self.event_log_action)
+
         self.next_turn_action = QAction("Next Turn", self)
         self.next_turn_action.setShortcut(QKeySequence("Ctrl+N"))
         self.next_turn_action.triggered.connect(self.next_turn)
@@ -922,6 +1003,23 @@ class InitiativeTracker(QMainWindow, Application):
                 stream_stop.set()
             except Exception:
                 pass
+        prefetcher = getattr(self, "statblock_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.shutdown()
+        # The final state goes into the mirror's outbox, so write it first.
+        if getattr(self, "autosave", None) is not None:
+            self.flush_autosave()
+        if (
+            getattr(self, "storage_changes", None) is not None
+            or getattr(self, "storage_sync", None) is not None
+        ):
+            self.stop_storage_changes()
+        cache = getattr(getattr(self, "storage_api", None), "cache", None)
+        if cache is not None:
+            cache.close()
+        bridge_client = getattr(self, "bridge_client", None)
+        if bridge_client is not None:
+            bridge_client.close()
         super().closeEvent(event)
 
     def eventFilter(self, obj, event):
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Compare the slotted creature representation with the old __dict__ one.
+
+The old layout is rebuilt here as a regular dataclass with the same fields
+and properties and a fresh dict for every resource field. For encounters of
+each size it measures
+  build     constructing N monsters (one in five is a spellcaster); the
+            slotted side goes through Monster(), so it pays for that too
+  paint     one table repaint's worth of reads: the raw column attributes
+            CreatureTableModel.data() uses plus the common properties
+  bytes     memory allocated per creature, via tracemalloc
+
+Usage:
+    python scripts/bench_creatures.py [--sizes 10,100,1000] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "lib"))
+
+from app.creature import RESOURCE_FIELDS, CreatureType, I_Creature, Monster  # noqa: E402
+
+COLUMNS = (
+    "_name", "_init", "_curr_hp", "_max_hp", "_armor_class", "_movement", "_action",
+    "_bonus_action", "_reaction", "_object_interaction", "_notes", "_status_time",
+    "_type", "_is_lair_action", "_death_successes", "_death_failures", "_death_stable",
+    "_temp_hp", "_max_hp_bonus", "_spell_slots", "_innate_slots", "_ability_uses",
+)
+PROPERTIES = ("name", "initiative", "curr_hp", "temp_hp", "effective_max_hp", "conditions", "active")
+
+
+def _dict_creature_class():
+    spec = []
+    for f in dataclasses.fields(I_Creature):
+        if f.name in RESOURCE_FIELDS:
+            spec.append((f.name, f.type, dataclasses.field(default_factory=dict)))
+        elif f.default_factory is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+    namespace = {k: v for k, v in vars(I_Creature).items() if isinstance(v, property)}
+    return dataclasses.make_dataclass("DictCreature", spec, namespace=namespace)
+
+
+DictCreature = _dict_creature_class()
+
+
+def _monster_kwargs(i: int) -> dict:
+    caster = i % 5 == 0
+    return {
+        "name": f"Goblin_{i}",
+        "init": i % 20,
+        "max_hp": 7,
+        "curr_hp": 7,
+        "armor_class": 15,
+        "movement": 30,
+        "conditions": None,
+        "spell_slots": {1: 2, 2: 1} if caster else None,
+        "spell_slots_used": {1: 0, 2: 0} if caster else None,
+        "innate_slots": None,
+        "innate_slots_used": None,
+        "ability_uses": {"Nimble Escape": -1} if caster else None,
+        "ability_uses_used": None,
+    }
+
+
+def _build_slotted(n: int) -> list:
+    return [Monster(**_monster_kwargs(i)) for i in range(n)]
+
+
+def _build_dict(n: int) -> list:
+    out = []
+    for i in range(n):
+        kw = _monster_kwargs(i)
+        out.append(DictCreature(
+            _type=CreatureType.MONSTER,
+            _name=kw["name"],
+            _init=kw["init"],
+            _max_hp=kw["max_hp"],
+            _curr_hp=kw["curr_hp"],
+            _armor_class=kw["armor_class"],
+            _movement=kw["movement"],
+            _conditions=[],
+            _spell_slots=kw["spell_slots"] or {},
+            _innate_slots={},
+            _spell_slots_used=kw["spell_slots_used"] or {},
+            _innate_slots_used={},
+            _ability_uses=kw["ability_uses"] or {},
+            _ability_uses_used={},
+        ))
+    return out
+
+
+def _paint(creatures: list) -> None:
+    for creature in creatures:
+        for attr in COLUMNS:
+            getattr(creature, attr)
+        for prop in PROPERTIES:
+            getattr(creature, prop)
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def _bytes_per_creature(build, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    creatures = build(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del creatures
+    return (after - before) / n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    print(f"median of {args.repeat}")
+    print(f"{'creatures':>9}  {'layout':<7}  {'build ms':>9}  {'paint ms':>9}  {'bytes each':>10}")
+    for n in sizes:
+        for layout, build in (("dict", _build_dict), ("slotted", _build_slotted)):
+            creatures = build(n)
+            print(
+                f"{n:>9}  {layout:<7}  {_time(lambda: build(n), args.repeat):>9.3f}  "
+                f"{_time(lambda: _paint(creatures), args.repeat):>9.3f}  "
+                f"{_bytes_per_creature(build, n):>10.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
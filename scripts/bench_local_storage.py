@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON-directory and SQLite local storage engines.
+
+Builds a synthetic library (statblocks, spells, items) in a temp dir with
+LocalStorage, migrates it into SQLiteStorage, then times the operations the
+app leans on: listing keys, bulk reads, manifests, random single gets and a
+batch of saves.
+
+Usage:
+    python scripts/bench_local_storage.py [--items N] [--spells N]
+                                          [--statblocks N] [--repeat N] [--json PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "lib"))
+
+from app.local_storage import LocalStorage  # noqa: E402
+from app.sqlite_storage import SQLiteStorage, migrate_directory  # noqa: E402
+
+_SCHOOLS = ["Abjuration", "Conjuration", "Evocation", "Illusion", "Necromancy"]
+_RARITIES = ["common", "uncommon", "rare", "very rare", "legendary"]
+
+
+def _build_library(storage, n_items: int, n_spells: int, n_statblocks: int) -> None:
+    rng = random.Random(7)
+    for i in range(n_items):
+        storage.save_item(f"item_{i:05d}.json", {
+            "name": f"Item {i}",
+            "cost": f"{rng.randint(1, 500)} gp",
+            "rarity": rng.choice(_RARITIES),
+            "tags": rng.sample(["weapon", "armor", "potion", "wondrous", "tool"], 2),
+            "description": "An item. " * 40,
+        })
+    for i in range(n_spells):
+        storage.save_spell(f"spell_{i:05d}.json", {
+            "name": f"Spell {i}",
+            "level": rng.randint(0, 9),
+            "school": rng.choice(_SCHOOLS),
+            "concentration": rng.random() < 0.4,
+            "description": "A spell. " * 60,
+        })
+    for i in range(n_statblocks):
+        storage.save_statblock(f"monster_{i:05d}.json", {
+            "name": f"Monster {i}",
+            "size": "Medium",
+            "type": "humanoid",
+            "challenge_rating": str(rng.randint(0, 20)),
+            "hit_points": rng.randint(5, 300),
+            "actions": [{"name": "Hit", "desc": "It hits. " * 20}] * 3,
+        })
+
+
+def _time(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def _bench(storage, repeat: int) -> dict:
+    rng = random.Random(11)
+    item_keys = storage.list_item_keys()
+    sample = [rng.choice(item_keys) for _ in range(200)] if item_keys else []
+
+    def _single_gets():
+        for key in sample:
+            storage.get_item(key)
+
+    def _batch_saves():
+        batch = getattr(storage, "batch", None)
+        ctx = batch() if batch else _NullContext()
+        with ctx:
+            for i in range(200):
+                storage.save_item(f"bench_{i:03d}.json", {"name": f"Bench {i}", "cost": "1 gp"})
+
+    return {
+        "list_keys (3 collections)": _time(
+            lambda: (storage.list_item_keys(), storage.list_spell_keys(),
+                     storage.list_statblock_keys()),
+            repeat,
+        ),
+        "bulk read items": _time(lambda: storage.get_items_bulk(), repeat),
+        "bulk read spells": _time(lambda: storage.get_spells_bulk(), repeat),
+        "item manifest": _time(lambda: storage.get_item_manifest(), repeat),
+        "200 random get_item": _time(_single_gets, repeat),
+        "200 save_item": _time(_batch_saves, repeat),
+    }
+
+
+class _NullContext:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--spells", type=int, default=1000)
+    parser.add_argument("--statblocks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "data")
+        files = LocalStorage(data_dir)
+        start = time.perf_counter()
+        _build_library(files, args.items, args.spells, args.statblocks)
+        print(f"built library in {time.perf_counter() - start:.1f}s")
+
+        db = SQLiteStorage(os.path.join(tmp, "library.sqlite"))
+        start = time.perf_counter()
+        counts = migrate_directory(data_dir, db)
+        print(f"migrated {counts} in {time.perf_counter() - start:.2f}s")
+
+        results = {"files": _bench(files, args.repeat), "sqlite": _bench(db, args.repeat)}
+        db.close()
+
+    width = max(len(name) for name in results["files"])
+    print(f"\n{'operation':<{width}}  {'files ms':>10}  {'sqlite ms':>10}  {'speedup':>8}")
+    for name, f in results["files"].items():
+        s = results["sqlite"][name]
+        speedup = f["median_ms"] / s["median_ms"] if s["median_ms"] else float("inf")
+        print(f"{name:<{width}}  {f['median_ms']:>10.2f}  {s['median_ms']:>10.2f}  {speedup:>7.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
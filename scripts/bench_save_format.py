@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compare save formats: payload size and load time.
+
+Builds an encounter with N monsters and a party of players, then measures
+  v1           GameState.to_dict() as LocalStorage wrote it (indent=2)
+  v2           save_format.encode_state(), written compact
+  v2 zlib      encode_state(compress=True)
+for the bytes on disk, encode time, and load time (parse + decode). Load is
+timed twice for v2: decoding every creature ("all") and adding the monsters
+of an encounter only ("monsters"), which never decodes the players.
+
+Usage:
+    python scripts/bench_save_format.py [--monsters N] [--players N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "lib"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+from bench_serialization import _build_state  # noqa: E402
+from app.save_format import decode_state, encode_state  # noqa: E402
+from app.serialization import from_primitive, to_primitive  # noqa: E402
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def _load_all(text: str) -> None:
+    state = decode_state(json.loads(text))
+    list(state["players"]), list(state["monsters"])
+
+
+def _load_monsters(text: str) -> None:
+    list(decode_state(json.loads(text))["monsters"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--monsters", type=int, default=500)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    state = _build_state(args.monsters, args.players)
+    compact = (",", ":")
+    v1 = json.dumps(to_primitive(state.to_dict()), ensure_ascii=False, indent=2)
+    v2 = json.dumps(encode_state(state), ensure_ascii=False, separators=compact)
+    v2z = json.dumps(encode_state(state, compress=True), ensure_ascii=False, separators=compact)
+
+    def _load_v1() -> None:
+        from_primitive(json.loads(v1))
+
+    rows = [
+        ("v1", len(v1.encode("utf-8")),
+         _time(lambda: to_primitive(state.to_dict()), args.repeat),
+         _time(_load_v1, args.repeat), None),
+        ("v2", len(v2.encode("utf-8")),
+         _time(lambda: encode_state(state), args.repeat),
+         _time(lambda: _load_all(v2), args.repeat),
+         _time(lambda: _load_monsters(v2), args.repeat)),
+        ("v2 zlib", len(v2z.encode("utf-8")),
+         _time(lambda: encode_state(state, compress=True), args.repeat),
+         _time(lambda: _load_all(v2z), args.repeat),
+         _time(lambda: _load_monsters(v2z), args.repeat)),
+    ]
+
+    print(f"{args.monsters} monsters + {args.players} players, median of {args.repeat}")
+    print(f"{'format':<8}  {'bytes':>9}  {'encode ms':>9}  {'load all ms':>11}  {'load monsters ms':>16}")
+    for name, size, enc, load_all, load_monsters in rows:
+        monsters = f"{load_monsters:>16.2f}" if load_monsters is not None else f"{'-':>16}"
+        print(f"{name:<8}  {size:>9}  {enc:>9.2f}  {load_all:>11.2f}  {monsters}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
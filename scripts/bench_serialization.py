@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Time encounter saves and loads: old double round trip vs single pass.
+
+Builds an encounter with N monsters and a party of players, then compares:
+  encode  json.loads(json.dumps(state, cls=CustomEncoder))  vs  to_primitive(state)
+  decode  json.loads(json.dumps(raw), object_hook=...)       vs  from_primitive(raw)
+  save    LocalStorage.put_json before/after (includes the file write)
+
+Usage:
+    python scripts/bench_serialization.py [--monsters N] [--players N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "lib"))
+
+from app.creature import CustomEncoder, I_Creature, Monster, Player  # noqa: E402
+from app.local_storage import LocalStorage  # noqa: E402
+from app.save_json import GameState  # noqa: E402
+from app.serialization import from_primitive, to_primitive  # noqa: E402
+
+
+def _build_state(n_monsters: int, n_players: int) -> GameState:
+    state = GameState()
+    state.players = [
+        Player(name=f"Player {i}", init=10 + i, max_hp=40, curr_hp=33,
+               conditions=["Blessed"], spell_slots={1: 4, 2: 3, 3: 2},
+               spell_slots_used={1: 2}, foundry_actor_id=f"actor{i}")
+        for i in range(n_players)
+    ]
+    state.monsters = [
+        Monster(name=f"Goblin {i}", init=i % 20, max_hp=7, curr_hp=7 - i % 7,
+                notes="Scimitar +4, 1d6+2 slashing. " * 4,
+                innate_slots={"misty step": 1}, ability_uses={"Nimble Escape": 3},
+                foundry_combatant_id=f"c{i}", foundry_token_id=f"t{i}")
+        for i in range(n_monsters)
+    ]
+    state.current_turn = 0
+    state.round_counter = 3
+    state.time_counter = 18
+    return state
+
+
+def _old_decoder(data):
+    if "_type" in data:
+        return I_Creature.from_dict(data)
+    return data
+
+
+def _old_put_json(storage: LocalStorage, key: str, obj: dict) -> None:
+    text = json.dumps(obj, cls=CustomEncoder, ensure_ascii=False)
+    storage._write_json(storage._enc_path(key), json.loads(text))
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--monsters", type=int, default=500)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    state = _build_state(args.monsters, args.players).to_dict()
+    raw = to_primitive(state)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalStorage(tmp)
+        rows = [
+            ("encode", _time(lambda: json.loads(json.dumps(state, cls=CustomEncoder)), args.repeat),
+             _time(lambda: to_primitive(state), args.repeat)),
+            ("decode", _time(lambda: json.loads(json.dumps(raw), object_hook=_old_decoder), args.repeat),
+             _time(lambda: from_primitive(raw), args.repeat)),
+            ("save (put_json)", _time(lambda: _old_put_json(storage, "bench.json", state), args.repeat),
+             _time(lambda: storage.put_json("bench.json", state), args.repeat)),
+        ]
+
+    print(f"{args.monsters} monsters + {args.players} players, median of {args.repeat}")
+    print(f"{'step':<16}  {'before ms':>10}  {'after ms':>10}  {'speedup':>8}")
+    for name, before, after in rows:
+        print(f"{name:<16}  {before:>10.2f}  {after:>10.2f}  {before / after:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Run the same storage workloads against every backend and emit JSON.
+
+Backends:
+  files   LocalStorage (one JSON file per record)
+  sqlite  SQLiteStorage (library.sqlite)
+  api     StorageAPI against the in-process mock server (app.mock_storage_api),
+          with --latency-ms added to every request (and key listings split
+          into --page-size pages when given)
+
+Workloads, on the items collection at each --sizes record count:
+  list    list_item_keys()
+  get     get_item() for up to 200 random keys
+  put     save_item() for 100 records (inside batch() where the backend has one)
+  bulk    get_items_bulk() of everything
+  search  case-insensitive name search through the item manifest
+
+Results go to --json (default: stdout when no table is wanted) as
+{"meta": {...}, "results": [{"backend", "size", "workload", "median_ms", ...}]}.
+Pass --baseline with an earlier file to flag workloads that slowed down by
+more than --threshold; the exit status is 1 if any did.
+
+Usage:
+    python scripts/bench_storage.py [--sizes 100,1000,10000] [--backends files,sqlite,api]
+                                    [--repeat N] [--latency-ms MS] [--page-size N]
+                                    [--json PATH|-]
+                                    [--baseline PATH] [--threshold 1.25]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(REPO_ROOT, "lib"))
+
+from app.local_storage import LocalStorage  # noqa: E402
+from app.mock_storage_api import MockStorageServer  # noqa: E402
+from app.sqlite_storage import SQLiteStorage  # noqa: E402
+from app.storage_api import StorageAPI  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000)
+WORKLOADS = ("list", "get", "put", "bulk", "search")
+GET_SAMPLE = 200
+PUT_COUNT = 100
+
+_RARITIES = ["common", "uncommon", "rare", "very rare", "legendary"]
+_TAGS = ["weapon", "armor", "potion", "wondrous", "tool"]
+
+
+def _records(n: int) -> dict:
+    rng = random.Random(7)
+    return {
+        f"item_{i:05d}.json": {
+            "name": f"Item {i}",
+            "cost": f"{rng.randint(1, 500)} gp",
+            "rarity": rng.choice(_RARITIES),
+            "tags": rng.sample(_TAGS, 2),
+            "description": "An item. " * 40,
+        }
+        for i in range(n)
+    }
+
+
+# ---- backends: each yields a storage object seeded with ``records`` ----
+# Seeding bypasses the code under test where it would dominate setup time.
+
+@contextmanager
+def _files_backend(records: dict, _args):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = LocalStorage(tmp)
+        for key, data in records.items():
+            with open(os.path.join(tmp, "items", key), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        yield storage
+
+
+@contextmanager
+def _sqlite_backend(records: dict, _args):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "library.sqlite"))
+        with storage.batch():
+            for key, data in records.items():
+                storage.save_item(key, data)
+        try:
+            yield storage
+        finally:
+            storage.close()
+
+
+@contextmanager
+def _api_backend(records: dict, args):
+    with MockStorageServer(
+        latency_s=args.latency_ms / 1000.0, page_size=args.page_size
+    ) as server:
+        for key, data in records.items():
+            server.store.put("items", key, data)
+        api = StorageAPI(server.base_url)
+        try:
+            yield api
+        finally:
+            api.session.close()
+
+
+BACKENDS = {
+    "files": _files_backend,
+    "sqlite": _sqlite_backend,
+    "api": _api_backend,
+}
+
+
+# ---- workloads ----
+
+def _search(storage, text: str) -> list:
+    text = text.lower()
+    return [
+        key for key, summary in storage.get_item_manifest().items()
+        if text in (summary.get("name") or "").lower()
+    ]
+
+
+def _workloads(storage, keys: list) -> dict:
+    rng = random.Random(11)
+    sample = [rng.choice(keys) for _ in range(min(GET_SAMPLE, len(keys)))]
+
+    def _gets():
+        for key in sample:
+            storage.get_item(key)
+
+    def _puts():
+        batch = getattr(storage, "batch", None)
+        with batch() if batch else nullcontext():
+            for i in range(PUT_COUNT):
+                storage.save_item(f"bench_{i:03d}.json", {"name": f"Bench {i}", "cost": "1 gp"})
+
+    return {
+        "list": (storage.list_item_keys, 1),
+        "get": (_gets, len(sample)),
+        "put": (_puts, PUT_COUNT),
+        "bulk": (storage.get_items_bulk, len(keys)),
+        "search": (lambda: _search(storage, "item 12"), 1),
+    }
+
+
+def _time(fn, repeat: int) -> dict:
+    fn()  # warm-up: first-call costs (manifests, connections) aren't the steady state
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def run(args) -> list:
+    results = []
+    for size in args.sizes:
+        records = _records(size)
+        keys = sorted(records)
+        for backend in args.backends:
+            with BACKENDS[backend](records, args) as storage:
+                for workload, (fn, ops) in _workloads(storage, keys).items():
+                    if workload not in args.workloads:
+                        continue
+                    timing = _time(fn, args.repeat)
+                    results.append({
+                        "backend": backend, "size": size, "workload": workload,
+                        "ops": ops, **timing,
+                    })
+                    print(
+                        f"{backend:<7} {size:>6}  {workload:<7} {timing['median_ms']:>10.2f} ms",
+                        file=sys.stderr,
+                    )
+    return results
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Rows of ``results`` at least ``threshold`` times slower than in ``baseline``."""
+    before = {
+        (r["backend"], r["size"], r["workload"]): r["median_ms"]
+        for r in baseline.get("results", [])
+    }
+    slower = []
+    for r in results:
+        old = before.get((r["backend"], r["size"], r["workload"]))
+        if old and r["median_ms"] / old >= threshold:
+            slower.append({**r, "baseline_ms": old, "ratio": r["median_ms"] / old})
+    return slower
+
+
+def _csv(value: str) -> list:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in _csv(v)],
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument("--backends", type=_csv, default=list(BACKENDS))
+    parser.add_argument("--workloads", type=_csv, default=list(WORKLOADS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="delay the mock API adds to each request")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help="paginate the mock API's key listings")
+    parser.add_argument("--json", default="-", help="write results here ('-' = stdout)")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    unknown = [b for b in args.backends if b not in BACKENDS]
+    unknown += [w for w in args.workloads if w not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown backend/workload: {', '.join(unknown)}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "page_size": args.page_size,
+        },
+        "results": run(args),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.json == "-":
+        print(text)
+    else:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(report["results"], json.load(f), args.threshold)
+        for r in slower:
+            print(
+                f"REGRESSION {r['backend']} {r['size']} {r['workload']}: "
+                f"{r['baseline_ms']:.2f} -> {r['median_ms']:.2f} ms ({r['ratio']:.2f}x)",
+                file=sys.stderr,
+            )
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -70,13 +70,13 @@ def _get_storage():
         from app.config import get_storage_api_base
         return StorageAPI(get_storage_api_base())
     else:
-        from app.local_storage import LocalStorage
-        from app.config import get_local_data_dir
+        from app.local_storage import open_local_storage
+        from app.config import get_local_data_dir, get_local_storage_engine
         data_dir = get_local_data_dir()
         if not data_dir:
             print("ERROR: local_data_dir not set in settings. Run the app first to configure storage.")
             sys.exit(1)
-        return LocalStorage(data_dir)
+        return open_local_storage(data_dir, get_local_storage_engine())
 
 
 def main():
@@ -92,13 +92,14 @@ def main():
 
     keys = storage.list_item_keys()
     print(f"Found {len(keys)} items.\n")
+    items = storage.get_items_bulk(keys)
 
     updated = 0
     skipped = 0
     unchanged = 0
 
     for key in sorted(keys):
-        item = storage.get_item(key)
+        item = items.get(key)
         if not item:
             print(f"  SKIP  {key}  (could not load)")
             skipped += 1
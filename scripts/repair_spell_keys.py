@@ -42,13 +42,13 @@ def _get_storage():
         from app.config import get_storage_api_base
         return StorageAPI(get_storage_api_base())
     else:
-        from app.local_storage import LocalStorage
-        from app.config import get_local_data_dir
+        from app.local_storage import open_local_storage
+        from app.config import get_local_data_dir, get_local_storage_engine
         data_dir = get_local_data_dir()
         if not data_dir:
             print("ERROR: local_data_dir not set in settings. Run the app first to configure storage.")
             sys.exit(1)
-        return LocalStorage(data_dir)
+        return open_local_storage(data_dir, get_local_storage_engine())
 
 
 def main():
@@ -63,13 +63,14 @@ def main():
     storage = _get_storage()
     keys = storage.list_spell_keys()
     print(f"Found {len(keys)} spells.\n")
+    spells = storage.get_spells_bulk(keys)
 
     renamed = 0
     skipped = 0
     unchanged = 0
 
     for old_key in sorted(keys):
-        data = storage.get_spell(old_key)
+        data = spells.get(old_key)
         if not data:
             print(f"  SKIP  {old_key}  (could not load)")
             skipped += 1
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+scripts/replay_bridge_session.py
+
+Replays a recorded Foundry bridge session (see app/session_recorder.py)
+through the snapshot-apply path and reports how long each snapshot took.
+
+Snapshots go through BridgeReconciler exactly as the tracker applies them;
+with --table the resulting UI events are also rendered into a
+CreatureTableModel/QTableView on Qt's offscreen platform. Peak memory is
+measured in a second pass under tracemalloc, so it doesn't skew the timings.
+
+The tracker is seeded with the first combatant of the first non-empty
+snapshot (the bridge only adds combatants to a tracker that already has
+creatures); everything else arrives through the normal sync path.
+
+Record a session by starting the app with BRIDGE_RECORD_PATH set:
+    BRIDGE_RECORD_PATH=~/sessions/ pipenv run python main.py
+
+Usage:
+    pipenv run python scripts/replay_bridge_session.py SESSION.jsonl.gz
+    pipenv run python scripts/replay_bridge_session.py SESSION.jsonl.gz --table --per-snapshot
+    pipenv run python scripts/replay_bridge_session.py SESSION.jsonl.gz --realtime
+    pipenv run python scripts/replay_bridge_session.py SESSION.jsonl.gz --json results.json
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+# Make lib importable
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lib"))
+
+from app.creature import CreatureType, I_Creature, Monster, Player
+from app.manager import CreatureManager
+from app.reconcile import (
+    BridgeReconciler,
+    CombatChanged,
+    CreaturesAdded,
+    CreaturesPruned,
+    RoundAdvanced,
+    RowsChanged,
+    TrackerState,
+    TurnOrderChanged,
+    resolve_creature_type,
+)
+from app.session_recorder import read_session
+
+Snapshot = Tuple[float, Dict[str, Any]]
+
+
+def load_session(path: str) -> Tuple[List[Snapshot], int]:
+    """Return ([(t, snapshot), ...], command_count) from a session file."""
+    snapshots: List[Snapshot] = []
+    commands = 0
+    for record in read_session(path):
+        kind = record.get("kind")
+        if kind == "snapshot" and isinstance(record.get("data"), dict):
+            snapshots.append((float(record.get("t") or 0.0), record["data"]))
+        elif kind == "command":
+            commands += 1
+    return snapshots, commands
+
+
+def _seed_state(snapshots: List[Snapshot]) -> TrackerState:
+    manager = CreatureManager()
+    for _, snapshot in snapshots:
+        combatants = [c for c in snapshot.get("combatants") or [] if isinstance(c, dict)]
+        named = [c for c in combatants if (c.get("name") or "").strip()]
+        if not named:
+            continue
+        first = named[0]
+        name = first["name"].strip()
+        resolved = resolve_creature_type(first)
+        if resolved == CreatureType.PLAYER:
+            creature = Player(name=name)
+        elif resolved == CreatureType.MONSTER:
+            creature = Monster(name=name)
+        else:
+            creature = I_Creature(_name=name)
+        for attr, key in (
+            ("foundry_combatant_id", "combatantId"),
+            ("foundry_token_id", "tokenId"),
+            ("foundry_actor_id", "actorId"),
+        ):
+            if first.get(key):
+                setattr(creature, attr, str(first[key]))
+        manager.add_creature(creature)
+        break
+    return TrackerState(manager=manager)
+
+
+class _TableHarness:
+    """Offscreen model + view that renders reconcile events like the tracker."""
+
+    def __init__(self, manager: CreatureManager):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication, QTableView
+        from ui.creature_table_model import CreatureTableModel
+
+        self.qapp = QApplication.instance() or QApplication([])
+        self.model = CreatureTableModel(manager)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.resize(1280, 720)
+        self.view.show()
+        self.qapp.processEvents()
+
+    def render(self, state: TrackerState, events: List[Any]) -> None:
+        needs_refresh = False
+        for event in events:
+            if isinstance(event, (CreaturesPruned, CreaturesAdded, TurnOrderChanged)):
+                needs_refresh = True
+            elif isinstance(event, RoundAdvanced) and event.timers_ticked:
+                needs_refresh = True
+            elif isinstance(event, CombatChanged):
+                self.model.set_active_creature(state.current_creature_name)
+            elif isinstance(event, RowsChanged) and not needs_refresh:
+                self.model.refresh_rows(dict(event.cells))
+        if needs_refresh:
+            self.model.refresh()
+        # Let the view repaint so the cost of the dataChanged signals is counted.
+        self.qapp.processEvents()
+
+
+def replay(
+    snapshots: List[Snapshot], table: bool = False, realtime: bool = False
+) -> List[Dict[str, Any]]:
+    state = _seed_state(snapshots)
+    reconciler = BridgeReconciler()
+    harness = _TableHarness(state.manager) if table else None
+
+    results: List[Dict[str, Any]] = []
+    wall_start = time.perf_counter()
+    for t, snapshot in snapshots:
+        if realtime:
+            delay = t - (time.perf_counter() - wall_start)
+            if delay > 0:
+                time.sleep(delay)
+        start = time.perf_counter()
+        state, events = reconciler.reconcile(state, snapshot)
+        applied = time.perf_counter()
+        if harness is not None:
+            harness.render(state, events)
+        done = time.perf_counter()
+        results.append({
+            "t": t,
+            "combatants": len(snapshot.get("combatants") or []),
+            "events": len(events),
+            "apply_ms": (applied - start) * 1000.0,
+            "refresh_ms": (done - applied) * 1000.0 if harness is not None else None,
+        })
+    return results
+
+
+def measure_peak_memory(snapshots: List[Snapshot]) -> int:
+    """Peak traced Python heap (bytes) while applying the whole session headless."""
+    tracemalloc.start()
+    try:
+        replay(snapshots)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": statistics.median(ordered),
+        "p95": p95,
+        "max": ordered[-1],
+        "total": sum(ordered),
+    }
+
+
+def _format(label: str, stats: Dict[str, float]) -> str:
+    if not stats:
+        return f"{label:<10} n/a"
+    return (
+        f"{label:<10} mean {stats['mean']:8.3f} ms   p50 {stats['p50']:8.3f}   "
+        f"p95 {stats['p95']:8.3f}   max {stats['max']:8.3f}   total {stats['total']:9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded bridge session and time the sync path.")
+    parser.add_argument("session", help="Session file written via BRIDGE_RECORD_PATH (*.jsonl.gz)")
+    parser.add_argument("--realtime", action="store_true", help="Pace snapshots at their recorded timing")
+    parser.add_argument("--table", action="store_true", help="Also render events into an offscreen table")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--per-snapshot", action="store_true", help="Print one line per snapshot")
+    parser.add_argument("--json", metavar="PATH", help="Write per-snapshot results and summary as JSON")
+    parser.add_argument("--show-logs", action="store_true", help="Keep the tracker's [Bridge] log output")
+    args = parser.parse_args()
+
+    snapshots, commands = load_session(args.session)
+    if not snapshots:
+        print("No snapshots in session.")
+        return 1
+    print(f"Loaded {len(snapshots)} snapshots and {commands} commands "
+          f"spanning {snapshots[-1][0] - snapshots[0][0]:.1f}s.\n")
+
+    # The sync path logs as it goes; the formatting still runs (and is timed)
+    # but the output is dropped unless asked for, so the report stays readable.
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as stack:
+        if not args.show_logs:
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        results = replay(snapshots, table=args.table, realtime=args.realtime)
+        peak = None if args.no_memory else measure_peak_memory(snapshots)
+
+    if args.per_snapshot:
+        print(f"{'#':>5} {'t (s)':>9} {'combat.':>7} {'events':>6} {'apply ms':>10} {'refresh ms':>11}")
+        for i, row in enumerate(results):
+            refresh = f"{row['refresh_ms']:11.3f}" if row["refresh_ms"] is not None else f"{'-':>11}"
+            print(f"{i:5d} {row['t']:9.2f} {row['combatants']:7d} {row['events']:6d} "
+                  f"{row['apply_ms']:10.3f} {refresh}")
+        print()
+
+    apply_stats = _summary([r["apply_ms"] for r in results])
+    refresh_stats = _summary([r["refresh_ms"] for r in results if r["refresh_ms"] is not None])
+    print(_format("apply", apply_stats))
+    if args.table:
+        print(_format("refresh", refresh_stats))
+
+    if peak is not None:
+        print(f"peak heap  {peak / (1024 * 1024):.2f} MiB (tracemalloc, headless pass)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "session": args.session,
+                "snapshots": len(snapshots),
+                "commands": commands,
+                "apply_ms": apply_stats,
+                "refresh_ms": refresh_stats or None,
+                "peak_heap_bytes": peak,
+                "per_snapshot": results,
+            }, f, indent=2)
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
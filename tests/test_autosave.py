@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.autosave import AutosaveService, write_json_atomic
+
+
+class _Recorder:
+    def __init__(self, fail=False):
+        self.written = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def __call__(self, snapshot):
+        if self.fail:
+            raise RuntimeError("disk full")
+        with self.lock:
+            self.written.append(snapshot)
+
+
+class AutosaveServiceTests(unittest.TestCase):
+    def _service(self, write, **kwargs):
+        service = AutosaveService(write, **kwargs)
+        self.addCleanup(service.close, 1.0)
+        return service
+
+    def test_burst_is_written_once_with_latest_snapshot(self):
+        write = _Recorder()
+        service = self._service(write, delay_s=0.1)
+        for round_no in range(1, 6):
+            service.submit({"round_counter": round_no})
+        self.assertTrue(service.flush(2.0))
+        self.assertEqual(write.written, [{"round_counter": 5}])
+
+    def test_immediate_submit_does_not_wait_for_debounce(self):
+        write = _Recorder()
+        saved = threading.Event()
+        service = self._service(write, delay_s=60, on_saved=lambda ts: saved.set())
+        service.submit({"round_counter": 1}, immediate=True)
+        self.assertTrue(saved.wait(2.0))
+        self.assertIsNotNone(service.last_saved_at)
+
+    def test_unchanged_snapshot_is_not_rewritten(self):
+        write = _Recorder()
+        service = self._service(write, delay_s=0.01)
+        service.submit({"players": []})
+        service.flush(2.0)
+        service.submit({"players": []})
+        service.flush(2.0)
+        self.assertEqual(len(write.written), 1)
+        self.assertEqual(service.writes, 1)
+
+    def test_errors_are_reported(self):
+        errors = []
+        service = self._service(_Recorder(fail=True), delay_s=0.01, on_error=errors.append)
+        service.submit({"players": []})
+        service.flush(2.0)
+        self.assertEqual([str(e) for e in errors], ["disk full"])
+        self.assertIsNone(service.last_saved_at)
+
+
+class WriteJsonAtomicTests(unittest.TestCase):
+    def test_failed_write_keeps_previous_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "last_state.json")
+            write_json_atomic(path, {"round_counter": 1})
+
+            with mock.patch("app.autosave.json.dump", side_effect=OSError("crash")):
+                with self.assertRaises(OSError):
+                    write_json_atomic(path, {"round_counter": 2})
+
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), {"round_counter": 1})
+            self.assertEqual(os.listdir(tmp), ["last_state.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.bulk_fetch import fetch_many
+from app.local_storage import LocalStorage
+from app.storage_api import StorageAPI
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    """Just enough of requests.Session for the item endpoints."""
+
+    def __init__(self, items, bulk=True):
+        self.items = items
+        self.bulk = bulk
+        self.headers = {}
+        self.gets = 0
+        self.posts = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None):
+        with self._lock:
+            self.gets += 1
+        key = url.rsplit("/", 1)[-1]
+        if key == "items":
+            return _Response(200, {"items": sorted(self.items)})
+        if key in self.items:
+            return _Response(200, {"data": self.items[key]})
+        return _Response(404)
+
+    def post(self, url, json=None, timeout=None):
+        self.posts += 1
+        if not self.bulk:
+            return _Response(404)
+        found = {k: {"data": self.items[k]} for k in json["keys"] if k in self.items}
+        return _Response(200, {"items": found})
+
+
+class FetchManyTests(unittest.TestCase):
+    def test_keeps_order_and_drops_misses_and_errors(self):
+        def fetch(key):
+            if key == "boom":
+                raise RuntimeError("down")
+            return None if key == "missing" else {"k": key}
+
+        result = fetch_many(["b", "missing", "a", "boom", "b"], fetch, max_workers=3)
+        self.assertEqual(list(result), ["b", "a"])
+
+
+class StorageAPIBulkTests(unittest.TestCase):
+    ITEMS = {f"item_{i}.json": {"name": f"Item {i}"} for i in range(250)}
+
+    def _api(self, bulk):
+        session = _FakeSession(self.ITEMS, bulk=bulk)
+        return StorageAPI("http://storage", session=session), session
+
+    def test_uses_bulk_endpoint_in_chunks(self):
+        api, session = self._api(bulk=True)
+        result = api.get_items_bulk(list(self.ITEMS) + ["nope.json"])
+
+        self.assertEqual(len(result), 250)
+        self.assertEqual(result["item_7.json"], {"name": "Item 7"})
+        self.assertEqual(session.posts, 2)
+        self.assertEqual(session.gets, 0)
+
+    def test_falls_back_to_single_gets_and_remembers(self):
+        api, session = self._api(bulk=False)
+        result = api.get_items_bulk()
+
+        self.assertEqual(len(result), 250)
+        self.assertEqual(session.posts, 1)
+        self.assertEqual(session.gets, 251)  # the listing plus one per item
+
+        api.get_items_bulk(["item_1.json"])
+        self.assertEqual(session.posts, 1)
+
+
+class LocalStorageBulkTests(unittest.TestCase):
+    def test_reads_every_collection(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalStorage(os.path.join(tmp, "data"))
+            storage.save_item("rope.json", {"name": "Rope"})
+            storage.save_spell("shield.json", {"name": "Shield"})
+            storage.save_statblock("goblin.json", {"name": "Goblin"})
+
+            self.assertEqual(storage.get_items_bulk(), {"rope.json": {"name": "Rope"}})
+            self.assertEqual(
+                storage.get_spells_bulk(["shield.json", "missing.json"]),
+                {"shield.json": {"name": "Shield"}},
+            )
+            self.assertEqual(list(storage.get_statblocks_bulk()), ["goblin.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+import unittest
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.combatant_index import CombatantIndex, NameSearchIndex, normalize_bridge_name
+
+
+def _combatant(cid, tid, aid, name):
+    return {"combatantId": cid, "tokenId": tid, "actorId": aid, "name": name}
+
+
+class NormalizeBridgeNameTests(unittest.TestCase):
+    def test_hash_suffix_and_whitespace_are_folded(self):
+        self.assertEqual(normalize_bridge_name("  Goblin   #2 "), "goblin 2")
+        self.assertEqual(normalize_bridge_name("GOBLIN 2"), "goblin 2")
+        self.assertEqual(normalize_bridge_name(None), "")
+
+
+class CombatantIndexTests(unittest.TestCase):
+    def setUp(self):
+        # Two unlinked goblins share one actor.
+        self.goblin_a = _combatant("c1", "t1", "goblin-actor", "Goblin")
+        self.goblin_b = _combatant("c2", "t2", "goblin-actor", "Goblin")
+        self.orc = _combatant("c3", "t3", "orc-actor", "Orc #1")
+        self.index = CombatantIndex([self.goblin_a, self.goblin_b, self.orc, "junk"])
+
+    def test_skips_non_dict_entries(self):
+        self.assertEqual(len(self.index), 3)
+
+    def test_combatant_id_wins_over_shared_actor_id(self):
+        creature = SimpleNamespace(
+            foundry_combatant_id="c2",
+            foundry_token_id=None,
+            foundry_actor_id="goblin-actor",
+        )
+        self.assertIs(self.index.for_creature(creature), self.goblin_b)
+
+    def test_token_id_lookup(self):
+        self.assertIs(self.index.by_id(token_id="t3"), self.orc)
+
+    def test_actor_id_fallback_is_optional(self):
+        creature = SimpleNamespace(
+            foundry_combatant_id="stale",
+            foundry_token_id=None,
+            foundry_actor_id="goblin-actor",
+        )
+        self.assertIs(self.index.for_creature(creature), self.goblin_a)
+        self.assertIsNone(self.index.for_creature(creature, use_actor_id=False))
+
+    def test_creature_without_ids(self):
+        self.assertIsNone(self.index.for_creature(SimpleNamespace()))
+
+    def test_name_lookup_keeps_duplicates(self):
+        self.assertEqual(self.index.by_normalized_name("goblin"), [self.goblin_a, self.goblin_b])
+        self.assertEqual(self.index.by_normalized_name("Orc 1"), [self.orc])
+        self.assertEqual(self.index.by_normalized_name(""), [])
+
+
+class NameSearchIndexTests(unittest.TestCase):
+    NAMES = [
+        "chitraya", "chitra", "goblin", "goblin boss", "goblin 2", "hobgoblin",
+        "orc", "orc war chief", "surina", "surina's echo", "ox", "o",
+    ]
+    QUERIES = [
+        "chitra", "chitra-ya", "goblin", "gob", "lin", "boss", "goblin 2 extra",
+        "orc", "o", "x", "echo", "surina", "zzz", "hobgoblin captain", "",
+    ]
+
+    @staticmethod
+    def _brute_force(names, key):
+        # The rule the fuzzy fallback has always used.
+        return [
+            name for name in names
+            if name.startswith(key) or key.startswith(name) or key in name
+        ]
+
+    def test_matches_agree_with_linear_scan(self):
+        search = NameSearchIndex(self.NAMES)
+        for key in self.QUERIES:
+            expected = self._brute_force(self.NAMES, key) if key else []
+            self.assertEqual(search.matches(key), expected, key)
+
+    def test_fuzzy_matches_dedupe_and_memoize(self):
+        shared = {"combatantId": "c1", "name": "Chitraya"}
+        index = CombatantIndex([
+            shared,
+            {"combatantId": "c1", "name": "Chitra-ya"},
+            {"combatantId": "c2", "name": "Goblin"},
+        ])
+        first = index.fuzzy_matches("chitra")
+        self.assertEqual(first, [shared])
+        self.assertIs(index.fuzzy_matches("chitra"), first)
+
+    def test_name_search_reused_only_when_names_match(self):
+        old = CombatantIndex([{"combatantId": "c1", "name": "Goblin"}])
+        search = old.name_search
+
+        same = CombatantIndex([{"combatantId": "c1", "name": "Goblin", "hp": 3}])
+        same.share_name_search(old)
+        self.assertIs(same.name_search, search)
+
+        renamed = CombatantIndex([{"combatantId": "c1", "name": "Goblin Boss"}])
+        renamed.share_name_search(old)
+        self.assertIsNot(renamed.name_search, search)
+        self.assertEqual(renamed.name_search.matches("boss"), ["goblin boss"])
+
+
+if __name__ == "__main__":
+    unittest.main()
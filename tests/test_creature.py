@@ -0,0 +1,46 @@
+import copy
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.creature import NO_RESOURCES, RESOURCE_FIELDS, I_Creature, Monster, Player
+from app.serialization import to_primitive
+
+
+class SlottedCreatureTests(unittest.TestCase):
+    def test_creatures_have_no_instance_dict(self):
+        for creature in (I_Creature(), Monster(name="Goblin"), Player(name="Aria")):
+            self.assertFalse(hasattr(creature, "__dict__"))
+        with self.assertRaises(AttributeError):
+            Monster(name="Goblin").typo = 1
+
+    def test_empty_resources_are_shared_and_copied_on_write(self):
+        a, b = Monster(name="Goblin"), Monster(name="Goblin_1", spell_slots={1: 2})
+        for name in RESOURCE_FIELDS:
+            self.assertIs(getattr(a, name), NO_RESOURCES)
+        self.assertEqual(b._spell_slots, {1: 2})
+        with self.assertRaises(TypeError):
+            a._ability_uses_used["Multiattack"] = 1
+        a.writable_resource("_ability_uses_used")["Multiattack"] = 1
+        self.assertEqual(a._ability_uses_used, {"Multiattack": 1})
+        self.assertIs(Monster(name="Orc")._ability_uses_used, NO_RESOURCES)
+        self.assertIs(copy.deepcopy(NO_RESOURCES), NO_RESOURCES)
+
+    def test_bridge_bindings_are_runtime_only(self):
+        goblin = Monster(name="Goblin")
+        self.assertIsNone(getattr(goblin, "foundry_combatant_id", None))
+        goblin.foundry_combatant_id = "c1"
+        goblin.foundry_effects = [{"label": "Prone"}]
+        self.assertNotIn("foundry_combatant_id", goblin.to_dict())
+        self.assertIsNone(goblin.to_dict()["_foundry_combatant_id"])
+        # The old __dict__ encoding included them once set; so does this one.
+        self.assertEqual(to_primitive(goblin)["foundry_combatant_id"], "c1")
+        self.assertEqual(to_primitive(goblin)["_spell_slots"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
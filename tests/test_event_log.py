@@ -0,0 +1,100 @@
+import io
+import logging
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.event_log import DEBUG, INFO, WARNING, EventLog, EventLogHandler
+
+
+class _Exploding:
+    def __format__(self, spec):
+        raise AssertionError("disabled records must not be formatted")
+
+
+class EventLogTests(unittest.TestCase):
+    def setUp(self):
+        self.log = EventLog(capacity=5, echo_level=None)
+
+    def test_category_levels_inherit_from_parents(self):
+        self.log.set_level("bridge", WARNING)
+        self.log.set_level("bridge.hp", DEBUG)
+
+        self.assertFalse(self.log.enabled("bridge.command", INFO))
+        self.assertTrue(self.log.enabled("bridge.hp.detail", DEBUG))
+        self.assertTrue(self.log.enabled("statblock", INFO))
+
+        self.log.clear_level("bridge.hp")
+        self.assertFalse(self.log.enabled("bridge.hp", DEBUG))
+
+    def test_disabled_records_are_not_formatted_or_kept(self):
+        self.log.debug("bridge.hp", "{value}", value=_Exploding())
+        self.assertEqual(self.log.records(), [])
+
+    def test_messages_format_lazily(self):
+        self.log.info("bridge", "enqueue {name!r} hp={hp}", name="Goblin", hp=3)
+        self.log.info("bridge", "plain {braces} are fine without fields")
+        messages = [r.message for r in self.log.records()]
+        self.assertEqual(
+            messages, ["enqueue 'Goblin' hp=3", "plain {braces} are fine without fields"]
+        )
+
+    def test_ring_buffer_is_bounded(self):
+        for i in range(8):
+            self.log.info("app", "event {i}", i=i)
+        records = self.log.records()
+        self.assertEqual([r.fields["i"] for r in records], [3, 4, 5, 6, 7])
+        self.assertEqual(
+            [r.fields["i"] for r in self.log.records(since_seq=records[2].seq)], [6, 7]
+        )
+
+    def test_sampling_keeps_one_in_n(self):
+        self.log.set_level("bridge.hp", DEBUG)
+        self.log.set_sample_rate("bridge.hp", 3)
+        for i in range(6):
+            self.log.debug("bridge.hp", "hp {i}", i=i)
+        self.assertEqual([r.fields["i"] for r in self.log.records()], [0, 3])
+
+    def test_filters_and_echo(self):
+        self.log.echo_level = WARNING
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.log.info("bridge.command", "sent")
+            self.log.warning("bridge.stream", "dropped")
+            self.log.info("statblock", "hit")
+        self.assertEqual(out.getvalue(), "[bridge.stream][WARNING] dropped\n")
+        self.assertEqual(len(self.log.records(category="bridge")), 2)
+        self.assertEqual(len(self.log.records(min_level=WARNING)), 1)
+
+    def test_export_jsonl(self):
+        self.log.info("app", "saved {name}", name="encounter")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.jsonl")
+            self.assertEqual(self.log.export(path), 1)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn('"message":"saved encounter"', f.read())
+
+    def test_stdlib_handler_forwards(self):
+        logger = logging.getLogger("test_event_log.service")
+        logger.addHandler(EventLogHandler(self.log, category="bridge.service"))
+        logger.setLevel(DEBUG)
+        logger.propagate = False
+        self.addCleanup(logger.handlers.clear)
+
+        logger.info("Command acked id=%s", "abc")
+        logger.debug("Commands polled count=%d", 1)
+
+        records = self.log.records()
+        self.assertEqual([r.message for r in records], ["Command acked id=abc"])
+        self.assertEqual(records[0].category, "bridge.service")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import fnmatch
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.combatant_index import normalize_bridge_name
+from app.foundry_ignore import IgnoreMatcher
+
+
+def _linear_match(patterns, name):
+    # The original per-pattern walk the compiled matcher replaces.
+    if not name:
+        return None
+    candidate = normalize_bridge_name(name)
+    for pattern in patterns:
+        norm = normalize_bridge_name(pattern)
+        if not norm:
+            continue
+        if any(ch in norm for ch in "*?["):
+            if fnmatch.fnmatchcase(candidate, norm):
+                return pattern
+        elif candidate == norm:
+            return pattern
+    return None
+
+
+class IgnoreMatcherTests(unittest.TestCase):
+    PATTERNS = ["Echo", "*Echo", "Summon*", "Spiritual Weapon", "Wolf #?", "[Bb]at*", "echo"]
+
+    def setUp(self):
+        self.matcher = IgnoreMatcher({
+            "patterns": self.PATTERNS,
+            "actor_ids": ["actor-1"],
+            "player_owned_npcs": True,
+        })
+
+    def test_matches_agree_with_linear_walk(self):
+        names = [
+            "Echo", "ECHO", "Surina's Echo", "Echo Talonshade", "Summoned Fey",
+            "spiritual   weapon", "Wolf #2", "Wolf 12", "bat swarm", "Goblin", "",
+        ]
+        for name in names:
+            self.assertEqual(
+                self.matcher.match_name(name), _linear_match(self.PATTERNS, name), name
+            )
+
+    def test_earliest_listed_pattern_wins(self):
+        matcher = IgnoreMatcher({"patterns": ["Summon*", "Summoned Fey", "*Fey"]})
+        self.assertEqual(matcher.match_name("Summoned Fey"), "Summon*")
+        matcher = IgnoreMatcher({"patterns": ["Summoned Fey", "Summon*"]})
+        self.assertEqual(matcher.match_name("Summoned Fey"), "Summoned Fey")
+
+    def test_combatant_reasons_in_priority_order(self):
+        reason = self.matcher.combatant_reason
+        self.assertEqual(
+            reason({"name": "Echo", "excludeFromSync": True}), "excluded in Foundry"
+        )
+        self.assertEqual(reason({"name": "Echo", "actorId": "actor-1"}), "ignored actor")
+        self.assertEqual(
+            reason({"name": "Fox", "actorType": "npc", "actorHasPlayerOwner": True}),
+            "player-owned NPC (summon/companion)",
+        )
+        self.assertEqual(reason({"name": "Rex", "actorName": "Summon Beast"}), "matches 'Summon*'")
+        self.assertIsNone(reason({"name": "Goblin", "actorType": "npc"}))
+        self.assertIsNone(reason("not a combatant"))
+
+    def test_player_owned_rule_can_be_disabled(self):
+        matcher = IgnoreMatcher({"player_owned_npcs": False})
+        combatant = {"name": "Fox", "actorType": "npc", "actorHasPlayerOwner": True}
+        self.assertIsNone(matcher.combatant_reason(combatant))
+
+    def test_decisions_are_cached(self):
+        combatant = {"name": "Surina's Echo", "actorId": "a2"}
+        self.assertEqual(self.matcher.combatant_reason(combatant), "matches '*Echo'")
+        self.matcher._glob_re = None  # any re-evaluation would now miss
+        self.assertEqual(self.matcher.combatant_reason(dict(combatant)), "matches '*Echo'")
+
+    def test_unhashable_fields_are_not_cached(self):
+        combatant = {"name": "Echo", "actorId": ["odd"]}
+        self.assertEqual(self.matcher.combatant_reason(combatant), "matches 'Echo'")
+
+
+if __name__ == "__main__":
+    unittest.main()
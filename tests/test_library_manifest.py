@@ -0,0 +1,124 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.library_manifest import MANIFEST_FILENAME, summarize
+from app.local_storage import LocalStorage
+from app.storage_api import StorageAPI
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _ManifestSession:
+    def __init__(self, spells, manifest=None):
+        self.spells = spells
+        self.manifest = manifest
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.urls.append(url)
+        key = url.rsplit("/", 1)[-1]
+        if key == "manifest":
+            if self.manifest is None:
+                return _Response(404)
+            return _Response(200, {"items": self.manifest})
+        if key == "items":
+            return _Response(200, {"items": sorted(self.spells)})
+        if key in self.spells:
+            return _Response(200, {"data": self.spells[key]})
+        return _Response(404)
+
+    def post(self, url, json=None, timeout=None):
+        return _Response(404)
+
+
+class SummarizeTests(unittest.TestCase):
+    def test_keeps_only_summary_fields(self):
+        item = {"name": "Rope", "cost": "1 gp", "tags": ("gear",), "description": "50 ft."}
+        self.assertEqual(
+            summarize("items", item), {"name": "Rope", "cost": "1 gp", "tags": ["gear"]}
+        )
+        self.assertEqual(summarize("spells", None), {})
+
+
+class LocalManifestTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = os.path.join(tmp.name, "data")
+        self.storage = LocalStorage(self.data_dir)
+
+    def test_tracks_saves_and_deletes(self):
+        self.storage.save_item("rope.json", {"name": "Rope", "cost": "1 gp"})
+        self.assertEqual(
+            self.storage.get_item_manifest(), {"rope.json": {"name": "Rope", "cost": "1 gp"}}
+        )
+
+        self.storage.save_item("rope.json", {"name": "Silk Rope", "cost": "10 gp"})
+        self.storage.save_item("torch.json", {"name": "Torch", "rarity": "common"})
+        self.storage.delete_item("rope.json")
+        self.assertEqual(
+            self.storage.get_item_manifest(),
+            {"torch.json": {"name": "Torch", "rarity": "common"}},
+        )
+        self.assertEqual(self.storage.list_item_keys(), ["torch.json"])
+
+    def test_picks_up_files_written_outside_the_app(self):
+        self.storage.save_spell("shield.json", {"name": "Shield", "level": 1})
+        self.storage.get_spell_manifest()
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, "spells", MANIFEST_FILENAME)))
+
+        path = os.path.join(self.data_dir, "spells", "fireball.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"name": "Fireball", "level": 3, "school": "Evocation"}, f)
+
+        fresh = LocalStorage(self.data_dir)
+        manifest = fresh.get_spell_manifest()
+        self.assertEqual(list(manifest), ["fireball.json", "shield.json"])
+        self.assertEqual(manifest["fireball.json"]["school"], "Evocation")
+
+
+class StorageAPIManifestTests(unittest.TestCase):
+    SPELLS = {
+        "shield.json": {"name": "Shield", "level": 1, "school": "Abjuration", "range": "Self"},
+    }
+
+    def test_uses_server_manifest(self):
+        session = _ManifestSession(self.SPELLS, manifest={"shield.json": {"name": "Shield"}})
+        api = StorageAPI("http://storage", session=session)
+        self.assertEqual(api.get_spell_manifest(), {"shield.json": {"name": "Shield"}})
+        self.assertEqual(len(session.urls), 1)
+
+    def test_builds_manifest_when_server_has_none(self):
+        session = _ManifestSession(self.SPELLS)
+        api = StorageAPI("http://storage", session=session)
+        expected = {"shield.json": {"name": "Shield", "level": 1, "school": "Abjuration"}}
+        self.assertEqual(api.get_spell_manifest(), expected)
+
+        session.urls.clear()
+        self.assertEqual(api.get_spell_manifest(), expected)
+        self.assertFalse(any(url.endswith("/manifest") for url in session.urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import BATCH_JOURNAL_FILENAME, BATCH_STAGING_PREFIX, LocalStorage
+
+
+def _staging_files(root):
+    return [
+        name for _, _, files in os.walk(root) for name in files
+        if name.startswith(BATCH_STAGING_PREFIX)
+    ]
+
+
+class LocalStorageBatchTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.storage = LocalStorage(self.root)
+
+    def test_writes_appear_at_commit(self):
+        self.storage.save_spell("shield.json", {"name": "Shield"})
+        with self.storage.batch():
+            self.storage.save_item("rope.json", {"name": "Rope"})
+            self.storage.put("goblins.json", {"players": []})
+            self.storage.delete_spell("shield.json")
+            self.assertFalse(os.path.exists(os.path.join(self.root, "items", "rope.json")))
+            self.assertTrue(os.path.exists(os.path.join(self.root, "spells", "shield.json")))
+            # ...but reads already see the batch.
+            self.assertEqual(self.storage.get_item("rope.json"), {"name": "Rope"})
+            self.assertEqual(self.storage.list_item_keys(), ["rope.json"])
+            self.assertIsNone(self.storage.get_spell("shield.json"))
+            self.assertEqual(self.storage.list_spell_keys(), [])
+
+        self.assertEqual(self.storage.list_item_keys(), ["rope.json"])
+        self.assertEqual(self.storage.list(), ["goblins.json"])
+        self.assertEqual(self.storage.list_spell_keys(), [])
+        self.assertEqual(_staging_files(self.root), [])
+        self.assertFalse(os.path.exists(os.path.join(self.root, BATCH_JOURNAL_FILENAME)))
+
+    def test_error_discards_the_whole_batch(self):
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch():
+                self.storage.save_item("rope.json", {"name": "Rope"})
+                with self.storage.batch():
+                    self.storage.save_item("torch.json", {"name": "Torch"})
+                raise RuntimeError("boom")
+        self.assertEqual(self.storage.list_item_keys(), [])
+        self.assertEqual(_staging_files(self.root), [])
+
+    def test_index_is_updated_at_commit(self):
+        self.storage.get_item_manifest()
+        self.storage.sync_search_index()
+        with self.storage.batch():
+            self.storage.save_item("rope.json", {"name": "Rope", "cost": "1 gp"})
+        self.assertEqual(self.storage.get_item_manifest()["rope.json"]["cost"], "1 gp")
+        self.assertEqual([h.key for h in self.storage.search("rope")], ["rope.json"])
+
+    def test_interrupted_commit_is_finished_on_open(self):
+        self.storage.save_item("rope.json", {"name": "Rope", "cost": "1 gp"})
+        with mock.patch.object(LocalStorage, "_apply_journal", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                with self.storage.batch():
+                    self.storage.save_item("rope.json", {"name": "Rope", "cost": "2 gp"})
+                    self.storage.save_item("torch.json", {"name": "Torch"})
+        self.assertEqual(self.storage.list_item_keys(), ["rope.json"])
+        self.assertTrue(os.path.exists(os.path.join(self.root, BATCH_JOURNAL_FILENAME)))
+
+        reopened = LocalStorage(self.root)
+        self.assertEqual(reopened.list_item_keys(), ["rope.json", "torch.json"])
+        self.assertEqual(reopened.get_item("rope.json")["cost"], "2 gp")
+        self.assertEqual(_staging_files(self.root), [])
+
+    def test_unfinished_staging_without_journal_is_ignored(self):
+        with self.assertRaises(OSError):
+            with mock.patch("app.local_storage.write_json_atomic", side_effect=OSError("disk full")):
+                with self.storage.batch():
+                    self.storage.save_item("rope.json", {"name": "Rope"})
+        self.assertEqual(_staging_files(self.root), [])
+        self.assertEqual(LocalStorage(self.root).list_item_keys(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.mock_storage_api import MockStorageServer
+from app.storage_api import StorageAPI
+from app.storage_cache import StorageCache
+
+
+class MockStorageServerTests(unittest.TestCase):
+    def _server(self, **options):
+        server = MockStorageServer(**options).start()
+        self.addCleanup(server.stop)
+        api = StorageAPI(server.base_url)
+        self.addCleanup(api.session.close)
+        return server, api
+
+    def test_storage_api_round_trip(self):
+        server, api = self._server()
+        api.save_item("rope.json", {"name": "Rope", "cost": "1 gp"})
+        api.save_spell("shield.json", {"name": "Shield", "level": 1})
+        api.put("goblins.json", {"players": []})
+
+        self.assertEqual(api.list_item_keys(), ["rope.json"])
+        self.assertEqual(api.list(), ["goblins.json"])
+        self.assertEqual(api.get_spell("shield.json"), {"name": "Shield", "level": 1})
+        self.assertEqual(api.get_items_bulk(), {"rope.json": {"name": "Rope", "cost": "1 gp"}})
+        self.assertEqual(api.get_item_manifest()["rope.json"]["cost"], "1 gp")
+
+        api.delete_item("rope.json")
+        self.assertIsNone(api.get_item("rope.json"))
+
+    def test_etag_revalidation_and_changes(self):
+        server, _ = self._server()
+        cache = StorageCache(":memory:", namespace=server.base_url, fresh_s=0)
+        self.addCleanup(cache.close)
+        api = StorageAPI(server.base_url, cache=cache)
+        self.addCleanup(api.session.close)
+        server.store.put("spells", "shield.json", {"name": "Shield"})
+        cursor = api.changes_since(None).cursor
+
+        api.get_spell("shield.json")
+        api.get_spell("shield.json")
+        self.assertEqual(api.cache_stats()["revalidated"], 1)
+
+        server.store.put("spells", "shield.json", {"name": "Shield", "level": 1})
+        batch = api.changes_since(cursor)
+        self.assertEqual([c.key for c in batch.changes], ["shield.json"])
+        self.assertEqual(api.get_spell("shield.json"), {"name": "Shield", "level": 1})
+
+    def test_older_server_without_optional_endpoints(self):
+        server, api = self._server(bulk=False, manifest=False, changes=False)
+        server.store.put("items", "rope.json", {"name": "Rope"})
+        self.assertEqual(api.get_items_bulk(), {"rope.json": {"name": "Rope"}})
+        self.assertEqual(api.get_item_manifest(), {"rope.json": {"name": "Rope"}})
+        self.assertIsNone(api.changes_since(None))
+
+    def test_paginated_listing(self):
+        server, api = self._server(page_size=3)
+        keys = [f"item_{i}.json" for i in range(8)]
+        for key in keys:
+            server.store.put("items", key, {"name": key})
+        self.assertEqual([len(p) for p in api.iter_key_pages("items")], [3, 3, 2])
+        self.assertEqual(api.list_item_keys(), keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
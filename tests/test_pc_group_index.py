@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.pc_group_index import PCGroupIndex
+
+
+class PCGroupIndexTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "pc_group_index.json")
+        self.index = PCGroupIndex(self.path, storage_id="local:/data")
+        self.index.set_group("pcgroup_main.json", {"surina", "chitra", "bram"})
+        self.index.set_group("pcgroup_oneshot.json", {"surina", "vex"})
+        self.index.set_group("pcgroup_other.json", {"vex", "odo", "lark"})
+
+    def test_best_match_counts_shared_names(self):
+        key, cover = self.index.best_match({"surina", "vex", "odo", "nobody"})
+        self.assertEqual((key, cover), ("pcgroup_oneshot.json", 2))
+        key, cover = self.index.best_match({"vex", "odo", "lark", "surina"})
+        self.assertEqual((key, cover), ("pcgroup_other.json", 3))
+
+    def test_best_match_respects_exclude_and_min_cover(self):
+        party = {"surina", "chitra"}
+        self.assertEqual(self.index.best_match(party), ("pcgroup_main.json", 2))
+        self.assertEqual(
+            self.index.best_match(party, exclude="pcgroup_main.json"),
+            ("pcgroup_oneshot.json", 1),
+        )
+        self.assertEqual(self.index.best_match(party, min_cover=2), (None, 0))
+
+    def test_ties_go_to_first_key(self):
+        self.assertEqual(self.index.best_match({"surina"}), ("pcgroup_main.json", 1))
+
+    def test_updates_and_removal_keep_postings_consistent(self):
+        self.index.set_group("pcgroup_oneshot.json", {"chitra"})
+        self.assertEqual(self.index.groups_with("surina"), {"pcgroup_main.json"})
+        self.assertTrue(self.index.remove_group("pcgroup_other.json"))
+        self.assertEqual(self.index.groups_with("odo"), frozenset())
+        self.assertFalse(self.index.set_group("pcgroup_oneshot.json", ["chitra"]))
+
+    def test_retain_drops_deleted_and_reports_missing(self):
+        missing = self.index.retain(["pcgroup_main.json", "pcgroup_new.json"])
+        self.assertEqual(missing, ["pcgroup_new.json"])
+        self.assertEqual(self.index.keys(), ["pcgroup_main.json"])
+
+    def test_round_trip_and_storage_scoping(self):
+        self.index.built = True
+        self.index.save()
+
+        loaded = PCGroupIndex.load(self.path, storage_id="local:/data")
+        self.assertTrue(loaded.built)
+        self.assertEqual(loaded.roster("pcgroup_oneshot.json"), {"surina", "vex"})
+        self.assertEqual(loaded.best_match({"bram"}), ("pcgroup_main.json", 1))
+
+        other = PCGroupIndex.load(self.path, storage_id="api:https://example")
+        self.assertFalse(other.built)
+        self.assertEqual(len(other), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.creature import Monster, Player
+from app.foundry_ignore import IgnoreMatcher
+from app.manager import CreatureManager
+from app.reconcile import (
+    BridgeReconciler,
+    CreaturesAdded,
+    CreaturesPruned,
+    PromptDeathSaves,
+    RoundAdvanced,
+    RowsChanged,
+    ShowStatblock,
+    StatblockNeeded,
+    TrackerState,
+    TurnOrderChanged,
+)
+
+
+def _combatant(cid, name, hp=10, init=10, actor_type="npc", effects=None, **extra):
+    data = {
+        "combatantId": cid,
+        "tokenId": f"tok-{cid}",
+        "actorId": f"act-{cid}",
+        "name": name,
+        "actorName": name,
+        "actorType": actor_type,
+        "initiative": init,
+        "hp": {"value": hp, "max": 10, "temp": 0, "tempmax": 0},
+        "effects": effects or [],
+    }
+    data.update(extra)
+    return data
+
+
+def _snapshot(*combatants, round_value=1, active="c1"):
+    return {
+        "combatants": list(combatants),
+        "combat": {"round": round_value, "activeCombatant": {"combatantId": active}},
+    }
+
+
+class ReconcileTests(unittest.TestCase):
+    def setUp(self):
+        self.manager = CreatureManager()
+        self.manager.add_creature(Player(name="Surina", init=15, max_hp=20, curr_hp=20))
+        self.manager.add_creature(Monster(name="Goblin", init=10, max_hp=10, curr_hp=10))
+        self.engine = BridgeReconciler()
+        self.state = TrackerState(manager=self.manager, current_creature_name="Surina")
+
+    def _run(self, snapshot):
+        self.state, events = self.engine.reconcile(self.state, snapshot)
+        return events
+
+    def _baseline(self, **kwargs):
+        return _snapshot(
+            _combatant("c0", "Surina", hp=20, init=15, actor_type="character"),
+            _combatant("c1", "Goblin", **kwargs),
+            active="c0",
+        )
+
+    def test_missing_combatants_are_added(self):
+        events = self._run(_snapshot(
+            _combatant("c0", "Surina", init=15, actor_type="character"),
+            _combatant("c1", "Goblin"),
+            _combatant("c2", "Wolf", init=12),
+            active="c0",
+        ))
+
+        self.assertIn("Wolf", self.manager.creatures)
+        self.assertIn(CreaturesAdded(), events)
+        needed = {e.statblock_name for e in events if isinstance(e, StatblockNeeded)}
+        self.assertEqual(needed, {"Goblin", "Wolf"})
+        self.assertEqual(self.manager.creatures["Goblin"].foundry_combatant_id, "c1")
+
+    def test_identical_snapshot_produces_no_events(self):
+        self._run(self._baseline())
+        self.assertEqual(self._run(self._baseline()), [])
+
+    def test_hp_change_repaints_one_row(self):
+        self._run(self._baseline())
+        events = self._run(self._baseline(hp=3))
+
+        self.assertEqual(events, [RowsChanged({"Goblin": None})])
+        self.assertEqual(self.manager.creatures["Goblin"].curr_hp, 3)
+
+    def test_condition_change_repaints_one_cell(self):
+        self._run(self._baseline())
+        events = self._run(self._baseline(effects=[{"id": "e1", "label": "Prone"}]))
+
+        self.assertEqual(events, [RowsChanged({"Goblin": frozenset({"_conditions"})})])
+        self.assertEqual(self.manager.creatures["Goblin"].conditions, ["Prone"])
+
+    def test_turn_change_to_monster(self):
+        self._run(self._baseline())
+        self.manager.creatures["Goblin"].reaction = True
+        events = self._run(_snapshot(
+            _combatant("c0", "Surina", hp=20, init=15, actor_type="character"),
+            _combatant("c1", "Goblin"),
+            active="c1",
+        ))
+
+        self.assertEqual(self.state.current_creature_name, "Goblin")
+        self.assertEqual(
+            events, [TurnOrderChanged(), ShowStatblock("Goblin"), PromptDeathSaves("Goblin")]
+        )
+        self.assertFalse(self.manager.creatures["Goblin"].reaction)
+
+    def test_round_advance_resets_actions_and_ticks_timers(self):
+        self._run(self._baseline())
+        goblin = self.manager.creatures["Goblin"]
+        goblin.action = True
+        goblin.status_time = 60
+
+        events = self._run(_snapshot(
+            _combatant("c0", "Surina", hp=20, init=15, actor_type="character"),
+            _combatant("c1", "Goblin"),
+            round_value=2,
+            active="c0",
+        ))
+
+        self.assertEqual(self.state.round_counter, 2)
+        self.assertIn(RoundAdvanced(2, True), events)
+        self.assertFalse(goblin.action)
+        self.assertEqual(goblin.status_time, 54)
+
+    def test_ignored_creatures_are_pruned(self):
+        self._run(self._baseline())
+        self.engine.ignore = IgnoreMatcher({"patterns": ["Gob*"]})
+
+        events = self._run(self._baseline())
+
+        self.assertEqual(events[0], CreaturesPruned(("Goblin",)))
+        self.assertNotIn("Goblin", self.manager.creatures)
+        self.assertEqual(len(self.engine.last_ignored), 1)
+        self.assertEqual(len(self.engine.raw_combatants), 2)
+
+    def test_empty_tracker_only_indexes(self):
+        engine = BridgeReconciler()
+        state = TrackerState(manager=CreatureManager())
+        new_state, events = engine.reconcile(state, self._baseline())
+
+        self.assertEqual(events, [])
+        self.assertEqual(new_state, state)
+        self.assertIsNotNone(engine.resolve_name("Goblin"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import sys
+import time
+from pathlib import Path
+import unittest
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.mock_storage_api import MockStorageServer
+from app.resilience import (
+    CLOSED, HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker, CircuitOpenError, StorageResilience,
+)
+from app.storage_api import StorageAPI
+from app.storage_cache import StorageCache
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _resilience(clock, sleeps=None, **options):
+    return StorageResilience(
+        breaker=CircuitBreaker(threshold=3, reset_s=10, clock=clock),
+        clock=clock,
+        sleep=(sleeps.append if sleeps is not None else lambda s: None),
+        rng=lambda: 1.0,
+        **options,
+    )
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_fails_fast_and_recovers_through_one_trial(self):
+        clock = _Clock()
+        changes = []
+        breaker = CircuitBreaker(threshold=3, reset_s=10, clock=clock, on_change=changes.append)
+        for _ in range(3):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now += 10
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())  # only one trial at a time
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        clock.now += 10
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(changes, [OPEN, HALF_OPEN, OPEN, HALF_OPEN, CLOSED])
+
+    def test_success_resets_the_failure_count(self):
+        breaker = CircuitBreaker(threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+
+class AdaptiveTimeoutTests(unittest.TestCase):
+    def test_follows_latency_within_bounds(self):
+        timeout = AdaptiveTimeout(initial_s=8, min_s=0.5, max_s=30)
+        self.assertEqual(timeout.current(), 8)
+        for _ in range(20):
+            timeout.observe(0.05)
+        self.assertEqual(timeout.current(), 0.5)
+        for _ in range(40):
+            timeout.observe(4.0)
+        self.assertAlmostEqual(timeout.current(), 4.0, delta=1.0)
+        timeout.timed_out()
+        self.assertGreater(timeout.current(), 7.0)
+        for _ in range(10):
+            timeout.timed_out()
+        self.assertEqual(timeout.current(), 30)
+
+
+class StorageResilienceTests(unittest.TestCase):
+    def test_retries_idempotent_requests_with_jittered_backoff(self):
+        sleeps = []
+        resilience = _resilience(_Clock(), sleeps)
+        answers = iter([_Response(503), requests.ConnectionError("reset"), _Response(200)])
+
+        def send(timeout):
+            answer = next(answers)
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        self.assertEqual(resilience.call(send, idempotent=True).status_code, 200)
+        self.assertEqual(sleeps, [0.2, 0.4])
+
+    def test_writes_are_not_retried(self):
+        resilience = _resilience(_Clock())
+        calls = []
+        r = resilience.call(lambda t: calls.append(t) or _Response(503))
+        self.assertEqual(r.status_code, 503)
+        self.assertEqual(len(calls), 1)
+
+    def test_open_breaker_fails_without_sending(self):
+        clock = _Clock()
+        resilience = _resilience(clock)
+        statuses = []
+        resilience.on_change = statuses.append
+
+        def down(timeout):
+            raise requests.ConnectTimeout("down")
+
+        for _ in range(3):
+            with self.assertRaises(requests.ConnectTimeout):
+                resilience.call(down)
+        sent = []
+        with self.assertRaises(CircuitOpenError):
+            resilience.call(lambda t: sent.append(t) or _Response(200), idempotent=True)
+        self.assertEqual(sent, [])
+        self.assertEqual(statuses[-1]["state"], OPEN)
+
+        clock.now += 10
+        self.assertEqual(resilience.call(lambda t: _Response(404)).status_code, 404)
+        self.assertEqual(statuses[-1]["state"], CLOSED)
+
+    def test_explicit_timeout_is_passed_through(self):
+        resilience = _resilience(_Clock())
+        seen = []
+        resilience.call(lambda t: seen.append(t) or _Response(200), timeout=(5, 30))
+        self.assertEqual(seen, [(5, 30)])
+
+
+class StorageAPIResilienceTests(unittest.TestCase):
+    def test_down_server_fails_fast_and_serves_cached_copies(self):
+        server = MockStorageServer().start()
+        self.addCleanup(server.stop)
+        cache = StorageCache(":memory:", namespace=server.base_url, fresh_s=0)
+        self.addCleanup(cache.close)
+        api = StorageAPI(server.base_url, cache=cache)
+        self.addCleanup(api.session.close)
+        api.resilience.retries = 0
+        api.save_spell("shield.json", {"name": "Shield"})
+        self.assertEqual(api.get_spell("shield.json"), {"name": "Shield"})
+
+        server.stop()
+        for _ in range(api.resilience.breaker.threshold):
+            with self.assertRaises(RuntimeError):
+                api.get_statblock("goblin.json")
+        self.assertEqual(api.resilience.status()["state"], OPEN)
+
+        start = time.perf_counter()
+        with self.assertRaises(RuntimeError):
+            api.get_statblock("goblin.json")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(api.get_spell("shield.json"), {"name": "Shield"})
+        self.assertEqual(cache.stats()["stale"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
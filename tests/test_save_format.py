@@ -0,0 +1,110 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.creature import Monster, Player
+from app.local_storage import LocalStorage
+from app.save_format import FORMAT_VERSION, compact_creature, decode_state, encode_state
+from app.save_json import GameState
+from app.serialization import to_primitive
+
+
+def _state():
+    state = GameState()
+    state.players = [
+        Player(name="Aria", init=14, max_hp=30, curr_hp=22, spell_slots={1: 4, 2: 2},
+               conditions=["Blessed"], foundry_actor_id="a1"),
+    ]
+    state.monsters = [
+        Monster(name="Goblin", init=12, max_hp=7, curr_hp=3, ability_uses={"Nimble Escape": 3}),
+        Monster(name="Goblin_1", init=8, max_hp=7, curr_hp=7),
+    ]
+    state.current_turn = 1
+    state.round_counter = 3
+    state.time_counter = 18
+    return state
+
+
+def _fields(creature):
+    return to_primitive(creature.to_dict())
+
+
+class SaveFormatTests(unittest.TestCase):
+    def test_omits_defaults_and_round_trips(self):
+        state = _state()
+        raw = json.loads(json.dumps(encode_state(state)))
+        self.assertEqual(raw["version"], FORMAT_VERSION)
+        goblin = raw["monsters"][1]
+        self.assertNotIn("_notes", goblin)
+        self.assertNotIn("_spell_slots", goblin)
+
+        loaded = decode_state(raw)
+        self.assertEqual(loaded["round_counter"], 3)
+        for before, after in zip(state.players + state.monsters,
+                                 list(loaded["players"]) + list(loaded["monsters"])):
+            self.assertIs(type(after), type(before))
+            self.assertEqual(_fields(after), _fields(before))
+
+    def test_compressed_encoding(self):
+        state = _state()
+        raw = json.loads(json.dumps(encode_state(state, compress=True)))
+        self.assertEqual(raw["encoding"], "zlib")
+        loaded = decode_state(raw)
+        self.assertEqual([m.name for m in loaded["monsters"]], ["Goblin", "Goblin_1"])
+
+    def test_creatures_decode_lazily(self):
+        loaded = decode_state(encode_state(_state()))
+        self.assertEqual(loaded["players"].names(), ["Aria"])
+        with mock.patch("app.creature.I_Creature.from_dict", wraps=Player.from_dict) as from_dict:
+            first = loaded["monsters"][0]
+            self.assertIs(loaded["monsters"][0], first)
+        self.assertEqual(from_dict.call_count, 1)
+
+    def test_decoded_defaults_are_not_shared(self):
+        loaded = decode_state(encode_state(_state()))
+        a, b = loaded["monsters"]
+        a.conditions = ["Prone"]
+        with self.assertRaises(TypeError):
+            a._spell_slots["1"] = 1  # the shared empty dict
+        a.writable_resource("_spell_slots")["1"] = 1
+        self.assertEqual(b.conditions, [])
+        self.assertEqual(b._spell_slots, {})
+        self.assertEqual(a._spell_slots, {"1": 1})
+
+    def test_reads_version_1_saves(self):
+        state = _state()
+        legacy = json.loads(json.dumps(to_primitive(state.to_dict())))
+        loaded = decode_state(legacy)
+        self.assertEqual(_fields(loaded["players"][0]), _fields(state.players[0]))
+        self.assertEqual(len(loaded["monsters"]), 2)
+
+    def test_rejects_newer_versions(self):
+        raw = encode_state(_state())
+        raw["version"] = FORMAT_VERSION + 1
+        with self.assertRaises(ValueError):
+            decode_state(raw)
+
+    def test_local_storage_writes_versioned_saves_compact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalStorage(tmp)
+            storage.put("enc.json", encode_state(_state()))
+            storage.put("players.json", {"players": []})
+            self.assertNotIn("\n", (Path(tmp) / "enc.json").read_text(encoding="utf-8"))
+            self.assertIn("\n", (Path(tmp) / "players.json").read_text(encoding="utf-8"))
+            self.assertEqual(decode_state(storage.get("enc.json"))["monsters"][0].name, "Goblin")
+
+    def test_compact_creature_keeps_identity_fields(self):
+        data = compact_creature(Monster(name="Bat"))
+        self.assertEqual(data["_type"], 1)
+        self.assertEqual(data["_name"], "Bat")
+
+
+if __name__ == "__main__":
+    unittest.main()
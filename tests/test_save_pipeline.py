@@ -0,0 +1,158 @@
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import LocalStorage
+from app.mock_storage_api import MockStorageServer
+from app.save_pipeline import BULK_WRITE_CHUNK, SavePipeline
+from app.sqlite_storage import SQLiteStorage
+from app.storage_api import StorageAPI
+
+
+def _docs(n):
+    return [(f"item_{i:03d}.json", {"name": f"Item {i}"}) for i in range(n)]
+
+
+class _FlakyStorage:
+    """save_item fails the first ``failures`` times per key."""
+
+    def __init__(self, failures=0, broken=()):
+        self.failures = failures
+        self.broken = set(broken)
+        self.calls = {}
+        self.saved = {}
+        self.lock = threading.Lock()
+
+    def save_item(self, key, data):
+        with self.lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            attempt = self.calls[key]
+        if key in self.broken or attempt <= self.failures:
+            raise RuntimeError(f"save_item({key}) failed")
+        self.saved[key] = data
+        return True
+
+
+class SavePipelineTests(unittest.TestCase):
+    def test_retries_with_backoff_then_reports_each_key(self):
+        storage = _FlakyStorage(failures=1, broken={"item_002.json"})
+        seen = []
+        pipeline = SavePipeline(storage, "items", retries=2, backoff_s=0, on_result=lambda k, e: seen.append((k, e)))
+        report = pipeline.run(_docs(4))
+
+        self.assertEqual(sorted(report.saved), ["item_000.json", "item_001.json", "item_003.json"])
+        self.assertIn("failed", report.failed["item_002.json"])
+        self.assertEqual(storage.calls["item_000.json"], 2)
+        self.assertEqual(storage.calls["item_002.json"], 3)
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(report.cancelled, [])
+
+    def test_pool_is_bounded(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        class _Slow(_FlakyStorage):
+            def save_item(self, key, data):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                threading.Event().wait(0.01)
+                with lock:
+                    active[0] -= 1
+                return super().save_item(key, data)
+
+        storage = _Slow()
+        report = SavePipeline(storage, "items", max_workers=3).run(_docs(20))
+        self.assertEqual(len(report.saved), 20)
+        self.assertLessEqual(peak[0], 3)
+        self.assertGreater(peak[0], 1)
+
+    def test_cancel_stops_unsent_keys_and_interrupts_backoff(self):
+        storage = _FlakyStorage(failures=10)
+        pipeline = SavePipeline(storage, "items", max_workers=1, retries=5, backoff_s=30)
+        threading.Timer(0.05, pipeline.cancel).start()
+        report = pipeline.run(_docs(5))
+        self.assertEqual(report.saved, [])
+        self.assertEqual(len(report.cancelled), 5)
+        self.assertEqual(storage.calls, {"item_000.json": 1})
+
+    def test_uses_bulk_write_endpoint(self):
+        server = MockStorageServer().start()
+        self.addCleanup(server.stop)
+        api = StorageAPI(server.base_url)
+        self.addCleanup(api.session.close)
+        requests_seen = []
+        original = api.session.request
+        api.session.request = lambda method, url, **kw: requests_seen.append((method, url)) or original(method, url, **kw)
+
+        docs = _docs(BULK_WRITE_CHUNK + 5) + [("bad.json", "not an object")]
+        report = SavePipeline(api, "items").run(docs)
+
+        self.assertEqual(len(report.saved), BULK_WRITE_CHUNK + 5)
+        self.assertIn("bad.json", report.failed)
+        self.assertEqual(server.store.get("items", "item_003.json")[1], {"name": "Item 3"})
+        self.assertTrue(all(url.endswith("/bulk_put") for _, url in requests_seen))
+        self.assertEqual(len(requests_seen), 2)
+
+    def test_falls_back_to_single_saves_without_bulk_endpoint(self):
+        server = MockStorageServer(bulk=False).start()
+        self.addCleanup(server.stop)
+        api = StorageAPI(server.base_url)
+        self.addCleanup(api.session.close)
+
+        report = SavePipeline(api, "items").run(_docs(12))
+        self.assertEqual(len(report.saved), 12)
+        self.assertEqual(len(server.store.keys("items")), 12)
+        self.assertIsNone(api.save_items_bulk({"x.json": {}}))
+
+    def test_local_backends(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for storage in (LocalStorage(tmp), SQLiteStorage(str(Path(tmp) / "lib.sqlite"))):
+                report = SavePipeline(storage, "items").run(_docs(10))
+                self.assertEqual(len(report.saved), 10)
+                self.assertEqual(len(storage.list_item_keys()), 10)
+                if hasattr(storage, "close"):
+                    storage.close()
+
+    def test_batched_results_wait_for_the_commit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalStorage(tmp)
+            seen = []
+
+            def on_result(key, error):
+                seen.append((key, error, Path(tmp, "items", key).exists()))
+
+            report = SavePipeline(storage, "items", on_result=on_result).run(_docs(3))
+            self.assertEqual(len(report.saved), 3)
+            self.assertTrue(all(error is None and on_disk for _, error, on_disk in seen))
+
+    def test_failed_commit_reports_the_whole_batch_as_failed(self):
+        class _Batched(_FlakyStorage):
+            @contextmanager
+            def batch(self):
+                yield
+                raise OSError("journal write failed")
+
+        storage = _Batched(broken={"item_001.json"})
+        seen = []
+        report = SavePipeline(storage, "items", retries=0, on_result=lambda k, e: seen.append((k, e))).run(_docs(3))
+        self.assertEqual(report.saved, [])
+        self.assertEqual(report.failed["item_000.json"], "journal write failed")
+        self.assertIn("save_item(item_001.json)", report.failed["item_001.json"])
+        self.assertEqual(len(report.failed), 3)
+        self.assertTrue(all(error is not None for _, error in seen))
+
+    def test_unknown_collection(self):
+        with self.assertRaises(ValueError):
+            SavePipeline(_FlakyStorage(), "encounters")
+
+
+if __name__ == "__main__":
+    unittest.main()
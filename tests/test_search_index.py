@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import LocalStorage
+from app.mock_storage_api import MockStorageServer
+from app.search_index import LibrarySearch, SearchIndex
+from app.sqlite_storage import SQLiteStorage
+from app.storage_api import StorageAPI
+
+FIREBALL = {
+    "name": "Fireball", "level": 3, "school": "Evocation",
+    "description": "Each creature in a 20-foot-radius sphere takes 8d6 fire damage.",
+}
+FLAME_TONGUE = {
+    "name": "Flame Tongue", "rarity": "Rare", "tags": ["weapon"],
+    "description": "The blade deals an extra 2d6 fire damage to any target it hits.",
+}
+RED_DRAGON = {
+    "name": "Adult Red Dragon", "type": "dragon (chromatic)", "size": "Huge",
+    "challenge_rating": "17", "damage_immunities": ["fire"],
+    "actions": [{"name": "Fire Breath", "description": "63 (18d6) fire damage."}],
+}
+SHIELD = {"name": "Shield", "level": 1, "school": "Abjuration",
+          "description": "An invisible barrier of magical force appears."}
+
+
+def _keys(hits):
+    return [h.key for h in hits]
+
+
+class SearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("spells", "fireball.json", FIREBALL)
+        self.index.add("spells", "shield.json", SHIELD)
+        self.index.add("items", "flame_tongue.json", FLAME_TONGUE)
+        self.index.add("statblocks", "red_dragon.json", RED_DRAGON)
+
+    def test_searches_descriptions_and_ranks_names_first(self):
+        hits = self.index.search("fire")
+        self.assertEqual(hits[0].key, "fireball.json")
+        self.assertEqual(set(_keys(hits)), {"fireball.json", "flame_tongue.json", "red_dragon.json"})
+
+    def test_last_word_matches_as_prefix(self):
+        self.assertEqual(_keys(self.index.search("flam")), ["flame_tongue.json"])
+        self.assertEqual(_keys(self.index.search("flam ")), [])
+
+    def test_field_filters(self):
+        self.assertEqual(_keys(self.index.search("level:3")), ["fireball.json"])
+        self.assertEqual(_keys(self.index.search("school:abjuration")), ["shield.json"])
+        self.assertEqual(_keys(self.index.search("immune:fire")), ["red_dragon.json"])
+        self.assertEqual(_keys(self.index.search("type:dragon cr:17")), ["red_dragon.json"])
+        self.assertEqual(_keys(self.index.search("tag:weapon")), ["flame_tongue.json"])
+        self.assertEqual(
+            _keys(self.index.search("damage:fire in:spells")), ["fireball.json"]
+        )
+        self.assertEqual(_keys(self.index.search("fire in:monster")), ["red_dragon.json"])
+
+    def test_collections_argument_restricts_results(self):
+        hits = self.index.search("fire", collections=("items",))
+        self.assertEqual(_keys(hits), ["flame_tongue.json"])
+
+    def test_update_and_remove(self):
+        self.index.add("spells", "fireball.json", dict(FIREBALL, description="Cold."))
+        self.assertNotIn("fireball.json", _keys(self.index.search("sphere")))
+        self.index.remove("items", "flame_tongue.json")
+        self.assertEqual(_keys(self.index.search("tag:weapon")), [])
+
+    def test_round_trips_through_json(self):
+        raw = json.loads(json.dumps(self.index.to_json("lib")))
+        loaded = SearchIndex.from_json(raw, "lib")
+        self.assertEqual(_keys(loaded.search("fire")), _keys(self.index.search("fire")))
+        self.assertEqual(len(SearchIndex.from_json(raw, "other library")), 0)
+
+
+class LibrarySearchTests(unittest.TestCase):
+    def setUp(self):
+        self.docs = {"spells": {"fireball.json": FIREBALL}, "statblocks": {}, "items": {}}
+        self.stamp_calls = 0
+        self.reading = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+        def stamps(collection):
+            self.stamp_calls += 1
+            return dict.fromkeys(self.docs[collection])
+
+        def read_many(collection, keys):
+            self.reading.set()
+            self.release.wait(5)
+            return {k: self.docs[collection][k] for k in keys if k in self.docs[collection]}
+
+        self.search = LibrarySearch(stamps, read_many)
+        self.search.sync(force=True)
+
+    def test_search_never_reads_the_backend(self):
+        self.search.invalidate()
+        self.stamp_calls = 0
+        self.assertEqual(_keys(self.search.search("sphere")), ["fireball.json"])
+        self.assertEqual(self.stamp_calls, 0)
+
+    def test_search_answers_during_a_sync_and_keeps_newer_saves(self):
+        self.docs["spells"]["shield.json"] = SHIELD
+        self.release.clear()
+        worker = threading.Thread(target=self.search.sync, kwargs={"force": True}, daemon=True)
+        worker.start()
+        self.assertTrue(self.reading.wait(5))
+        self.assertEqual(_keys(self.search.search("sphere")), ["fireball.json"])
+        self.search.update("spells", "shield.json", dict(SHIELD, description="Thorns."))
+        self.release.set()
+        worker.join(5)
+        self.assertEqual(_keys(self.search.search("thorns")), ["shield.json"])
+        self.assertEqual(_keys(self.search.search("barrier")), [])
+
+    def test_reread_all_keeps_old_entries_until_the_next_sync(self):
+        self.docs["spells"]["fireball.json"] = dict(FIREBALL, description="A bead of flame.")
+        self.search.reread_all()
+        self.assertEqual(_keys(self.search.search("sphere")), ["fireball.json"])
+        self.assertEqual(self.search.sync(), 1)
+        self.assertEqual(_keys(self.search.search("sphere")), [])
+        self.assertEqual(_keys(self.search.search("bead")), ["fireball.json"])
+
+
+class BackendSearchTests(unittest.TestCase):
+    def _check_backend(self, storage):
+        storage.save_spell("fireball.json", FIREBALL)
+        storage.save_item("flame_tongue.json", FLAME_TONGUE)
+        self.assertEqual(storage.sync_search_index(), 2)
+        self.assertEqual(_keys(storage.search("sphere")), ["fireball.json"])
+
+        # Saves and deletes update the index without a rescan.
+        storage.save_spell("shield.json", SHIELD)
+        storage.delete_item("flame_tongue.json")
+        self.assertEqual(_keys(storage.search("barrier")), ["shield.json"])
+        self.assertEqual(_keys(storage.search("tag:weapon")), [])
+
+    def test_local_storage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = LocalStorage(tmp)
+            self._check_backend(storage)
+
+            # Files changed behind the backend's back are picked up on sync.
+            with open(os.path.join(tmp, "spells", "shield.json"), "w", encoding="utf-8") as f:
+                json.dump(dict(SHIELD, description="A wall of thorns."), f)
+            os.utime(os.path.join(tmp, "spells", "shield.json"), ns=(1, 1))
+            storage.sync_search_index()
+            self.assertEqual(_keys(storage.search("thorns")), ["shield.json"])
+
+            # A fresh instance loads the saved index instead of re-reading files.
+            again = LocalStorage(tmp)
+            self.assertEqual(again.sync_search_index(), 0)
+            self.assertEqual(_keys(again.search("thorns")), ["shield.json"])
+
+    def test_sqlite_storage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "library.sqlite")
+            storage = SQLiteStorage(path)
+            self._check_backend(storage)
+            storage.close()
+
+            again = SQLiteStorage(path)
+            self.addCleanup(again.close)
+            self.assertEqual(again.sync_search_index(), 0)
+            self.assertEqual(_keys(again.search("barrier")), ["shield.json"])
+
+    def test_storage_api(self):
+        server = MockStorageServer().start()
+        self.addCleanup(server.stop)
+        with tempfile.TemporaryDirectory() as tmp:
+            api = StorageAPI(server.base_url, search_index_path=os.path.join(tmp, "index.json"))
+            self.addCleanup(api.session.close)
+            self._check_backend(api)
+
+            # Another client's edit reaches the index through the change feed.
+            cursor = api.changes_since(None).cursor
+            server.store.put("spells", "shield.json", dict(SHIELD, description="Thorns."))
+            api.changes_since(cursor)
+            api.sync_search_index()
+            self.assertEqual(_keys(api.search("thorns")), ["shield.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
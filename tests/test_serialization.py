@@ -0,0 +1,71 @@
+import json
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.creature import CustomEncoder, I_Creature, Monster, Player, slot_values
+from app.save_json import GameState
+from app.serialization import from_primitive, to_primitive
+
+
+def _state():
+    state = GameState()
+    state.players = [
+        Player(name="Surina", init=14, max_hp=30, curr_hp=22, conditions=["Prone"],
+               spell_slots={1: 4, 2: 3}, spell_slots_used={1: 1}),
+    ]
+    state.monsters = [
+        Monster(name="Goblin", init=12, max_hp=7, curr_hp=7, innate_slots={"misty step": 1},
+                ability_uses={"Nimble Escape": 3}, foundry_token_id="tok1"),
+    ]
+    state.current_turn = 1
+    state.round_counter = 2
+    state.time_counter = 6
+    return state
+
+
+def _old_decoder(data):
+    if "_type" in data:
+        return I_Creature.from_dict(data)
+    return data
+
+
+class SerializationTests(unittest.TestCase):
+    def test_to_primitive_matches_encoder_round_trip(self):
+        state = _state()
+        expected = json.loads(json.dumps(state.to_dict(), cls=CustomEncoder))
+        self.assertEqual(to_primitive(state.to_dict()), expected)
+        # Creature objects themselves encode as their fields, as before.
+        player = state.players[0]
+        self.assertEqual(to_primitive(player), json.loads(json.dumps(player, cls=CustomEncoder)))
+
+    def test_keys_are_stringified_like_json(self):
+        data = {1: "a", 2.5: "b", None: "d", "x": (1, 2)}
+        self.assertEqual(to_primitive(data), json.loads(json.dumps(data)))
+        # True == 1, so bool keys need a dict of their own.
+        flags = {True: "c", False: "e"}
+        self.assertEqual(to_primitive(flags), {"true": "c", "false": "e"})
+        self.assertEqual(to_primitive(flags), json.loads(json.dumps(flags)))
+
+    def test_from_primitive_matches_object_hook(self):
+        raw = to_primitive(_state().to_dict())
+        old = json.loads(json.dumps(raw), object_hook=_old_decoder)
+        new = from_primitive(raw)
+
+        self.assertEqual(list(new), list(old))
+        for a, b in zip(new["players"] + new["monsters"], old["players"] + old["monsters"]):
+            self.assertIs(type(a), type(b))
+            self.assertEqual(slot_values(a), slot_values(b))
+        self.assertIsInstance(raw["players"][0], dict)  # input left untouched
+
+    def test_rejects_unserializable_values(self):
+        with self.assertRaises(TypeError):
+            to_primitive({"bad": {1, 2}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.session_recorder import SessionRecorder, read_session
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class SessionRecorderTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "session.jsonl.gz")
+        self.clock = _FakeClock()
+
+    def test_round_trip(self):
+        recorder = SessionRecorder(self.path, clock=self.clock)
+        self.clock.now = 101.5
+        recorder.record_snapshot({"combatants": [{"name": "Goblin"}]}, source="stream")
+        self.clock.now = 102.0
+        recorder.record_command({"type": "next_turn", "payload": {}}, status=202, ok=True)
+        recorder.close()
+
+        records = list(read_session(self.path))
+        self.assertEqual([r["kind"] for r in records], ["session", "snapshot", "command"])
+        self.assertEqual(records[1]["t"], 1.5)
+        self.assertEqual(records[1]["source"], "stream")
+        self.assertEqual(records[1]["data"]["combatants"][0]["name"], "Goblin")
+        self.assertEqual(records[2]["status"], 202)
+
+    def test_truncated_session_keeps_complete_lines(self):
+        recorder = SessionRecorder(self.path, clock=self.clock, flush_interval_s=0)
+        for i in range(3):
+            recorder.record_snapshot({"combat": {"round": i}}, source="poll")
+        recorder._fh.fileobj.flush()
+        with open(self.path, "rb") as f:
+            partial = f.read()
+        recorder.close()
+
+        cut = self.path + ".cut"
+        with open(cut, "wb") as f:
+            f.write(partial)
+        rounds = [r["data"]["combat"]["round"] for r in read_session(cut) if r["kind"] == "snapshot"]
+        self.assertEqual(rounds, [0, 1, 2])
+
+    def test_writes_after_close_are_ignored(self):
+        recorder = SessionRecorder(self.path, clock=self.clock)
+        recorder.close()
+        recorder.record_snapshot({"combatants": []}, source="poll")
+        self.assertFalse(recorder.active)
+        with gzip.open(self.path, "rt") as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
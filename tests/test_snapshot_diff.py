@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.snapshot_diff import ALL_FIELDS, diff_snapshots
+
+
+def _combatant(cid, name, hp=10, **extra):
+    data = {
+        "combatantId": cid,
+        "tokenId": f"tok-{cid}",
+        "actorId": f"act-{cid}",
+        "name": name,
+        "initiative": 12,
+        "hp": {"value": hp, "max": 10, "temp": 0, "tempmax": 0},
+        "effects": [],
+    }
+    data.update(extra)
+    return data
+
+
+def _snapshot(*combatants, round_value=1, active="c1"):
+    return {
+        "combatants": list(combatants),
+        "combat": {"round": round_value, "activeCombatant": {"combatantId": active}},
+    }
+
+
+class SnapshotDiffTests(unittest.TestCase):
+    def test_first_snapshot_adds_everything(self):
+        current = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+
+        diff = diff_snapshots(None, current)
+
+        self.assertEqual([c.combatant_id for c in diff.added], ["c1", "c2"])
+        self.assertTrue(all(c.fields == ALL_FIELDS for c in diff.added))
+        self.assertTrue(diff.combat_changed)
+
+    def test_identical_snapshot_is_empty(self):
+        previous = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+        current = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertTrue(diff.is_empty)
+        self.assertFalse(diff.membership_changed)
+
+    def test_only_changed_fields_are_reported(self):
+        previous = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+        current = _snapshot(
+            _combatant("c1", "Goblin", hp=4),
+            _combatant("c2", "Orc"),
+        )
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertEqual(len(diff.changed), 1)
+        self.assertEqual(diff.changed[0].combatant_id, "c1")
+        self.assertEqual(diff.changed[0].fields, frozenset({"hp"}))
+        self.assertFalse(diff.combat_changed)
+        self.assertFalse(diff.membership_changed)
+
+    def test_unsynced_fields_are_ignored(self):
+        previous = _snapshot(_combatant("c1", "Goblin", img="a.png"))
+        current = _snapshot(_combatant("c1", "Goblin", img="b.png"))
+
+        self.assertTrue(diff_snapshots(previous, current).is_empty)
+
+    def test_added_and_removed_combatants(self):
+        previous = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+        current = _snapshot(_combatant("c1", "Goblin"), _combatant("c3", "Wolf"))
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertEqual([c.combatant_id for c in diff.added], ["c3"])
+        self.assertEqual(diff.removed, ["c2"])
+        self.assertTrue(diff.membership_changed)
+        self.assertEqual(set(diff.changes_by_id()), {"c3"})
+
+    def test_rename_counts_as_membership_change(self):
+        previous = _snapshot(_combatant("c1", "Goblin"))
+        current = _snapshot(_combatant("c1", "Goblin Boss"))
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertEqual(diff.changed[0].fields, frozenset({"name"}))
+        self.assertTrue(diff.membership_changed)
+
+    def test_turn_change_only_touches_combat(self):
+        previous = _snapshot(_combatant("c1", "Goblin"), _combatant("c2", "Orc"))
+        current = _snapshot(
+            _combatant("c1", "Goblin"), _combatant("c2", "Orc"), active="c2"
+        )
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertTrue(diff.combat_changed)
+        self.assertFalse(diff.changed)
+        self.assertFalse(diff.added)
+
+    def test_combatants_without_id_are_unkeyed(self):
+        loose = {"name": "Mystery", "hp": {"value": 3}}
+        previous = _snapshot(_combatant("c1", "Goblin"))
+        current = _snapshot(_combatant("c1", "Goblin"), loose)
+
+        diff = diff_snapshots(previous, current)
+
+        self.assertEqual(diff.unkeyed, [loose])
+        self.assertTrue(diff.membership_changed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import LocalStorage, open_local_storage
+from app.sqlite_storage import DB_FILENAME, SQLiteStorage
+
+
+class SQLiteStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.storage = SQLiteStorage(":memory:")
+        self.addCleanup(self.storage.close)
+
+    def test_round_trips_every_collection(self):
+        s = self.storage
+        s.put("encounter.json", {"players": []})
+        s.save_statblock("goblin.json", {"name": "Goblin", "challenge_rating": "1/4"})
+        s.save_spell("shield.json", {"name": "Shield", "level": 1})
+        s.save_item("rope.json", {"name": "Rope", "cost": "1 gp", "description": "50 ft."})
+
+        self.assertEqual(s.list(), ["encounter.json"])
+        self.assertEqual(s.get_json("encounter.json"), {"players": []})
+        self.assertEqual(s.get_statblock("goblin.json")["challenge_rating"], "1/4")
+        self.assertEqual(
+            s.get_spells_bulk(["nope.json", "shield.json"]),
+            {"shield.json": {"name": "Shield", "level": 1}},
+        )
+        self.assertEqual(s.get_item_manifest(), {"rope.json": {"name": "Rope", "cost": "1 gp"}})
+
+        s.delete_item("rope.json")
+        self.assertIsNone(s.get_item("rope.json"))
+        self.assertEqual(s.list_item_keys(), [])
+
+    def test_name_and_tag_lookups(self):
+        self.storage.save_item("dagger.json", {"name": "Dagger", "tags": ["weapon", "light"]})
+        self.storage.save_item("dart.json", {"name": "Dart", "tags": ["Weapon"]})
+        self.storage.save_item("drum.json", {"name": "Drum", "tags": ["instrument"]})
+
+        self.assertEqual(self.storage.keys_named("items", "da"), ["dagger.json", "dart.json"])
+        self.assertEqual(self.storage.keys_with_tag("items", "weapon"), ["dagger.json", "dart.json"])
+
+        self.storage.save_item("dart.json", {"name": "Dart"})
+        self.assertEqual(self.storage.keys_with_tag("items", "weapon"), ["dagger.json"])
+
+    def test_batch_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.storage.batch():
+                self.storage.save_spell("a.json", {"name": "A"})
+                with self.storage.batch():
+                    self.storage.save_spell("b.json", {"name": "B"})
+                raise RuntimeError("abort")
+        self.assertEqual(self.storage.list_spell_keys(), [])
+
+        with self.storage.batch():
+            self.storage.save_spell("a.json", {"name": "A"})
+        self.assertEqual(self.storage.list_spell_keys(), ["a.json"])
+
+
+class MigrationTests(unittest.TestCase):
+    def test_imports_directory_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            files = LocalStorage(tmp)
+            files.put("last_state.json", {"round": 3})
+            files.save_statblock("goblin.json", {"name": "Goblin"})
+            files.save_item("rope.json", {"name": "Rope"})
+
+            db = open_local_storage(tmp, engine="sqlite")
+            self.addCleanup(db.close)
+            self.assertTrue(os.path.exists(os.path.join(tmp, DB_FILENAME)))
+            self.assertEqual(db.get("last_state.json"), {"round": 3})
+            self.assertEqual(db.list_statblock_keys(), ["goblin.json"])
+
+            # Later deletes in the database aren't undone by a re-import.
+            db.delete_item("rope.json")
+            db.close()
+            again = SQLiteStorage.for_data_dir(tmp)
+            self.addCleanup(again.close)
+            self.assertEqual(again.list_item_keys(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
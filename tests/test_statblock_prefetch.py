@@ -0,0 +1,94 @@
+import sys
+import threading
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.statblock_prefetch import StatblockPrefetcher
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StatblockPrefetcherTests(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.fetched = []
+        self.library = {"goblin": {"name": "Goblin"}}
+        self.clock = _FakeClock()
+
+    def _fetch(self, key):
+        self.release.wait(5)
+        self.fetched.append(key)
+        return self.library.get(key)
+
+    def _dispatch(self, fn):
+        # Run inline; the app routes this to the GUI thread instead.
+        fn()
+
+    def _prefetcher(self):
+        prefetcher = StatblockPrefetcher(
+            self._fetch, self._dispatch, max_workers=2, miss_ttl_s=30, clock=self.clock
+        )
+        self.addCleanup(prefetcher.shutdown)
+        return prefetcher
+
+    def _wait_idle(self, prefetcher):
+        prefetcher._executor.shutdown(wait=True)
+        prefetcher._executor = None
+
+    def test_concurrent_requests_share_one_fetch(self):
+        prefetcher = self._prefetcher()
+        results = []
+        self.assertTrue(prefetcher.request("goblin", results.append))
+        self.assertTrue(prefetcher.request("goblin", results.append))
+        self.release.set()
+        self._wait_idle(prefetcher)
+
+        self.assertEqual(self.fetched, ["goblin"])
+        self.assertEqual(results, [{"name": "Goblin"}, {"name": "Goblin"}])
+
+    def test_misses_are_cached_until_ttl(self):
+        prefetcher = self._prefetcher()
+        self.release.set()
+        results = []
+        prefetcher.request("dragon", results.append)
+        self._wait_idle(prefetcher)
+
+        self.assertEqual(results, [])
+        self.assertTrue(prefetcher.is_known_miss("dragon"))
+        self.assertFalse(prefetcher.request("dragon", results.append))
+
+        self.clock.now = 31
+        self.assertTrue(prefetcher.request("dragon", results.append))
+        self._wait_idle(prefetcher)
+        self.assertEqual(self.fetched, ["dragon", "dragon"])
+
+    def test_fetch_errors_count_as_misses(self):
+        def broken(key):
+            raise RuntimeError("storage down")
+
+        prefetcher = StatblockPrefetcher(broken, self._dispatch, clock=self.clock)
+        prefetcher.request("goblin", lambda data: self.fail("should not dispatch"))
+        self._wait_idle(prefetcher)
+        self.assertTrue(prefetcher.is_known_miss("goblin"))
+
+        prefetcher.forget_misses()
+        self.assertFalse(prefetcher.is_known_miss("goblin"))
+
+    def test_empty_key_is_ignored(self):
+        prefetcher = self._prefetcher()
+        self.assertFalse(prefetcher.request("", lambda data: None))
+        self.assertIsNone(prefetcher._executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
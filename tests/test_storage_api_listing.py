@@ -0,0 +1,117 @@
+import sys
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.storage_api import StorageAPI
+
+KEYS = [f"spell_{i:02d}.json" for i in range(25)]
+
+
+class _Response:
+    def __init__(self, status_code, payload=None, links=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.links = links or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _PagingSession:
+    """Serves KEYS from /v1/spells/items ten at a time in the given style."""
+
+    def __init__(self, style, page_size=10, fail_after=None):
+        self.style = style
+        self.page_size = page_size
+        self.fail_after = fail_after
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.urls.append(url)
+        parts = urlsplit(url)
+        if not parts.path.endswith("/items"):
+            return _Response(404)
+        if self.fail_after is not None and len(self.urls) > self.fail_after:
+            return _Response(503)
+        params = dict(parse_qsl(parts.query))
+        start = int(params.get("cursor") or params.get("offset") or 0)
+        end = start + self.page_size
+        page = KEYS[start:end]
+        more = end < len(KEYS)
+        if self.style == "next_url":
+            nxt = f"{parts.path}?cursor={end}" if more else None
+            return _Response(200, {"items": page, "next": nxt})
+        if self.style == "cursor":
+            body = {"data": {"keys": [{"key": k} for k in page]}, "next_cursor": str(end)}
+            body["has_more"] = more
+            return _Response(200, body)
+        if self.style == "offset":
+            return _Response(200, {"results": page, "offset": start, "limit": 10,
+                                   "total": len(KEYS)})
+        if self.style == "link":
+            links = {"next": {"url": f"?cursor={end}"}} if more else {}
+            return _Response(200, page, links=links)
+        return _Response(200, {"items": KEYS})
+
+
+class PaginatedListingTests(unittest.TestCase):
+    def _api(self, style, **options):
+        session = _PagingSession(style, **options)
+        return StorageAPI("http://storage", session=session), session
+
+    def test_follows_each_pagination_style(self):
+        for style in ("next_url", "cursor", "offset", "link"):
+            with self.subTest(style=style):
+                api, session = self._api(style)
+                self.assertEqual(api.list_spell_keys(), KEYS)
+                self.assertEqual(len(session.urls), 3)
+
+    def test_unpaginated_server_is_one_page(self):
+        api, session = self._api("all")
+        self.assertEqual(list(api.iter_key_pages("spells")), [KEYS])
+        self.assertEqual(session.urls, ["http://storage/v1/spells/items"])
+
+    def test_pages_are_yielded_as_they_arrive(self):
+        api, session = self._api("offset")
+        pages = api.iter_key_pages("spells")
+        self.assertEqual(next(pages), KEYS[:10])
+        self.assertEqual(len(session.urls), 1)
+
+    def test_failure_after_first_page_raises(self):
+        api, _ = self._api("next_url", fail_after=1)
+        pages = api.iter_key_pages("spells")
+        self.assertEqual(next(pages), KEYS[:10])
+        with self.assertRaises(RuntimeError):
+            next(pages)
+
+    def test_repeated_keys_are_skipped(self):
+        api, _ = self._api("offset")
+        # A record inserted at the front between pages shifts the offsets.
+        original = list(KEYS)
+        pages = api.iter_key_pages("spells")
+        first = next(pages)
+        KEYS.insert(0, "aaa.json")
+        try:
+            rest = [k for page in pages for k in page]
+        finally:
+            KEYS[:] = original
+        self.assertEqual(len(first + rest), len(set(first + rest)))
+
+    def test_unknown_collection(self):
+        api, _ = self._api("all")
+        with self.assertRaises(ValueError):
+            api.iter_keys("potions")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.storage_api import StorageAPI
+from app.storage_cache import StorageCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Response:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _ETagSession:
+    """Serves spells with an ETag per version and honours If-None-Match."""
+
+    def __init__(self, spells):
+        self.spells = spells
+        self.versions = {k: 1 for k in spells}
+        self.headers = {}
+        self.calls = []
+
+    def get(self, url, timeout=None, headers=None):
+        key = url.rsplit("/", 1)[-1]
+        self.calls.append(("GET", key, dict(headers or {})))
+        if key not in self.spells:
+            return _Response(404)
+        etag = f'"{key}-{self.versions[key]}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return _Response(304)
+        return _Response(200, {"data": self.spells[key]}, {"ETag": etag})
+
+    def put(self, url, json=None, timeout=None):
+        key = url.rsplit("/", 1)[-1]
+        self.calls.append(("PUT", key, {}))
+        self.spells[key] = json["data"]
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return _Response(200, {})
+
+
+class StorageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = StorageCache(":memory:", namespace="http://storage", fresh_s=60, clock=self.clock)
+        self.addCleanup(self.cache.close)
+        self.session = _ETagSession({"shield.json": {"name": "Shield"}})
+        self.api = StorageAPI("http://storage", session=self.session, cache=self.cache)
+
+    def test_repeat_lookup_is_served_locally(self):
+        self.assertEqual(self.api.get_spell("shield.json"), {"name": "Shield"})
+        self.assertEqual(self.api.get_spell("shield.json"), {"name": "Shield"})
+        self.assertEqual(len(self.session.calls), 1)
+        stats = self.api.cache_stats()
+        self.assertEqual((stats["misses"], stats["hits"], stats["entries"]), (1, 1, 1))
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        self.api.get_spell("shield.json")
+        self.clock.now += 120
+        self.assertEqual(self.api.get_spell("shield.json"), {"name": "Shield"})
+
+        _, _, headers = self.session.calls[-1]
+        self.assertEqual(headers, {"If-None-Match": '"shield.json-1"'})
+        self.assertEqual(self.api.cache_stats()["revalidated"], 1)
+
+        # The 304 refreshed the entry, so the next read stays local.
+        self.api.get_spell("shield.json")
+        self.assertEqual(len(self.session.calls), 2)
+
+    def test_local_write_invalidates(self):
+        self.api.get_spell("shield.json")
+        self.api.save_spell("shield.json", {"name": "Shield", "level": 1})
+        self.assertEqual(self.api.get_spell("shield.json"), {"name": "Shield", "level": 1})
+        self.assertEqual(self.api.cache_stats()["invalidations"], 1)
+
+    def test_missing_key_is_not_cached(self):
+        self.assertIsNone(self.api.get_spell("nope.json"))
+        self.assertIsNone(self.api.get_spell("nope.json"))
+        self.assertEqual(len(self.session.calls), 2)
+
+    def test_lru_eviction_bounds_size(self):
+        cache = StorageCache(":memory:", max_bytes=100, clock=self.clock)
+        self.addCleanup(cache.close)
+        for i in range(3):
+            self.clock.now += 1
+            cache.store("items", f"k{i}", {"pad": "x" * 20})
+        self.clock.now += 1
+        cache.lookup("items", "k0")  # recently used, so it survives
+        self.clock.now += 1
+        cache.store("items", "k3", {"pad": "x" * 20})
+
+        self.assertIsNotNone(cache.lookup("items", "k0"))
+        self.assertIsNone(cache.lookup("items", "k1"))
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 100)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_running_total_follows_writes(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "cache.sqlite")
+        cache = StorageCache(path, clock=self.clock)
+        cache.store("items", "a", {"pad": "x" * 20})
+        cache.store("items", "a", {"pad": "x" * 5})
+        cache.store("items", "b", {"pad": "y"})
+        cache.invalidate("items", "b")
+        cache.invalidate("items", "missing")
+        self.assertEqual(cache._total, cache.stats()["bytes"])
+        cache.close()
+
+        reopened = StorageCache(path, clock=self.clock)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened._total, reopened.stats()["bytes"])
+        reopened.clear()
+        self.assertEqual(reopened._total, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+import unittest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import LocalStorage
+from app.sqlite_storage import SQLiteStorage
+from app.storage_api import StorageAPI
+from app.storage_cache import StorageCache
+from app.storage_changes import Change, ChangeBatch, ChangeFeed
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _ChangesSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+class LocalStorageChangesTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.storage = LocalStorage(tmp.name)
+
+    def test_reports_files_changed_by_other_writers(self):
+        self.storage.save_spell("shield.json", {"name": "Shield"})
+        cursor = self.storage.changes_since(None).cursor
+
+        # Simulate a script rewriting one spell and adding an item.
+        path = os.path.join(self.storage.data_dir, "spells", "shield.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"name": "Shield", "level": 1}, f)
+        self.storage.save_item("rope.json", {"name": "Rope"})
+
+        batch = self.storage.changes_since(cursor)
+        self.assertFalse(batch.reset)
+        self.assertEqual(
+            set(batch.changes),
+            {Change("spells", "shield.json", "put"), Change("items", "rope.json", "put")},
+        )
+
+        self.storage.delete_spell("shield.json")
+        batch = self.storage.changes_since(batch.cursor)
+        self.assertEqual(batch.changes, [Change("spells", "shield.json", "delete")])
+        self.assertEqual(self.storage.changes_since(batch.cursor).changes, [])
+
+    def test_unknown_cursor_resets(self):
+        self.storage.changes_since(None)
+        self.assertTrue(self.storage.changes_since("elsewhere:3").reset)
+
+    def test_manifest_files_are_ignored(self):
+        cursor = self.storage.changes_since(None).cursor
+        self.storage.get_item_manifest()
+        self.storage.save_item("rope.json", {"name": "Rope"})
+        self.storage.get_item_manifest()
+        keys = [c.key for c in self.storage.changes_since(cursor).changes]
+        self.assertEqual(keys, ["rope.json"])
+
+
+class SQLiteStorageChangesTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "library.sqlite")
+        self.storage = SQLiteStorage(self.path)
+        self.addCleanup(self.storage.close)
+
+    def test_writes_from_another_connection_are_reported(self):
+        cursor = self.storage.changes_since(None).cursor
+        other = SQLiteStorage(self.path)
+        self.addCleanup(other.close)
+        with other.batch():
+            other.save_spell("shield.json", {"name": "Shield"})
+            other.delete_item("rope.json")
+
+        batch = self.storage.changes_since(cursor)
+        self.assertEqual(
+            batch.changes,
+            [Change("spells", "shield.json", "put"), Change("items", "rope.json", "delete")],
+        )
+
+    def test_trimmed_cursor_resets(self):
+        cursor = self.storage.changes_since(None).cursor
+        with mock.patch("app.sqlite_storage.CHANGE_LOG_SIZE", 2):
+            for i in range(5):
+                self.storage.save_spell(f"s{i}.json", {"name": str(i)})
+            self.assertTrue(self.storage.changes_since(cursor).reset)
+
+
+class StorageAPIChangesTests(unittest.TestCase):
+    def test_reported_changes_invalidate_the_cache(self):
+        cache = StorageCache(":memory:", namespace="http://storage", fresh_s=60)
+        self.addCleanup(cache.close)
+        cache.store("spells", "shield.json", {"name": "Shield"})
+        session = _ChangesSession([
+            _Response(200, {"cursor": "7", "changes": [
+                {"collection": "spells", "key": "shield.json", "op": "put"}]}),
+        ])
+        api = StorageAPI("http://storage", session=session, cache=cache)
+
+        batch = api.changes_since("5")
+        self.assertEqual(session.urls, ["http://storage/v1/changes?since=5"])
+        self.assertEqual(batch.cursor, "7")
+        self.assertIsNone(cache.lookup("spells", "shield.json"))
+
+    def test_missing_endpoint_disables_feed(self):
+        session = _ChangesSession([_Response(404)])
+        api = StorageAPI("http://storage", session=session)
+        self.assertIsNone(api.changes_since(None))
+        self.assertIsNone(api.changes_since(None))
+        self.assertEqual(len(session.urls), 1)
+
+
+class ChangeFeedTests(unittest.TestCase):
+    def test_subscribers_get_only_their_collections(self):
+        batches = [
+            ChangeBatch("1"),
+            ChangeBatch("2", [Change("spells", "shield.json", "put"),
+                              Change("items", "rope.json", "delete")]),
+        ]
+        feed = ChangeFeed(lambda cursor: batches.pop(0))
+        seen = []
+        feed.subscribe(("spells",), lambda c, keys, reset: seen.append((c, keys, reset)))
+
+        self.assertEqual(feed.poll(), 0)  # first poll only fetches the cursor
+        self.assertEqual(feed.poll(), 2)
+        self.assertEqual(seen, [("spells", {"shield.json"}, False)])
+        self.assertEqual(feed.cursor, "2")
+
+    def test_reset_reaches_every_subscribed_collection(self):
+        batches = [ChangeBatch("1"), ChangeBatch("9", reset=True)]
+        feed = ChangeFeed(lambda cursor: batches.pop(0))
+        seen = []
+        feed.subscribe(("spells", "items"), lambda c, keys, reset: seen.append((c, reset)))
+        feed.poll()
+        feed.poll()
+        self.assertEqual(sorted(seen), [("items", True), ("spells", True)])
+
+    def test_unsupported_source_stops_feed(self):
+        feed = ChangeFeed(lambda cursor: None)
+        feed.poll()
+        self.assertFalse(feed.supported)
+
+
+if __name__ == "__main__":
+    unittest.main()
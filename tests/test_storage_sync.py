@@ -0,0 +1,152 @@
+import sys
+import tempfile
+import threading
+from pathlib import Path
+import unittest
+from unittest import mock
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+LIB_DIR = REPO_ROOT / "lib"
+sys.path.insert(0, str(LIB_DIR))
+
+from app.local_storage import LocalStorage
+from app.mock_storage_api import MockStorageServer
+from app.storage_api import StorageAPI
+from app.storage_sync import MirroredStorage
+
+
+def _offline():
+    return mock.patch.object(
+        requests.Session, "request", side_effect=requests.ConnectionError("offline")
+    )
+
+
+class MirroredStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.server = MockStorageServer().start()
+        self.addCleanup(self.server.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.mirror_dir = tmp.name
+        self.server.store.put("spells", "shield.json", {"name": "Shield", "level": 1})
+        self.server.store.put("encounters", "goblins.json", {"players": []})
+
+    def _mirror(self, **options):
+        api = StorageAPI(self.server.base_url)
+        self.addCleanup(api.session.close)
+        return MirroredStorage(api, LocalStorage(self.mirror_dir), **options)
+
+    def test_first_sync_copies_the_server_and_reads_stay_local(self):
+        mirror = self._mirror()
+        self.assertTrue(mirror.sync_once())
+        with _offline():
+            self.assertEqual(mirror.get_spell("shield.json"), {"name": "Shield", "level": 1})
+            self.assertEqual(mirror.list(), ["goblins.json"])
+            self.assertEqual(mirror.list_spell_keys(), ["shield.json"])
+
+    def test_writes_queue_while_offline_and_push_later(self):
+        mirror = self._mirror()
+        mirror.sync_once()
+        with _offline():
+            mirror.save_item("rope.json", {"name": "Rope"})
+            mirror.delete_spell("shield.json")
+            self.assertFalse(mirror.sync_once())
+        self.assertEqual(mirror.status()["pending"], 2)
+        self.assertFalse(mirror.status()["online"])
+        self.assertIsNone(self.server.store.get("items", "rope.json"))
+
+        # Queued writes survive a restart.
+        mirror = self._mirror()
+        self.assertTrue(mirror.sync_once())
+        self.assertEqual(self.server.store.get("items", "rope.json")[1], {"name": "Rope"})
+        self.assertIsNone(self.server.store.get("spells", "shield.json"))
+        self.assertEqual(mirror.status()["pending"], 0)
+
+    def test_pulls_remote_changes_incrementally(self):
+        mirror = self._mirror()
+        mirror.sync_once()
+        self.server.store.put("spells", "fireball.json", {"name": "Fireball"})
+        self.server.store.delete("encounters", "goblins.json")
+        with mock.patch.object(mirror, "_full_sync") as full_sync:
+            mirror.sync_once()
+        full_sync.assert_not_called()
+        self.assertEqual(mirror.get_spell("fireball.json"), {"name": "Fireball"})
+        self.assertEqual(mirror.list(), [])
+
+    def test_conflicting_edit_keeps_server_copy_until_resolved(self):
+        mirror = self._mirror()
+        mirror.sync_once()
+        self.server.store.put("spells", "shield.json", {"name": "Shield", "level": 2})
+        mirror.save_spell("shield.json", {"name": "Shield", "level": 3})
+        mirror.sync_once()
+
+        self.assertEqual(mirror.get_spell("shield.json")["level"], 2)
+        [conflict] = mirror.conflicts()
+        self.assertEqual(conflict["local"]["level"], 3)
+
+        mirror.resolve_conflict("spells", "shield.json", keep_local=True)
+        mirror.sync_once()
+        self.assertEqual(self.server.store.get("spells", "shield.json")[1]["level"], 3)
+        self.assertEqual(mirror.status()["conflicts"], 0)
+
+    def test_server_without_change_feed_is_compared_periodically(self):
+        self.server.stop()
+        self.server = MockStorageServer(changes=False).start()
+        self.addCleanup(self.server.stop)
+        self.server.store.put("items", "rope.json", {"name": "Rope"})
+        now = [1000.0]
+        mirror = self._mirror(clock=lambda: now[0])
+        mirror.sync_once()
+        self.assertEqual(mirror.list_item_keys(), ["rope.json"])
+
+        self.server.store.put("items", "torch.json", {"name": "Torch"})
+        mirror.sync_once()
+        self.assertEqual(mirror.list_item_keys(), ["rope.json"])
+        now[0] += 601
+        mirror.sync_once()
+        self.assertEqual(mirror.list_item_keys(), ["rope.json", "torch.json"])
+
+    def test_write_after_stop_is_uploaded_after_restart(self):
+        mirror = self._mirror()
+        mirror.sync_once()
+        mirror.put("last_state.json", {"round_counter": 1})
+        mirror.sync_once()
+        mirror.stop()
+        mirror.put("last_state.json", {"round_counter": 7})
+
+        mirror = self._mirror()
+        self.assertEqual(mirror.status()["pending"], 1)
+        mirror.sync_once()
+        self.assertEqual(self.server.store.get("encounters", "last_state.json")[1], {"round_counter": 7})
+
+    def test_sync_runs_while_another_thread_has_a_batch_open(self):
+        mirror = self._mirror()
+        mirror.sync_once()
+        self.server.store.put("spells", "fireball.json", {"name": "Fireball", "level": 3})
+        synced = threading.Event()
+        worker = threading.Thread(target=lambda: mirror.sync_once() and synced.set(), daemon=True)
+        with mirror.batch():
+            mirror.save_item("rope.json", {"name": "Rope"})
+            worker.start()
+            self.assertTrue(synced.wait(5))
+            mirror.save_item("torch.json", {"name": "Torch"})
+            self.assertIsNone(self.server.store.get("items", "rope.json"))  # not committed yet
+        self.assertEqual(mirror.get_spell("fireball.json"), {"name": "Fireball", "level": 3})
+        self.assertEqual(mirror.status()["pending"], 2)
+        mirror.sync_once()
+        self.assertEqual(self.server.store.get("items", "rope.json")[1], {"name": "Rope"})
+
+    def test_status_callback_reports_changes_only(self):
+        seen = []
+        mirror = self._mirror(on_status=seen.append)
+        mirror.sync_once()
+        mirror.sync_once()
+        with _offline():
+            mirror.sync_once()
+        self.assertEqual([s["online"] for s in seen], [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()